@@ -0,0 +1,110 @@
+import threading
+import time
+
+class BackendSelector:
+    """
+    Escolhe, para cada tipo de operação, o backend mais rápido no momento: a latência de cada
+    backend é uma média móvel exponencial das suas execuções recentes. Backends ainda sem medição
+    são experimentados primeiro e, a cada `explore_every` execuções de uma operação, uma vai para
+    o backend medido há mais tempo, para que a sua média não fique desatualizada. Um backend que
+    falha em uma operação fica fora dela por `error_cooldown` segundos.
+
+    Args:
+        backends (tuple[str, ...]): Backends disponíveis, em ordem de preferência para o desempate
+        smoothing (float): Peso de cada nova medição na média (0 a 1)
+        explore_every (int): A cada quantas execuções de uma operação uma é de exploração
+        error_cooldown (float): Segundos que um backend fica fora de uma operação após uma falha
+    """
+    def __init__(self, backends: tuple[str, ...], smoothing: float = 0.2, explore_every: int = 20,
+                 error_cooldown: float = 30.0):
+        self.backends = backends
+        self._smoothing = smoothing
+        self._explore_every = explore_every
+        self._error_cooldown = error_cooldown
+        self._lock = threading.Lock()
+        self._calls: dict[str, int] = {}
+        # (operação, backend) -> latência média (s), execuções, falhas, último uso e fim da suspensão
+        self._latency: dict[tuple[str, str], float] = {}
+        self._executions: dict[tuple[str, str], int] = {}
+        self._errors: dict[tuple[str, str], int] = {}
+        self._last_used: dict[tuple[str, str], float] = {}
+        self._suspended_until: dict[tuple[str, str], float] = {}
+
+    def candidates(self, operation: str) -> list[str]:
+        """
+        Backends na ordem em que devem ser tentados em uma execução da operação: o escolhido
+        primeiro e os demais como alternativa em caso de falha.
+
+        Args:
+            operation (str): Tipo de operação (por exemplo, "get_order_report")
+
+        Returns:
+            list[str]: Backends em ordem de tentativa; os suspensos por falha ficam por último
+        """
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls.get(operation, 0) + 1
+            self._calls[operation] = calls
+
+            available = [b for b in self.backends if self._suspended_until.get((operation, b), 0.0) <= now]
+            suspended = [b for b in self.backends if b not in available]
+            if not available:
+                # Todos suspensos: tenta o que volta primeiro
+                return sorted(suspended, key=lambda b: self._suspended_until[(operation, b)])
+
+            unmeasured = [b for b in available if (operation, b) not in self._latency]
+            if unmeasured:
+                chosen = unmeasured[0]
+            else:
+                chosen = min(available, key=lambda b: self._latency[(operation, b)])
+                if calls % self._explore_every == 0 and len(available) > 1:
+                    chosen = min((b for b in available if b != chosen),
+                                 key=lambda b: self._last_used.get((operation, b), 0.0))
+
+        return [chosen] + [b for b in available if b != chosen] + suspended
+
+    def record_success(self, operation: str, backend: str, seconds: float) -> None:
+        """
+        Registra a latência de uma execução bem-sucedida, encerrando uma eventual suspensão.
+        """
+        key = (operation, backend)
+        with self._lock:
+            previous = self._latency.get(key)
+            self._latency[key] = seconds if previous is None else previous + self._smoothing * (seconds - previous)
+            self._executions[key] = self._executions.get(key, 0) + 1
+            self._last_used[key] = time.monotonic()
+            self._suspended_until.pop(key, None)
+
+    def record_error(self, operation: str, backend: str) -> None:
+        """
+        Registra uma falha do backend, suspendendo-o da operação por `error_cooldown` segundos.
+        """
+        key = (operation, backend)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+            self._last_used[key] = time.monotonic()
+            self._suspended_until[key] = time.monotonic() + self._error_cooldown
+
+    def statistics(self) -> dict:
+        """
+        Situação atual de cada backend por operação.
+
+        Returns:
+            dict: {operação: {backend: {'latency_ms', 'executions', 'errors', 'suspended'}}};
+                'latency_ms' é None enquanto o backend não tiver medição
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                operation: {
+                    backend: {
+                        'latency_ms': round(self._latency[(operation, backend)] * 1000, 3)
+                                      if (operation, backend) in self._latency else None,
+                        'executions': self._executions.get((operation, backend), 0),
+                        'errors': self._errors.get((operation, backend), 0),
+                        'suspended': self._suspended_until.get((operation, backend), 0.0) > now
+                    }
+                    for backend in self.backends
+                }
+                for operation in self._calls
+            }
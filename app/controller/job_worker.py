@@ -0,0 +1,62 @@
+import threading
+from app.controller.order_controller import OrderController
+
+class JobWorkerPool:
+    """
+    Threads que executam os jobs em segundo plano (OrderController.submit_job): cada uma reserva
+    o próximo job pendente, executa e grava o resultado. Sem jobs, espera `poll_interval` segundos
+    antes de consultar a fila de novo. Vários pools (em processos diferentes) podem atender a
+    mesma fila, já que cada job é reservado por um único worker.
+
+    Args:
+        workers (int): Quantidade de threads
+        poll_interval (float): Espera (s) entre consultas à fila quando não há jobs
+        stale_after (float): Tempo (s) após o qual um job em execução é retomado por outro worker
+    """
+    def __init__(self, workers: int = 4, poll_interval: float = 1.0, stale_after: float = 3600.0):
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._stale_after = stale_after
+        self._stopped = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.executed = 0
+
+    def start(self, drain: bool = False) -> None:
+        """
+        Inicia os workers.
+
+        Args:
+            drain (bool): Os workers terminam quando a fila fica vazia, em vez de esperar novos jobs
+        """
+        for position in range(self._workers):
+            thread = threading.Thread(target=self._work, args=(drain,), name=f"job-worker-{position}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self, drain: bool) -> None:
+        while not self._stopped.is_set():
+            _, job_id = OrderController.run_next_job(self._stale_after)
+            if job_id is None:
+                if drain:
+                    return
+                self._stopped.wait(self._poll_interval)
+                continue
+            with self._lock:
+                self.executed += 1
+
+    def join(self) -> None:
+        """
+        Aguarda o fim dos workers (após stop ou, com drain, quando a fila esvaziar).
+        """
+        for thread in self._threads:
+            # join com timeout para que o KeyboardInterrupt seja recebido pela thread principal
+            while thread.is_alive():
+                thread.join(0.5)
+
+    def stop(self) -> None:
+        """
+        Encerra os workers depois dos jobs em execução.
+        """
+        self._stopped.set()
+        self.join()
@@ -1,29 +1,747 @@
-from app.dao.psycopg_dao import (
-    find_customer_id_by_name,
-    find_employee_id_by_name,
-    find_product_id_and_price_by_name,
-    insert_order,
-    insert_order_detail,
-    find_order_with_details,
-    get_employee_sales_ranking
-)
-from app.model.psycopg_model import Orders as PsycopgOrders, OrderDetails as PsycopgOrderDetails
-
-# Importações para SQLAlchemy
-from app.dao.sqlalchemy_dao import (
-    find_customer_id_by_name as sqlalchemy_find_customer_id_by_name,
-    find_employee_id_by_name as sqlalchemy_find_employee_id_by_name,
-    find_product_id_and_price_by_name as sqlalchemy_find_product_id_and_price_by_name,
-    insert_order as sqlalchemy_insert_order,
-    insert_order_detail as sqlalchemy_insert_order_detail,
-    find_order_with_details as sqlalchemy_find_order_with_details,
-    get_employee_sales_ranking as sqlalchemy_get_employee_sales_ranking
-)
-from app.model.orm_model import Orders as SqlalchemyOrders, OrderDetails as SqlalchemyOrderDetails
-
-from datetime import date
+from datetime import date, datetime
+import base64
+import functools
+import importlib
+import time
+from app.controller.backend_selector import BackendSelector
+
+# Os backends (e o SQLAlchemy, no caso do ORM) só são importados quando usados pela primeira vez
+_DAO_MODULES = {
+    "psycopg": "app.dao.psycopg_dao",
+    "sqlalchemy": "app.dao.sqlalchemy_dao",
+    "asyncpg": "app.dao.asyncpg_dao",
+    "sharded": "app.dao.sharded_dao",
+    "columnar": "app.dao.columnar_dao",
+}
+
+_MODEL_MODULES = {
+    "psycopg": "app.model.psycopg_model",
+    "sqlalchemy": "app.model.orm_model",
+    "asyncpg": "app.model.psycopg_model",
+    "sharded": "app.model.psycopg_model",
+}
+
+def _load_dao(mode: str):
+    """
+    Retorna o módulo DAO do backend informado, importando-o no primeiro uso
+    """
+    return importlib.import_module(_DAO_MODULES[mode])
+
+def _load_model(mode: str):
+    """
+    Retorna o módulo de modelos do backend informado, importando-o no primeiro uso
+    """
+    return importlib.import_module(_MODEL_MODULES[mode])
+
+def _mark_recent_write() -> None:
+    """
+    Após gravar, direciona as leituras do cliente atual ao primário por alguns segundos (read-your-writes)
+    """
+    importlib.import_module("app.dao.base_dao").mark_recent_write()
+
+def _reads_go_to_primary() -> bool:
+    """
+    Indica se as leituras do cliente atual vão para o primário (gravação recente)
+    """
+    return importlib.import_module("app.dao.base_dao").reads_go_to_primary()
+
+class TimeoutResult(str):
+    """
+    Mensagem de erro devolvida quando uma operação excede o seu tempo máximo (statement_timeout,
+    configurado por DB_TIMEOUT_<TIPO>_MS). Como é um str, é exibida como as demais mensagens de
+    erro; quem precisa tratar o timeout à parte usa isinstance(mensagem, TimeoutResult).
+    """
+    def __new__(cls, operation: str, timeout_ms: int):
+        message = super().__new__(cls, f"Erro: A operação excedeu o tempo limite de {timeout_ms} ms e foi cancelada.")
+        message.operation = operation
+        message.timeout_ms = timeout_ms
+        return message
+
+class BackendFailure(str):
+    """
+    Mensagem de erro devolvida quando uma operação fica sem resultado por uma falha do banco
+    (conexão recusada, erro na consulta). Como TimeoutResult, é exibida como as demais mensagens
+    de erro e se distingue de respostas como "não encontrado" por isinstance(mensagem, BackendFailure).
+    """
+    def __new__(cls, operation: str):
+        message = super().__new__(cls, "Erro: Falha no acesso ao banco de dados. Tente novamente.")
+        message.operation = operation
+        return message
+
+def _is_operation_timeout(error: Exception) -> bool:
+    # O erro só pode ter vindo de um DAO, então base_dao já está importado
+    return isinstance(error, importlib.import_module("app.dao.base_dao").OperationTimeoutError)
+
+def _is_operation_error(error: Exception) -> bool:
+    """
+    Indica se o erro é um timeout ou uma falha do banco sinalizados pelo DAO
+    """
+    base_dao = importlib.import_module("app.dao.base_dao")
+    return isinstance(error, (base_dao.OperationTimeoutError, base_dao.OperationFailedError))
+
+def _timeout_result(function):
+    """
+    Converte o timeout de uma operação do DAO (OperationTimeoutError) em (False, TimeoutResult) e
+    a falha do banco (OperationFailedError) em (False, BackendFailure)
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            if _is_operation_timeout(e):
+                return (False, TimeoutResult(e.operation, e.timeout_ms))
+            if _is_operation_error(e):
+                return (False, BackendFailure(e.operation))
+            raise
+    return wrapper
+
+def _stock_reservation_enabled() -> bool:
+    """
+    Indica se a criação de pedidos reserva o estoque dos produtos (DB_RESERVE_STOCK=1)
+    """
+    return importlib.import_module("app.dao.base_dao").stock_reservation_enabled()
+
+# Dimensões aceitas pelo resumo de vendas (get_sales_rollup_report_<backend>)
+SALES_ROLLUP_DIMENSIONS = ("employee", "customer", "product", "category", "ship_country")
+
+# Granularidades aceitas pela tendência de vendas (get_sales_trend_report_<backend>)
+SALES_TREND_BUCKETS = ("day", "week", "month")
+
+# Tamanho máximo de página da listagem de pedidos (list_orders_<backend>)
+MAX_ORDER_PAGE_SIZE = 500
+
+# Catálogos aceitos pela busca por nome (search_customers/search_products)
+NAME_SEARCH_CATALOGS = ("customers", "products")
+
+# Quantidade máxima de pedidos por leitura do feed de pedidos (read_order_feed_<backend>)
+MAX_ORDER_FEED_BATCH_SIZE = 1000
+
+# Gravação em lotes (group commit) dos pedidos do psycopg; desativada por padrão
+_order_write_batcher = None
+
+# Coalescência de leituras idênticas (relatórios de pedido e ranking); desativada por padrão
+_report_loaders = {}
+_ranking_single_flight = None
+
+@_timeout_result
+def _create_new_order(
+    mode: str,
+    customer_name: str,
+    employee_first_name: str,
+    employee_last_name: str,
+    items_data: list[dict],
+    shipping_data: dict = None
+) -> tuple[bool, str]:
+    """
+    Cria um pedido nos backends que usam os registros de psycopg_model (psycopg e sharded).
+    Ver OrderController.create_new_order_psycopg.
+    """
+    dao = _load_dao(mode)
+    model = _load_model(mode)
+    
+    if mode == "sharded" and _stock_reservation_enabled():
+        return (False, "Erro: A reserva de estoque não está disponível no modo particionado (sharded).")
+    
+    if shipping_data is None:
+        shipping_data = {}
+    
+    customer_id = dao.find_customer_id_by_name(customer_name)
+    if customer_id is None:
+        return (False, "Erro: Cliente não encontrado.")
+    
+    employee_id = dao.find_employee_id_by_name(employee_first_name, employee_last_name)
+    if employee_id is None:
+        return (False, "Erro: Funcionário não encontrado.")
+    
+    order_date = date.today()
+    
+    new_order = model.OrderRecord(
+        customerid=customer_id,
+        employeeid=employee_id,
+        orderdate=order_date,
+        requireddate=shipping_data.get('required_date'),
+        shippeddate=shipping_data.get('shipped_date'),
+        shipperid=shipping_data.get('shipper_id'),
+        freight=shipping_data.get('freight', 0.0),
+        shipname=shipping_data.get('ship_name'),
+        shipaddress=shipping_data.get('ship_address'),
+        shipcity=shipping_data.get('ship_city'),
+        shipregion=shipping_data.get('ship_region'),
+        shippostalcode=shipping_data.get('ship_postal_code'),
+        shipcountry=shipping_data.get('ship_country')
+    )
+    
+    # Os produtos são resolvidos antes de qualquer gravação, para que um item inválido
+    # não deixe um pedido incompleto no banco
+    order_details = []
+    for item in items_data:
+        product_name = item.get('product_name')
+        quantity = item.get('quantity', 1)
+        discount = item.get('discount', 0.0)
+        
+        product_info = dao.find_product_id_and_price_by_name(product_name)
+        if product_info is None:
+            return (False, f"Erro: Produto '{product_name}' não encontrado.")
+            
+        product_id, unit_price = product_info
+        
+        order_details.append(model.OrderDetailRecord(
+            productid=product_id,
+            unitprice=unit_price,
+            quantity=quantity,
+            discount=discount,
+            orderdate=order_date
+        ))
+    
+    if mode == "psycopg" and _order_write_batcher is not None:
+        try:
+            new_order_id = _order_write_batcher.write(new_order, order_details)
+        except Exception as e:
+            if _is_operation_error(e):
+                raise
+            return (False, f"Erro: Falha ao inserir o pedido. {e}")
+        _mark_recent_write()
+        return (True, f"Pedido {new_order_id} inserido com sucesso!")
+    
+    if _stock_reservation_enabled():
+        # A reserva de estoque precisa do pedido e dos itens na mesma transação: um lote de um pedido
+        result = dao.insert_order_batch([(new_order, order_details)])[0]
+        if _is_operation_error(result):
+            raise result
+        if isinstance(result, str):
+            return (False, f"Erro: {result}.")
+        _mark_recent_write()
+        return (True, f"Pedido {result} inserido com sucesso!")
+    
+    if mode == "sharded":
+        # Pedido e itens vão para o mesmo shard, em uma única transação
+        result = dao.insert_order_with_details(new_order, order_details)
+        if isinstance(result, str):
+            return (False, f"Erro: {result}.")
+        _mark_recent_write()
+        return (True, f"Pedido {result} inserido com sucesso!")
+    
+    new_order_id = dao.insert_order(new_order)
+    if new_order_id is None:
+        return (False, "Erro: Falha ao inserir o cabeçalho do pedido.")
+    
+    for order_detail in order_details:
+        dao.insert_order_detail(order_detail._replace(orderid=new_order_id))
+    
+    _mark_recent_write()
+    return (True, f"Pedido {new_order_id} inserido com sucesso!")
+
+@_timeout_result
+def _get_order_report(mode: str, order_id: int) -> tuple[bool, dict | str]:
+    """
+    Implementação comum de OrderController.get_order_report_<backend>
+    """
+    dao = _load_dao(mode)
+    
+    if not isinstance(order_id, int) or order_id <= 0:
+        return (False, "Erro: ID do pedido deve ser um número inteiro positivo.")
+    
+    loader = _report_loaders.get(mode)
+    if loader is not None:
+        try:
+            order_data = loader.load(order_id)
+        except Exception as e:
+            if _is_operation_timeout(e):
+                raise
+            # Falha do banco na busca agrupada, e não um pedido inexistente
+            print(f"Erro ao buscar o pedido com ID {order_id}: {e}")
+            return (False, BackendFailure("report"))
+    else:
+        order_data = dao.find_order_with_details(order_id)
+    
+    if order_data is None:
+        return (False, f"Erro: Pedido com ID {order_id} não encontrado.")
+        
+    return (True, order_data)
+
+@_timeout_result
+def _get_employee_ranking_report(mode: str, start_date: date, end_date: date) -> tuple[bool, list | str]:
+    """
+    Implementação comum de OrderController.get_employee_ranking_report_<backend>
+    """
+    dao = _load_dao(mode)
+    
+    if not isinstance(start_date, date):
+        return (False, "Erro: A data inicial deve ser um objeto date.")
+        
+    if not isinstance(end_date, date):
+        return (False, "Erro: A data final deve ser um objeto date.")
+        
+    if start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    single_flight = _ranking_single_flight
+    if single_flight is not None:
+        # Quem gravou há pouco lê do primário e só compartilha a consulta com quem também grava
+        ranking_data = single_flight.do(
+            (mode, start_date, end_date, _reads_go_to_primary()),
+            lambda: dao.get_employee_sales_ranking(start_date, end_date)
+        )
+    else:
+        ranking_data = dao.get_employee_sales_ranking(start_date, end_date)
+    
+    if ranking_data is None:
+        return (False, "Erro: Ocorreu um erro ao gerar o ranking de vendas.")
+        
+    if len(ranking_data) == 0:
+        return (True, "Nenhum pedido encontrado no período especificado.")
+        
+    return (True, ranking_data)
+
+@_timeout_result
+def _get_sales_rollup_report(
+    mode: str,
+    start_date: date,
+    end_date: date,
+    grouping_sets: list[list[str]] = None,
+    rollup: list[str] = None
+) -> tuple[bool, list | str]:
+    """
+    Implementação comum de OrderController.get_sales_rollup_report_<backend>
+    """
+    if not isinstance(start_date, date) or not isinstance(end_date, date):
+        return (False, "Erro: As datas devem ser objetos date.")
+        
+    if start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    if rollup:
+        # ROLLUP(a, b, c) equivale a GROUPING SETS ((a, b, c), (a, b), (a), ())
+        grouping_sets = [rollup[:size] for size in range(len(rollup), -1, -1)]
+    elif not grouping_sets:
+        # Padrão: cada dimensão isoladamente e o total geral
+        grouping_sets = [[dimension] for dimension in SALES_ROLLUP_DIMENSIONS] + [[]]
+    
+    normalized = []
+    for grouping_set in grouping_sets:
+        for dimension in grouping_set:
+            if dimension not in SALES_ROLLUP_DIMENSIONS:
+                return (False, f"Erro: Dimensão inválida '{dimension}'. Use: {', '.join(SALES_ROLLUP_DIMENSIONS)}.")
+        grouping_set = tuple(dict.fromkeys(grouping_set))
+        if grouping_set not in normalized:
+            normalized.append(grouping_set)
+    
+    rollup_data = _load_dao(mode).get_sales_rollup(start_date, end_date, normalized)
+    
+    if rollup_data is None:
+        return (False, "Erro: Ocorreu um erro ao gerar o resumo de vendas.")
+        
+    if len(rollup_data) == 0:
+        return (True, "Nenhum pedido encontrado no período especificado.")
+        
+    return (True, rollup_data)
+
+@_timeout_result
+def _get_sales_trend_report(
+    mode: str,
+    start_date: date,
+    end_date: date,
+    bucket: str = "month",
+    window: int = 3,
+    use_summary: bool = False
+) -> tuple[bool, list | str]:
+    """
+    Implementação comum de OrderController.get_sales_trend_report_<backend>
+    """
+    if not isinstance(start_date, date) or not isinstance(end_date, date):
+        return (False, "Erro: As datas devem ser objetos date.")
+        
+    if start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    if bucket not in SALES_TREND_BUCKETS:
+        return (False, f"Erro: Período inválido '{bucket}'. Use: {', '.join(SALES_TREND_BUCKETS)}.")
+    
+    if window < 1:
+        return (False, "Erro: A janela da média móvel deve ter ao menos 1 período.")
+    
+    trend_data = _load_dao(mode).get_employee_sales_trend(start_date, end_date, bucket, window, use_summary)
+    
+    if trend_data is None:
+        return (False, "Erro: Ocorreu um erro ao gerar a tendência de vendas.")
+        
+    if len(trend_data) == 0:
+        return (True, "Nenhum pedido encontrado no período especificado.")
+        
+    return (True, trend_data)
+
+@_timeout_result
+def _get_team_ranking_report(mode: str, start_date: date, end_date: date) -> tuple[bool, list | str]:
+    """
+    Implementação comum de OrderController.get_team_ranking_report_<backend>
+    """
+    if not isinstance(start_date, date) or not isinstance(end_date, date):
+        return (False, "Erro: As datas devem ser objetos date.")
+        
+    if start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    ranking_data = _load_dao(mode).get_team_sales_ranking(start_date, end_date)
+    
+    if ranking_data is None:
+        return (False, "Erro: Ocorreu um erro ao gerar o ranking por equipe.")
+        
+    if len(ranking_data) == 0:
+        return (True, "Nenhum funcionário encontrado na hierarquia (execute `python main.py hierarchy build`).")
+        
+    return (True, ranking_data)
+
+@_timeout_result
+def _list_order_ids(mode: str, start_date: date, end_date: date) -> tuple[bool, list | str]:
+    """
+    Implementação comum de OrderController.list_order_ids_<backend>
+    """
+    if start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    order_ids = _load_dao(mode).find_order_ids_by_period(start_date, end_date)
+    
+    if order_ids is None:
+        return (False, "Erro: Ocorreu um erro ao listar os pedidos do período.")
+        
+    return (True, order_ids)
+
+@_timeout_result
+def _get_order_reports(mode: str, order_ids: list[int], start_date: date = None, end_date: date = None) -> tuple[bool, dict | str]:
+    """
+    Implementação comum de OrderController.get_order_reports_<backend>
+    """
+    if start_date is not None and end_date is not None and start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    orders = _load_dao(mode).find_orders_with_details(order_ids, start_date, end_date)
+    
+    if orders is None:
+        return (False, "Erro: Ocorreu um erro ao buscar os pedidos.")
+        
+    return (True, orders)
+
+def _encode_order_cursor(order: dict) -> str:
+    """
+    Cursor da página seguinte: (orderdate, orderid) do último pedido, em um texto opaco seguro para URLs
+    """
+    key = f"{order['order_date'].isoformat()}|{order['order_id']}"
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_order_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """
+    Inverso de _encode_order_cursor; retorna None para cursores inválidos
+    """
+    try:
+        key = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        order_date, order_id = key.split("|")
+        return (datetime.fromisoformat(order_date), int(order_id))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+@_timeout_result
+def _list_orders(
+    mode: str,
+    customer_name: str = None,
+    employee_name: tuple[str, str] = None,
+    start_date: date = None,
+    end_date: date = None,
+    cursor: str = None,
+    page_size: int = 50
+) -> tuple[bool, dict | str]:
+    """
+    Implementação comum de OrderController.list_orders_<backend>
+    """
+    dao = _load_dao(mode)
+    
+    if not isinstance(page_size, int) or not 1 <= page_size <= MAX_ORDER_PAGE_SIZE:
+        return (False, f"Erro: O tamanho da página deve estar entre 1 e {MAX_ORDER_PAGE_SIZE}.")
+        
+    if start_date is not None and end_date is not None and start_date > end_date:
+        return (False, "Erro: A data inicial não pode ser posterior à data final.")
+    
+    after = None
+    if cursor:
+        after = _decode_order_cursor(cursor)
+        if after is None:
+            return (False, "Erro: Cursor de página inválido.")
+    
+    customer_id = None
+    if customer_name:
+        customer_id = dao.find_customer_id_by_name(customer_name)
+        if customer_id is None:
+            return (False, "Erro: Cliente não encontrado.")
+    
+    employee_id = None
+    if employee_name:
+        employee_id = dao.find_employee_id_by_name(*employee_name)
+        if employee_id is None:
+            return (False, "Erro: Funcionário não encontrado.")
+    
+    # Um pedido a mais indica se existe uma página seguinte
+    orders = dao.list_orders(customer_id, employee_id, start_date, end_date, after, page_size + 1)
+    
+    if orders is None:
+        return (False, "Erro: Ocorreu um erro ao listar os pedidos.")
+    
+    next_cursor = _encode_order_cursor(orders[page_size - 1]) if len(orders) > page_size else None
+    return (True, {'orders': orders[:page_size], 'next_cursor': next_cursor})
+
+def _encode_feed_offset(txid: int, position: int) -> str:
+    return f"{txid}:{position}"
+
+def _decode_feed_offset(offset: str) -> tuple[int, int] | None:
+    """
+    Converte um offset do feed ("txid:posição") na tupla usada pela consulta, ou None se inválido
+    """
+    try:
+        txid, position = (int(part) for part in offset.split(":"))
+    except (AttributeError, ValueError):
+        return None
+    return (txid, position)
+
+@_timeout_result
+def _read_order_feed(mode: str, consumer: str, offset: str | None, batch_size: int) -> tuple[bool, dict | str]:
+    """
+    Implementação comum de OrderController.read_order_feed_<backend>
+    """
+    if not isinstance(consumer, str) or not consumer.strip():
+        return (False, "Erro: Informe o nome do consumidor do feed.")
+    
+    if not isinstance(batch_size, int) or not 1 <= batch_size <= MAX_ORDER_FEED_BATCH_SIZE:
+        return (False, f"Erro: A quantidade de pedidos por leitura deve estar entre 1 e {MAX_ORDER_FEED_BATCH_SIZE}.")
+    
+    after = None
+    if offset is not None:
+        after = _decode_feed_offset(offset)
+        if after is None:
+            return (False, "Erro: Offset do feed inválido.")
+    
+    # O feed fica no banco principal, independentemente do backend usado para montar os pedidos
+    entries = importlib.import_module("app.dao.order_feed").read_order_feed(consumer, after, batch_size)
+    
+    if entries is None:
+        return (False, "Erro: Ocorreu um erro ao ler o feed de pedidos.")
+    
+    if not entries:
+        return (True, {'orders': [], 'offset': offset})
+    
+    # Os documentos dos pedidos da leitura são buscados de uma vez
+    orders = _load_dao(mode).find_orders_with_details([order_id for _, _, order_id in entries])
+    
+    if orders is None:
+        return (False, "Erro: Ocorreu um erro ao buscar os pedidos do feed.")
+    
+    return (True, {
+        'orders': [
+            {'offset': _encode_feed_offset(txid, position), 'order_id': order_id, 'order': orders.get(order_id)}
+            for txid, position, order_id in entries
+        ],
+        'offset': _encode_feed_offset(*entries[-1][:2])
+    })
+
+def _search_names(catalog: str, term: str, limit: int) -> tuple[bool, list | str]:
+    """
+    Implementação comum de OrderController.search_customers e search_products
+    """
+    if not isinstance(term, str):
+        return (False, "Erro: O termo de busca deve ser um texto.")
+    
+    if not isinstance(limit, int) or not 1 <= limit <= 50:
+        return (False, "Erro: A quantidade de resultados deve estar entre 1 e 50.")
+    
+    # A busca usa um índice em memória comum a todos os backends (ver app/dao/name_search.py)
+    results = importlib.import_module("app.dao.name_search").search_names(catalog, term, limit)
+    
+    if results is None:
+        return (False, "Erro: Ocorreu um erro ao buscar os nomes.")
+        
+    return (True, results)
+
+# Modo "auto": cada tipo de operação vai para o backend mais rápido no momento (ver BackendSelector)
+AUTO_BACKENDS = ("psycopg", "sqlalchemy")
+
+_backend_selector = BackendSelector(AUTO_BACKENDS)
+
+def _is_backend_error(result: tuple[bool, object]) -> bool:
+    # As demais mensagens de erro (validação, "não encontrado") são respostas válidas e seriam
+    # iguais no outro backend
+    success, data = result
+    return not success and isinstance(data, (TimeoutResult, BackendFailure))
+
+def _run_auto(operation: str, retry: bool, *args, **kwargs) -> tuple[bool, object]:
+    """
+    Implementação comum de OrderController.<operação>_auto: executa a operação no backend escolhido
+    e registra a latência. Se o backend falhar e `retry` for True, tenta o próximo; timeouts não
+    são repetidos, já que a mesma consulta tende a exceder o limite também no outro backend.
+    """
+    for backend in _backend_selector.candidates(operation):
+        started = time.perf_counter()
+        try:
+            result = getattr(OrderController, f"{operation}_{backend}")(*args, **kwargs)
+        except Exception as e:
+            # Ex.: SQLAlchemy não instalado ou erro não tratado pelo DAO
+            print(f"Erro no backend {backend}: {e}")
+            result = (False, BackendFailure(operation))
+        
+        if not _is_backend_error(result):
+            _backend_selector.record_success(operation, backend, time.perf_counter() - started)
+            return result
+        
+        _backend_selector.record_error(operation, backend)
+        if not retry or isinstance(result[1], TimeoutResult):
+            return result
+    
+    return result
+
+# Jobs em segundo plano: tipos aceitos e operações do controlador que cada um usa (com o sufixo do backend)
+JOB_KINDS = ("ranking", "rollup", "reports", "export")
+
+_JOB_OPERATIONS = {
+    "ranking": ("get_employee_ranking_report",),
+    "rollup": ("get_sales_rollup_report",),
+    "reports": ("get_order_reports",),
+    "export": ("list_order_ids", "get_order_reports"),
+}
+
+# Pedidos buscados por consulta nos jobs de relatórios e exportação
+JOB_REPORT_CHUNK_SIZE = 500
+
+def _normalize_job_params(kind: str, params: dict) -> dict | str:
+    """
+    Valida os parâmetros de um job e devolve apenas os usados pelo tipo, no formato gravado
+    (datas AAAA-MM-DD), para que jobs idênticos tenham os mesmos parâmetros; ou a mensagem de erro
+    """
+    if not isinstance(params, dict):
+        return "Erro: Os parâmetros do job devem ser um objeto."
+    
+    if kind == "reports":
+        order_ids = params.get('order_ids')
+        if not isinstance(order_ids, list) or not order_ids or not all(
+            isinstance(order_id, int) and order_id > 0 for order_id in order_ids
+        ):
+            return "Erro: Informe os IDs dos pedidos (inteiros positivos)."
+        return {'order_ids': order_ids}
+    
+    try:
+        start_date = date.fromisoformat(params['from'])
+        end_date = date.fromisoformat(params['to'])
+    except (KeyError, TypeError, ValueError):
+        return "Erro: Informe as datas 'from' e 'to' no formato AAAA-MM-DD."
+    
+    if start_date > end_date:
+        return "Erro: A data inicial não pode ser posterior à data final."
+    
+    normalized = {'from': start_date.isoformat(), 'to': end_date.isoformat()}
+    if kind == "rollup":
+        normalized['grouping_sets'] = params.get('grouping_sets')
+        normalized['rollup'] = params.get('rollup')
+    return normalized
+
+def _collect_order_reports(backend: str, order_ids: list[int], start_date: date = None,
+                           end_date: date = None) -> tuple[bool, dict | str]:
+    """
+    Busca os relatórios dos pedidos em blocos de JOB_REPORT_CHUNK_SIZE, na ordem dos IDs
+    """
+    get_reports = getattr(OrderController, f"get_order_reports_{backend}")
+    orders = []
+    not_found = []
+    for position in range(0, len(order_ids), JOB_REPORT_CHUNK_SIZE):
+        chunk = order_ids[position:position + JOB_REPORT_CHUNK_SIZE]
+        success, reports = get_reports(chunk, start_date, end_date)
+        if not success:
+            return (False, reports)
+        for order_id in chunk:
+            if order_id in reports:
+                orders.append(reports[order_id])
+            else:
+                not_found.append(order_id)
+    return (True, {'orders': orders, 'not_found': not_found})
+
+def _run_job(kind: str, backend: str, params: dict) -> tuple[bool, object]:
+    """
+    Executa um job com os parâmetros gravados por OrderController.submit_job
+    """
+    if kind == "reports":
+        return _collect_order_reports(backend, params['order_ids'])
+    
+    start_date = date.fromisoformat(params['from'])
+    end_date = date.fromisoformat(params['to'])
+    
+    if kind == "ranking":
+        return getattr(OrderController, f"get_employee_ranking_report_{backend}")(start_date, end_date)
+    
+    if kind == "rollup":
+        return getattr(OrderController, f"get_sales_rollup_report_{backend}")(
+            start_date, end_date, params['grouping_sets'], params['rollup']
+        )
+    
+    success, order_ids = getattr(OrderController, f"list_order_ids_{backend}")(start_date, end_date)
+    if not success:
+        return (False, order_ids)
+    # O período limita as partições lidas na busca dos pedidos
+    return _collect_order_reports(backend, order_ids, start_date, end_date)
 
 class OrderController:
+    @staticmethod
+    def enable_write_batching(max_batch_size: int = 50, max_latency_ms: float = 5.0, result_timeout: float = 30.0) -> None:
+        """
+        Ativa a gravação em lotes para create_new_order_psycopg: os pedidos validados são
+        enfileirados e gravados por uma thread dedicada, vários pedidos por transação.
+        Cada chamada continua bloqueando até o seu pedido ser gravado, por no máximo
+        `result_timeout` segundos.
+        
+        Args:
+            max_batch_size (int): Quantidade máxima de pedidos por transação
+            max_latency_ms (float): Tempo máximo que um pedido espera o lote completar
+            result_timeout (float): Tempo máximo (s) de espera pela gravação de um pedido
+        """
+        global _order_write_batcher
+        if _order_write_batcher is None:
+            from app.dao.order_write_batcher import OrderWriteBatcher
+            _order_write_batcher = OrderWriteBatcher(max_batch_size, max_latency_ms, result_timeout)
+    
+    @staticmethod
+    def disable_write_batching() -> None:
+        """
+        Desativa a gravação em lotes, aguardando a gravação dos pedidos já enfileirados.
+        """
+        global _order_write_batcher
+        if _order_write_batcher is not None:
+            batcher, _order_write_batcher = _order_write_batcher, None
+            batcher.close()
+    
+    @staticmethod
+    def enable_read_coalescing(window_ms: float = 2.0, max_batch_size: int = 100) -> None:
+        """
+        Ativa a coalescência de leituras: relatórios de pedido concorrentes são agrupados em uma
+        única consulta por janela de `window_ms`, e rankings idênticos em andamento compartilham
+        uma única consulta.
+        
+        Args:
+            window_ms (float): Janela de agrupamento dos relatórios de pedido
+            max_batch_size (int): Quantidade máxima de pedidos por consulta agrupada
+        """
+        global _ranking_single_flight
+        from app.dao.read_coalescer import OrderReportLoader, SingleFlight
+        for mode in ("psycopg", "sqlalchemy", "sharded"):
+            _report_loaders[mode] = OrderReportLoader(
+                lambda order_ids, mode=mode: _load_dao(mode).find_orders_with_details(order_ids),
+                window_ms,
+                max_batch_size
+            )
+        _ranking_single_flight = SingleFlight()
+    
+    @staticmethod
+    def disable_read_coalescing() -> None:
+        """
+        Desativa a coalescência de leituras.
+        """
+        global _ranking_single_flight
+        _report_loaders.clear()
+        _ranking_single_flight = None
+    
     @staticmethod
     def create_new_order_psycopg(
         customer_name: str,
@@ -48,64 +766,10 @@ class OrderController:
         Returns:
             tuple[bool, str]: Tupla contendo status de sucesso e mensagem
         """
-        if shipping_data is None:
-            shipping_data = {}
-        
-        customer_id = find_customer_id_by_name(customer_name)
-        if customer_id is None:
-            return (False, "Erro: Cliente não encontrado.")
-        
-        employee_id = find_employee_id_by_name(employee_first_name, employee_last_name)
-        if employee_id is None:
-            return (False, "Erro: Funcionário não encontrado.")
-        
-        order_date = date.today()
-        
-        new_order = PsycopgOrders(
-            orderid=None,
-            customerid=customer_id,
-            employeeid=employee_id,
-            orderdate=order_date,
-            requireddate=shipping_data.get('required_date'),
-            shippeddate=shipping_data.get('shipped_date'),
-            shipperid=shipping_data.get('shipper_id'),
-            freight=shipping_data.get('freight', 0.0),
-            shipname=shipping_data.get('ship_name'),
-            shipaddress=shipping_data.get('ship_address'),
-            shipcity=shipping_data.get('ship_city'),
-            shipregion=shipping_data.get('ship_region'),
-            shippostalcode=shipping_data.get('ship_postal_code'),
-            shipcountry=shipping_data.get('ship_country')
-        )
-        
-        new_order_id = insert_order(new_order)
-        if new_order_id is None:
-            return (False, "Erro: Falha ao inserir o cabeçalho do pedido.")
-        
-        for item in items_data:
-            product_name = item.get('product_name')
-            quantity = item.get('quantity', 1)
-            discount = item.get('discount', 0.0)
-            
-            product_info = find_product_id_and_price_by_name(product_name)
-            if product_info is None:
-                return (False, f"Erro: Produto '{product_name}' não encontrado.")
-                
-            product_id, unit_price = product_info
-            
-            order_detail = PsycopgOrderDetails(
-                orderid=new_order_id,
-                productid=product_id,
-                unitprice=unit_price,
-                quantity=quantity,
-                discount=discount
-            )
-            
-            insert_order_detail(order_detail)
-        
-        return (True, f"Pedido {new_order_id} inserido com sucesso!")
+        return _create_new_order("psycopg", customer_name, employee_first_name, employee_last_name, items_data, shipping_data)
     
     @staticmethod
+    @_timeout_result
     def create_new_order_sqlalchemy(
         customer_name: str,
         employee_first_name: str, 
@@ -129,20 +793,23 @@ class OrderController:
         Returns:
             tuple[bool, str]: Tupla contendo status de sucesso e mensagem
         """
+        sqlalchemy_dao = _load_dao("sqlalchemy")
+        orm_model = _load_model("sqlalchemy")
+        
         if shipping_data is None:
             shipping_data = {}
         
-        customer_id = sqlalchemy_find_customer_id_by_name(customer_name)
+        customer_id = sqlalchemy_dao.find_customer_id_by_name(customer_name)
         if customer_id is None:
             return (False, "Erro: Cliente não encontrado.")
         
-        employee_id = sqlalchemy_find_employee_id_by_name(employee_first_name, employee_last_name)
+        employee_id = sqlalchemy_dao.find_employee_id_by_name(employee_first_name, employee_last_name)
         if employee_id is None:
             return (False, "Erro: Funcionário não encontrado.")
         
         order_date = date.today()
         
-        new_order = SqlalchemyOrders(
+        new_order = orm_model.Orders(
             orderid=None,
             customerid=customer_id,
             employeeid=employee_id,
@@ -159,7 +826,32 @@ class OrderController:
             shipcountry=shipping_data.get('ship_country')
         )
         
-        order_result = sqlalchemy_insert_order(new_order)
+        if _stock_reservation_enabled():
+            # A reserva de estoque precisa do pedido e dos itens na mesma transação: os produtos
+            # são resolvidos antes e tudo é gravado por insert_order_with_details
+            order_details = []
+            for item in items_data:
+                product_info = sqlalchemy_dao.find_product_id_and_price_by_name(item.get('product_name'))
+                if product_info is None:
+                    return (False, f"Erro: Produto '{item.get('product_name')}' não encontrado.")
+                
+                product_id, unit_price = product_info
+                order_details.append(orm_model.OrderDetails(
+                    productid=product_id,
+                    unitprice=unit_price,
+                    quantity=item.get('quantity', 1),
+                    discount=item.get('discount', 0.0),
+                    orderdate=order_date
+                ))
+            
+            result = sqlalchemy_dao.insert_order_with_details(new_order, order_details)
+            if isinstance(result, str):
+                return (False, f"Erro: {result}.")
+            
+            _mark_recent_write()
+            return (True, f"Pedido {result} inserido com sucesso!")
+        
+        order_result = sqlalchemy_dao.insert_order(new_order)
         if order_result is None:
             return (False, "Erro: Falha ao inserir o cabeçalho do pedido.")
         
@@ -170,24 +862,53 @@ class OrderController:
             quantity = item.get('quantity', 1)
             discount = item.get('discount', 0.0)
             
-            product_info = sqlalchemy_find_product_id_and_price_by_name(product_name)
+            product_info = sqlalchemy_dao.find_product_id_and_price_by_name(product_name)
             if product_info is None:
                 return (False, f"Erro: Produto '{product_name}' não encontrado.")
                 
             product_id, unit_price = product_info
             
-            order_detail = SqlalchemyOrderDetails(
+            order_detail = orm_model.OrderDetails(
                 orderid=new_order_id,
                 productid=product_id,
                 unitprice=unit_price,
                 quantity=quantity,
-                discount=discount
+                discount=discount,
+                orderdate=order_date
             )
             
-            sqlalchemy_insert_order_detail(order_detail)
+            sqlalchemy_dao.insert_order_detail(order_detail)
         
+        _mark_recent_write()
         return (True, f"Pedido {new_order_id} inserido com sucesso!")
     
+    @staticmethod
+    def create_new_order_sharded(
+        customer_name: str,
+        employee_first_name: str, 
+        employee_last_name: str,
+        items_data: list[dict],
+        shipping_data: dict = None
+    ) -> tuple[bool, str]:
+        """
+        Cria um novo pedido com seus detalhes no modo particionado (sharding): o pedido
+        e seus itens são gravados no banco escolhido pelo hash do ID do cliente.
+        
+        Args:
+            customer_name: Nome da empresa cliente
+            employee_first_name: Nome do funcionário 
+            employee_last_name: Sobrenome do funcionário
+            items_data: Lista de dicionários com detalhes dos produtos
+                Cada dicionário contém: 'product_name', 'quantity', 'discount'
+            shipping_data: Dicionário com informações de envio
+                Pode conter: 'shipper_id', 'freight', 'ship_name', 'ship_address',
+                'ship_city', 'ship_region', 'ship_postal_code', 'ship_country'
+        
+        Returns:
+            tuple[bool, str]: Tupla contendo status de sucesso e mensagem
+        """
+        return _create_new_order("sharded", customer_name, employee_first_name, employee_last_name, items_data, shipping_data)
+    
     @staticmethod
     def get_order_report_psycopg(order_id: int) -> tuple[bool, dict | str]:
         """
@@ -201,15 +922,7 @@ class OrderController:
                 - status de sucesso (bool)
                 - dados do pedido (dict) ou mensagem de erro (str)
         """
-        if not isinstance(order_id, int) or order_id <= 0:
-            return (False, "Erro: ID do pedido deve ser um número inteiro positivo.")
-        
-        order_data = find_order_with_details(order_id)
-        
-        if order_data is None:
-            return (False, f"Erro: Pedido com ID {order_id} não encontrado.")
-            
-        return (True, order_data)
+        return _get_order_report("psycopg", order_id)
     
     @staticmethod
     def get_order_report_sqlalchemy(order_id: int) -> tuple[bool, dict | str]:
@@ -224,15 +937,22 @@ class OrderController:
                 - status de sucesso (bool)
                 - dados do pedido (dict) ou mensagem de erro (str)
         """
-        if not isinstance(order_id, int) or order_id <= 0:
-            return (False, "Erro: ID do pedido deve ser um número inteiro positivo.")
-        
-        order_data = sqlalchemy_find_order_with_details(order_id)
+        return _get_order_report("sqlalchemy", order_id)
+    
+    @staticmethod
+    def get_order_report_sharded(order_id: int) -> tuple[bool, dict | str]:
+        """
+        Obtém um relatório completo de um pedido específico usando o modo particionado (sharding).
         
-        if order_data is None:
-            return (False, f"Erro: Pedido com ID {order_id} não encontrado.")
+        Args:
+            order_id (int): ID do pedido a ser consultado
             
-        return (True, order_data)
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dados do pedido (dict) ou mensagem de erro (str)
+        """
+        return _get_order_report("sharded", order_id)
     
     @staticmethod
     def get_employee_ranking_report_psycopg(start_date: date, end_date: date) -> tuple[bool, list | str]:
@@ -248,29 +968,938 @@ class OrderController:
                 - status de sucesso (bool)
                 - lista de ranking (list) ou mensagem de erro (str)
         """
-        if not isinstance(start_date, date):
-            return (False, "Erro: A data inicial deve ser um objeto date.")
+        return _get_employee_ranking_report("psycopg", start_date, end_date)
+    
+    @staticmethod
+    def get_employee_ranking_report_sqlalchemy(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém um relatório de ranking de vendas dos funcionários em um período específico usando SQLAlchemy.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem de erro (str)
+        """
+        return _get_employee_ranking_report("sqlalchemy", start_date, end_date)
+    
+    @staticmethod
+    def get_employee_ranking_report_sharded(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém um relatório de ranking de vendas dos funcionários em um período específico usando o modo particionado (sharding).
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem de erro (str)
+        """
+        return _get_employee_ranking_report("sharded", start_date, end_date)
+    
+    @staticmethod
+    def get_employee_ranking_report_columnar(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém um relatório de ranking de vendas dos funcionários em um período específico a partir
+        do snapshot colunar em memória (NumPy), sem consultar o banco.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem de erro (str)
+        """
+        return _get_employee_ranking_report("columnar", start_date, end_date)
+    
+    @staticmethod
+    def get_sales_rollup_report_psycopg(
+        start_date: date,
+        end_date: date,
+        grouping_sets: list[list[str]] = None,
+        rollup: list[str] = None
+    ) -> tuple[bool, list | str]:
+        """
+        Gera o resumo de vendas (valor líquido e quantidade de pedidos) de um período por
+        várias combinações de dimensões em uma única consulta usando psycopg.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            grouping_sets (list[list[str]]): Combinações de dimensões a agregar (SALES_ROLLUP_DIMENSIONS);
+                a lista vazia representa o total geral. Padrão: cada dimensão isolada e o total geral
+            rollup (list[str]): Dimensões hierárquicas (ROLLUP); quando informado, substitui grouping_sets
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas do resumo (list) ou mensagem (str)
+        """
+        return _get_sales_rollup_report("psycopg", start_date, end_date, grouping_sets, rollup)
+    
+    @staticmethod
+    def get_sales_rollup_report_sqlalchemy(
+        start_date: date,
+        end_date: date,
+        grouping_sets: list[list[str]] = None,
+        rollup: list[str] = None
+    ) -> tuple[bool, list | str]:
+        """
+        Gera o resumo de vendas (valor líquido e quantidade de pedidos) de um período por
+        várias combinações de dimensões em uma única consulta usando SQLAlchemy.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            grouping_sets (list[list[str]]): Combinações de dimensões a agregar (SALES_ROLLUP_DIMENSIONS);
+                a lista vazia representa o total geral. Padrão: cada dimensão isolada e o total geral
+            rollup (list[str]): Dimensões hierárquicas (ROLLUP); quando informado, substitui grouping_sets
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas do resumo (list) ou mensagem (str)
+        """
+        return _get_sales_rollup_report("sqlalchemy", start_date, end_date, grouping_sets, rollup)
+    
+    @staticmethod
+    def get_sales_rollup_report_columnar(
+        start_date: date,
+        end_date: date,
+        grouping_sets: list[list[str]] = None,
+        rollup: list[str] = None
+    ) -> tuple[bool, list | str]:
+        """
+        Gera o resumo de vendas (valor líquido e quantidade de pedidos) de um período por
+        várias combinações de dimensões a partir do snapshot colunar em memória (NumPy).
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            grouping_sets (list[list[str]]): Combinações de dimensões a agregar (SALES_ROLLUP_DIMENSIONS);
+                a lista vazia representa o total geral. Padrão: cada dimensão isolada e o total geral
+            rollup (list[str]): Dimensões hierárquicas (ROLLUP); quando informado, substitui grouping_sets
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas do resumo (list) ou mensagem (str)
+        """
+        return _get_sales_rollup_report("columnar", start_date, end_date, grouping_sets, rollup)
+    
+    @staticmethod
+    def get_sales_trend_report_psycopg(
+        start_date: date,
+        end_date: date,
+        bucket: str = "month",
+        window: int = 3,
+        use_summary: bool = False
+    ) -> tuple[bool, list | str]:
+        """
+        Gera a tendência de vendas por funcionário (valor por período, total acumulado e média
+        móvel) em uma única consulta usando psycopg.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            bucket (str): Granularidade dos períodos (SALES_TREND_BUCKETS)
+            window (int): Quantidade de períodos da média móvel
+            use_summary (bool): Lê o resumo diário pré-agregado em vez dos itens de pedido
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas da tendência (list) ou mensagem (str)
+        """
+        return _get_sales_trend_report("psycopg", start_date, end_date, bucket, window, use_summary)
+    
+    @staticmethod
+    def get_sales_trend_report_sqlalchemy(
+        start_date: date,
+        end_date: date,
+        bucket: str = "month",
+        window: int = 3,
+        use_summary: bool = False
+    ) -> tuple[bool, list | str]:
+        """
+        Gera a tendência de vendas por funcionário (valor por período, total acumulado e média
+        móvel) em uma única consulta usando SQLAlchemy.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            bucket (str): Granularidade dos períodos (SALES_TREND_BUCKETS)
+            window (int): Quantidade de períodos da média móvel
+            use_summary (bool): Lê o resumo diário pré-agregado em vez dos itens de pedido
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas da tendência (list) ou mensagem (str)
+        """
+        return _get_sales_trend_report("sqlalchemy", start_date, end_date, bucket, window, use_summary)
+    
+    @staticmethod
+    def get_team_ranking_report_psycopg(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém o ranking de vendas por equipe (funcionário e subordinados diretos e indiretos)
+        em um período específico usando psycopg.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem (str)
+        """
+        return _get_team_ranking_report("psycopg", start_date, end_date)
+    
+    @staticmethod
+    def get_team_ranking_report_sqlalchemy(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém o ranking de vendas por equipe (funcionário e subordinados diretos e indiretos)
+        em um período específico usando SQLAlchemy.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem (str)
+        """
+        return _get_team_ranking_report("sqlalchemy", start_date, end_date)
+    
+    @staticmethod
+    def list_order_ids_psycopg(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Lista os IDs dos pedidos realizados em um período específico usando psycopg.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de IDs (list) ou mensagem de erro (str)
+        """
+        return _list_order_ids("psycopg", start_date, end_date)
+    
+    @staticmethod
+    def list_order_ids_sqlalchemy(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Lista os IDs dos pedidos realizados em um período específico usando SQLAlchemy.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de IDs (list) ou mensagem de erro (str)
+        """
+        return _list_order_ids("sqlalchemy", start_date, end_date)
+    
+    @staticmethod
+    def list_order_ids_sharded(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Lista os IDs dos pedidos realizados em um período específico usando o modo particionado (sharding).
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de IDs (list) ou mensagem de erro (str)
+        """
+        return _list_order_ids("sharded", start_date, end_date)
+    
+    @staticmethod
+    def get_order_reports_psycopg(order_ids: list[int], start_date: date = None, end_date: date = None) -> tuple[bool, dict | str]:
+        """
+        Obtém o relatório de vários pedidos de uma vez usando psycopg.
+        
+        Args:
+            order_ids (list[int]): IDs dos pedidos
+            start_date (date): Data de início do período dos pedidos, quando conhecida
+            end_date (date): Data de fim do período dos pedidos, quando conhecida
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dicionário {order_id: pedido} sem os pedidos não encontrados (dict) ou mensagem de erro (str)
+        """
+        return _get_order_reports("psycopg", order_ids, start_date, end_date)
+    
+    @staticmethod
+    def get_order_reports_sqlalchemy(order_ids: list[int], start_date: date = None, end_date: date = None) -> tuple[bool, dict | str]:
+        """
+        Obtém o relatório de vários pedidos de uma vez usando SQLAlchemy.
+        
+        Args:
+            order_ids (list[int]): IDs dos pedidos
+            start_date (date): Data de início do período dos pedidos, quando conhecida
+            end_date (date): Data de fim do período dos pedidos, quando conhecida
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dicionário {order_id: pedido} sem os pedidos não encontrados (dict) ou mensagem de erro (str)
+        """
+        return _get_order_reports("sqlalchemy", order_ids, start_date, end_date)
+    
+    @staticmethod
+    def get_order_reports_sharded(order_ids: list[int], start_date: date = None, end_date: date = None) -> tuple[bool, dict | str]:
+        """
+        Obtém o relatório de vários pedidos de uma vez usando o modo particionado (sharding).
+        
+        Args:
+            order_ids (list[int]): IDs dos pedidos
+            start_date (date): Data de início do período dos pedidos, quando conhecida
+            end_date (date): Data de fim do período dos pedidos, quando conhecida
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dicionário {order_id: pedido} sem os pedidos não encontrados (dict) ou mensagem de erro (str)
+        """
+        return _get_order_reports("sharded", order_ids, start_date, end_date)
+    
+    @staticmethod
+    def list_orders_psycopg(
+        customer_name: str = None,
+        employee_name: tuple[str, str] = None,
+        start_date: date = None,
+        end_date: date = None,
+        cursor: str = None,
+        page_size: int = 50
+    ) -> tuple[bool, dict | str]:
+        """
+        Lista resumos de pedidos (data, cliente, funcionário, país de entrega, quantidade de itens e
+        total) filtrados por cliente, funcionário e/ou período, em ordem de data usando psycopg.
+        A paginação é por keyset: o custo de cada página não depende da sua profundidade.
+        
+        Args:
+            customer_name (str): Filtra pelo nome da empresa do cliente
+            employee_name (tuple[str, str]): Filtra pelo funcionário (primeiro nome, sobrenome)
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            cursor (str): 'next_cursor' da página anterior; None para a primeira página
+            page_size (int): Quantidade de pedidos por página (até MAX_ORDER_PAGE_SIZE)
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'orders': [...], 'next_cursor': str | None} (dict) ou mensagem de erro (str);
+                  next_cursor é None na última página
+        """
+        return _list_orders("psycopg", customer_name, employee_name, start_date, end_date, cursor, page_size)
+    
+    @staticmethod
+    def list_orders_sqlalchemy(
+        customer_name: str = None,
+        employee_name: tuple[str, str] = None,
+        start_date: date = None,
+        end_date: date = None,
+        cursor: str = None,
+        page_size: int = 50
+    ) -> tuple[bool, dict | str]:
+        """
+        Lista resumos de pedidos (data, cliente, funcionário, país de entrega, quantidade de itens e
+        total) filtrados por cliente, funcionário e/ou período, em ordem de data usando SQLAlchemy.
+        A paginação é por keyset: o custo de cada página não depende da sua profundidade.
+        
+        Args:
+            customer_name (str): Filtra pelo nome da empresa do cliente
+            employee_name (tuple[str, str]): Filtra pelo funcionário (primeiro nome, sobrenome)
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            cursor (str): 'next_cursor' da página anterior; None para a primeira página
+            page_size (int): Quantidade de pedidos por página (até MAX_ORDER_PAGE_SIZE)
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'orders': [...], 'next_cursor': str | None} (dict) ou mensagem de erro (str);
+                  next_cursor é None na última página
+        """
+        return _list_orders("sqlalchemy", customer_name, employee_name, start_date, end_date, cursor, page_size)
+    
+    @staticmethod
+    def search_customers(term: str, limit: int = 10) -> tuple[bool, list | str]:
+        """
+        Busca clientes pelo nome da empresa a partir de um texto parcial ou com erros de digitação
+        (autocompletar), sem exigir o nome exato.
+        
+        Args:
+            term (str): Texto digitado
+            limit (int): Quantidade máxima de resultados (1 a 50)
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - candidatos ordenados com 'id', 'name', 'match' e 'score' (list) ou mensagem de erro (str)
+        """
+        return _search_names("customers", term, limit)
+    
+    @staticmethod
+    def search_products(term: str, limit: int = 10) -> tuple[bool, list | str]:
+        """
+        Busca produtos pelo nome a partir de um texto parcial ou com erros de digitação
+        (autocompletar), sem exigir o nome exato.
+        
+        Args:
+            term (str): Texto digitado
+            limit (int): Quantidade máxima de resultados (1 a 50)
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - candidatos ordenados com 'id', 'name', 'match' e 'score' (list) ou mensagem de erro (str)
+        """
+        return _search_names("products", term, limit)
+    
+    @staticmethod
+    def quote_baskets(baskets: list[list[dict]]) -> tuple[bool, list | str]:
+        """
+        Calcula o valor de várias cestas de produtos sem criar pedidos, com a mesma fórmula
+        do relatório de pedidos (quantidade * preço unitário * (1 - desconto)).
+        
+        Args:
+            baskets (list[list[dict]]): Cestas, cada uma uma lista de itens
+                Cada dicionário contém: 'product_name', 'quantity', 'discount'
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - uma cotação por cesta, na mesma ordem, com 'total_order', 'line_totals' e
+                  'unknown_products' (list) ou mensagem de erro (str)
+        """
+        if not isinstance(baskets, list) or not all(isinstance(items, list) for items in baskets):
+            return (False, "Erro: As cestas devem ser uma lista de listas de itens.")
+        
+        # A cotação usa a tabela de preços em memória, comum a todos os backends (ver app/dao/quote_engine.py)
+        quotes = importlib.import_module("app.dao.quote_engine").quote_baskets(baskets)
+        
+        if quotes is None:
+            return (False, "Erro: Ocorreu um erro ao cotar as cestas.")
+        
+        return (True, quotes)
+    
+    @staticmethod
+    def read_order_feed_psycopg(consumer: str, offset: str = None, batch_size: int = 100) -> tuple[bool, dict | str]:
+        """
+        Lê os próximos pedidos novos do feed de pedidos usando psycopg. A leitura não avança o
+        offset do consumidor: confirme com ack_order_feed depois de processar os pedidos.
+        
+        Args:
+            consumer (str): Nome do consumidor
+            offset (str): Offset a partir do qual ler, ou None para continuar do último confirmado
+            batch_size (int): Quantidade máxima de pedidos (1 a MAX_ORDER_FEED_BATCH_SIZE)
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'orders': [...], 'offset': ...} (dict) ou mensagem de erro (str). Cada pedido
+                  tem 'offset', 'order_id' e 'order' (None se o pedido não existe mais); 'offset'
+                  é o do último pedido lido
+        """
+        return _read_order_feed("psycopg", consumer, offset, batch_size)
+    
+    @staticmethod
+    def read_order_feed_sqlalchemy(consumer: str, offset: str = None, batch_size: int = 100) -> tuple[bool, dict | str]:
+        """
+        Lê os próximos pedidos novos do feed de pedidos usando SQLAlchemy. A leitura não avança o
+        offset do consumidor: confirme com ack_order_feed depois de processar os pedidos.
+        
+        Args:
+            consumer (str): Nome do consumidor
+            offset (str): Offset a partir do qual ler, ou None para continuar do último confirmado
+            batch_size (int): Quantidade máxima de pedidos (1 a MAX_ORDER_FEED_BATCH_SIZE)
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'orders': [...], 'offset': ...} (dict) ou mensagem de erro (str). Cada pedido
+                  tem 'offset', 'order_id' e 'order' (None se o pedido não existe mais); 'offset'
+                  é o do último pedido lido
+        """
+        return _read_order_feed("sqlalchemy", consumer, offset, batch_size)
+    
+    @staticmethod
+    def ack_order_feed(consumer: str, offset: str) -> tuple[bool, str]:
+        """
+        Confirma o processamento dos pedidos do feed até o offset informado (inclusive); a
+        próxima leitura sem offset continua a partir dele.
+        
+        Args:
+            consumer (str): Nome do consumidor
+            offset (str): Offset do último pedido processado
+            
+        Returns:
+            tuple[bool, str]: Tupla contendo:
+                - status de sucesso (bool)
+                - offset confirmado ou mensagem de erro (str)
+        """
+        if not isinstance(consumer, str) or not consumer.strip():
+            return (False, "Erro: Informe o nome do consumidor do feed.")
+        
+        position = _decode_feed_offset(offset)
+        if position is None:
+            return (False, "Erro: Offset do feed inválido.")
+        
+        if not importlib.import_module("app.dao.order_feed").save_order_feed_offset(consumer, position):
+            return (False, "Erro: Ocorreu um erro ao confirmar o offset do feed.")
+        
+        return (True, offset)
+    
+    @staticmethod
+    def create_new_order_auto(
+        customer_name: str,
+        employee_first_name: str, 
+        employee_last_name: str,
+        items_data: list[dict],
+        shipping_data: dict = None
+    ) -> tuple[bool, str]:
+        """
+        Cria um novo pedido com seus detalhes no backend mais rápido no momento (AUTO_BACKENDS).
+        Uma falha de gravação não é repetida no outro backend, para não duplicar o pedido.
+        
+        Args:
+            customer_name: Nome da empresa cliente
+            employee_first_name: Nome do funcionário 
+            employee_last_name: Sobrenome do funcionário
+            items_data: Lista de dicionários com detalhes dos produtos
+                Cada dicionário contém: 'product_name', 'quantity', 'discount'
+            shipping_data: Dicionário com informações de envio
+                Pode conter: 'shipper_id', 'freight', 'ship_name', 'ship_address',
+                'ship_city', 'ship_region', 'ship_postal_code', 'ship_country'
+        
+        Returns:
+            tuple[bool, str]: Tupla contendo status de sucesso e mensagem
+        """
+        return _run_auto("create_new_order", False, customer_name, employee_first_name, employee_last_name,
+                         items_data, shipping_data)
+    
+    @staticmethod
+    def get_order_report_auto(order_id: int) -> tuple[bool, dict | str]:
+        """
+        Obtém um relatório completo de um pedido específico no backend mais rápido no momento,
+        usando o outro backend se ele falhar.
+        
+        Args:
+            order_id (int): ID do pedido a ser consultado
             
-        if not isinstance(end_date, date):
-            return (False, "Erro: A data final deve ser um objeto date.")
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dados do pedido (dict) ou mensagem de erro (str)
+        """
+        return _run_auto("get_order_report", True, order_id)
+    
+    @staticmethod
+    def get_employee_ranking_report_auto(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém um relatório de ranking de vendas dos funcionários em um período específico no
+        backend mais rápido no momento, usando o outro backend se ele falhar.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
             
-        if start_date > end_date:
-            return (False, "Erro: A data inicial não pode ser posterior à data final.")
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem de erro (str)
+        """
+        return _run_auto("get_employee_ranking_report", True, start_date, end_date)
+    
+    @staticmethod
+    def get_sales_rollup_report_auto(
+        start_date: date,
+        end_date: date,
+        grouping_sets: list[list[str]] = None,
+        rollup: list[str] = None
+    ) -> tuple[bool, list | str]:
+        """
+        Gera o resumo de vendas de um período por várias combinações de dimensões no backend
+        mais rápido no momento, usando o outro backend se ele falhar.
         
-        ranking_data = get_employee_sales_ranking(start_date, end_date)
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            grouping_sets (list[list[str]]): Combinações de dimensões a agregar (SALES_ROLLUP_DIMENSIONS);
+                a lista vazia representa o total geral. Padrão: cada dimensão isolada e o total geral
+            rollup (list[str]): Dimensões hierárquicas (ROLLUP); quando informado, substitui grouping_sets
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas do resumo (list) ou mensagem (str)
+        """
+        return _run_auto("get_sales_rollup_report", True, start_date, end_date, grouping_sets, rollup)
+    
+    @staticmethod
+    def get_sales_trend_report_auto(
+        start_date: date,
+        end_date: date,
+        bucket: str = "month",
+        window: int = 3,
+        use_summary: bool = False
+    ) -> tuple[bool, list | str]:
+        """
+        Gera a tendência de vendas por funcionário no backend mais rápido no momento, usando o
+        outro backend se ele falhar.
         
-        if ranking_data is None:
-            return (False, "Erro: Ocorreu um erro ao gerar o ranking de vendas.")
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            bucket (str): Granularidade dos períodos (SALES_TREND_BUCKETS)
+            window (int): Quantidade de períodos da média móvel
+            use_summary (bool): Lê o resumo diário pré-agregado em vez dos itens de pedido
             
-        if len(ranking_data) == 0:
-            return (True, "Nenhum pedido encontrado no período especificado.")
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - linhas da tendência (list) ou mensagem (str)
+        """
+        return _run_auto("get_sales_trend_report", True, start_date, end_date, bucket, window, use_summary)
+    
+    @staticmethod
+    def get_team_ranking_report_auto(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém o ranking de vendas por equipe em um período específico no backend mais rápido no
+        momento, usando o outro backend se ele falhar.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
             
-        return (True, ranking_data)
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de ranking (list) ou mensagem (str)
+        """
+        return _run_auto("get_team_ranking_report", True, start_date, end_date)
     
     @staticmethod
-    def get_employee_ranking_report_sqlalchemy(start_date: date, end_date: date) -> tuple[bool, list | str]:
+    def list_order_ids_auto(start_date: date, end_date: date) -> tuple[bool, list | str]:
         """
-        Obtém um relatório de ranking de vendas dos funcionários em um período específico usando SQLAlchemy.
+        Lista os IDs dos pedidos realizados em um período específico no backend mais rápido no
+        momento, usando o outro backend se ele falhar.
+        
+        Args:
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            
+        Returns:
+            tuple[bool, list | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - lista de IDs (list) ou mensagem de erro (str)
+        """
+        return _run_auto("list_order_ids", True, start_date, end_date)
+    
+    @staticmethod
+    def get_order_reports_auto(order_ids: list[int], start_date: date = None, end_date: date = None) -> tuple[bool, dict | str]:
+        """
+        Obtém o relatório de vários pedidos de uma vez no backend mais rápido no momento, usando
+        o outro backend se ele falhar.
+        
+        Args:
+            order_ids (list[int]): IDs dos pedidos
+            start_date (date): Data de início do período dos pedidos, quando conhecida
+            end_date (date): Data de fim do período dos pedidos, quando conhecida
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dicionário {order_id: pedido} sem os pedidos não encontrados (dict) ou mensagem de erro (str)
+        """
+        return _run_auto("get_order_reports", True, order_ids, start_date, end_date)
+    
+    @staticmethod
+    def list_orders_auto(
+        customer_name: str = None,
+        employee_name: tuple[str, str] = None,
+        start_date: date = None,
+        end_date: date = None,
+        cursor: str = None,
+        page_size: int = 50
+    ) -> tuple[bool, dict | str]:
+        """
+        Lista resumos de pedidos filtrados por cliente, funcionário e/ou período, em ordem de
+        data, no backend mais rápido no momento, usando o outro backend se ele falhar. Os
+        cursores de página valem para qualquer backend.
+        
+        Args:
+            customer_name (str): Filtra pelo nome da empresa do cliente
+            employee_name (tuple[str, str]): Filtra pelo funcionário (primeiro nome, sobrenome)
+            start_date (date): Data de início do período
+            end_date (date): Data de fim do período
+            cursor (str): 'next_cursor' da página anterior; None para a primeira página
+            page_size (int): Quantidade de pedidos por página (até MAX_ORDER_PAGE_SIZE)
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'orders': [...], 'next_cursor': str | None} (dict) ou mensagem de erro (str)
+        """
+        return _run_auto("list_orders", True, customer_name, employee_name, start_date, end_date, cursor, page_size)
+    
+    @staticmethod
+    def read_order_feed_auto(consumer: str, offset: str = None, batch_size: int = 100) -> tuple[bool, dict | str]:
+        """
+        Lê os próximos pedidos novos do feed de pedidos no backend mais rápido no momento, usando
+        o outro backend se ele falhar. A leitura não avança o offset do consumidor: confirme com
+        ack_order_feed depois de processar os pedidos.
+        
+        Args:
+            consumer (str): Nome do consumidor
+            offset (str): Offset a partir do qual ler, ou None para continuar do último confirmado
+            batch_size (int): Quantidade máxima de pedidos (1 a MAX_ORDER_FEED_BATCH_SIZE)
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'orders': [...], 'offset': ...} (dict) ou mensagem de erro (str)
+        """
+        return _run_auto("read_order_feed", True, consumer, offset, batch_size)
+    
+    @staticmethod
+    def get_backend_statistics() -> dict:
+        """
+        Latência média, execuções, falhas e suspensão de cada backend por tipo de operação, como
+        usadas pelo modo auto para escolher o backend.
+        
+        Returns:
+            dict: {operação: {backend: {'latency_ms', 'executions', 'errors', 'suspended'}}}
+        """
+        return _backend_selector.statistics()
+    
+    @staticmethod
+    def submit_job(kind: str, params: dict, backend: str = "psycopg") -> tuple[bool, dict | str]:
+        """
+        Enfileira um relatório demorado para execução em segundo plano pelos workers de jobs
+        (run_next_job) e retorna imediatamente. Se um job idêntico ainda estiver pendente ou em
+        execução, retorna o ID dele em vez de enfileirar outro.
+        
+        Args:
+            kind (str): Tipo do job (JOB_KINDS):
+                'ranking' e 'export': {'from': 'AAAA-MM-DD', 'to': 'AAAA-MM-DD'}
+                'rollup': os mesmos, mais 'grouping_sets' e 'rollup' opcionais
+                'reports': {'order_ids': [...]}
+            params (dict): Parâmetros do job
+            backend (str): Backend que executará o job
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - {'job_id', 'deduplicated'} (dict) ou mensagem de erro (str); 'deduplicated'
+                  indica que o ID é de um job idêntico já enfileirado
+        """
+        if kind not in JOB_KINDS:
+            return (False, f"Erro: Tipo de job inválido '{kind}'. Use: {', '.join(JOB_KINDS)}.")
+        
+        if not all(hasattr(OrderController, f"{operation}_{backend}") for operation in _JOB_OPERATIONS[kind]):
+            return (False, f"Erro: O job '{kind}' não está disponível no backend {backend}.")
+        
+        params = _normalize_job_params(kind, params)
+        if isinstance(params, str):
+            return (False, params)
+        
+        submitted = importlib.import_module("app.dao.job_store").submit_job(kind, backend, params)
+        
+        if submitted is None:
+            return (False, "Erro: Ocorreu um erro ao enfileirar o job.")
+        
+        job_id, created = submitted
+        return (True, {'job_id': job_id, 'deduplicated': not created})
+    
+    @staticmethod
+    def get_job(job_id: str, include_result: bool = False) -> tuple[bool, dict | str]:
+        """
+        Obtém o status de um job e, se pedido, o seu resultado.
+        
+        Args:
+            job_id (str): ID devolvido por submit_job
+            include_result (bool): Inclui o resultado ('result'), disponível com o status 'done'
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - job (dict), com 'status' ('pending', 'running', 'done' ou 'failed') e 'error'
+                  quando falhou, ou mensagem de erro (str)
+        """
+        if not isinstance(job_id, str) or not job_id:
+            return (False, "Erro: Informe o ID do job.")
+        
+        job = importlib.import_module("app.dao.job_store").find_job(job_id, include_result)
+        
+        if job is None:
+            return (False, f"Erro: Job {job_id} não encontrado ou expirado.")
+        
+        return (True, job)
+    
+    @staticmethod
+    def run_next_job(stale_after: float = 3600.0) -> tuple[bool, str | None]:
+        """
+        Executa o próximo job pendente e grava o seu resultado. Chamado pelos workers de jobs.
+        
+        Args:
+            stale_after (float): Segundos após os quais um job em execução é considerado
+                abandonado (worker encerrado no meio) e executado de novo
+            
+        Returns:
+            tuple[bool, str | None]: Tupla contendo:
+                - status de sucesso (bool): False se o resultado não pôde ser gravado (inclusive
+                  quando o job foi retomado por outro worker durante a execução)
+                - ID do job executado, ou None se não havia jobs pendentes
+        """
+        job_store = importlib.import_module("app.dao.job_store")
+        job = job_store.claim_job(stale_after)
+        
+        if job is None:
+            return (True, None)
+        
+        try:
+            success, result = _run_job(job['kind'], job['backend'], job['params'])
+        except Exception as e:
+            print(f"Erro ao executar o job {job['job_id']}: {e}")
+            success, result = False, f"Erro: Falha ao executar o job. {e}"
+        
+        return (job_store.finish_job(job['job_id'], job['attempts'], success, result), job['job_id'])
+    
+    @staticmethod
+    async def create_new_order_asyncpg(
+        customer_name: str,
+        employee_first_name: str, 
+        employee_last_name: str,
+        items_data: list[dict],
+        shipping_data: dict = None
+    ) -> tuple[bool, str]:
+        """
+        Cria um novo pedido com seus detalhes usando o backend assíncrono (asyncpg).
+        As buscas de cliente, funcionário e produtos são feitas concorrentemente
+        e validadas antes de qualquer inserção.
+        
+        Args:
+            customer_name: Nome da empresa cliente
+            employee_first_name: Nome do funcionário 
+            employee_last_name: Sobrenome do funcionário
+            items_data: Lista de dicionários com detalhes dos produtos
+                Cada dicionário contém: 'product_name', 'quantity', 'discount'
+            shipping_data: Dicionário com informações de envio
+                Pode conter: 'shipper_id', 'freight', 'ship_name', 'ship_address',
+                'ship_city', 'ship_region', 'ship_postal_code', 'ship_country'
+        
+        Returns:
+            tuple[bool, str]: Tupla contendo status de sucesso e mensagem
+        """
+        asyncpg_dao = _load_dao("asyncpg")
+        psycopg_model = _load_model("asyncpg")
+        
+        if shipping_data is None:
+            shipping_data = {}
+        
+        # Importado aqui: o asyncio é a maior parte do tempo de importação de main.py
+        import asyncio
+        
+        customer_id, employee_id, *products_info = await asyncio.gather(
+            asyncpg_dao.find_customer_id_by_name(customer_name),
+            asyncpg_dao.find_employee_id_by_name(employee_first_name, employee_last_name),
+            *(asyncpg_dao.find_product_id_and_price_by_name(item.get('product_name')) for item in items_data)
+        )
+        
+        if customer_id is None:
+            return (False, "Erro: Cliente não encontrado.")
+        
+        if employee_id is None:
+            return (False, "Erro: Funcionário não encontrado.")
+        
+        for item, product_info in zip(items_data, products_info):
+            if product_info is None:
+                return (False, f"Erro: Produto '{item.get('product_name')}' não encontrado.")
+        
+        order_date = date.today()
+        new_order = psycopg_model.OrderRecord(
+            customerid=customer_id,
+            employeeid=employee_id,
+            orderdate=order_date,
+            requireddate=shipping_data.get('required_date'),
+            shippeddate=shipping_data.get('shipped_date'),
+            shipperid=shipping_data.get('shipper_id'),
+            freight=shipping_data.get('freight', 0.0),
+            shipname=shipping_data.get('ship_name'),
+            shipaddress=shipping_data.get('ship_address'),
+            shipcity=shipping_data.get('ship_city'),
+            shipregion=shipping_data.get('ship_region'),
+            shippostalcode=shipping_data.get('ship_postal_code'),
+            shipcountry=shipping_data.get('ship_country')
+        )
+        
+        order_details = [
+            psycopg_model.OrderDetailRecord(
+                productid=product_id,
+                unitprice=unit_price,
+                quantity=item.get('quantity', 1),
+                discount=item.get('discount', 0.0),
+                orderdate=order_date
+            )
+            for item, (product_id, unit_price) in zip(items_data, products_info)
+        ]
+        
+        # Cabeçalho, itens (e a reserva de estoque, se ativa) em uma única transação: uma falha
+        # em um item não deixa o cabeçalho gravado sem os itens
+        result = await asyncpg_dao.insert_order_with_details(new_order, order_details)
+        if isinstance(result, str):
+            return (False, f"Erro: {result}.")
+        
+        return (True, f"Pedido {result} inserido com sucesso!")
+    
+    @staticmethod
+    async def get_order_report_asyncpg(order_id: int) -> tuple[bool, dict | str]:
+        """
+        Obtém um relatório completo de um pedido específico usando o backend assíncrono (asyncpg).
+        
+        Args:
+            order_id (int): ID do pedido a ser consultado
+            
+        Returns:
+            tuple[bool, dict | str]: Tupla contendo:
+                - status de sucesso (bool)
+                - dados do pedido (dict) ou mensagem de erro (str)
+        """
+        asyncpg_dao = _load_dao("asyncpg")
+        
+        if not isinstance(order_id, int) or order_id <= 0:
+            return (False, "Erro: ID do pedido deve ser um número inteiro positivo.")
+        
+        order_data = await asyncpg_dao.find_order_with_details(order_id)
+        
+        if order_data is None:
+            return (False, f"Erro: Pedido com ID {order_id} não encontrado.")
+            
+        return (True, order_data)
+    
+    @staticmethod
+    async def get_employee_ranking_report_asyncpg(start_date: date, end_date: date) -> tuple[bool, list | str]:
+        """
+        Obtém um relatório de ranking de vendas dos funcionários em um período específico
+        usando o backend assíncrono (asyncpg).
         
         Args:
             start_date (date): Data de início do período
@@ -281,6 +1910,8 @@ class OrderController:
                 - status de sucesso (bool)
                 - lista de ranking (list) ou mensagem de erro (str)
         """
+        asyncpg_dao = _load_dao("asyncpg")
+        
         if not isinstance(start_date, date):
             return (False, "Erro: A data inicial deve ser um objeto date.")
             
@@ -290,7 +1921,7 @@ class OrderController:
         if start_date > end_date:
             return (False, "Erro: A data inicial não pode ser posterior à data final.")
         
-        ranking_data = sqlalchemy_get_employee_sales_ranking(start_date, end_date)
+        ranking_data = await asyncpg_dao.get_employee_sales_ranking(start_date, end_date)
         
         if ranking_data is None:
             return (False, "Erro: Ocorreu um erro ao gerar o ranking de vendas.")
@@ -298,5 +1929,4 @@ class OrderController:
         if len(ranking_data) == 0:
             return (True, "Nenhum pedido encontrado no período especificado.")
             
-        return (True, ranking_data)
-    
\ No newline at end of file
+        return (True, ranking_data)
\ No newline at end of file
@@ -0,0 +1,111 @@
+import psycopg2
+from app.dao.base_dao import get_pooled_connection, release_pooled_connection
+from datetime import date
+
+# Arquivamento de pedidos antigos: pedidos anteriores a uma data de corte saem de orders/order_details
+# e passam para orders_archive/order_details_archive, mantendo pequenas as tabelas ativas (e seus
+# índices, scans e vacuums). As vendas arquivadas também são somadas em employee_sales_archive,
+# um agregado por funcionário e dia, para que o ranking não precise ler os pedidos arquivados.
+# Depois do primeiro arquivamento, defina DB_ORDER_ARCHIVE=1 no .env.
+
+def ensure_archive_tables(cursor) -> None:
+    """
+    Cria as tabelas de arquivo, com as mesmas colunas das tabelas ativas, se ainda não existirem
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS northwind.orders_archive (
+            LIKE northwind.orders INCLUDING DEFAULTS,
+            CONSTRAINT orders_archive_pkey PRIMARY KEY (orderid)
+        );
+        CREATE TABLE IF NOT EXISTS northwind.order_details_archive (
+            LIKE northwind.order_details INCLUDING DEFAULTS,
+            CONSTRAINT order_details_archive_pkey PRIMARY KEY (orderid, productid)
+        );
+        CREATE TABLE IF NOT EXISTS northwind.employee_sales_archive (
+            employeeid integer NOT NULL,
+            salesdate date NOT NULL,
+            total_orders integer NOT NULL,
+            total_value numeric NOT NULL,
+            CONSTRAINT employee_sales_archive_pkey PRIMARY KEY (employeeid, salesdate)
+        );
+        """)
+
+def archive_orders(cutoff: date, batch_size: int = 1000) -> int | None:
+    """
+    Move os pedidos com orderdate anterior a `cutoff` (e seus itens) para as tabelas de arquivo.
+    Cada lote de `batch_size` pedidos é movido em uma transação própria, para não manter
+    bloqueios longos nem uma transação gigante; uma interrupção preserva os lotes já concluídos.
+
+    Args:
+        cutoff (date): Data de corte (exclusiva)
+        batch_size (int): Quantidade de pedidos por transação
+
+    Returns:
+        int | None: Quantidade de pedidos arquivados ou None em caso de erro
+    """
+    session = None
+    archived = 0
+
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            ensure_archive_tables(cursor)
+            session.commit()
+
+            while True:
+                cursor.execute("""
+                    SELECT orderid
+                    FROM northwind.orders
+                    WHERE orderdate < %s
+                    ORDER BY orderid
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                    """, (cutoff, batch_size))
+                order_ids = [row[0] for row in cursor.fetchall()]
+                if not order_ids:
+                    break
+
+                cursor.execute("""
+                    INSERT INTO northwind.employee_sales_archive (employeeid, salesdate, total_orders, total_value)
+                    SELECT
+                        o.employeeid,
+                        o.orderdate::date,
+                        COUNT(DISTINCT o.orderid),
+                        SUM(od.quantity * od.unitprice * (1 - od.discount))
+                    FROM northwind.orders o
+                    INNER JOIN northwind.order_details od ON o.orderid = od.orderid
+                    WHERE o.orderid = ANY(%s)
+                    GROUP BY o.employeeid, o.orderdate::date
+                    ON CONFLICT (employeeid, salesdate) DO UPDATE SET
+                        total_orders = employee_sales_archive.total_orders + EXCLUDED.total_orders,
+                        total_value = employee_sales_archive.total_value + EXCLUDED.total_value
+                    """, (order_ids,))
+                cursor.execute("""
+                    INSERT INTO northwind.orders_archive
+                    SELECT * FROM northwind.orders WHERE orderid = ANY(%s)
+                    """, (order_ids,))
+                cursor.execute("""
+                    INSERT INTO northwind.order_details_archive
+                    SELECT * FROM northwind.order_details WHERE orderid = ANY(%s)
+                    """, (order_ids,))
+                cursor.execute("DELETE FROM northwind.order_details WHERE orderid = ANY(%s)", (order_ids,))
+                cursor.execute("DELETE FROM northwind.orders WHERE orderid = ANY(%s)", (order_ids,))
+                session.commit()
+
+                archived += len(order_ids)
+                print(f"{archived} pedidos arquivados...")
+
+        return archived
+
+    except psycopg2.Error as e:
+        print(f"Erro ao arquivar pedidos (após {archived} pedidos arquivados): {e}")
+        if session:
+            session.rollback()
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
@@ -0,0 +1,380 @@
+import asyncpg
+from app.dao.base_dao import get_async_pool, order_archive_enabled, partitioned_orders_enabled, stock_reservation_enabled
+from app.model.psycopg_model import OrderRecord, OrderDetailRecord
+from datetime import date, datetime, time
+
+class _InsufficientStock(Exception):
+    """
+    Interrompe a transação de insert_order_with_details quando falta estoque
+    """
+    def __init__(self, product_ids: list[int]):
+        super().__init__(product_ids)
+        self.product_ids = product_ids
+
+def _as_datetime(value):
+    """
+    Converte date em datetime: o asyncpg exige datetime para colunas timestamp
+    """
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    return value
+
+async def _find_next_order_id(connection) -> int:
+    """
+    Busca o próximo ID para o pedido, visto que o ID não é auto incrementado no Banco de Dados
+    """
+    max_id = await connection.fetchval("SELECT MAX(orderid) FROM northwind.orders")
+    return max_id + 1 if max_id is not None else 1
+
+async def find_customer_id_by_name(company_name: str) -> str | None:
+    """
+    Busca o ID de um cliente pelo nome da empresa
+
+    Args:
+        company_name (str): Nome da empresa do cliente
+
+    Returns:
+        str | None: ID do cliente ou None se não encontrado
+    """
+    sql = """
+        SELECT customerid
+        FROM northwind.customers
+        WHERE companyname = $1
+        """
+
+    try:
+        pool = await get_async_pool()
+        return await pool.fetchval(sql, company_name)
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Error ao buscar customer_id de '{company_name}': {e}")
+        return None
+
+async def find_employee_id_by_name(first_name: str, last_name: str) -> int | None:
+    """
+    Busca o ID de um funcionário pelo primeiro e último nome
+
+    Args:
+        first_name (str): Primeiro nome do funcionário
+        last_name (str): Sobrenome do funcionário
+
+    Returns:
+        int | None: ID do funcionário ou None se não encontrado
+    """
+    sql = """
+        SELECT employeeid
+        FROM northwind.employees
+        WHERE firstname = $1 AND lastname = $2
+        """
+
+    try:
+        pool = await get_async_pool()
+        return await pool.fetchval(sql, first_name, last_name)
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Error ao buscar employee_id de '{first_name} {last_name}': {e}")
+        return None
+
+async def find_product_id_and_price_by_name(name: str) -> tuple[int, float] | None:
+    """
+    Busca o ID e preço unitário de um produto pelo nome
+
+    Args:
+        name (str): Nome do produto
+
+    Returns:
+        tuple[int, float] | None: Tupla contendo (productid, unitprice) ou None se não encontrado
+    """
+    sql = """
+        SELECT productid, unitprice
+        FROM northwind.products
+        WHERE productname = $1
+        """
+
+    try:
+        pool = await get_async_pool()
+        row = await pool.fetchrow(sql, name)
+        if row is None:
+            return None
+        unit_price = float(row['unitprice']) if row['unitprice'] is not None else 0.0
+        return (row['productid'], unit_price)
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Error ao buscar produto com nome '{name}': {e}")
+        return None
+
+_INSERT_ORDER_SQL = """
+    INSERT INTO northwind.orders
+    (orderid, customerid, employeeid, orderdate, requireddate, shippeddate, shipperid, freight, shipname, shipaddress, shipcity, shipregion, shippostalcode, shipcountry)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14);
+    """
+
+_INSERT_ORDER_DETAIL_SQL = """
+    INSERT INTO northwind.order_details
+    (orderid, productid, unitprice, quantity, discount)
+    VALUES ($1, $2, $3, $4, $5);
+    """
+
+# Reserva de estoque de todos os itens em um único comando (ver _RESERVE_STOCK_SQL em psycopg_dao)
+_RESERVE_STOCK_SQL = """
+    WITH requested AS (
+        SELECT productid, SUM(quantity) AS quantity
+        FROM unnest($1::integer[], $2::integer[]) AS item (productid, quantity)
+        GROUP BY productid
+    ),
+    locked AS (
+        SELECT p.productid, r.quantity
+        FROM northwind.products p
+        INNER JOIN requested r ON r.productid = p.productid
+        ORDER BY p.productid
+        FOR UPDATE OF p
+    )
+    UPDATE northwind.products p
+    SET unitsinstock = p.unitsinstock - l.quantity
+    FROM locked l
+    WHERE p.productid = l.productid AND p.unitsinstock >= l.quantity
+    RETURNING p.productid;
+    """
+
+def _order_params(order: OrderRecord, order_id: int) -> list:
+    return [
+        order_id,
+        order.customerid,
+        order.employeeid,
+        _as_datetime(order.orderdate),
+        _as_datetime(order.requireddate),
+        _as_datetime(order.shippeddate),
+        order.shipperid,
+        order.freight,
+        order.shipname,
+        order.shipaddress,
+        order.shipcity,
+        order.shipregion,
+        order.shippostalcode,
+        order.shipcountry
+    ]
+
+def _order_detail_statement(detail: OrderDetailRecord, order_id: int | None = None) -> tuple:
+    """
+    Comando e parâmetros de inserção de um item (orderid do registro, se order_id não for informado)
+    """
+    sql = _INSERT_ORDER_DETAIL_SQL
+    params = [order_id if order_id is not None else detail.orderid, detail.productid, detail.unitprice, detail.quantity, detail.discount]
+    if partitioned_orders_enabled():
+        # Com as tabelas particionadas, os itens guardam a data do pedido (chave de partição)
+        sql = sql.replace("discount)", "discount, orderdate)").replace("$5)", "$5, $6)")
+        params.append(_as_datetime(detail.orderdate))
+    return (sql, *params)
+
+async def insert_order(order: OrderRecord) -> int | None:
+    """
+    Insere um novo pedido no banco
+
+    Args:
+        order (OrderRecord): Registro com os dados do pedido (o orderid é ignorado)
+
+    Returns:
+        int | None: ID do pedido ou None se falhar
+    """
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as connection:
+            async with connection.transaction():
+                next_order_id = await _find_next_order_id(connection)
+                await connection.execute(_INSERT_ORDER_SQL, *_order_params(order, next_order_id))
+        return next_order_id
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Error ao inserir pedido: {e}")
+        return None
+
+async def insert_order_detail(detail: OrderDetailRecord) -> None:
+    """
+    Insere um item de pedido no banco
+
+    Args:
+        detail (OrderDetailRecord): Registro com os dados do item
+    """
+    try:
+        pool = await get_async_pool()
+        await pool.execute(*_order_detail_statement(detail))
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Error ao inserir detalhe do pedido: {e}")
+
+async def insert_order_with_details(order: OrderRecord, details: list[OrderDetailRecord]) -> int | str:
+    """
+    Insere um pedido e seus itens em uma única transação. Com a reserva de estoque ativa
+    (DB_RESERVE_STOCK=1), também desconta o estoque dos produtos e não grava nada se algum
+    produto não tiver estoque suficiente.
+
+    Args:
+        order (OrderRecord): Registro com os dados do pedido (o orderid é ignorado)
+        details (list[OrderDetailRecord]): Itens do pedido (o orderid é ignorado)
+
+    Returns:
+        int | str: ID do pedido ou a mensagem de erro
+    """
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as connection:
+            async with connection.transaction():
+                if stock_reservation_enabled():
+                    product_ids = [detail.productid for detail in details]
+                    reserved = await connection.fetch(
+                        _RESERVE_STOCK_SQL, product_ids, [detail.quantity for detail in details]
+                    )
+                    missing = sorted(set(product_ids) - {row['productid'] for row in reserved})
+                    if missing:
+                        # Desfaz a transação (e a reserva dos demais produtos)
+                        raise _InsufficientStock(missing)
+
+                next_order_id = await _find_next_order_id(connection)
+                await connection.execute(_INSERT_ORDER_SQL, *_order_params(order, next_order_id))
+                for detail in details:
+                    await connection.execute(*_order_detail_statement(detail, next_order_id))
+        return next_order_id
+
+    except _InsufficientStock as e:
+        return f"Estoque insuficiente para o(s) produto(s) com ID {', '.join(map(str, e.product_ids))}"
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Error ao inserir pedido: {e}")
+        return f"Falha ao inserir o pedido ({e})"
+
+async def find_order_with_details(order_id: int) -> dict | None:
+    """
+    Busca todos os detalhes do pedido, incluindo informações do cliente, funcionário e itens
+
+    Args:
+        order_id (int): ID do pedido a ser pesquisado
+
+    Returns:
+        dict | None: Dicionário com todas as informações do pedido ou None se não encontrado
+    """
+    header_sql = """
+        SELECT
+            o.orderid,
+            o.orderdate,
+            c.companyname AS customer_name,
+            e.firstname || ' ' || e.lastname AS employee_name
+        FROM northwind.orders o
+        INNER JOIN northwind.customers c ON o.customerid = c.customerid
+        INNER JOIN northwind.employees e ON o.employeeid = e.employeeid
+        WHERE o.orderid = $1
+        """
+
+    items_sql = """
+        SELECT
+            p.productname AS product_name,
+            od.quantity,
+            od.unitprice,
+            od.discount
+        FROM northwind.order_details od
+        INNER JOIN northwind.products p ON od.productid = p.productid
+        WHERE od.orderid = $1
+        """
+
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as connection:
+            header_row = await connection.fetchrow(header_sql, order_id)
+            if not header_row and order_archive_enabled():
+                # Pedidos antigos podem ter sido movidos para as tabelas de arquivo
+                header_sql, items_sql = _archived(header_sql), _archived(items_sql)
+                header_row = await connection.fetchrow(header_sql, order_id)
+            if not header_row:
+                return None
+            items_rows = await connection.fetch(items_sql, order_id)
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Erro ao buscar detalhes do pedido {order_id}: {e}")
+        return None
+
+    result = {
+        'order_id': header_row['orderid'],
+        'order_date': header_row['orderdate'],
+        'customer_name': header_row['customer_name'],
+        'employee_name': header_row['employee_name'],
+        'items': []
+    }
+
+    for item in items_rows:
+        result['items'].append({
+            'product_name': item['product_name'],
+            'quantity': item['quantity'],
+            'total_price': float(item['quantity'] * item['unitprice'] * (1 - item['discount'])),
+        })
+
+    # Calcular o total do pedido
+    result['total_order'] = sum(item['total_price'] for item in result['items'])
+    return result
+
+def _archived(sql: str) -> str:
+    """
+    Mesma consulta sobre as tabelas de pedidos arquivados (ver app/dao/archive.py)
+    """
+    return (
+        sql.replace("northwind.orders o", "northwind.orders_archive o")
+        .replace("northwind.order_details od", "northwind.order_details_archive od")
+    )
+
+async def get_employee_sales_ranking(start_date, end_date) -> list | None:
+    """
+    Calcula o ranking de vendas dos funcionários em um período específico.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+
+    Returns:
+        list | None: Lista de dicionários com ranking de vendas ou None em caso de erro
+    """
+    sales = """
+            SELECT o.employeeid, COUNT(DISTINCT o.orderid) AS total_orders,
+                   SUM(od.quantity * od.unitprice * (1 - od.discount)) AS total_value
+            FROM northwind.orders o
+            INNER JOIN northwind.order_details od ON o.orderid = od.orderid
+            WHERE o.orderdate BETWEEN $1 AND $2
+            GROUP BY o.employeeid"""
+    params = [_as_datetime(start_date), _as_datetime(end_date)]
+
+    if order_archive_enabled():
+        # Soma às vendas das tabelas ativas os agregados diários dos pedidos arquivados
+        sales += """
+            UNION ALL
+            SELECT employeeid, SUM(total_orders), SUM(total_value)
+            FROM northwind.employee_sales_archive
+            WHERE salesdate BETWEEN $3 AND $4
+            GROUP BY employeeid"""
+        params += [start_date, end_date]
+
+    sql = f"""
+        WITH sales AS ({sales}
+        )
+        SELECT
+            e.firstname || ' ' || e.lastname AS employee_name,
+            SUM(s.total_orders)::int AS total_orders,
+            ROUND(SUM(s.total_value)::numeric, 2) AS total_value
+        FROM sales s
+        INNER JOIN northwind.employees e ON e.employeeid = s.employeeid
+        GROUP BY e.employeeid, e.firstname, e.lastname
+        ORDER BY total_value DESC
+        """
+
+    try:
+        pool = await get_async_pool()
+        rows = await pool.fetch(sql, *params)
+
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Erro ao calcular ranking de vendas: {e}")
+        return None
+
+    return [
+        {
+            'employee_name': row['employee_name'],
+            'total_orders': row['total_orders'],
+            'total_value': float(row['total_value']) if row['total_value'] is not None else 0.0
+        }
+        for row in rows
+    ]
@@ -1,16 +1,188 @@
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+import psycopg2.pool
+import contextvars
+import functools
+import itertools
 import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import re
+import threading
+import time
 
-load_dotenv()
+# Engine do SQLAlchemy e fábrica de sessões, criados apenas no primeiro uso para que
+# o caminho do psycopg não pague o custo de importar o SQLAlchemy
+_engine = None
+_session_factory = None
+_sqlalchemy_lock = threading.Lock()
+_environment_loaded = False
 
-db_url = f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-engine = create_engine(db_url, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool de conexões do psycopg, criado apenas no primeiro uso
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
+_pool_max_connections = None
+_reserved_connections = 0
+
+# Réplicas de leitura (DB_READ_HOSTS=host:porta,...), configuradas no primeiro uso
+_read_replicas = None
+_read_replicas_lock = threading.Lock()
+_read_replica_counter = itertools.count()
+
+# Bancos do modo particionado (DB_SHARD_HOSTS=host:porta,..., na ordem dos shards)
+_shards = None
+_shards_lock = threading.Lock()
+
+# Leituras de um cliente vão para o primário por alguns segundos após ele gravar (read-your-writes)
+_current_client = contextvars.ContextVar("db_current_client", default=None)
+_recent_writes = {}
+_recent_writes_lock = threading.Lock()
+# Leituras feitas em nome de outros clientes (leituras agrupadas) que precisam ir ao primário
+_primary_reads = contextvars.ContextVar("db_primary_reads", default=False)
+
+# Pool assíncrono (asyncpg), criado no primeiro uso dentro do event loop
+_async_pool = None
+_async_pool_lock = None
+
+# Liga/desliga o uso de prepared statements (DB_PREPARED_STATEMENTS=0 desativa)
+_prepared_statements_enabled = None
+
+# Tabelas de pedidos particionadas por data (DB_PARTITIONED_ORDERS=1)
+_partitioned_orders_enabled = None
+
+# Pedidos antigos movidos para as tabelas de arquivo (DB_ORDER_ARCHIVE=1)
+_order_archive_enabled = None
+
+# Totais dos pedidos gravados em orders/order_details (DB_ORDER_TOTALS=1)
+_order_totals_enabled = None
+
+# Reserva de estoque (products.unitsinstock) na criação de pedidos (DB_RESERVE_STOCK=1)
+_stock_reservation_enabled = None
+
+# Tempo máximo (statement_timeout, em ms) de cada tipo de operação; DB_TIMEOUT_<TIPO>_MS=0 desativa
+_STATEMENT_TIMEOUT_DEFAULTS = {"lookup": 2000, "insert": 5000, "report": 10000, "ranking": 60000}
+_statement_timeouts = {}
+_current_budget = contextvars.ContextVar("db_operation_budget", default=None)
+
+
+class OperationTimeoutError(Exception):
+    """
+    Uma operação excedeu o seu tempo máximo (statement_timeout) e foi cancelada pelo banco
+    """
+    def __init__(self, operation: str, timeout_ms: int):
+        super().__init__(f"A operação '{operation}' excedeu o tempo limite de {timeout_ms} ms")
+        self.operation = operation
+        self.timeout_ms = timeout_ms
+
+
+class OperationFailedError(Exception):
+    """
+    Uma operação ficou sem resultado por uma falha do banco (conexão recusada, erro na consulta),
+    e não porque o registro procurado não existe
+    """
+    def __init__(self, operation: str):
+        super().__init__(f"A operação '{operation}' falhou no banco de dados")
+        self.operation = operation
+
+
+class _OperationBudget:
+    """
+    Tempo máximo da operação em andamento, se algum comando dela foi cancelado por exceder esse
+    tempo e se algum comando ou conexão dela falhou no banco
+    """
+    def __init__(self, operation: str, timeout_ms: int):
+        self.operation = operation
+        self.timeout_ms = timeout_ms
+        self.timed_out = False
+        self.failed = False
+
+
+class BudgetCursor(psycopg2.extensions.cursor):
+    """
+    Cursor que aplica o tempo máximo da operação em andamento (ver with_statement_timeout): o
+    primeiro comando de cada transação é precedido de SET LOCAL statement_timeout, que vale até o
+    commit ou rollback. Um cancelamento por tempo ou outro erro do banco é registrado na operação
+    antes de o erro seguir para o tratamento de erros do DAO.
+    """
+    def execute(self, query, vars=None):
+        return self._with_budget(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._with_budget(super().executemany, query, vars_list)
+
+    def _with_budget(self, execute, query, vars):
+        budget = _current_budget.get()
+        if budget is None:
+            return execute(query, vars)
+
+        try:
+            if budget.timeout_ms and self.connection.status == psycopg2.extensions.STATUS_READY:
+                super().execute("SELECT set_config('statement_timeout', %s, true)", (str(budget.timeout_ms),))
+            return execute(query, vars)
+        except psycopg2.errors.QueryCanceled:
+            budget.timed_out = True
+            raise
+        except psycopg2.Error:
+            budget.failed = True
+            raise
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """
+    Conexão psycopg que guarda os nomes dos statements já preparados nela.
+    Como prepared statements pertencem à sessão do servidor, cada conexão nova
+    do pool começa com o registro vazio e prepara os statements novamente.
+    Os cursores aplicam o tempo máximo da operação em andamento (BudgetCursor).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        self.cursor_factory = BudgetCursor
+
+
+def _load_environment() -> None:
+    """
+    Carrega as variáveis do arquivo .env na primeira vez em que uma conexão é solicitada
+    """
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+def get_db_url() -> str:
+    _load_environment()
+    return f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+
+def get_engine():
+    """
+    Retorna o engine do SQLAlchemy, criando-o (e importando o SQLAlchemy) no primeiro uso
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _sqlalchemy_lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                from sqlalchemy.orm import sessionmaker
+                engine = create_engine(get_db_url(), echo=False, pool_size=_get_pool_max_connections(),
+                                       connect_args={"connection_factory": PreparedConnection})
+                _track_engine_failures(engine)
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
+
+def __getattr__(name: str):
+    # Compatibilidade com o acesso antigo aos atributos criados na importação do módulo
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        get_engine()
+        return _session_factory
+    if name == "db_url":
+        return get_db_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_db_connection():
+    _load_environment()
     try:
         session = psycopg2.connect(
             dbname=os.getenv("DB_NAME"),
@@ -21,18 +193,565 @@ def get_db_connection():
         )
 
         return session
-    
+
     except psycopg2.Error as e:
         print(f"Error connecting to PostgreSQL: {e}")
         return None
-    
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+def _get_pool_max_connections() -> int:
+    _load_environment()
+    return _pool_max_connections or int(os.getenv("DB_POOL_MAX", "10"))
+
+def configure_connection_pool(max_connections: int) -> None:
+    """
+    Define o tamanho máximo dos pools do psycopg e do SQLAlchemy.
+    Só tem efeito se chamada antes do primeiro uso de cada pool.
+    """
+    global _pool_max_connections
+    _pool_max_connections = max_connections
+
+def reserve_pooled_connections(count: int) -> None:
+    """
+    Acrescenta `count` conexões ao pool do psycopg do primário para uma thread em segundo plano
+    (como o gravador em lote), que assim não disputa as conexões dos workers. Vale também para um
+    pool já criado; um `count` negativo desfaz a reserva.
+    """
+    global _reserved_connections
+    with _connection_pool_lock:
+        _reserved_connections += count
+        if _connection_pool is not None:
+            _connection_pool.maxconn += count
+
+def _create_pool(host: str, port: str) -> psycopg2.pool.ThreadedConnectionPool:
+    """
+    Cria um pool de conexões psycopg para o servidor informado, com as credenciais do .env
+    """
+    _load_environment()
+    return psycopg2.pool.ThreadedConnectionPool(
+        int(os.getenv("DB_POOL_MIN", "1")),
+        _get_pool_max_connections(),
+        dbname=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        host=host,
+        port=port,
+        connection_factory=PreparedConnection
+    )
+
+def _get_connection_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    global _connection_pool
+    if _connection_pool is None:
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _load_environment()
+                _connection_pool = _create_pool(os.getenv("DB_HOST"), os.getenv("DB_PORT"))
+                _connection_pool.maxconn += _reserved_connections
+    return _connection_pool
+
+def get_pooled_connection():
+    """
+    Obtém uma conexão do pool do psycopg. Deve ser devolvida com release_pooled_connection.
+    """
+    try:
+        return _get_connection_pool().getconn()
+
+    except psycopg2.Error as e:
+        print(f"Error connecting to PostgreSQL: {e}")
+        _mark_operation_failed()
+        return None
+
+    except Exception as e:
+        print(f"Error: {e}")
+        _mark_operation_failed()
+        return None
+
+def release_pooled_connection(session) -> None:
+    """
+    Devolve uma conexão ao pool de origem (primário ou réplica).
+    Transações pendentes são desfeitas pelo próprio pool.
+    """
+    try:
+        pool = getattr(session, "owner_pool", None) or _get_connection_pool()
+        pool.putconn(session)
     except Exception as e:
         print(f"Error: {e}")
+
+class ReadReplica:
+    """
+    Réplica de leitura com pools próprios (psycopg e SQLAlchemy, criados no primeiro uso)
+    e a última medição do atraso de replicação
+    """
+    def __init__(self, host: str, port: str):
+        self.host = host
+        self.port = port
+        self.pool = None
+        self.session_factory = None
+        self.lag = None
+        self.checked_at = None
+        self.lock = threading.Lock()
+        self.check_lock = threading.Lock()
+
+def _get_read_replicas() -> list[ReadReplica]:
+    global _read_replicas
+    if _read_replicas is None:
+        with _read_replicas_lock:
+            if _read_replicas is None:
+                _load_environment()
+                _read_replicas = [
+                    ReadReplica(host, port) for host, port in _parse_hosts(os.getenv("DB_READ_HOSTS", ""))
+                ]
+    return _read_replicas
+
+def _get_replica_pool(replica: ReadReplica) -> psycopg2.pool.ThreadedConnectionPool:
+    if replica.pool is None:
+        with replica.lock:
+            if replica.pool is None:
+                replica.pool = _create_pool(replica.host, replica.port)
+    return replica.pool
+
+def _measure_replica_lag(replica: ReadReplica) -> float | None:
+    """
+    Mede o atraso de replicação (em segundos) da réplica; None se ela não responder
+    """
+    session = None
+    pool = None
+    try:
+        pool = _get_replica_pool(replica)
+        session = pool.getconn()
+        with session.cursor() as cursor:
+            # Sem WAL pendente de aplicação a réplica está em dia, mesmo que o primário esteja ocioso
+            cursor.execute("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+                """)
+            return float(cursor.fetchone()[0])
+    except Exception as e:
+        print(f"Error ao verificar a réplica {replica.host}:{replica.port}: {e}")
         return None
-    
+    finally:
+        if session:
+            pool.putconn(session)
+
+def _replica_is_healthy(replica: ReadReplica) -> bool:
+    """
+    Indica se a réplica está acessível e com atraso aceitável. A medição é refeita a cada
+    DB_REPLICA_CHECK_INTERVAL_SECONDS por uma única thread; as demais usam o último valor.
+    """
+    interval = float(os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "1"))
+    now = time.monotonic()
+    if (replica.checked_at is None or now - replica.checked_at >= interval) and replica.check_lock.acquire(blocking=False):
+        try:
+            replica.lag = _measure_replica_lag(replica)
+            replica.checked_at = time.monotonic()
+        finally:
+            replica.check_lock.release()
+    return replica.lag is not None and replica.lag <= float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+
+def set_current_client(client_id: str | None) -> contextvars.Token:
+    """
+    Define o cliente da requisição atual, usado para garantir read-your-writes.
+    Devolve um token para reset_current_client.
+    """
+    return _current_client.set(client_id)
+
+def reset_current_client(token: contextvars.Token) -> None:
+    _current_client.reset(token)
+
+def mark_recent_write() -> None:
+    """
+    Registra que o cliente atual gravou dados: por DB_READ_YOUR_WRITES_SECONDS suas leituras
+    vão para o primário, evitando ler de uma réplica que ainda não recebeu a gravação.
+    """
+    now = time.monotonic()
+    window = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+    with _recent_writes_lock:
+        if len(_recent_writes) > 10000:
+            for client_id, until in list(_recent_writes.items()):
+                if until <= now:
+                    del _recent_writes[client_id]
+        _recent_writes[_current_client.get()] = now + window
+
+def reads_go_to_primary() -> bool:
+    """
+    Indica se as leituras do contexto atual devem ir ao primário: o cliente atual gravou dados
+    há pouco (ver mark_recent_write) ou as leituras foram direcionadas com set_primary_reads
+    """
+    if _primary_reads.get():
+        return True
+    with _recent_writes_lock:
+        until = _recent_writes.get(_current_client.get(), 0)
+    return until > time.monotonic()
+
+def set_primary_reads(enabled: bool) -> contextvars.Token:
+    """
+    Direciona as leituras do contexto atual ao primário, como as de uma leitura agrupada que
+    atende um cliente com gravação recente. Devolve um token para reset_primary_reads.
+    """
+    return _primary_reads.set(enabled)
+
+def reset_primary_reads(token: contextvars.Token) -> None:
+    _primary_reads.reset(token)
+
+def _choose_read_replica() -> ReadReplica | None:
+    """
+    Escolhe uma réplica saudável em round-robin; None quando a leitura deve ir ao primário
+    """
+    replicas = _get_read_replicas()
+    if not replicas:
+        return None
+    if reads_go_to_primary():
+        return None
+    start = next(_read_replica_counter)
+    for offset in range(len(replicas)):
+        replica = replicas[(start + offset) % len(replicas)]
+        if _replica_is_healthy(replica):
+            return replica
+    return None
+
+def get_read_connection():
+    """
+    Obtém uma conexão para consultas de relatório: de uma réplica saudável quando configurada,
+    ou do primário (sem réplicas, réplicas atrasadas/indisponíveis ou após gravação do cliente).
+    Deve ser devolvida com release_pooled_connection.
+    """
+    replica = _choose_read_replica()
+    if replica is not None:
+        try:
+            session = _get_replica_pool(replica).getconn()
+            session.owner_pool = replica.pool
+            return session
+        except Exception as e:
+            print(f"Error ao conectar à réplica {replica.host}:{replica.port}: {e}")
+            replica.lag = None
+    return get_pooled_connection()
+
+def _parse_hosts(value: str) -> list[tuple[str, str]]:
+    hosts = []
+    for address in value.split(","):
+        if address.strip():
+            host, _, port = address.strip().partition(":")
+            hosts.append((host, port or os.getenv("DB_PORT")))
+    return hosts
+
+class DatabaseShard:
+    """
+    Banco do modo particionado, com pool próprio criado no primeiro uso
+    """
+    def __init__(self, host: str, port: str):
+        self.host = host
+        self.port = port
+        self.pool = None
+        self.lock = threading.Lock()
+
+def _get_shards() -> list[DatabaseShard]:
+    global _shards
+    if _shards is None:
+        with _shards_lock:
+            if _shards is None:
+                _load_environment()
+                _shards = [
+                    DatabaseShard(host, port) for host, port in _parse_hosts(os.getenv("DB_SHARD_HOSTS", ""))
+                ]
+    return _shards
+
+def get_shard_count() -> int:
+    """
+    Quantidade de bancos do modo particionado (DB_SHARD_HOSTS)
+    """
+    return len(_get_shards())
+
+def get_shard_connection(shard: int):
+    """
+    Obtém uma conexão do pool do shard informado. Deve ser devolvida com release_pooled_connection.
+
+    Args:
+        shard (int): Índice do shard (posição em DB_SHARD_HOSTS)
+    """
+    try:
+        database = _get_shards()[shard]
+        if database.pool is None:
+            with database.lock:
+                if database.pool is None:
+                    database.pool = _create_pool(database.host, database.port)
+        session = database.pool.getconn()
+        session.owner_pool = database.pool
+        return session
+
+    except psycopg2.Error as e:
+        print(f"Error connecting to PostgreSQL (shard {shard}): {e}")
+        return None
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+async def get_async_pool():
+    """
+    Retorna o pool de conexões asyncpg, criando-o no primeiro uso.
+    O asyncpg prepara e guarda em cache os statements de cada conexão automaticamente.
+    """
+    global _async_pool, _async_pool_lock
+    if _async_pool is None:
+        import asyncio
+        if _async_pool_lock is None:
+            _async_pool_lock = asyncio.Lock()
+        async with _async_pool_lock:
+            if _async_pool is None:
+                import asyncpg
+                _load_environment()
+                _async_pool = await asyncpg.create_pool(
+                    min_size=int(os.getenv("DB_POOL_MIN", "1")),
+                    max_size=_get_pool_max_connections(),
+                    database=os.getenv("DB_NAME"),
+                    user=os.getenv("DB_USER"),
+                    password=os.getenv("DB_PASSWORD"),
+                    host=os.getenv("DB_HOST"),
+                    port=int(os.getenv("DB_PORT", "5432"))
+                )
+    return _async_pool
+
+async def close_async_pool() -> None:
+    """
+    Fecha o pool asyncpg (chamar antes de encerrar o event loop)
+    """
+    global _async_pool, _async_pool_lock
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+        _async_pool_lock = None
+
+def set_prepared_statements(enabled: bool) -> None:
+    """
+    Ativa ou desativa o uso de prepared statements (útil para comparar os dois modos em benchmarks)
+    """
+    global _prepared_statements_enabled
+    _prepared_statements_enabled = enabled
+
+def prepared_statements_enabled() -> bool:
+    global _prepared_statements_enabled
+    if _prepared_statements_enabled is None:
+        _load_environment()
+        _prepared_statements_enabled = os.getenv("DB_PREPARED_STATEMENTS", "1") != "0"
+    return _prepared_statements_enabled
+
+def set_partitioned_orders(enabled: bool) -> None:
+    """
+    Indica se orders/order_details estão particionadas por data (ver app/dao/partitioning.py)
+    """
+    global _partitioned_orders_enabled
+    _partitioned_orders_enabled = enabled
+
+def partitioned_orders_enabled() -> bool:
+    """
+    Com as tabelas particionadas, order_details tem a coluna orderdate e as consultas por período
+    filtram também os itens por ela, para que o planner descarte as partições fora do período
+    """
+    global _partitioned_orders_enabled
+    if _partitioned_orders_enabled is None:
+        _load_environment()
+        _partitioned_orders_enabled = os.getenv("DB_PARTITIONED_ORDERS", "0") == "1"
+    return _partitioned_orders_enabled
+
+def set_order_archive(enabled: bool) -> None:
+    """
+    Indica se existem pedidos arquivados (ver app/dao/archive.py)
+    """
+    global _order_archive_enabled
+    _order_archive_enabled = enabled
+
+def order_archive_enabled() -> bool:
+    """
+    Com o arquivo ativo, os relatórios de pedido também procuram nas tabelas de arquivo e o
+    ranking soma os agregados diários dos pedidos arquivados
+    """
+    global _order_archive_enabled
+    if _order_archive_enabled is None:
+        _load_environment()
+        _order_archive_enabled = os.getenv("DB_ORDER_ARCHIVE", "0") == "1"
+    return _order_archive_enabled
+
+def set_order_totals(enabled: bool) -> None:
+    """
+    Indica se os totais dos pedidos já estão gravados nas tabelas (ver app/dao/order_totals.py)
+    """
+    global _order_totals_enabled
+    _order_totals_enabled = enabled
+
+def order_totals_enabled() -> bool:
+    """
+    Com os totais gravados, os relatórios leem order_details.net_amount e orders.order_total/line_count
+    em vez de recalcular quantity * unitprice * (1 - discount) a cada item
+    """
+    global _order_totals_enabled
+    if _order_totals_enabled is None:
+        _load_environment()
+        _order_totals_enabled = os.getenv("DB_ORDER_TOTALS", "0") == "1"
+    return _order_totals_enabled
+
+def set_stock_reservation(enabled: bool) -> None:
+    """
+    Ativa ou desativa a reserva de estoque na criação de pedidos
+    """
+    global _stock_reservation_enabled
+    _stock_reservation_enabled = enabled
+
+def stock_reservation_enabled() -> bool:
+    """
+    Com a reserva de estoque, a criação de um pedido desconta a quantidade dos itens de
+    products.unitsinstock na mesma transação do pedido, e falha se algum produto não tiver estoque
+    """
+    global _stock_reservation_enabled
+    if _stock_reservation_enabled is None:
+        _load_environment()
+        _stock_reservation_enabled = os.getenv("DB_RESERVE_STOCK", "0") == "1"
+    return _stock_reservation_enabled
+
+def set_statement_timeout(operation: str, timeout_ms: int) -> None:
+    """
+    Define o tempo máximo (em ms, 0 para nenhum) de um tipo de operação, sobrescrevendo o .env
+    """
+    _statement_timeouts[operation] = timeout_ms
+
+def statement_timeout(operation: str) -> int:
+    """
+    Tempo máximo em ms de um tipo de operação ("lookup", "insert", "report" ou "ranking"):
+    DB_TIMEOUT_<TIPO>_MS ou o padrão do tipo
+    """
+    if operation not in _statement_timeouts:
+        _load_environment()
+        default = _STATEMENT_TIMEOUT_DEFAULTS[operation]
+        _statement_timeouts[operation] = int(os.getenv(f"DB_TIMEOUT_{operation.upper()}_MS", str(default)))
+    return _statement_timeouts[operation]
+
+def operation_timed_out() -> bool:
+    """
+    Indica se algum comando da operação em andamento (ver with_statement_timeout) foi cancelado
+    por exceder o tempo máximo
+    """
+    budget = _current_budget.get()
+    return budget is not None and budget.timed_out
+
+def operation_failed() -> bool:
+    """
+    Indica se algum comando ou conexão da operação em andamento falhou no banco
+    """
+    budget = _current_budget.get()
+    return budget is not None and budget.failed
+
+def _mark_operation_failed() -> None:
+    """
+    Registra na operação em andamento (se houver) uma falha do banco
+    """
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.failed = True
+
+def _track_engine_failures(engine) -> None:
+    """
+    Registra na operação em andamento os erros do banco no engine do SQLAlchemy, inclusive os de
+    conexão, que não passam pelos cursores (BudgetCursor)
+    """
+    from sqlalchemy import event
+    event.listen(engine, "handle_error", lambda context: _mark_operation_failed())
+
+def with_statement_timeout(operation: str):
+    """
+    Decorador de funções do DAO: os comandos executados pela função (conexões psycopg do pool e
+    sessões do SQLAlchemy) são cancelados pelo banco se excederem o tempo máximo da operação. A
+    função trata o cancelamento como qualquer erro do banco; ao final, se ela não devolveu um
+    resultado (None), o decorador o converte em OperationTimeoutError, para que o controlador
+    diferencie o timeout dos demais erros. Da mesma forma, um None após uma falha do banco vira
+    OperationFailedError, e não se confunde com um registro inexistente. Uma função que grava
+    parte do trabalho mesmo após uma falha (insert_order_batch) devolve o seu resultado e informa
+    o erro onde ele ocorreu.
+
+    Args:
+        operation (str): Tipo da operação ("lookup", "insert", "report" ou "ranking")
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            budget = _OperationBudget(operation, statement_timeout(operation))
+            token = _current_budget.set(budget)
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                _current_budget.reset(token)
+            if result is None:
+                if budget.timed_out:
+                    raise OperationTimeoutError(operation, budget.timeout_ms)
+                if budget.failed:
+                    raise OperationFailedError(operation)
+            return result
+        return wrapper
+    return decorator
+
+def _to_positional_parameters(sql: str) -> str:
+    counter = iter(range(1, sql.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(counter)}", sql)
+
+def execute_statement(cursor, name: str, sql: str, params: tuple = ()) -> None:
+    """
+    Executa um statement usando PREPARE/EXECUTE quando prepared statements estão ativos.
+    O PREPARE é feito uma única vez por conexão; nas execuções seguintes só o EXECUTE é enviado,
+    evitando o custo de parse/plan a cada chamada.
+
+    Args:
+        cursor: Cursor da conexão
+        name (str): Nome do prepared statement (único por statement)
+        sql (str): Comando SQL com placeholders %s
+        params (tuple): Parâmetros do comando
+    """
+    prepared = getattr(cursor.connection, "prepared_statements", None)
+    if prepared is None or not prepared_statements_enabled():
+        cursor.execute(sql, params)
+        return
+
+    if name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {_to_positional_parameters(sql)}")
+        prepared.add(name)
+
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
+
+def get_sql_alchemy_read_session():
+    """
+    Sessão do SQLAlchemy para consultas de relatório, seguindo as mesmas regras de get_read_connection
+    """
+    replica = _choose_read_replica()
+    if replica is None:
+        return get_sql_alchemy_new_session()
+    try:
+        if replica.session_factory is None:
+            from sqlalchemy import create_engine
+            from sqlalchemy.orm import sessionmaker
+            with replica.lock:
+                if replica.session_factory is None:
+                    url = f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{replica.host}:{replica.port}/{os.getenv('DB_NAME')}"
+                    engine = create_engine(url, echo=False, pool_size=_get_pool_max_connections(),
+                                           connect_args={"connection_factory": PreparedConnection})
+                    _track_engine_failures(engine)
+                    replica.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        return replica.session_factory()
+    except Exception as e:
+        print(f"Error: {e}")
+        return get_sql_alchemy_new_session()
+
 def get_sql_alchemy_new_session():
     try:
-        return SessionLocal()
+        get_engine()
+        return _session_factory()
     except Exception as e:
         print(f"Error: {e}")
-        return None
\ No newline at end of file
+        _mark_operation_failed()
+        return None
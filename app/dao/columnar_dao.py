@@ -0,0 +1,364 @@
+import json
+import os
+import threading
+import psycopg2
+from app.dao.base_dao import get_read_connection, release_pooled_connection, order_archive_enabled
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional: sem NumPy o snapshot fica indisponível
+    np = None
+
+# Snapshot colunar dos itens de pedido para análises em memória: cada coluna é um arquivo binário
+# (memory-mapped na leitura) com um valor por item. Funcionário, cliente, produto, categoria e país
+# são codificados por dicionário (inteiros sequenciais), datas viram número de dias desde 1970-01-01
+# e o valor líquido do item é um float. Ranking e resumo de vendas são calculados com group-by
+# vetorizado (np.bincount/np.unique), sem consultar o banco.
+#
+# A atualização é incremental pelos IDs de pedido: são lidos os pedidos com orderid maior que o
+# último carregado menos ANALYTICS_SNAPSHOT_SAFETY_WINDOW IDs, ignorando os itens (pedido e produto)
+# já carregados. A janela cobre pedidos com ID menor confirmados depois de um ID maior (transações
+# concorrentes) e itens gravados depois do cabeçalho do pedido, em outra transação, que uma leitura
+# só a partir do último ID pularia para sempre. Alterações ou remoções de itens antigos exigem
+# `refresh_snapshot(full=True)`.
+
+_COLUMNS = {
+    "orderid": "int32",
+    "day": "int32",
+    "employee": "int32",
+    "customer": "int32",
+    "product": "int32",
+    "category": "int32",
+    "ship_country": "int32",
+    "net_value": "float64",
+}
+
+# Dimensões codificadas por dicionário, na mesma ordem do resumo de vendas dos outros backends
+_DIMENSIONS = ("employee", "customer", "product", "category", "ship_country")
+
+_EPOCH = date(1970, 1, 1)
+_FETCH_SIZE = 50000
+
+_SNAPSHOT_SQL = """
+    SELECT
+        o.orderid,
+        o.orderdate::date - DATE '1970-01-01' AS day,
+        o.employeeid, e.firstname || ' ' || e.lastname,
+        o.customerid, c.companyname,
+        od.productid, p.productname,
+        p.categoryid, cat.categoryname,
+        o.shipcountry, o.shipcountry,
+        od.quantity * od.unitprice * (1 - od.discount) AS net_value
+    FROM {orders} o
+    INNER JOIN {details} od ON od.orderid = o.orderid
+    LEFT JOIN northwind.employees e ON e.employeeid = o.employeeid
+    LEFT JOIN northwind.customers c ON c.customerid = o.customerid
+    LEFT JOIN northwind.products p ON p.productid = od.productid
+    LEFT JOIN northwind.categories cat ON cat.categoryid = p.categoryid
+    WHERE o.orderid > %s AND o.orderdate IS NOT NULL
+    ORDER BY o.orderid
+    """
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def _snapshot_dir() -> str:
+    return os.getenv("ANALYTICS_SNAPSHOT_DIR", os.path.join("data", "snapshot"))
+
+def _metadata_path() -> str:
+    return os.path.join(_snapshot_dir(), "snapshot.json")
+
+def _column_path(name: str) -> str:
+    return os.path.join(_snapshot_dir(), f"{name}.bin")
+
+def _read_metadata() -> dict | None:
+    try:
+        with open(_metadata_path(), encoding="utf-8") as metadata_file:
+            return json.load(metadata_file)
+    except FileNotFoundError:
+        return None
+
+def _write_metadata(metadata: dict) -> None:
+    # Gravado por último e de forma atômica: bytes além de metadata['rows'] nas colunas são ignorados
+    temporary_path = _metadata_path() + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as metadata_file:
+        json.dump(metadata, metadata_file)
+    os.replace(temporary_path, _metadata_path())
+
+def _safety_window() -> int:
+    return int(os.getenv("ANALYTICS_SNAPSHOT_SAFETY_WINDOW", "1000"))
+
+def _loaded_order_lines(rows: int, above: int, products: list) -> set:
+    """
+    Itens (orderid, productid) já carregados no snapshot com orderid maior que `above`; `products`
+    é o dicionário da dimensão de produto ([productid, nome] por código)
+    """
+    if not rows:
+        return set()
+    order_ids = np.memmap(_column_path("orderid"), dtype=_COLUMNS["orderid"], mode="r", shape=(rows,))
+    product_codes = np.memmap(_column_path("product"), dtype=_COLUMNS["product"], mode="r", shape=(rows,))
+    selected = order_ids > above
+    return {
+        (order_id, products[code][0])
+        for order_id, code in zip(order_ids[selected].tolist(), product_codes[selected].tolist())
+    }
+
+def _numpy_available() -> bool:
+    if np is None:
+        print("Erro: O snapshot colunar requer NumPy (pip install numpy).")
+        return False
+    return True
+
+def refresh_snapshot(full: bool = False) -> int | None:
+    """
+    Carrega no snapshot os itens ainda não carregados (orderid maior que o último carregado,
+    relendo a janela de segurança dos IDs anteriores), lendo o banco em blocos com um cursor do
+    lado do servidor.
+
+    Args:
+        full (bool): Descarta o snapshot atual e recarrega todos os pedidos
+
+    Returns:
+        int | None: Quantidade de itens adicionados ou None em caso de erro
+    """
+    if not _numpy_available():
+        return None
+
+    os.makedirs(_snapshot_dir(), exist_ok=True)
+    metadata = None if full else _read_metadata()
+    if metadata is None:
+        metadata = {'rows': 0, 'last_orderid': 0, 'dictionaries': {name: [] for name in _DIMENSIONS}}
+        # Remove (em vez de truncar) as colunas antigas: leitores que as mapearam continuam válidos
+        for name in _COLUMNS:
+            if os.path.exists(_column_path(name)):
+                os.remove(_column_path(name))
+
+    # Descarta bytes de uma atualização interrompida antes de gravar os metadados
+    for name, dtype in _COLUMNS.items():
+        with open(_column_path(name), "ab") as column_file:
+            column_file.truncate(metadata['rows'] * np.dtype(dtype).itemsize)
+
+    # Pedidos com ID menor que o último carregado ainda podem ser confirmados depois dele
+    reread_from = max(metadata['last_orderid'] - _safety_window(), 0)
+    loaded = _loaded_order_lines(metadata['rows'], reread_from, metadata['dictionaries']['product'])
+
+    codes = {
+        name: {key: code for code, (key, _) in enumerate(metadata['dictionaries'][name])}
+        for name in _DIMENSIONS
+    }
+
+    def encode(name: str, key, label) -> int:
+        code = codes[name].get(key)
+        if code is None:
+            code = codes[name][key] = len(metadata['dictionaries'][name])
+            metadata['dictionaries'][name].append([key, label])
+        return code
+
+    orders = "northwind.orders"
+    details = "northwind.order_details"
+    if order_archive_enabled():
+        # Inclui os pedidos arquivados, que saíram das tabelas ativas
+        orders = """(
+            SELECT orderid, customerid, employeeid, orderdate, shipcountry FROM northwind.orders
+            UNION ALL
+            SELECT orderid, customerid, employeeid, orderdate, shipcountry FROM northwind.orders_archive
+        )"""
+        details = """(
+            SELECT orderid, productid, unitprice, quantity, discount FROM northwind.order_details
+            UNION ALL
+            SELECT orderid, productid, unitprice, quantity, discount FROM northwind.order_details_archive
+        )"""
+
+    session = None
+    added = 0
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor(name="northwind_columnar_snapshot") as cursor:
+            cursor.itersize = _FETCH_SIZE
+            cursor.execute(_SNAPSHOT_SQL.format(orders=orders, details=details), (reread_from,))
+
+            while True:
+                fetched = cursor.fetchmany(_FETCH_SIZE)
+                if not fetched:
+                    break
+                # Um item gravado depois do cabeçalho (outra transação) entra mesmo com o pedido já carregado
+                rows = [row for row in fetched if (row[0], row[6]) not in loaded]
+                if not rows:
+                    continue
+
+                columns = {
+                    "orderid": [row[0] for row in rows],
+                    "day": [row[1] for row in rows],
+                    "net_value": [float(row[12]) for row in rows],
+                }
+                for position, name in enumerate(_DIMENSIONS):
+                    columns[name] = [encode(name, row[2 + 2 * position], row[3 + 2 * position]) for row in rows]
+
+                for name, dtype in _COLUMNS.items():
+                    with open(_column_path(name), "ab") as column_file:
+                        column_file.write(np.asarray(columns[name], dtype=dtype).tobytes())
+
+                added += len(rows)
+                metadata['rows'] += len(rows)
+                metadata['last_orderid'] = max(metadata['last_orderid'], rows[-1][0])
+
+        session.rollback()
+
+    except psycopg2.Error as e:
+        print(f"Erro ao atualizar o snapshot colunar: {e}")
+        if session:
+            session.rollback()
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    _write_metadata(metadata)
+    return added
+
+def _load_snapshot():
+    """
+    Retorna o snapshot mapeado em memória, recarregando-o quando os metadados mudam
+    """
+    global _snapshot
+
+    try:
+        modified = os.stat(_metadata_path()).st_mtime_ns
+    except FileNotFoundError:
+        print("Erro: Snapshot colunar não encontrado (execute `python main.py snapshot refresh`).")
+        return None
+
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot['modified'] != modified:
+            metadata = _read_metadata()
+            rows = metadata['rows']
+            columns = {
+                name: np.memmap(_column_path(name), dtype=dtype, mode="r", shape=(rows,)) if rows
+                else np.empty(0, dtype=dtype)
+                for name, dtype in _COLUMNS.items()
+            }
+            labels = {
+                name: [label for _, label in metadata['dictionaries'][name]]
+                for name in _DIMENSIONS
+            }
+            _snapshot = {'modified': modified, 'columns': columns, 'labels': labels}
+        return _snapshot
+
+def _period_mask(columns: dict, start_date, end_date):
+    return (columns["day"] >= (start_date - _EPOCH).days) & (columns["day"] <= (end_date - _EPOCH).days)
+
+def _count_distinct_orders(keys, order_ids, size: int):
+    """
+    Conta, para cada chave de grupo, os pedidos distintos (cada item carrega o ID do seu pedido)
+    """
+    pairs = np.unique(np.stack((keys.astype("int64"), order_ids.astype("int64"))), axis=1)
+    return np.bincount(pairs[0], minlength=size)
+
+def get_employee_sales_ranking(start_date, end_date) -> list | None:
+    """
+    Calcula o ranking de vendas dos funcionários em um período a partir do snapshot colunar.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+
+    Returns:
+        list | None: Lista no mesmo formato da versão do psycopg ou None em caso de erro
+    """
+    if not _numpy_available():
+        return None
+
+    snapshot = _load_snapshot()
+    if snapshot is None:
+        return None
+
+    columns = snapshot['columns']
+    names = snapshot['labels']['employee']
+    mask = _period_mask(columns, start_date, end_date)
+    employees = columns["employee"][mask]
+
+    totals = np.bincount(employees, weights=columns["net_value"][mask], minlength=len(names))
+    orders = _count_distinct_orders(employees, columns["orderid"][mask], len(names))
+
+    ranking = [code for code in np.argsort(-totals, kind="stable") if orders[code] > 0]
+    return [
+        {
+            'employee_name': names[code],
+            'total_orders': int(orders[code]),
+            'total_value': round(float(totals[code]), 2)
+        }
+        for code in ranking
+    ]
+
+def get_sales_rollup(start_date, end_date, grouping_sets: list[tuple[str, ...]]) -> list | None:
+    """
+    Calcula o resumo de vendas de um período por conjuntos de dimensões a partir do snapshot colunar.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+        grouping_sets (list[tuple[str, ...]]): Conjuntos de dimensões; o conjunto vazio () produz o total geral
+
+    Returns:
+        list | None: Lista no mesmo formato da versão do psycopg ou None em caso de erro
+    """
+    if not _numpy_available():
+        return None
+
+    snapshot = _load_snapshot()
+    if snapshot is None:
+        return None
+
+    columns = snapshot['columns']
+    labels = snapshot['labels']
+    mask = _period_mask(columns, start_date, end_date)
+    if not mask.any():
+        return []
+
+    order_ids = columns["orderid"][mask]
+    values = columns["net_value"][mask]
+    dimensions = [name for name in _DIMENSIONS if any(name in grouping_set for grouping_set in grouping_sets)]
+    selected = {name: columns[name][mask] for name in dimensions}
+
+    result = []
+    for grouping_set in grouping_sets:
+        if grouping_set:
+            # Combina os códigos das dimensões do conjunto em uma única chave por item
+            combined = np.ravel_multi_index(
+                [selected[name] for name in grouping_set],
+                [max(len(labels[name]), 1) for name in grouping_set]
+            )
+            keys, groups = np.unique(combined, return_inverse=True)
+            groups = groups.ravel()
+        else:
+            keys = np.zeros(1, dtype="int64")
+            groups = np.zeros(len(values), dtype="int64")
+
+        totals = np.bincount(groups, weights=values, minlength=len(keys))
+        orders = _count_distinct_orders(groups, order_ids, len(keys))
+        if grouping_set:
+            group_codes = np.unravel_index(keys, [max(len(labels[name]), 1) for name in grouping_set])
+        else:
+            group_codes = ()
+
+        for position in range(len(keys)):
+            entry = {'grouped_by': [name for name in dimensions if name in grouping_set]}
+            for name in dimensions:
+                entry[name] = None
+            for name, codes in zip(grouping_set, group_codes):
+                entry[name] = labels[name][codes[position]]
+            entry['total_orders'] = int(orders[position])
+            entry['total_value'] = round(float(totals[position]), 2)
+            result.append(entry)
+
+    # Mesma ordenação da consulta com GROUPING SETS: conjuntos com mais dimensões agrupadas primeiro
+    result.sort(key=lambda entry: (
+        [name not in entry['grouped_by'] for name in dimensions],
+        -entry['total_value']
+    ))
+    return result
@@ -0,0 +1,82 @@
+import psycopg2
+from app.dao.base_dao import get_pooled_connection, release_pooled_connection
+
+# Hierarquia de funcionários (employees.reportsto) materializada em uma closure table: uma linha por
+# par (gestor, subordinado direto ou indireto), incluindo o próprio funcionário com depth 0. A tabela
+# é calculada uma vez por uma CTE recursiva e recalculada por trigger somente quando employees muda,
+# então o ranking por equipe faz um único join em vez de percorrer a árvore a cada consulta.
+
+def build_employee_closure() -> bool:
+    """
+    Cria a closure table northwind.employee_closure, a função que a recalcula e a trigger que a
+    mantém atualizada quando employees é alterada, e faz o cálculo inicial
+
+    Returns:
+        bool: True se a closure table foi criada e calculada
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS northwind.employee_closure (
+                    ancestorid integer NOT NULL,
+                    descendantid integer NOT NULL,
+                    depth integer NOT NULL,
+                    CONSTRAINT employee_closure_pkey PRIMARY KEY (ancestorid, descendantid)
+                );
+                CREATE INDEX IF NOT EXISTS employee_closure_descendantid_idx
+                    ON northwind.employee_closure (descendantid);
+
+                CREATE OR REPLACE FUNCTION northwind.refresh_employee_closure() RETURNS void
+                LANGUAGE plpgsql AS $$
+                BEGIN
+                    DELETE FROM northwind.employee_closure;
+                    INSERT INTO northwind.employee_closure (ancestorid, descendantid, depth)
+                    WITH RECURSIVE tree AS (
+                        SELECT employeeid AS ancestorid, employeeid AS descendantid, 0 AS depth,
+                            ARRAY[employeeid] AS path
+                        FROM northwind.employees
+                        UNION ALL
+                        SELECT t.ancestorid, e.employeeid, t.depth + 1, t.path || e.employeeid
+                        FROM tree t
+                        INNER JOIN northwind.employees e ON e.reportsto = t.descendantid
+                        -- Um ciclo em reportsto encerra o ramo em vez de recursar indefinidamente
+                        WHERE e.employeeid <> ALL(t.path)
+                    )
+                    SELECT ancestorid, descendantid, MIN(depth)
+                    FROM tree
+                    GROUP BY ancestorid, descendantid;
+                END;
+                $$;
+
+                CREATE OR REPLACE FUNCTION northwind.employee_closure_trigger() RETURNS trigger
+                LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM northwind.refresh_employee_closure();
+                    RETURN NULL;
+                END;
+                $$;
+
+                DROP TRIGGER IF EXISTS employee_closure_refresh ON northwind.employees;
+                CREATE TRIGGER employee_closure_refresh
+                    AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF reportsto ON northwind.employees
+                    FOR EACH STATEMENT EXECUTE FUNCTION northwind.employee_closure_trigger();
+
+                SELECT northwind.refresh_employee_closure();
+                """)
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao montar a hierarquia de funcionários: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
@@ -0,0 +1,285 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+# Armazenamento local dos jobs em segundo plano (relatórios demorados executados por workers).
+# Fica em um arquivo SQLite (JOBS_DB_PATH), fora do PostgreSQL, para que a fila e os resultados
+# sobrevivam ao processo que enviou o job e sejam compartilhados entre a linha de comando e os
+# workers da mesma máquina. Jobs concluídos expiram após JOBS_RESULT_TTL segundos. Enquanto um
+# job está pendente ou em execução, um job idêntico (mesmo tipo, backend e parâmetros) recebe o
+# mesmo ID em vez de ser executado de novo.
+
+_initialized_paths = set()
+_schema_lock = threading.Lock()
+
+def _jobs_db_path() -> str:
+    return os.getenv("JOBS_DB_PATH", "northwind_jobs.sqlite3")
+
+def _result_ttl() -> float:
+    return float(os.getenv("JOBS_RESULT_TTL", "86400"))
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def _connect() -> sqlite3.Connection:
+    """
+    Abre uma conexão com o arquivo de jobs (em autocommit: as transações são abertas com
+    BEGIN IMMEDIATE onde é preciso), criando as tabelas no primeiro uso do arquivo no processo.
+    """
+    path = _jobs_db_path()
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    if path not in _initialized_paths:
+        with _schema_lock:
+            if path not in _initialized_paths:
+                # WAL: consultas de status não esperam a gravação dos resultados
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        backend TEXT NOT NULL,
+                        params TEXT NOT NULL,
+                        dedup_key TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        result TEXT,
+                        error TEXT,
+                        created_at REAL NOT NULL,
+                        started_at REAL,
+                        finished_at REAL,
+                        expires_at REAL
+                    );
+                    CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_dedup_idx
+                        ON jobs (dedup_key) WHERE status IN ('pending', 'running');
+                    CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, created_at);
+                    CREATE INDEX IF NOT EXISTS jobs_expires_idx ON jobs (expires_at);
+                    """)
+                _initialized_paths.add(path)
+    return connection
+
+def _timestamp(value: float | None) -> datetime | None:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+def _job_from_row(row: sqlite3.Row, include_result: bool) -> dict:
+    job = {
+        'job_id': row['id'],
+        'kind': row['kind'],
+        'backend': row['backend'],
+        'params': json.loads(row['params']),
+        'status': row['status'],
+        'attempts': row['attempts'],
+        'error': row['error'],
+        'created_at': _timestamp(row['created_at']),
+        'started_at': _timestamp(row['started_at']),
+        'finished_at': _timestamp(row['finished_at']),
+        'expires_at': _timestamp(row['expires_at'])
+    }
+    if include_result:
+        job['result'] = json.loads(row['result']) if row['result'] is not None else None
+    return job
+
+def submit_job(kind: str, backend: str, params: dict) -> tuple[str, bool] | None:
+    """
+    Enfileira um job, ou devolve o ID de um job idêntico ainda pendente ou em execução.
+
+    Args:
+        kind (str): Tipo do job
+        backend (str): Backend que executará o job
+        params (dict): Parâmetros do job (serializáveis em JSON)
+
+    Returns:
+        tuple[str, bool] | None: ID do job e True se ele foi criado (False se é um job idêntico
+            já enfileirado), ou None em caso de erro
+    """
+    params_json = json.dumps(params, sort_keys=True, default=_json_default)
+    dedup_key = f"{kind}|{backend}|{params_json}"
+    connection = None
+    try:
+        connection = _connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("DELETE FROM jobs WHERE expires_at < ?", (now,))
+        row = connection.execute(
+            "SELECT id FROM jobs WHERE dedup_key = ? AND status IN ('pending', 'running')", (dedup_key,)
+        ).fetchone()
+        if row is not None:
+            connection.execute("COMMIT")
+            return (row['id'], False)
+
+        job_id = uuid.uuid4().hex
+        connection.execute(
+            "INSERT INTO jobs (id, kind, backend, params, dedup_key, status, created_at) VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+            (job_id, kind, backend, params_json, dedup_key, now)
+        )
+        connection.execute("COMMIT")
+        return (job_id, True)
+
+    except sqlite3.Error as e:
+        print(f"Erro ao enfileirar o job: {e}")
+        if connection and connection.in_transaction:
+            connection.execute("ROLLBACK")
+        return None
+
+    finally:
+        if connection:
+            connection.close()
+
+def claim_job(stale_after: float) -> dict | None:
+    """
+    Reserva o job pendente mais antigo para execução. Jobs em execução há mais de `stale_after`
+    segundos (de um worker que parou no meio) também são retomados. Cada reserva incrementa o
+    número de tentativas do job ('attempts' do job devolvido), que identifica a execução em
+    finish_job: se o job for retomado enquanto a execução anterior ainda roda, só o resultado da
+    última reserva é gravado.
+
+    Args:
+        stale_after (float): Tempo máximo (s) de execução antes de o job ser retomado
+
+    Returns:
+        dict | None: Job reservado ou None se não há jobs pendentes ou em caso de erro
+    """
+    connection = None
+    try:
+        connection = _connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        row = connection.execute(
+            """
+            SELECT * FROM jobs
+            WHERE status = 'pending' OR (status = 'running' AND started_at < ?)
+            ORDER BY created_at
+            LIMIT 1
+            """, (now - stale_after,)
+        ).fetchone()
+        if row is None:
+            connection.execute("COMMIT")
+            return None
+
+        connection.execute(
+            "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+            (now, row['id'])
+        )
+        connection.execute("COMMIT")
+        job = _job_from_row(row, False)
+        job.update(status='running', attempts=row['attempts'] + 1, started_at=_timestamp(now))
+        return job
+
+    except sqlite3.Error as e:
+        print(f"Erro ao reservar um job: {e}")
+        if connection and connection.in_transaction:
+            connection.execute("ROLLBACK")
+        return None
+
+    finally:
+        if connection:
+            connection.close()
+
+def finish_job(job_id: str, attempt: int, success: bool, result: Any) -> bool:
+    """
+    Grava o resultado de um job executado; ele fica disponível por JOBS_RESULT_TTL segundos.
+    Um resultado que não pode ser serializado em JSON marca o job como falho, para que ele não
+    fique em execução e seja retomado indefinidamente.
+
+    Args:
+        job_id (str): ID do job
+        attempt (int): Tentativa executada ('attempts' do job devolvido por claim_job)
+        success (bool): Se o job foi concluído (status 'done') ou falhou ('failed')
+        result (Any): Resultado (serializável em JSON) ou mensagem de erro, quando falhou
+
+    Returns:
+        bool: True se o resultado foi gravado; False em caso de erro, de resultado não
+            serializável ou se o job foi retomado por outra reserva depois desta tentativa
+    """
+    stored = True
+    if success:
+        try:
+            status, result_json, error = "done", json.dumps(result, default=_json_default), None
+        except (TypeError, ValueError) as e:
+            print(f"Erro ao gravar o resultado do job: {e}")
+            status, result_json, error = "failed", None, f"Erro: O resultado do job não pôde ser gravado. {e}"
+            stored = False
+    else:
+        status, result_json, error = "failed", None, str(result)
+
+    connection = None
+    try:
+        now = time.time()
+        connection = _connect()
+        updated = connection.execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ?
+            WHERE id = ? AND status = 'running' AND attempts = ?
+            """, (status, result_json, error, now, now + _result_ttl(), job_id, attempt)
+        ).rowcount
+        if updated == 0:
+            print(f"O job {job_id} foi retomado por outro worker; o resultado da tentativa {attempt} foi descartado")
+            return False
+        return stored
+
+    except sqlite3.Error as e:
+        print(f"Erro ao gravar o resultado do job: {e}")
+        return False
+
+    finally:
+        if connection:
+            connection.close()
+
+def find_job(job_id: str, include_result: bool = False) -> dict | None:
+    """
+    Busca um job pelo ID.
+
+    Args:
+        job_id (str): ID do job
+        include_result (bool): Inclui o resultado ('result'), que pode ser grande
+
+    Returns:
+        dict | None: Job ou None se ele não existe, expirou ou em caso de erro
+    """
+    connection = None
+    try:
+        connection = _connect()
+        row = connection.execute(
+            "SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at >= ?)", (job_id, time.time())
+        ).fetchone()
+        return _job_from_row(row, include_result) if row is not None else None
+
+    except sqlite3.Error as e:
+        print(f"Erro ao buscar o job: {e}")
+        return None
+
+    finally:
+        if connection:
+            connection.close()
+
+def purge_expired_jobs() -> int | None:
+    """
+    Remove os jobs concluídos cujo resultado expirou.
+
+    Returns:
+        int | None: Quantidade de jobs removidos ou None em caso de erro
+    """
+    connection = None
+    try:
+        connection = _connect()
+        removed = connection.execute("DELETE FROM jobs WHERE expires_at < ?", (time.time(),)).rowcount
+        connection.execute("VACUUM")
+        return removed
+
+    except sqlite3.Error as e:
+        print(f"Erro ao remover os jobs expirados: {e}")
+        return None
+
+    finally:
+        if connection:
+            connection.close()
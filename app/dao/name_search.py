@@ -0,0 +1,366 @@
+import bisect
+import heapq
+import math
+import os
+import threading
+import time
+import unicodedata
+import psycopg2
+from app.dao.base_dao import get_pooled_connection, get_read_connection, release_pooled_connection, execute_statement
+
+# Busca por nome de clientes e produtos (autocompletar e correção de erros de digitação). Catálogos
+# de até NAME_SEARCH_MAX_ROWS nomes são carregados em um índice em memória: prefixos (do nome ou de
+# qualquer palavra dele) por busca binária em uma lista ordenada e nomes parecidos por trigramas,
+# como o pg_trgm. Catálogos maiores são consultados no banco com os índices de trigramas criados por
+# install_name_search_indexes. O índice é recarregado em segundo plano a cada NAME_SEARCH_TTL segundos.
+
+_CATALOGS = {
+    "customers": ("customerid", "companyname", "northwind.customers"),
+    "products": ("productid", "productname", "northwind.products"),
+}
+
+# Similaridade mínima dos nomes parecidos (mesmo limite padrão do operador % do pg_trgm)
+_SIMILARITY_THRESHOLD = 0.3
+
+# Entradas lidas por busca de prefixo: limita o custo de prefixos muito curtos em catálogos grandes
+_MAX_PREFIX_SCAN = 256
+
+# Nomes verificados por busca de nomes parecidos
+_MAX_SIMILAR_CANDIDATES = 256
+
+# Ordem dos tipos de correspondência no resultado
+_MATCH_RANKS = {"exact": 0, "prefix": 1, "word": 2, "similar": 3}
+
+def _normalize(text: str) -> str:
+    """
+    Minúsculas, sem acentos e com espaços simples: a forma comparada pela busca
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+def _trigrams(normalized: str) -> set[str]:
+    """
+    Trigramas de cada palavra com dois espaços antes e um depois, como no pg_trgm
+    """
+    result = set()
+    for word in "".join(char if char.isalnum() else " " for char in normalized).split():
+        padded = f"  {word} "
+        result.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return result
+
+def _similarity(first: frozenset, second: frozenset) -> float:
+    """
+    Trigramas em comum sobre o total de trigramas distintos dos dois textos (similarity do pg_trgm)
+    """
+    common = len(first & second)
+    return common / (len(first) + len(second) - common) if common else 0.0
+
+class NameIndex:
+    """
+    Índice em memória dos nomes de um catálogo.
+
+    Args:
+        rows (list[tuple]): Pares (id, nome)
+    """
+    def __init__(self, rows: list[tuple]):
+        self.ids = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        normalized = [_normalize(name or "") for name in self.names]
+
+        # Chaves de prefixo: o nome inteiro e o trecho a partir de cada palavra seguinte
+        keys = []
+        for position, name in enumerate(normalized):
+            words = name.split(" ")
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), position, start == 0))
+        keys.sort()
+        self.prefix_keys = [key for key, _, _ in keys]
+        self.prefix_entries = [(position, whole) for _, position, whole in keys]
+
+        self.normalized = normalized
+        self.trigram_sets = [frozenset(_trigrams(name)) for name in normalized]
+        self.postings: dict[str, list[int]] = {}
+        for position, name_trigrams in enumerate(self.trigram_sets):
+            for trigram in name_trigrams:
+                self.postings.setdefault(trigram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _similar(self, query_trigrams: frozenset) -> list[int]:
+        """
+        Posições dos nomes com similaridade de trigramas mínima em relação à busca
+        """
+        # Um nome parecido compartilha pelo menos `required` trigramas da busca e, portanto, aparece
+        # em alguma das listas dos (len - required + 1) trigramas mais raros. As listas são lidas da
+        # mais rara para a mais comum até _MAX_SIMILAR_CANDIDATES nomes: os que só compartilham
+        # trigramas muito frequentes (sufixos como "Restaurante") ficam de fora
+        required = max(1, math.ceil(_SIMILARITY_THRESHOLD * len(query_trigrams)))
+        postings = sorted((self.postings.get(trigram, ()) for trigram in query_trigrams), key=len)
+        candidates = set()
+        for positions in postings[:len(query_trigrams) - required + 1]:
+            if candidates and len(candidates) + len(positions) > _MAX_SIMILAR_CANDIDATES:
+                break
+            candidates.update(positions)
+        return [
+            position for position in candidates
+            if _similarity(query_trigrams, self.trigram_sets[position]) >= _SIMILARITY_THRESHOLD
+        ]
+
+    def search(self, term: str, limit: int = 10) -> list[dict]:
+        """
+        Retorna até `limit` nomes: iguais ao termo, começando por ele, com uma palavra começando
+        por ele e, por fim, parecidos (similaridade de trigramas), nessa ordem; empates favorecem
+        os nomes mais parecidos e mais curtos.
+
+        Args:
+            term (str): Texto digitado (parcial ou com erros)
+            limit (int): Quantidade máxima de resultados
+
+        Returns:
+            list[dict]: Resultados com 'id', 'name', 'match' (exact, prefix, word ou similar) e 'score'
+        """
+        normalized = _normalize(term)
+        if not normalized:
+            return []
+
+        matches = {}
+        start = bisect.bisect_left(self.prefix_keys, normalized)
+        for offset in range(start, min(start + _MAX_PREFIX_SCAN, len(self.prefix_keys))):
+            if not self.prefix_keys[offset].startswith(normalized):
+                break
+            position, whole = self.prefix_entries[offset]
+            if whole and self.normalized[position] == normalized:
+                match = "exact"
+            else:
+                match = "prefix" if whole else "word"
+            if position not in matches or _MATCH_RANKS[match] < _MATCH_RANKS[matches[position]]:
+                matches[position] = match
+
+        query_trigrams = frozenset(_trigrams(normalized))
+        if len(matches) < limit and query_trigrams:
+            for position in self._similar(query_trigrams):
+                matches.setdefault(position, "similar")
+
+        # Prefixos são ordenados pelo tamanho do nome; a similaridade só é calculada para os parecidos
+        # e para os resultados devolvidos
+        ranked = heapq.nsmallest(limit, (
+            (_MATCH_RANKS[match],
+             -_similarity(query_trigrams, self.trigram_sets[position]) if match == "similar" else 0.0,
+             len(self.names[position]), self.names[position], position, match)
+            for position, match in matches.items()
+        ))
+        return [
+            {
+                'id': self.ids[position],
+                'name': name,
+                'match': match,
+                'score': round(_similarity(query_trigrams, self.trigram_sets[position]), 3)
+            }
+            for _, _, _, name, position, match in ranked
+        ]
+
+# Índices carregados por catálogo: (momento da carga, NameIndex ou None quando o catálogo é grande)
+_indexes: dict[str, tuple[float, NameIndex | None]] = {}
+_indexes_lock = threading.Lock()
+_refreshing: set[str] = set()
+
+def _index_ttl() -> float:
+    return float(os.getenv("NAME_SEARCH_TTL", "300"))
+
+def _max_rows() -> int:
+    return int(os.getenv("NAME_SEARCH_MAX_ROWS", "20000"))
+
+def _load_index(catalog: str) -> tuple[float, NameIndex | None] | None:
+    """
+    Lê os nomes do catálogo; retorna None no índice quando o catálogo excede NAME_SEARCH_MAX_ROWS
+    """
+    id_column, name_column, table = _CATALOGS[catalog]
+    session = None
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            execute_statement(
+                cursor,
+                f"northwind_name_search_{catalog}",
+                f"SELECT {id_column}, {name_column} FROM {table} WHERE {name_column} IS NOT NULL LIMIT %s",
+                (_max_rows() + 1,)
+            )
+            rows = cursor.fetchall()
+
+        index = NameIndex(rows) if len(rows) <= _max_rows() else None
+        return (time.monotonic(), index)
+
+    except psycopg2.Error as e:
+        print(f"Erro ao carregar os nomes de {catalog}: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def _refresh_in_background(catalog: str) -> None:
+    def refresh():
+        try:
+            loaded = _load_index(catalog)
+            if loaded is not None:
+                with _indexes_lock:
+                    _indexes[catalog] = loaded
+        finally:
+            with _indexes_lock:
+                _refreshing.discard(catalog)
+
+    with _indexes_lock:
+        if catalog in _refreshing:
+            return
+        _refreshing.add(catalog)
+    threading.Thread(target=refresh, name=f"name-search-{catalog}", daemon=True).start()
+
+def _get_index(catalog: str) -> tuple[float, NameIndex | None] | None:
+    """
+    Retorna o índice do catálogo, carregando-o na primeira busca. Índices vencidos continuam em uso
+    enquanto a nova carga é feita em segundo plano, para não atrasar a busca.
+    """
+    loaded = _indexes.get(catalog)
+    if loaded is None:
+        loaded = _load_index(catalog)
+        if loaded is None:
+            return None
+        with _indexes_lock:
+            _indexes[catalog] = loaded
+    elif time.monotonic() - loaded[0] > _index_ttl():
+        _refresh_in_background(catalog)
+    return loaded
+
+def refresh_name_indexes() -> bool:
+    """
+    Recarrega agora os índices de nomes de todos os catálogos.
+
+    Returns:
+        bool: True se todos os catálogos foram carregados
+    """
+    all_ok = True
+    for catalog in _CATALOGS:
+        loaded = _load_index(catalog)
+        if loaded is None:
+            all_ok = False
+            continue
+        with _indexes_lock:
+            _indexes[catalog] = loaded
+    return all_ok
+
+def _search_database(catalog: str, term: str, limit: int) -> list | None:
+    """
+    Busca no banco (catálogos grandes): prefixos com ILIKE e nomes parecidos pela distância de
+    trigramas (<->), ambos atendidos pelos índices GiST de install_name_search_indexes
+    """
+    id_column, name_column, table = _CATALOGS[catalog]
+    prefix = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    sql = f"""
+    SELECT id, name, similarity(name, %s) AS score, name ILIKE %s AS whole
+    FROM (
+        (SELECT {id_column} AS id, {name_column} AS name FROM {table}
+         WHERE {name_column} ILIKE %s OR {name_column} ILIKE %s LIMIT %s)
+        UNION
+        (SELECT {id_column}, {name_column} FROM {table} ORDER BY {name_column} <-> %s LIMIT %s)
+    ) candidates
+    ORDER BY whole DESC, score DESC, length(name), name
+    """
+    session = None
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            execute_statement(
+                cursor,
+                f"northwind_name_search_{catalog}_trgm",
+                sql,
+                (term, prefix, prefix, f"% {prefix}", _MAX_PREFIX_SCAN, term, limit)
+            )
+            rows = cursor.fetchall()
+
+    except psycopg2.Error as e:
+        print(f"Erro ao buscar nomes em {catalog}: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    normalized = _normalize(term)
+    results = []
+    for row_id, name, score, whole in rows:
+        if _normalize(name) == normalized:
+            match = "exact"
+        elif whole:
+            match = "prefix"
+        elif f" {normalized}" in _normalize(name):
+            match = "word"
+        elif score >= _SIMILARITY_THRESHOLD:
+            match = "similar"
+        else:
+            continue
+        results.append({'id': row_id, 'name': name, 'match': match, 'score': round(float(score), 3)})
+
+    results.sort(key=lambda entry: (_MATCH_RANKS[entry['match']], -entry['score'], len(entry['name']), entry['name']))
+    return results[:limit]
+
+def search_names(catalog: str, term: str, limit: int = 10) -> list | None:
+    """
+    Busca nomes de clientes ou produtos por prefixo ou semelhança.
+
+    Args:
+        catalog (str): customers ou products
+        term (str): Texto digitado (parcial ou com erros)
+        limit (int): Quantidade máxima de resultados
+
+    Returns:
+        list | None: Resultados ordenados (ver NameIndex.search) ou None em caso de erro
+    """
+    loaded = _get_index(catalog)
+    if loaded is None:
+        return None
+
+    index = loaded[1]
+    if index is None:
+        return _search_database(catalog, term, limit)
+    return index.search(term, limit)
+
+def install_name_search_indexes() -> bool:
+    """
+    Cria a extensão pg_trgm e os índices GiST de trigramas usados pela busca no banco.
+
+    Returns:
+        bool: True se os índices foram criados
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for catalog, (_, name_column, table) in _CATALOGS.items():
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {catalog}_{name_column}_trgm "
+                    f"ON {table} USING gist ({name_column} gist_trgm_ops)"
+                )
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao criar os índices de busca por nome: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
@@ -0,0 +1,262 @@
+import select
+import time
+import psycopg2
+from app.dao.base_dao import get_db_connection, get_pooled_connection, release_pooled_connection, execute_statement
+
+# Feed de pedidos novos (outbox): uma trigger em northwind.orders grava o ID de cada pedido inserido
+# em northwind.order_feed, na mesma transação, e avisa os consumidores com NOTIFY (entregue no
+# commit). Cada entrada tem a transação que a gravou (txid) e uma posição; o feed é lido em ordem
+# (txid, posição) e apenas até a transação mais antiga ainda aberta, de modo que uma transação
+# lenta não tenha entradas "puladas" por consumidores que já leram entradas posteriores. Os
+# consumidores guardam o último offset confirmado em northwind.order_feed_offsets: a entrega é
+# pelo menos uma vez (o que foi lido e não confirmado é lido de novo).
+
+FEED_CHANNEL = "northwind_order_feed"
+
+def install_order_feed() -> bool:
+    """
+    Cria as tabelas do feed e a trigger em northwind.orders. Com as tabelas particionadas, a
+    trigger é replicada em cada partição; depois de `partitions migrate`, instale novamente.
+
+    Returns:
+        bool: True se o feed foi instalado
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS northwind.order_feed (
+                    orderid integer PRIMARY KEY,
+                    txid bigint NOT NULL DEFAULT txid_current(),
+                    position bigserial NOT NULL,
+                    created_at timestamptz NOT NULL DEFAULT now()
+                );
+                CREATE INDEX IF NOT EXISTS order_feed_offset_idx ON northwind.order_feed (txid, position);
+
+                CREATE TABLE IF NOT EXISTS northwind.order_feed_offsets (
+                    consumer text PRIMARY KEY,
+                    txid bigint NOT NULL,
+                    position bigint NOT NULL,
+                    updated_at timestamptz NOT NULL DEFAULT now()
+                );
+
+                -- ON CONFLICT: pedidos regravados (ex.: movidos entre partições) não voltam ao feed.
+                -- O NOTIFY sem conteúdo é agrupado pelo PostgreSQL em um aviso por transação.
+                CREATE OR REPLACE FUNCTION northwind.order_feed_publish() RETURNS trigger
+                LANGUAGE plpgsql AS $$
+                BEGIN
+                    INSERT INTO northwind.order_feed (orderid) VALUES (NEW.orderid) ON CONFLICT (orderid) DO NOTHING;
+                    PERFORM pg_notify('{FEED_CHANNEL}', '');
+                    RETURN NULL;
+                END;
+                $$;
+
+                DROP TRIGGER IF EXISTS order_feed_publish ON northwind.orders;
+                CREATE TRIGGER order_feed_publish
+                    AFTER INSERT ON northwind.orders
+                    FOR EACH ROW EXECUTE FUNCTION northwind.order_feed_publish();
+                """)
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao instalar o feed de pedidos: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def read_order_feed(consumer: str, after: tuple[int, int] | None, limit: int) -> list | None:
+    """
+    Lê as próximas entradas do feed de um consumidor.
+
+    Args:
+        consumer (str): Nome do consumidor
+        after (tuple[int, int] | None): Offset (txid, posição) a partir do qual ler, ou None para
+            continuar do último offset confirmado pelo consumidor (do início, se não houver)
+        limit (int): Quantidade máxima de entradas
+
+    Returns:
+        list | None: Tuplas (txid, posição, orderid) em ordem, ou None em caso de erro
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            if after is None:
+                execute_statement(cursor, "northwind_order_feed_offset",
+                                  "SELECT txid, position FROM northwind.order_feed_offsets WHERE consumer = %s",
+                                  (consumer,))
+                after = cursor.fetchone() or (0, 0)
+
+            # Entradas de transações ainda abertas (txid >= xmin) ficam para a próxima leitura
+            execute_statement(cursor, "northwind_order_feed_read", """
+                SELECT txid, position, orderid
+                FROM northwind.order_feed
+                WHERE (txid, position) > (%s, %s)
+                AND txid < txid_snapshot_xmin(txid_current_snapshot())
+                ORDER BY txid, position
+                LIMIT %s
+                """, (after[0], after[1], limit))
+            entries = cursor.fetchall()
+        session.commit()
+        return entries
+
+    except psycopg2.Error as e:
+        print(f"Erro ao ler o feed de pedidos: {e}")
+        if session:
+            session.rollback()
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def save_order_feed_offset(consumer: str, offset: tuple[int, int]) -> bool:
+    """
+    Confirma o processamento das entradas do feed até o offset informado (inclusive).
+
+    Args:
+        consumer (str): Nome do consumidor
+        offset (tuple[int, int]): Offset (txid, posição) da última entrada processada
+
+    Returns:
+        bool: True se o offset foi gravado
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            execute_statement(cursor, "northwind_order_feed_save_offset", """
+                INSERT INTO northwind.order_feed_offsets (consumer, txid, position)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (consumer) DO UPDATE
+                SET txid = EXCLUDED.txid, position = EXCLUDED.position, updated_at = now()
+                """, (consumer, offset[0], offset[1]))
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao gravar o offset do feed de pedidos: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def prune_order_feed() -> int | None:
+    """
+    Remove as entradas do feed já confirmadas por todos os consumidores registrados.
+
+    Returns:
+        int | None: Quantidade de entradas removidas ou None em caso de erro
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            cursor.execute("""
+                DELETE FROM northwind.order_feed f
+                USING (
+                    SELECT txid, position FROM northwind.order_feed_offsets ORDER BY txid, position LIMIT 1
+                ) slowest
+                WHERE (f.txid, f.position) <= (slowest.txid, slowest.position)
+                """)
+            removed = cursor.rowcount
+        session.commit()
+        return removed
+
+    except psycopg2.Error as e:
+        print(f"Erro ao limpar o feed de pedidos: {e}")
+        if session:
+            session.rollback()
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+class OrderFeedListener:
+    """
+    Conexão dedicada (fora do pool) que escuta os avisos de pedidos novos, para que o consumidor
+    espere por eles em vez de consultar o feed repetidamente.
+    """
+    def __init__(self):
+        self.session = None
+
+    def listen(self) -> bool:
+        """
+        Passa a escutar o canal do feed. Deve ser chamado antes da primeira leitura, para que
+        nenhum aviso entre a leitura e a espera seja perdido.
+
+        Returns:
+            bool: True se a conexão está escutando
+        """
+        if self.session is not None:
+            return True
+
+        session = get_db_connection()
+        if not session:
+            return False
+        try:
+            session.autocommit = True
+            with session.cursor() as cursor:
+                cursor.execute(f"LISTEN {FEED_CHANNEL}")
+        except psycopg2.Error as e:
+            print(f"Erro ao escutar o feed de pedidos: {e}")
+            session.close()
+            return False
+
+        self.session = session
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Espera um aviso de pedidos novos por até `timeout` segundos.
+
+        Args:
+            timeout (float): Tempo máximo de espera em segundos
+
+        Returns:
+            bool: True se chegou um aviso; False no fim do tempo ou se a conexão falhou (nesse
+                caso ela é refeita na próxima espera)
+        """
+        if not self.listen():
+            time.sleep(timeout)
+            return False
+
+        try:
+            if not self.session.notifies:
+                select.select([self.session], [], [], timeout)
+                self.session.poll()
+            notified = bool(self.session.notifies)
+            self.session.notifies.clear()
+            return notified
+
+        except (psycopg2.Error, OSError) as e:
+            print(f"Erro ao esperar o feed de pedidos: {e}")
+            self.close()
+            return False
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+            self.session = None
@@ -0,0 +1,52 @@
+import psycopg2
+from psycopg2 import sql
+from app.dao.base_dao import get_pooled_connection, release_pooled_connection
+
+# Índices da listagem paginada de pedidos (list_orders): cada filtro (cliente, funcionário ou só o
+# período) tem um índice terminado em (orderdate, orderid), a ordem da listagem. Assim a condição
+# (orderdate, orderid) > cursor vira uma faixa do índice e cada página lê apenas as suas linhas.
+
+_LISTING_INDEXES = (
+    ("customer_date", ("customerid", "orderdate", "orderid")),
+    ("employee_date", ("employeeid", "orderdate", "orderid")),
+    ("date", ("orderdate", "orderid")),
+)
+
+def create_order_listing_indexes() -> bool:
+    """
+    Cria os índices da listagem de pedidos em northwind.orders e, se existir, em
+    northwind.orders_archive. Com as tabelas particionadas, o índice criado na tabela
+    principal é replicado em cada partição.
+
+    Returns:
+        bool: True se os índices foram criados
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            for table in ("orders", "orders_archive"):
+                cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (f"northwind.{table}",))
+                if not cursor.fetchone()[0]:
+                    continue
+                for suffix, columns in _LISTING_INDEXES:
+                    cursor.execute(sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                        sql.Identifier(f"{table}_{suffix}_idx"),
+                        sql.Identifier("northwind", table),
+                        sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+                    ))
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao criar os índices da listagem de pedidos: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
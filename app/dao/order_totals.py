@@ -0,0 +1,152 @@
+import psycopg2
+from psycopg2 import sql
+from app.dao.base_dao import get_pooled_connection, release_pooled_connection, partitioned_orders_enabled
+
+# Totais desnormalizados dos pedidos: order_details.net_amount guarda o valor líquido de cada item e
+# orders.order_total/line_count o total e a quantidade de itens do pedido. Triggers em order_details
+# mantêm os valores em qualquer gravação (psycopg, SQLAlchemy, asyncpg, lotes); pedidos anteriores à
+# instalação ficam com order_total NULL até o backfill, e as triggers só atualizam pedidos já
+# calculados. Depois do backfill, defina DB_ORDER_TOTALS=1 no .env para que os relatórios leiam
+# essas colunas.
+
+# Pares (pedidos, itens) preenchidos pelo backfill; as tabelas de arquivo só se existirem
+_TABLE_PAIRS = (("orders", "order_details"), ("orders_archive", "order_details_archive"))
+
+def install_order_totals(cursor) -> None:
+    """
+    Cria as colunas de totais (e nas tabelas de arquivo, se existirem) e as triggers que as mantêm
+    """
+    # Com as tabelas particionadas, o filtro pela data do pedido limita o UPDATE a uma partição
+    old_date = " AND orderdate = OLD.orderdate" if partitioned_orders_enabled() else ""
+    new_date = " AND orderdate = NEW.orderdate" if partitioned_orders_enabled() else ""
+
+    cursor.execute("""
+        ALTER TABLE northwind.order_details ADD COLUMN IF NOT EXISTS net_amount numeric;
+        -- Sem default na criação: os pedidos existentes ficam NULL (não calculados) até o backfill
+        ALTER TABLE northwind.orders ADD COLUMN IF NOT EXISTS order_total numeric;
+        ALTER TABLE northwind.orders ADD COLUMN IF NOT EXISTS line_count integer;
+        ALTER TABLE northwind.orders ALTER COLUMN order_total SET DEFAULT 0;
+        ALTER TABLE northwind.orders ALTER COLUMN line_count SET DEFAULT 0;
+
+        -- As tabelas de arquivo recebem as linhas com SELECT *: precisam das mesmas colunas
+        ALTER TABLE IF EXISTS northwind.order_details_archive ADD COLUMN IF NOT EXISTS net_amount numeric;
+        ALTER TABLE IF EXISTS northwind.orders_archive ADD COLUMN IF NOT EXISTS order_total numeric;
+        ALTER TABLE IF EXISTS northwind.orders_archive ADD COLUMN IF NOT EXISTS line_count integer;
+
+        CREATE OR REPLACE FUNCTION northwind.order_details_net_amount() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.net_amount := COALESCE(NEW.quantity * NEW.unitprice * (1 - NEW.discount), 0);
+            RETURN NEW;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS order_details_net_amount ON northwind.order_details;
+        CREATE TRIGGER order_details_net_amount
+            BEFORE INSERT OR UPDATE OF quantity, unitprice, discount ON northwind.order_details
+            FOR EACH ROW EXECUTE FUNCTION northwind.order_details_net_amount();
+        """)
+
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION northwind.order_totals_from_details() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE northwind.orders
+                SET order_total = order_total - OLD.net_amount, line_count = line_count - 1
+                WHERE orderid = OLD.orderid{old_date} AND order_total IS NOT NULL;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE northwind.orders
+                SET order_total = order_total + NEW.net_amount, line_count = line_count + 1
+                WHERE orderid = NEW.orderid{new_date} AND order_total IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS order_totals_from_details ON northwind.order_details;
+        CREATE TRIGGER order_totals_from_details
+            AFTER INSERT OR DELETE OR UPDATE OF orderid, quantity, unitprice, discount ON northwind.order_details
+            FOR EACH ROW EXECUTE FUNCTION northwind.order_totals_from_details();
+        """)
+
+def _table_exists(cursor, table: str) -> bool:
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (f"northwind.{table}",))
+    return cursor.fetchone()[0]
+
+def backfill_order_totals(batch_size: int = 5000) -> int | None:
+    """
+    Instala as colunas e triggers de totais e calcula os valores ainda não preenchidos (itens com
+    net_amount NULL e pedidos com order_total NULL), inclusive nas tabelas de arquivo. Cada lote
+    de `batch_size` linhas é gravado em uma transação própria; o comando pode ser repetido.
+
+    Args:
+        batch_size (int): Quantidade de linhas atualizadas por transação
+
+    Returns:
+        int | None: Quantidade de pedidos calculados ou None em caso de erro
+    """
+    session = None
+    filled = 0
+
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            install_order_totals(cursor)
+            session.commit()
+
+            for orders, details in _TABLE_PAIRS:
+                if not _table_exists(cursor, orders):
+                    continue
+                orders_table = sql.Identifier("northwind", orders)
+                details_table = sql.Identifier("northwind", details)
+
+                while True:
+                    cursor.execute(sql.SQL("""
+                        UPDATE {details} od
+                        SET net_amount = COALESCE(od.quantity * od.unitprice * (1 - od.discount), 0)
+                        WHERE (od.orderid, od.productid) IN (
+                            SELECT orderid, productid FROM {details} WHERE net_amount IS NULL LIMIT %s
+                        )
+                        """).format(details=details_table), (batch_size,))
+                    session.commit()
+                    if cursor.rowcount == 0:
+                        break
+
+                while True:
+                    cursor.execute(sql.SQL("""
+                        WITH batch AS (
+                            SELECT orderid FROM {orders} WHERE order_total IS NULL ORDER BY orderid LIMIT %s
+                        ),
+                        totals AS (
+                            SELECT b.orderid, COALESCE(SUM(od.net_amount), 0) AS order_total, COUNT(od.orderid) AS line_count
+                            FROM batch b
+                            LEFT JOIN {details} od ON od.orderid = b.orderid
+                            GROUP BY b.orderid
+                        )
+                        UPDATE {orders} o
+                        SET order_total = t.order_total, line_count = t.line_count
+                        FROM totals t
+                        WHERE o.orderid = t.orderid
+                        """).format(orders=orders_table, details=details_table), (batch_size,))
+                    session.commit()
+                    if cursor.rowcount == 0:
+                        break
+                    filled += cursor.rowcount
+                    print(f"{filled} pedidos calculados...")
+
+        return filled
+
+    except psycopg2.Error as e:
+        print(f"Erro ao preencher os totais dos pedidos (após {filled} pedidos): {e}")
+        if session:
+            session.rollback()
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
@@ -0,0 +1,132 @@
+from app.dao.base_dao import OperationFailedError, OperationTimeoutError, reserve_pooled_connections
+from app.dao.psycopg_dao import insert_order_batch
+from app.model.psycopg_model import OrderRecord, OrderDetailRecord
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import queue
+import threading
+import time
+
+class OrderWriteError(Exception):
+    """
+    Erro ao gravar um pedido enfileirado no OrderWriteBatcher
+    """
+
+
+class OrderWriteBatcher:
+    """
+    Agrupa pedidos enviados concorrentemente e os grava em lotes por uma única thread
+    (group commit): cada lote é gravado em uma transação, pagando um único commit
+    (e um único flush do WAL) para vários pedidos.
+
+    Um lote é gravado quando atinge `max_batch_size` pedidos ou quando o pedido mais
+    antigo do lote espera `max_latency_ms` milissegundos, o que acontecer primeiro.
+    A thread de gravação reserva uma conexão a mais no pool do psycopg enquanto o gravador
+    estiver ativo, e quem aguarda a gravação (write) espera no máximo `result_timeout` segundos.
+    """
+    def __init__(self, max_batch_size: int = 50, max_latency_ms: float = 5.0, result_timeout: float = 30.0):
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.result_timeout = result_timeout
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        reserve_pooled_connections(1)
+        self._thread = threading.Thread(target=self._run, name="order-write-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, order: OrderRecord, details: list[OrderDetailRecord]) -> Future:
+        """
+        Enfileira um pedido já validado para gravação.
+
+        Args:
+            order (OrderRecord): Cabeçalho do pedido
+            details (list[OrderDetailRecord]): Itens do pedido
+
+        Returns:
+            Future: Resolvido com o ID do pedido gravado ou com OrderWriteError
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise OrderWriteError("O gravador de pedidos foi encerrado.")
+            self._queue.put((order, details, future))
+        return future
+
+    def write(self, order: OrderRecord, details: list[OrderDetailRecord]) -> int:
+        """
+        Enfileira um pedido já validado e aguarda a sua gravação por até `result_timeout` segundos.
+
+        Args:
+            order (OrderRecord): Cabeçalho do pedido
+            details (list[OrderDetailRecord]): Itens do pedido
+
+        Returns:
+            int: ID do pedido gravado
+
+        Raises:
+            OperationTimeoutError: A gravação do pedido excedeu o tempo máximo do banco
+            OperationFailedError: A gravação do pedido falhou no banco
+            OrderWriteError: Falha ao gravar o pedido, ou a gravação não foi confirmada no prazo
+        """
+        future = self.submit(order, details)
+        try:
+            return future.result(timeout=self.result_timeout)
+        except FutureTimeoutError:
+            # O lote ainda pode ser gravado depois: o pedido não é dado como perdido
+            raise OrderWriteError(
+                f"a gravação não foi confirmada em {self.result_timeout:g} s; consulte o pedido antes de reenviá-lo"
+            ) from None
+
+    def close(self) -> None:
+        """
+        Encerra o gravador após gravar os pedidos já enfileirados
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        reserve_pooled_connections(-1)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is None:
+                break
+
+            batch = [entry]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._flush(batch)
+
+    def _flush(self, batch: list) -> None:
+        try:
+            results = insert_order_batch([(order, details) for order, details, _ in batch])
+        except OperationTimeoutError as e:
+            results = [e] * len(batch)
+        except Exception as e:
+            results = [f"Error ao inserir lote de pedidos: {e}"] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, int):
+                future.set_result(result)
+            elif isinstance(result, (OperationTimeoutError, OperationFailedError)):
+                # O timeout e a falha do banco chegam à requisição do pedido como tais, e não como
+                # uma recusa do pedido (estoque insuficiente)
+                future.set_exception(result)
+            else:
+                future.set_exception(OrderWriteError(result))
@@ -0,0 +1,317 @@
+import psycopg2
+from psycopg2 import sql
+from app.dao.base_dao import get_pooled_connection, release_pooled_connection
+from datetime import date
+import threading
+
+# Ferramentas para converter northwind.orders e northwind.order_details em tabelas particionadas
+# por faixa de orderdate (mês ou ano). Os itens recebem uma cópia da data do pedido, que faz parte
+# das chaves primárias e da chave estrangeira (orderid, orderdate), e as consultas por período
+# filtram as duas tabelas pela data para que o planner leia apenas as partições do período.
+# Depois da conversão, defina DB_PARTITIONED_ORDERS=1 no .env.
+
+GRANULARITIES = ("month", "year")
+
+_COMMENT_PREFIX = "northwind:partitioned:"
+
+def _period_start(day: date, granularity: str) -> date:
+    if granularity == "year":
+        return date(day.year, 1, 1)
+    return date(day.year, day.month, 1)
+
+def _next_period(start: date, granularity: str) -> date:
+    if granularity == "year":
+        return date(start.year + 1, 1, 1)
+    if start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+def _partition_suffix(start: date, granularity: str) -> str:
+    if granularity == "year":
+        return f"y{start.year}"
+    return f"y{start.year}m{start.month:02d}"
+
+def _partition_ranges(first_day: date, last_day: date, granularity: str) -> list[tuple[date, date]]:
+    """
+    Faixas [início, fim) que cobrem de first_day até last_day (inclusive)
+    """
+    ranges = []
+    start = _period_start(first_day, granularity)
+    while start <= last_day:
+        end = _next_period(start, granularity)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def _future_limit(periods_ahead: int, granularity: str) -> date:
+    start = _period_start(date.today(), granularity)
+    for _ in range(periods_ahead):
+        start = _next_period(start, granularity)
+    return start
+
+def _get_granularity(cursor) -> str | None:
+    """
+    Granularidade das partições de northwind.orders, ou None se a tabela não está particionada
+    """
+    cursor.execute("""
+        SELECT obj_description(p.partrelid, 'pg_class')
+        FROM pg_partitioned_table p
+        WHERE p.partrelid = 'northwind.orders'::regclass
+        """)
+    row = cursor.fetchone()
+    if not row:
+        return None
+    comment = row[0] or ""
+    return comment[len(_COMMENT_PREFIX):] if comment.startswith(_COMMENT_PREFIX) else "month"
+
+def _create_partition(cursor, start: date, end: date, granularity: str) -> bool:
+    """
+    Cria as partições de orders e order_details da faixa [start, end), se ainda não existirem.
+    Pedidos dessa faixa que estejam nas partições padrão são movidos para as novas partições.
+    """
+    suffix = _partition_suffix(start, granularity)
+    cursor.execute("SELECT to_regclass(%s)", (f"northwind.orders_{suffix}",))
+    if cursor.fetchone()[0] is not None:
+        return False
+
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM northwind.orders_default WHERE orderdate >= %s AND orderdate < %s)",
+        (start, end)
+    )
+    has_default_rows = cursor.fetchone()[0]
+
+    if has_default_rows:
+        # A partição não pode ser criada enquanto a padrão tiver linhas da mesma faixa
+        for table in ("order_details", "orders"):
+            cursor.execute(
+                sql.SQL("CREATE TEMP TABLE {} AS SELECT * FROM {} WHERE orderdate >= %s AND orderdate < %s").format(
+                    sql.Identifier(f"moved_{table}"), sql.Identifier("northwind", f"{table}_default")
+                ),
+                (start, end)
+            )
+            cursor.execute(
+                sql.SQL("DELETE FROM {} WHERE orderdate >= %s AND orderdate < %s").format(
+                    sql.Identifier("northwind", f"{table}_default")
+                ),
+                (start, end)
+            )
+
+    for table in ("orders", "order_details"):
+        cursor.execute(
+            sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES FROM (%s) TO (%s)").format(
+                sql.Identifier("northwind", f"{table}_{suffix}"), sql.Identifier("northwind", table)
+            ),
+            (start, end)
+        )
+
+    if has_default_rows:
+        for table in ("orders", "order_details"):
+            cursor.execute(
+                sql.SQL("INSERT INTO {} SELECT * FROM {}").format(
+                    sql.Identifier("northwind", table), sql.Identifier(f"moved_{table}")
+                )
+            )
+            cursor.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(f"moved_{table}")))
+
+    return True
+
+def partition_order_tables(granularity: str = "month", periods_ahead: int = 3) -> bool:
+    """
+    Converte orders e order_details em tabelas particionadas por orderdate, em uma única transação.
+    As tabelas originais são mantidas como orders_unpartitioned e order_details_unpartitioned
+    para conferência e podem ser removidas depois.
+
+    Args:
+        granularity (str): "month" ou "year"
+        periods_ahead (int): Quantidade de partições futuras criadas além do período atual
+
+    Returns:
+        bool: True se a conversão foi concluída
+    """
+    if granularity not in GRANULARITIES:
+        print(f"Granularidade inválida: {granularity}")
+        return False
+
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            if _get_granularity(cursor) is not None:
+                print("As tabelas de pedidos já estão particionadas.")
+                return False
+
+            cursor.execute("LOCK TABLE northwind.orders, northwind.order_details IN ACCESS EXCLUSIVE MODE")
+            cursor.execute("SELECT COUNT(*) FILTER (WHERE orderdate IS NULL), MIN(orderdate), MAX(orderdate) FROM northwind.orders")
+            null_dates, first_date, last_date = cursor.fetchone()
+            if null_dates:
+                print(f"Existem {null_dates} pedidos sem orderdate; preencha a data antes de particionar.")
+                session.rollback()
+                return False
+
+            # Os nomes de índices e da chave primária são únicos no schema e passam para as novas tabelas
+            cursor.execute("""
+                ALTER TABLE northwind.order_details RENAME TO order_details_unpartitioned;
+                ALTER TABLE northwind.orders RENAME TO orders_unpartitioned;
+                ALTER TABLE northwind.orders_unpartitioned RENAME CONSTRAINT orders_pkey TO orders_unpartitioned_pkey;
+                ALTER TABLE northwind.order_details_unpartitioned RENAME CONSTRAINT order_details_pkey TO order_details_unpartitioned_pkey;
+                ALTER INDEX IF EXISTS northwind.fki_fk_orders_customers RENAME TO fki_fk_orders_customers_unpartitioned;
+                ALTER INDEX IF EXISTS northwind.fki_fk_order_details_orders RENAME TO fki_fk_order_details_orders_unpartitioned;
+                ALTER INDEX IF EXISTS northwind.fki_fk_order_details_products RENAME TO fki_fk_order_details_products_unpartitioned;
+
+                CREATE TABLE northwind.orders (LIKE northwind.orders_unpartitioned INCLUDING DEFAULTS)
+                    PARTITION BY RANGE (orderdate);
+                ALTER TABLE northwind.orders ADD CONSTRAINT orders_pkey PRIMARY KEY (orderid, orderdate);
+                ALTER TABLE northwind.orders ADD CONSTRAINT fk_orders_customers
+                    FOREIGN KEY (customerid) REFERENCES northwind.customers (customerid);
+                ALTER TABLE northwind.orders ADD CONSTRAINT fk_orders_employees
+                    FOREIGN KEY (employeeid) REFERENCES northwind.employees (employeeid);
+                CREATE INDEX fki_fk_orders_customers ON northwind.orders (employeeid);
+
+                CREATE TABLE northwind.order_details (
+                    LIKE northwind.order_details_unpartitioned INCLUDING DEFAULTS,
+                    orderdate timestamp NOT NULL
+                ) PARTITION BY RANGE (orderdate);
+                ALTER TABLE northwind.order_details ADD CONSTRAINT order_details_pkey
+                    PRIMARY KEY (orderid, productid, orderdate);
+                ALTER TABLE northwind.order_details ADD CONSTRAINT fk_order_details_orders
+                    FOREIGN KEY (orderid, orderdate) REFERENCES northwind.orders (orderid, orderdate);
+                ALTER TABLE northwind.order_details ADD CONSTRAINT fk_order_details_products
+                    FOREIGN KEY (productid) REFERENCES northwind.products (productid);
+                CREATE INDEX fki_fk_order_details_orders ON northwind.order_details (orderid);
+                CREATE INDEX fki_fk_order_details_products ON northwind.order_details (productid);
+                """)
+
+            today = date.today()
+            first_day = min(first_date.date(), today) if first_date else today
+            last_day = max(last_date.date(), today) if last_date else today
+            last_day = max(last_day, _future_limit(periods_ahead, granularity))
+            ranges = _partition_ranges(first_day, last_day, granularity)
+            for table in ("orders", "order_details"):
+                cursor.execute(
+                    sql.SQL("CREATE TABLE {} PARTITION OF {} DEFAULT").format(
+                        sql.Identifier("northwind", f"{table}_default"), sql.Identifier("northwind", table)
+                    )
+                )
+            for start, end in ranges:
+                _create_partition(cursor, start, end, granularity)
+
+            cursor.execute("INSERT INTO northwind.orders SELECT * FROM northwind.orders_unpartitioned")
+            cursor.execute("""
+                INSERT INTO northwind.order_details (orderid, productid, unitprice, quantity, discount, orderdate)
+                SELECT od.orderid, od.productid, od.unitprice, od.quantity, od.discount, o.orderdate
+                FROM northwind.order_details_unpartitioned od
+                INNER JOIN northwind.orders_unpartitioned o ON o.orderid = od.orderid
+                """)
+            cursor.execute(
+                sql.SQL("COMMENT ON TABLE northwind.orders IS {}").format(sql.Literal(_COMMENT_PREFIX + granularity))
+            )
+            cursor.execute("ANALYZE northwind.orders")
+            cursor.execute("ANALYZE northwind.order_details")
+
+        session.commit()
+        print(f"Tabelas de pedidos particionadas por {granularity} ({len(ranges)} partições).")
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao particionar as tabelas de pedidos: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def ensure_order_partitions(periods_ahead: int = 3) -> int | None:
+    """
+    Cria as partições do período atual e dos próximos `periods_ahead` períodos que ainda não existem.
+
+    Args:
+        periods_ahead (int): Quantidade de períodos futuros que devem ter partição
+
+    Returns:
+        int | None: Quantidade de partições criadas ou None em caso de erro
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return None
+
+        created = 0
+        with session.cursor() as cursor:
+            granularity = _get_granularity(cursor)
+            if granularity is None:
+                print("As tabelas de pedidos não estão particionadas.")
+                return None
+
+            for start, end in _partition_ranges(date.today(), _future_limit(periods_ahead, granularity), granularity):
+                if _create_partition(cursor, start, end, granularity):
+                    created += 1
+        session.commit()
+        return created
+
+    except psycopg2.Error as e:
+        print(f"Erro ao criar partições de pedidos: {e}")
+        if session:
+            session.rollback()
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def list_order_partitions() -> list | None:
+    """
+    Lista as partições de northwind.orders com seus limites e a estimativa de linhas
+
+    Returns:
+        list | None: Lista de dicionários {'partition', 'bounds', 'estimated_rows'} ou None em caso de erro
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            cursor.execute("""
+                SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+                FROM pg_inherits i
+                INNER JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'northwind.orders'::regclass
+                ORDER BY c.relname
+                """)
+            return [
+                {'partition': row[0], 'bounds': row[1], 'estimated_rows': max(row[2], 0)}
+                for row in cursor.fetchall()
+            ]
+
+    except psycopg2.Error as e:
+        print(f"Erro ao listar partições de pedidos: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def start_partition_maintenance(interval_seconds: float = 86400, periods_ahead: int = 3) -> threading.Event:
+    """
+    Executa ensure_order_partitions agora e a cada `interval_seconds` em uma thread em segundo plano.
+
+    Returns:
+        threading.Event: Evento que encerra a manutenção quando sinalizado
+    """
+    stop = threading.Event()
+
+    def _run():
+        while True:
+            ensure_order_partitions(periods_ahead)
+            if stop.wait(interval_seconds):
+                break
+
+    threading.Thread(target=_run, name="order-partition-maintenance", daemon=True).start()
+    return stop
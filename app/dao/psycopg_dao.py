@@ -1,8 +1,119 @@
 import psycopg2
-from app.dao.base_dao import get_db_connection
-from app.model.psycopg_model import Orders, OrderDetails
+import psycopg2.errors
+from app.dao.base_dao import (
+    get_pooled_connection,
+    get_read_connection,
+    release_pooled_connection,
+    execute_statement,
+    partitioned_orders_enabled,
+    order_archive_enabled,
+    order_totals_enabled,
+    stock_reservation_enabled,
+    statement_timeout,
+    with_statement_timeout,
+    OperationFailedError,
+    OperationTimeoutError
+)
+from app.model.psycopg_model import OrderRecord, OrderDetailRecord
 from datetime import date
 
+_INSERT_ORDER_SQL = """
+    INSERT INTO northwind.orders
+    (orderid, customerid, employeeid, orderdate, requireddate, shippeddate, shipperid, freight, shipname, shipaddress, shipcity, shipregion, shippostalcode, shipcountry)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+
+_INSERT_ORDER_DETAIL_SQL = """
+    INSERT INTO northwind.order_details
+    (orderid, productid, unitprice, quantity, discount)
+    VALUES (%s, %s, %s, %s, %s);
+    """
+
+# Com as tabelas particionadas, os itens guardam a data do pedido (chave de partição)
+_INSERT_PARTITIONED_ORDER_DETAIL_SQL = """
+    INSERT INTO northwind.order_details
+    (orderid, productid, unitprice, quantity, discount, orderdate)
+    VALUES (%s, %s, %s, %s, %s, %s);
+    """
+
+# Reserva o estoque de todos os itens de um pedido em um único comando. As linhas dos produtos são
+# bloqueadas em ordem de productid, para que pedidos concorrentes com os mesmos produtos não entrem
+# em deadlock, e só são atualizadas se houver estoque para a quantidade total do produto no pedido:
+# os produtos que não voltam no RETURNING não tinham estoque suficiente.
+_RESERVE_STOCK_SQL = """
+    WITH requested AS (
+        SELECT productid, SUM(quantity) AS quantity
+        FROM unnest(%s::integer[], %s::integer[]) AS item (productid, quantity)
+        GROUP BY productid
+    ),
+    locked AS (
+        SELECT p.productid, r.quantity
+        FROM northwind.products p
+        INNER JOIN requested r ON r.productid = p.productid
+        ORDER BY p.productid
+        FOR UPDATE OF p
+    )
+    UPDATE northwind.products p
+    SET unitsinstock = p.unitsinstock - l.quantity
+    FROM locked l
+    WHERE p.productid = l.productid AND p.unitsinstock >= l.quantity
+    RETURNING p.productid;
+    """
+
+def _insert_order_detail_statement() -> tuple[str, str]:
+    if partitioned_orders_enabled():
+        return ("northwind_insert_partitioned_order_detail", _INSERT_PARTITIONED_ORDER_DETAIL_SQL)
+    return ("northwind_insert_order_detail", _INSERT_ORDER_DETAIL_SQL)
+
+def _order_detail_params(detail: OrderDetailRecord, order_id: int | None = None) -> tuple:
+    return detail.to_insert_params(order_id, partitioned_orders_enabled())
+
+def _line_total_sql() -> str:
+    """
+    Valor líquido de um item: a coluna gravada (DB_ORDER_TOTALS=1, ver app/dao/order_totals.py) ou o cálculo
+    """
+    if order_totals_enabled():
+        # Itens ainda não calculados pelo backfill usam o cálculo
+        return "COALESCE(od.net_amount, od.quantity * od.unitprice * (1 - od.discount))"
+    return "od.quantity * od.unitprice * (1 - od.discount)"
+
+def _employee_sales_sql(period: str = "") -> str:
+    """
+    Consulta das vendas por funcionário no período (parâmetros início e fim), agrupadas também por
+    `period` (expressão sobre o.orderdate) quando informado: colunas employeeid, [period,]
+    total_orders e total_value. Com DB_ORDER_TOTALS=1, lê os totais gravados em orders, sem o join
+    com os itens; pedidos ainda não calculados pelo backfill (order_total NULL) somam os seus itens,
+    como nos relatórios de pedido.
+    """
+    period_column = f"{period} AS period, " if period else ""
+    group_by = "GROUP BY 1, 2" if period else "GROUP BY o.employeeid"
+    detail_filter = "od.orderid = o.orderid"
+    if partitioned_orders_enabled():
+        # O filtro repetido nos itens permite descartar também as partições de order_details
+        detail_filter += " AND od.orderdate = o.orderdate AND od.orderdate BETWEEN %s AND %s"
+
+    if order_totals_enabled():
+        # Os itens só são lidos para os pedidos sem total gravado
+        return f"""
+            SELECT o.employeeid, {period_column}COUNT(*) AS total_orders,
+                SUM(COALESCE(o.order_total, t.total_value)) AS total_value
+            FROM northwind.orders o
+            LEFT JOIN LATERAL (
+                SELECT COUNT(*) AS line_count, SUM(od.quantity * od.unitprice * (1 - od.discount)) AS total_value
+                FROM northwind.order_details od
+                WHERE {detail_filter} AND o.order_total IS NULL
+            ) t ON true
+            WHERE o.orderdate BETWEEN %s AND %s AND COALESCE(o.line_count, t.line_count) > 0
+            {group_by}"""
+
+    return f"""
+            SELECT o.employeeid, {period_column}COUNT(DISTINCT o.orderid) AS total_orders,
+                SUM(od.quantity * od.unitprice * (1 - od.discount)) AS total_value
+            FROM northwind.orders o
+            INNER JOIN northwind.order_details od ON {detail_filter}
+            WHERE o.orderdate BETWEEN %s AND %s
+            {group_by}"""
+
 def _find_next_order_id() -> int | None:
     """
     Busca o próximo ID para o pedido, visto que o ID não é auto incrementado no Banco de Dados
@@ -11,10 +122,10 @@ def _find_next_order_id() -> int | None:
     next_order_id = None
     
     try:
-        session = get_db_connection()
+        session = get_pooled_connection()
         if session:
             with session.cursor() as cursor:
-                cursor.execute("SELECT MAX(orderid) FROM northwind.orders")
+                execute_statement(cursor, "northwind_next_order_id", "SELECT MAX(orderid) FROM northwind.orders")
                 max_id_result = cursor.fetchone()
                 if max_id_result and max_id_result[0] is not None:
                     next_order_id = max_id_result[0] + 1
@@ -27,9 +138,10 @@ def _find_next_order_id() -> int | None:
         print(f"Error ao buscar próximo ID para o pedido: {e}")
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
     return next_order_id
 
+@with_statement_timeout("lookup")
 def find_customer_id_by_name(company_name: str) -> str | None:
     """
     Busca o ID de um cliente pelo nome da empresa
@@ -49,10 +161,10 @@ def find_customer_id_by_name(company_name: str) -> str | None:
         """
     
     try:
-        session = get_db_connection()
+        session = get_pooled_connection()
         if session:
             with session.cursor() as cursor:
-                cursor.execute(sql, (company_name,))
+                execute_statement(cursor, "northwind_find_customer_id", sql, (company_name,))
                 result = cursor.fetchone()
                 if result:
                     customer_id = result[0]
@@ -61,9 +173,10 @@ def find_customer_id_by_name(company_name: str) -> str | None:
         print(f"Error ao buscar customer_id de '{company_name}': {e}")
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
     return customer_id
 
+@with_statement_timeout("lookup")
 def find_employee_id_by_name(first_name: str, last_name: str) -> int | None:
     """
     Busca o ID de um funcionário pelo primeiro e último nome
@@ -84,10 +197,10 @@ def find_employee_id_by_name(first_name: str, last_name: str) -> int | None:
         """
     
     try:
-        session = get_db_connection()
+        session = get_pooled_connection()
         if session:
             with session.cursor() as cursor:
-                cursor.execute(sql, (first_name, last_name))
+                execute_statement(cursor, "northwind_find_employee_id", sql, (first_name, last_name))
                 result = cursor.fetchone()
                 if result:
                     employee_id = result[0]
@@ -96,9 +209,10 @@ def find_employee_id_by_name(first_name: str, last_name: str) -> int | None:
         print(f"Error ao buscar employee_id de '{first_name} {last_name}': {e}")
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
     return employee_id
 
+@with_statement_timeout("lookup")
 def find_product_id_and_price_by_name(name: str) -> tuple[int, float] | None:
     """
     Busca o ID e preço unitário de um produto pelo nome
@@ -118,10 +232,10 @@ def find_product_id_and_price_by_name(name: str) -> tuple[int, float] | None:
         """
     
     try:
-        session = get_db_connection()
+        session = get_pooled_connection()
         if session:
             with session.cursor() as cursor:
-                cursor.execute(sql, (name,))
+                execute_statement(cursor, "northwind_find_product", sql, (name,))
                 result = cursor.fetchone()
                 if result:
                     product_id = result[0]
@@ -132,15 +246,16 @@ def find_product_id_and_price_by_name(name: str) -> tuple[int, float] | None:
         print(f"Error ao buscar produto com nome '{name}': {e}")
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
     return result_data
 
-def insert_order(order: Orders) -> int | None:
+@with_statement_timeout("insert")
+def insert_order(order: OrderRecord) -> int | None:
     """
     Insere um novo pedido no banco
 
     Args:
-        order (Orders): Objeto Orders contendo os dados do pedido
+        order (OrderRecord): Registro com os dados do pedido (o orderid é ignorado)
 
     Returns:
         int | None: ID do pedido ou None se falhar
@@ -153,37 +268,14 @@ def insert_order(order: Orders) -> int | None:
         print("Erro ao buscar próximo ID para o pedido")
         return None
 
-    sql = """
-        INSERT INTO northwind.orders
-        (orderid, customerid, employeeid, orderdate, requireddate, shippeddate, shipperid, freight, shipname, shipaddress, shipcity, shipregion, shippostalcode, shipcountry)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-        """
-    
-    params = (
-        next_order_id,
-        order.customerid,
-        order.employeeid,
-        order.orderdate,
-        order.requireddate,
-        order.shippeddate,
-        order.shipperid,
-        order.freight,
-        order.shipname,
-        order.shipaddress,
-        order.shipcity,
-        order.shipregion,
-        order.shippostalcode,
-        order.shipcountry
-    )
+    params = order.to_insert_params(next_order_id)
 
     try:
-        session = get_db_connection()
+        session = get_pooled_connection()
         if session:
             with session.cursor() as cursor:
-                cursor.execute(sql, params)
+                execute_statement(cursor, "northwind_insert_order", _INSERT_ORDER_SQL, params)
             session.commit()
-            # Atualiza o objeto order com o ID gerado
-            order.orderid = next_order_id
     
     except psycopg2.Error as e:
         print(f"Error ao inserir pedido: {e}")
@@ -193,36 +285,25 @@ def insert_order(order: Orders) -> int | None:
 
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
     return next_order_id
 
-def insert_order_detail(detail: OrderDetails):
+@with_statement_timeout("insert")
+def insert_order_detail(detail: OrderDetailRecord):
     """
     Insere um item de pedido no banco
 
     Args:
-        detail (OrderDetails): Objeto OrderDetails contendo os dados do item
+        detail (OrderDetailRecord): Registro com os dados do item
     """
     session = None
-    sql = """
-        INSERT INTO northwind.order_details
-        (orderid, productid, unitprice, quantity, discount)
-        VALUES (%s, %s, %s, %s, %s);
-        """
-    
-    params = (
-        detail.orderid,
-        detail.productid,
-        detail.unitprice,
-        detail.quantity,
-        detail.discount
-    )
+    params = _order_detail_params(detail)
 
     try:
-        session = get_db_connection()
+        session = get_pooled_connection()
         if session:
             with session.cursor() as cursor:
-                cursor.execute(sql, params)
+                execute_statement(cursor, *_insert_order_detail_statement(), params)
             session.commit()
     
     except psycopg2.Error as e:
@@ -232,8 +313,118 @@ def insert_order_detail(detail: OrderDetails):
 
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
+
+def _reserve_stock(cursor, details: list[OrderDetailRecord]) -> list[int]:
+    """
+    Reserva o estoque dos itens de um pedido na transação do cursor.
+
+    Returns:
+        list[int]: IDs dos produtos sem estoque suficiente (vazia se a reserva foi feita). Nesse
+            caso, a transação (ou o savepoint) deve ser desfeita, pois os demais produtos já
+            foram atualizados
+    """
+    product_ids = [detail.productid for detail in details]
+    execute_statement(cursor, "northwind_reserve_stock", _RESERVE_STOCK_SQL,
+                      (product_ids, [detail.quantity for detail in details]))
+    reserved = {row[0] for row in cursor.fetchall()}
+    return sorted(set(product_ids) - reserved)
 
+@with_statement_timeout("insert")
+def insert_order_batch(
+    entries: list[tuple[OrderRecord, list[OrderDetailRecord]]]
+) -> list[int | str | OperationTimeoutError | OperationFailedError]:
+    """
+    Insere vários pedidos, cada um com seus itens, em uma única transação (um único commit).
+    Cada pedido é isolado por um SAVEPOINT: a falha de um pedido não descarta os demais.
+    Com a reserva de estoque ativa (DB_RESERVE_STOCK=1), cada pedido também desconta o estoque
+    dos seus produtos e falha se algum não tiver estoque suficiente.
+
+    Args:
+        entries (list[tuple[OrderRecord, list[OrderDetailRecord]]]): Pares (pedido, itens do pedido);
+            o orderid dos registros é ignorado
+
+    Returns:
+        list[int | str | OperationTimeoutError | OperationFailedError]: Para cada pedido, na mesma
+            ordem, o ID gerado, a mensagem de erro (estoque insuficiente), OperationTimeoutError se
+            um comando do pedido excedeu o tempo máximo ou OperationFailedError se ele falhou no
+            banco (os demais pedidos do lote são gravados normalmente)
+    """
+    session = None
+    results = []
+
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return [OperationFailedError("insert")] * len(entries)
+
+        with session.cursor() as cursor:
+            reserve_stock = stock_reservation_enabled()
+            if reserve_stock:
+                # Os produtos de todo o lote são bloqueados de uma vez, em ordem de productid: as
+                # reservas de cada pedido só atualizam linhas já bloqueadas, sem risco de deadlock
+                execute_statement(cursor, "northwind_lock_products",
+                                  "SELECT productid FROM northwind.products WHERE productid = ANY(%s) ORDER BY productid FOR UPDATE",
+                                  (sorted({detail.productid for _, details in entries for detail in details}),))
+
+            next_order_id = None
+            for order, details in entries:
+                # Uma nova tentativa cobre o caso de outro processo ter usado o mesmo ID
+                for attempt in range(2):
+                    cursor.execute("SAVEPOINT order_entry")
+                    try:
+                        if reserve_stock:
+                            missing = _reserve_stock(cursor, details)
+                            if missing:
+                                cursor.execute("ROLLBACK TO SAVEPOINT order_entry")
+                                results.append(
+                                    f"Estoque insuficiente para o(s) produto(s) com ID {', '.join(map(str, missing))}"
+                                )
+                                break
+
+                        if next_order_id is None:
+                            execute_statement(cursor, "northwind_next_order_id", "SELECT MAX(orderid) FROM northwind.orders")
+                            max_id = cursor.fetchone()[0]
+                            next_order_id = max_id + 1 if max_id is not None else 1
+
+                        execute_statement(cursor, "northwind_insert_order", _INSERT_ORDER_SQL, order.to_insert_params(next_order_id))
+                        for detail in details:
+                            execute_statement(cursor, *_insert_order_detail_statement(), _order_detail_params(detail, next_order_id))
+
+                        cursor.execute("RELEASE SAVEPOINT order_entry")
+                        results.append(next_order_id)
+                        next_order_id += 1
+                        break
+
+                    except psycopg2.Error as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT order_entry")
+                        next_order_id = None
+                        if isinstance(e, psycopg2.errors.QueryCanceled):
+                            results.append(OperationTimeoutError("insert", statement_timeout("insert")))
+                            break
+                        if not isinstance(e, psycopg2.errors.UniqueViolation) or attempt == 1:
+                            print(f"Error ao inserir pedido: {e}")
+                            results.append(OperationFailedError("insert"))
+                            break
+
+        session.commit()
+
+    except psycopg2.Error as e:
+        print(f"Error ao inserir lote de pedidos: {e}")
+        if session:
+            session.rollback()
+        if isinstance(e, psycopg2.errors.QueryCanceled):
+            # Nada foi gravado: o timeout vale para todos os pedidos do lote
+            return [OperationTimeoutError("insert", statement_timeout("insert"))] * len(entries)
+        return [OperationFailedError("insert")] * len(entries)
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return results
+
+@with_statement_timeout("report")
 def find_order_with_details(order_id: int) -> dict | None:
     """
     Busca todos os detalhes do pedido, incluindo informações do cliente, funcionário e itens
@@ -248,7 +439,7 @@ def find_order_with_details(order_id: int) -> dict | None:
     result = None
     
     try:
-        session = get_db_connection()
+        session = get_read_connection()
         if not session:
             return None
             
@@ -265,8 +456,21 @@ def find_order_with_details(order_id: int) -> dict | None:
             WHERE o.orderid = %s
             """
             
-            cursor.execute(sql, (order_id,))
+            totals = order_totals_enabled()
+            suffix = "_with_totals" if totals else ""
+            if totals:
+                # Total gravado no pedido, em vez da soma dos itens
+                sql = sql.replace("AS employee_name", "AS employee_name, o.order_total")
+            
+            execute_statement(cursor, f"northwind_order_header{suffix}", sql, (order_id,))
             header_row = cursor.fetchone()
+            archived = False
+            
+            if not header_row and order_archive_enabled():
+                # Pedidos antigos podem ter sido movidos para as tabelas de arquivo
+                execute_statement(cursor, f"northwind_archived_order_header{suffix}", _archived(sql), (order_id,))
+                header_row = cursor.fetchone()
+                archived = True
             
             if not header_row:
                 return None
@@ -279,30 +483,34 @@ def find_order_with_details(order_id: int) -> dict | None:
                 'items': []
             }
 
-            sql = """
+            sql = f"""
             SELECT 
                 p.productname AS product_name,
                 od.quantity,
-                od.unitprice,
-                od.discount
+                {_line_total_sql()} AS total_price
             FROM northwind.order_details od
             INNER JOIN northwind.products p ON od.productid = p.productid
             WHERE od.orderid = %s
             """
             
-            cursor.execute(sql, (order_id,))
+            if archived:
+                execute_statement(cursor, f"northwind_archived_order_items{suffix}", _archived(sql), (order_id,))
+            else:
+                execute_statement(cursor, f"northwind_order_items{suffix}", sql, (order_id,))
             items_rows = cursor.fetchall()
             
             for item in items_rows:
                 result['items'].append({
                     'product_name': item[0],
                     'quantity': item[1],
-                    'total_price': float(item[1] * item[2] * (1 - item[3])),
+                    'total_price': float(item[2]),
                 })
                 
-            # Calcular o total do pedido
-            total_order = sum(item['total_price'] for item in result['items'])
-            result['total_order'] = total_order
+            if totals and header_row[4] is not None:
+                result['total_order'] = float(header_row[4])
+            else:
+                # Calcular o total do pedido
+                result['total_order'] = sum(item['total_price'] for item in result['items'])
             
     except psycopg2.Error as e:
         print(f"Erro ao buscar detalhes do pedido {order_id}: {e}")
@@ -310,10 +518,139 @@ def find_order_with_details(order_id: int) -> dict | None:
         
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
             
     return result
 
+def _archived(sql: str) -> str:
+    """
+    Mesma consulta sobre as tabelas de pedidos arquivados (ver app/dao/archive.py)
+    """
+    return (
+        sql.replace("northwind.orders o", "northwind.orders_archive o")
+        .replace("northwind.order_details od", "northwind.order_details_archive od")
+    )
+
+def _fetch_orders_with_details(cursor, order_ids: list[int], start_date=None, end_date=None, archived: bool = False) -> dict:
+    """
+    Consultas de find_orders_with_details, nas tabelas de pedidos ou nas de arquivo
+    """
+    result = {}
+    totals = order_totals_enabled()
+    prefix = "northwind_archived" if archived else "northwind"
+    if totals:
+        prefix += "_with_totals"
+
+    sql = """
+    SELECT 
+        o.orderid,
+        o.orderdate,
+        c.companyname AS customer_name,
+        e.firstname || ' ' || e.lastname AS employee_name
+    FROM northwind.orders o
+    INNER JOIN northwind.customers c ON o.customerid = c.customerid
+    INNER JOIN northwind.employees e ON o.employeeid = e.employeeid
+    WHERE o.orderid = ANY(%s)
+    """
+    if totals:
+        # Total gravado no pedido, em vez da soma dos itens
+        sql = sql.replace("AS employee_name", "AS employee_name, o.order_total")
+    params = (list(order_ids),)
+    statement_name = f"{prefix}_order_headers"
+    if start_date is not None and end_date is not None:
+        sql += "AND o.orderdate BETWEEN %s AND %s"
+        params += (start_date, end_date)
+        statement_name = f"{prefix}_order_headers_by_period"
+
+    execute_statement(cursor, statement_name, _archived(sql) if archived else sql, params)
+    for header_row in cursor.fetchall():
+        result[header_row[0]] = {
+            'order_id': header_row[0],
+            'order_date': header_row[1],
+            'customer_name': header_row[2],
+            'employee_name': header_row[3],
+            'items': []
+        }
+        if totals and header_row[4] is not None:
+            result[header_row[0]]['total_order'] = float(header_row[4])
+
+    if not result:
+        return result
+
+    sql = f"""
+    SELECT 
+        od.orderid,
+        p.productname AS product_name,
+        od.quantity,
+        {_line_total_sql()} AS total_price
+    FROM northwind.order_details od
+    INNER JOIN northwind.products p ON od.productid = p.productid
+    WHERE od.orderid = ANY(%s)
+    """
+    params = (list(result),)
+    statement_name = f"{prefix}_orders_items"
+    if start_date is not None and end_date is not None and partitioned_orders_enabled() and not archived:
+        sql += "AND od.orderdate BETWEEN %s AND %s"
+        params += (start_date, end_date)
+        statement_name = f"{prefix}_orders_items_by_period"
+
+    execute_statement(cursor, statement_name, _archived(sql) if archived else sql, params)
+    for item in cursor.fetchall():
+        result[item[0]]['items'].append({
+            'product_name': item[1],
+            'quantity': item[2],
+            'total_price': float(item[3]),
+        })
+
+    for order in result.values():
+        if 'total_order' not in order:
+            # Calcular o total do pedido (pedidos ainda sem total gravado)
+            order['total_order'] = sum(item['total_price'] for item in order['items'])
+    return result
+
+@with_statement_timeout("report")
+def find_orders_with_details(order_ids: list[int], start_date=None, end_date=None) -> dict | None:
+    """
+    Busca vários pedidos com seus detalhes em duas consultas (cabeçalhos e itens), usando
+    `orderid = ANY(...)` em vez de uma ida ao banco por pedido. Com o arquivo ativo
+    (DB_ORDER_ARCHIVE=1), os pedidos não encontrados são procurados nas tabelas de arquivo.
+
+    Args:
+        order_ids (list[int]): IDs dos pedidos a serem pesquisados
+        start_date: Data de início do período dos pedidos, quando conhecida (inclusive)
+        end_date: Data de fim do período dos pedidos, quando conhecida (inclusive).
+            Com as tabelas particionadas, o período limita a busca às partições correspondentes
+
+    Returns:
+        dict | None: Dicionário {order_id: pedido} no mesmo formato de find_order_with_details
+            (pedidos não encontrados ficam fora do dicionário) ou None em caso de erro
+    """
+    session = None
+    result = None
+
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            result = _fetch_orders_with_details(cursor, order_ids, start_date, end_date)
+
+            missing = [order_id for order_id in order_ids if order_id not in result]
+            if missing and order_archive_enabled():
+                result.update(_fetch_orders_with_details(cursor, missing, start_date, end_date, archived=True))
+
+    except psycopg2.Error as e:
+        print(f"Erro ao buscar detalhes dos pedidos {list(order_ids)}: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return result
+
+@with_statement_timeout("ranking")
 def get_employee_sales_ranking(start_date, end_date) -> list | None:
     """
     Calcula o ranking de vendas dos funcionários em um período específico.
@@ -329,25 +666,45 @@ def get_employee_sales_ranking(start_date, end_date) -> list | None:
     result = None
     
     try:
-        session = get_db_connection()
+        session = get_read_connection()
         if not session:
             return None
             
         with session.cursor() as cursor:
-            sql = """
+            sales = _employee_sales_sql()
+            statement_name = "northwind_employee_ranking"
+            
+            if order_archive_enabled():
+                # Soma às vendas das tabelas ativas os agregados diários dos pedidos arquivados
+                sales += """
+                UNION ALL
+                SELECT employeeid, SUM(total_orders), SUM(total_value)
+                FROM northwind.employee_sales_archive
+                WHERE salesdate BETWEEN %s AND %s
+                GROUP BY employeeid"""
+                statement_name += "_with_archive"
+            
+            if order_totals_enabled():
+                statement_name += "_totals"
+            
+            if partitioned_orders_enabled():
+                statement_name += "_partitioned"
+            
+            sql = f"""
+            WITH sales AS ({sales}
+            )
             SELECT 
                 e.firstname || ' ' || e.lastname AS employee_name,
-                COUNT(DISTINCT o.orderid) AS total_orders,
-                ROUND(SUM(od.quantity * od.unitprice * (1 - od.discount))::numeric, 2) AS total_value
-            FROM northwind.employees e
-            INNER JOIN northwind.orders o ON e.employeeid = o.employeeid
-            INNER JOIN northwind.order_details od ON o.orderid = od.orderid
-            WHERE o.orderdate BETWEEN %s AND %s
+                SUM(s.total_orders)::int AS total_orders,
+                ROUND(SUM(s.total_value)::numeric, 2) AS total_value
+            FROM sales s
+            INNER JOIN northwind.employees e ON e.employeeid = s.employeeid
             GROUP BY e.employeeid, e.firstname, e.lastname
             ORDER BY total_value DESC
             """
             
-            cursor.execute(sql, (start_date, end_date))
+            # Todos os parâmetros da consulta são pares (início, fim) do período
+            execute_statement(cursor, statement_name, sql, (start_date, end_date) * (sql.count("%s") // 2))
             rows = cursor.fetchall()
             
             if not rows:
@@ -368,7 +725,516 @@ def get_employee_sales_ranking(start_date, end_date) -> list | None:
         
     finally:
         if session:
-            session.close()
+            release_pooled_connection(session)
             
     return result
-    
\ No newline at end of file
+    
+@with_statement_timeout("report")
+def find_order_ids_by_period(start_date, end_date) -> list | None:
+    """
+    Busca os IDs dos pedidos realizados em um período específico.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+
+    Returns:
+        list | None: Lista de IDs de pedidos ordenada ou None em caso de erro
+    """
+    session = None
+    result = None
+    sql = """
+        SELECT orderid
+        FROM northwind.orders
+        WHERE orderdate BETWEEN %s AND %s
+        ORDER BY orderid
+        """
+
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            execute_statement(cursor, "northwind_order_ids_by_period", sql, (start_date, end_date))
+            result = [row[0] for row in cursor.fetchall()]
+
+    except psycopg2.Error as e:
+        print(f"Erro ao buscar pedidos do período: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return result
+
+@with_statement_timeout("report")
+def list_orders(customer_id: str | None = None, employee_id: int | None = None, start_date=None, end_date=None,
+                after: tuple | None = None, limit: int = 50) -> list | None:
+    """
+    Lista resumos de pedidos filtrados por cliente, funcionário e/ou período em ordem de
+    (orderdate, orderid), paginados por keyset: a página seguinte começa depois do par
+    (orderdate, orderid) do último pedido da anterior, em vez de usar OFFSET. Com os índices de
+    app/dao/order_listing.py, cada página lê apenas as suas linhas, qualquer que seja a profundidade.
+    Pedidos sem orderdate não são listados.
+
+    Args:
+        customer_id (str | None): Filtra pelo cliente
+        employee_id (int | None): Filtra pelo funcionário
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+        after (tuple | None): (orderdate, orderid) do último pedido da página anterior
+        limit (int): Quantidade máxima de pedidos
+
+    Returns:
+        list | None: Lista de dicionários com 'order_id', 'order_date', 'customer_name', 'employee_name',
+            'ship_country', 'line_count' e 'total_order' ou None em caso de erro
+    """
+    session = None
+    result = None
+    totals = order_totals_enabled()
+    statement_name = "northwind_list_orders"
+
+    conditions = ["o.orderdate IS NOT NULL"]
+    params = []
+    if customer_id is not None:
+        conditions.append("o.customerid = %s")
+        params.append(customer_id)
+        statement_name += "_customer"
+    if employee_id is not None:
+        conditions.append("o.employeeid = %s")
+        params.append(employee_id)
+        statement_name += "_employee"
+    if start_date is not None:
+        conditions.append("o.orderdate >= %s")
+        params.append(start_date)
+        statement_name += "_from"
+    if end_date is not None:
+        conditions.append("o.orderdate <= %s")
+        params.append(end_date)
+        statement_name += "_to"
+    if after is not None:
+        # Comparação de linha: percorre o índice (..., orderdate, orderid) a partir do cursor
+        conditions.append("(o.orderdate, o.orderid) > (%s, %s)")
+        params.extend(after)
+        statement_name += "_after"
+
+    page = f"""
+        SELECT o.orderid, o.orderdate, o.customerid, o.employeeid, o.shipcountry{", o.line_count, o.order_total" if totals else ""}
+        FROM northwind.orders o
+        WHERE {" AND ".join(conditions)}
+        ORDER BY o.orderdate, o.orderid
+        LIMIT %s"""
+    sources = [page]
+    all_params = params + [limit]
+    if order_archive_enabled():
+        # Cada tabela devolve a sua página pelo próprio índice; a consulta externa junta as duas
+        sources.append(_archived(page))
+        all_params += params + [limit]
+        statement_name += "_with_archive"
+
+    if totals:
+        line_totals = "p.line_count, p.order_total"
+        lateral = ""
+        statement_name += "_totals"
+    else:
+        details = "SELECT quantity, unitprice, discount FROM northwind.order_details WHERE orderid = p.orderid"
+        if partitioned_orders_enabled():
+            # A data do pedido limita a busca dos itens a uma partição
+            details += " AND orderdate = p.orderdate"
+            statement_name += "_partitioned"
+        if order_archive_enabled():
+            details += """
+                UNION ALL
+                SELECT quantity, unitprice, discount FROM northwind.order_details_archive WHERE orderid = p.orderid"""
+        line_totals = "t.line_count, t.order_total"
+        lateral = f"""
+        LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS line_count, SUM(od.quantity * od.unitprice * (1 - od.discount)) AS order_total
+            FROM ({details}
+            ) od
+        ) t ON true"""
+
+    sql = f"""
+        WITH page AS ({" UNION ALL ".join(f"({source})" for source in sources)}
+        )
+        SELECT
+            p.orderid,
+            p.orderdate,
+            c.companyname AS customer_name,
+            e.firstname || ' ' || e.lastname AS employee_name,
+            p.shipcountry,
+            {line_totals}
+        FROM page p
+        LEFT JOIN northwind.customers c ON c.customerid = p.customerid
+        LEFT JOIN northwind.employees e ON e.employeeid = p.employeeid{lateral}
+        ORDER BY p.orderdate, p.orderid
+        LIMIT %s
+        """
+    all_params.append(limit)
+
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            execute_statement(cursor, statement_name, sql, tuple(all_params))
+            rows = cursor.fetchall()
+
+        result = []
+        for row in rows:
+            result.append({
+                'order_id': row[0],
+                'order_date': row[1],
+                'customer_name': row[2],
+                'employee_name': row[3],
+                'ship_country': row[4],
+                'line_count': row[5] or 0,
+                'total_order': float(row[6]) if row[6] is not None else 0.0
+            })
+
+    except psycopg2.Error as e:
+        print(f"Erro ao listar pedidos: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return result
+
+# Dimensões do resumo de vendas: (expressão exibida, colunas agrupadas, tabelas necessárias)
+_ROLLUP_DIMENSIONS = {
+    "employee": ("e.firstname || ' ' || e.lastname", "e.employeeid, e.firstname, e.lastname", ("e",)),
+    "customer": ("c.companyname", "c.customerid, c.companyname", ("c",)),
+    "product": ("p.productname", "p.productid, p.productname", ("p",)),
+    "category": ("cat.categoryname", "cat.categoryid, cat.categoryname", ("p", "cat")),
+    "ship_country": ("o.shipcountry", "o.shipcountry", ()),
+}
+
+_ROLLUP_JOINS = {
+    "e": "INNER JOIN northwind.employees e ON e.employeeid = o.employeeid",
+    "c": "INNER JOIN northwind.customers c ON c.customerid = o.customerid",
+    "p": "INNER JOIN northwind.products p ON p.productid = od.productid",
+    "cat": "INNER JOIN northwind.categories cat ON cat.categoryid = p.categoryid",
+}
+
+@with_statement_timeout("ranking")
+def get_sales_rollup(start_date, end_date, grouping_sets: list[tuple[str, ...]]) -> list | None:
+    """
+    Calcula o valor líquido e a quantidade de pedidos de um período agregados por vários
+    conjuntos de dimensões em uma única consulta (GROUPING SETS), lendo os itens uma só vez.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+        grouping_sets (list[tuple[str, ...]]): Conjuntos de dimensões (employee, customer, product,
+            category, ship_country); o conjunto vazio () produz o total geral
+
+    Returns:
+        list | None: Lista de dicionários com as dimensões agrupadas ('grouped_by'), o valor de cada
+            dimensão (None quando não agrupada), 'total_orders' e 'total_value', ou None em caso de erro
+    """
+    session = None
+    result = None
+    dimensions = [name for name in _ROLLUP_DIMENSIONS if any(name in grouping_set for grouping_set in grouping_sets)]
+
+    joins = []
+    for name in dimensions:
+        for alias in _ROLLUP_DIMENSIONS[name][2]:
+            if _ROLLUP_JOINS[alias] not in joins:
+                joins.append(_ROLLUP_JOINS[alias])
+
+    columns = [f"{_ROLLUP_DIMENSIONS[name][0]} AS {name}" for name in dimensions]
+    flags = [f"GROUPING({_ROLLUP_DIMENSIONS[name][1].split(',')[0]}) AS {name}_grouping" for name in dimensions]
+    sets = [
+        "(" + ", ".join(_ROLLUP_DIMENSIONS[name][1] for name in grouping_set) + ")"
+        for grouping_set in grouping_sets
+    ]
+
+    orders_source = "northwind.orders"
+    details_source = "northwind.order_details"
+    join_condition = "o.orderid = od.orderid"
+    params = (start_date, end_date)
+    if order_archive_enabled():
+        # Inclui os pedidos arquivados, que saíram das tabelas ativas
+        orders_source = """(
+            SELECT orderid, customerid, employeeid, orderdate, shipcountry FROM northwind.orders
+            UNION ALL
+            SELECT orderid, customerid, employeeid, orderdate, shipcountry FROM northwind.orders_archive
+        )"""
+        details_source = """(
+            SELECT orderid, productid, unitprice, quantity, discount FROM northwind.order_details
+            UNION ALL
+            SELECT orderid, productid, unitprice, quantity, discount FROM northwind.order_details_archive
+        )"""
+    elif partitioned_orders_enabled():
+        # O filtro repetido nos itens permite descartar também as partições de order_details
+        join_condition += " AND o.orderdate = od.orderdate AND od.orderdate BETWEEN %s AND %s"
+        params = (start_date, end_date, start_date, end_date)
+
+    sql = f"""
+        SELECT
+            {"".join(column + ", " for column in columns + flags)}
+            COUNT(DISTINCT o.orderid) AS total_orders,
+            ROUND(SUM(od.quantity * od.unitprice * (1 - od.discount))::numeric, 2) AS total_value
+        FROM {orders_source} o
+        INNER JOIN {details_source} od ON {join_condition}
+        {" ".join(joins)}
+        WHERE o.orderdate BETWEEN %s AND %s
+        GROUP BY GROUPING SETS ({", ".join(sets)})
+        ORDER BY {"".join(flag.split(" AS ")[1] + ", " for flag in flags)}total_value DESC
+        """
+
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            # Consulta montada conforme as dimensões pedidas: executada sem prepared statement
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        result = []
+        for row in rows:
+            values = row[:len(dimensions)]
+            grouping = row[len(dimensions):2 * len(dimensions)]
+            entry = {'grouped_by': [name for name, flag in zip(dimensions, grouping) if flag == 0]}
+            entry.update(zip(dimensions, values))
+            entry['total_orders'] = row[-2]
+            entry['total_value'] = float(row[-1]) if row[-1] is not None else 0.0
+            result.append(entry)
+
+    except psycopg2.Error as e:
+        print(f"Erro ao calcular resumo de vendas: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return result
+
+# Unidades aceitas por date_trunc para os períodos da tendência de vendas
+_TREND_BUCKETS = ("day", "week", "month")
+
+# Filtro do resumo diário (employee_sales_daily) com o arquivo ativo: até o próximo REFRESH, o resumo
+# ainda contém os pedidos movidos para o arquivo, que já são somados pelos agregados de
+# employee_sales_archive, então os dias arquivados ficam de fora
+_SUMMARY_AFTER_ARCHIVE_SQL = """
+              AND salesdate > (SELECT COALESCE(MAX(salesdate), DATE '-infinity') FROM northwind.employee_sales_archive)"""
+
+@with_statement_timeout("ranking")
+def get_employee_sales_trend(start_date, end_date, bucket: str = "month", window: int = 3, use_summary: bool = False) -> list | None:
+    """
+    Calcula, em uma única consulta, as vendas de cada funcionário por período (dia, semana ou mês)
+    com o total acumulado e a média móvel das últimas `window` janelas (funções de janela no servidor).
+    Períodos sem vendas entram com valor zero, para que acumulado e média móvel sigam o calendário.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+        bucket (str): Granularidade dos períodos: day, week ou month
+        window (int): Quantidade de períodos da média móvel
+        use_summary (bool): Lê o resumo diário pré-agregado (northwind.employee_sales_daily)
+            em vez dos itens de pedido
+
+    Returns:
+        list | None: Lista de dicionários ordenada por funcionário e período com 'employee_name',
+            'period', 'total_orders', 'total_value', 'running_total' e 'moving_average',
+            ou None em caso de erro
+    """
+    session = None
+    result = None
+
+    if bucket not in _TREND_BUCKETS or window < 1:
+        print(f"Erro ao calcular tendência de vendas: período '{bucket}' ou janela {window} inválidos")
+        return None
+
+    if use_summary:
+        sales = f"""
+            SELECT employeeid, date_trunc('{bucket}', salesdate)::date AS period,
+                SUM(total_orders) AS total_orders, SUM(total_value) AS total_value
+            FROM northwind.employee_sales_daily
+            WHERE salesdate BETWEEN %s AND %s{_SUMMARY_AFTER_ARCHIVE_SQL if order_archive_enabled() else ""}
+            GROUP BY 1, 2"""
+    else:
+        sales = _employee_sales_sql(f"date_trunc('{bucket}', o.orderdate)::date")
+
+    if order_archive_enabled():
+        # Soma os agregados diários dos pedidos arquivados
+        sales += f"""
+            UNION ALL
+            SELECT employeeid, date_trunc('{bucket}', salesdate)::date,
+                SUM(total_orders), SUM(total_value)
+            FROM northwind.employee_sales_archive
+            WHERE salesdate BETWEEN %s AND %s
+            GROUP BY 1, 2"""
+
+    sql = f"""
+        WITH sales AS ({sales}
+        ),
+        buckets AS (
+            SELECT employeeid, period, SUM(total_orders) AS total_orders, SUM(total_value) AS total_value
+            FROM sales
+            GROUP BY employeeid, period
+        ),
+        periods AS (
+            SELECT generate_series(
+                date_trunc('{bucket}', %s::timestamp), %s::timestamp, interval '1 {bucket}'
+            )::date AS period
+        ),
+        sellers AS (
+            SELECT DISTINCT employeeid FROM buckets
+        )
+        SELECT
+            e.firstname || ' ' || e.lastname AS employee_name,
+            p.period,
+            COALESCE(b.total_orders, 0)::int AS total_orders,
+            ROUND(COALESCE(b.total_value, 0)::numeric, 2) AS total_value,
+            ROUND((SUM(COALESCE(b.total_value, 0)) OVER running)::numeric, 2) AS running_total,
+            ROUND((AVG(COALESCE(b.total_value, 0)) OVER moving)::numeric, 2) AS moving_average
+        FROM sellers s
+        CROSS JOIN periods p
+        INNER JOIN northwind.employees e ON e.employeeid = s.employeeid
+        LEFT JOIN buckets b ON b.employeeid = s.employeeid AND b.period = p.period
+        WINDOW
+            running AS (PARTITION BY s.employeeid ORDER BY p.period),
+            moving AS (PARTITION BY s.employeeid ORDER BY p.period ROWS BETWEEN %s PRECEDING AND CURRENT ROW)
+        ORDER BY employee_name, p.period
+        """
+
+    statement_name = f"northwind_sales_trend_{bucket}"
+    if use_summary:
+        statement_name += "_summary"
+    if order_archive_enabled():
+        statement_name += "_with_archive"
+    if order_totals_enabled() and not use_summary:
+        statement_name += "_totals"
+    if partitioned_orders_enabled() and not use_summary:
+        statement_name += "_partitioned"
+
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            # Os parâmetros são pares (início, fim) do período e, por último, o tamanho da janela
+            # (um parâmetro, e não parte do texto, para não preparar um statement por tamanho)
+            params = (start_date, end_date) * ((sql.count("%s") - 1) // 2) + (window - 1,)
+            execute_statement(cursor, statement_name, sql, params)
+            rows = cursor.fetchall()
+
+        result = []
+        for row in rows:
+            result.append({
+                'employee_name': row[0],
+                'period': row[1],
+                'total_orders': row[2],
+                'total_value': float(row[3]),
+                'running_total': float(row[4]),
+                'moving_average': float(row[5])
+            })
+
+    except psycopg2.Error as e:
+        print(f"Erro ao calcular tendência de vendas: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return result
+
+@with_statement_timeout("ranking")
+def get_team_sales_ranking(start_date, end_date) -> list | None:
+    """
+    Calcula o ranking de vendas por equipe: as vendas de cada funcionário somadas às de todos os
+    seus subordinados diretos e indiretos (employees.reportsto), lidas da closure table
+    northwind.employee_closure (ver app/dao/employee_hierarchy.py).
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+
+    Returns:
+        list | None: Lista de dicionários com 'employee_name', 'team_size' (subordinados),
+            'team_orders', 'team_value' e 'own_value', ordenada por team_value,
+            ou None em caso de erro
+    """
+    session = None
+    result = None
+
+    sales = _employee_sales_sql()
+
+    if order_archive_enabled():
+        # Soma os agregados diários dos pedidos arquivados
+        sales += """
+        UNION ALL
+        SELECT employeeid, SUM(total_orders), SUM(total_value)
+        FROM northwind.employee_sales_archive
+        WHERE salesdate BETWEEN %s AND %s
+        GROUP BY employeeid"""
+
+    sql = f"""
+        WITH sales AS ({sales}
+        ),
+        employee_sales AS (
+            SELECT employeeid, SUM(total_orders) AS total_orders, SUM(total_value) AS total_value
+            FROM sales
+            GROUP BY employeeid
+        )
+        SELECT
+            e.firstname || ' ' || e.lastname AS employee_name,
+            COUNT(*) - 1 AS team_size,
+            COALESCE(SUM(s.total_orders), 0)::int AS team_orders,
+            ROUND(COALESCE(SUM(s.total_value), 0)::numeric, 2) AS team_value,
+            ROUND(COALESCE(SUM(s.total_value) FILTER (WHERE c.depth = 0), 0)::numeric, 2) AS own_value
+        FROM northwind.employee_closure c
+        INNER JOIN northwind.employees e ON e.employeeid = c.ancestorid
+        LEFT JOIN employee_sales s ON s.employeeid = c.descendantid
+        GROUP BY e.employeeid, e.firstname, e.lastname
+        ORDER BY team_value DESC
+        """
+
+    statement_name = "northwind_team_ranking"
+    if order_archive_enabled():
+        statement_name += "_with_archive"
+    if order_totals_enabled():
+        statement_name += "_totals"
+    if partitioned_orders_enabled():
+        statement_name += "_partitioned"
+
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            # Todos os parâmetros da consulta são pares (início, fim) do período
+            execute_statement(cursor, statement_name, sql, (start_date, end_date) * (sql.count("%s") // 2))
+            rows = cursor.fetchall()
+
+        result = []
+        for row in rows:
+            result.append({
+                'employee_name': row[0],
+                'team_size': row[1],
+                'team_orders': row[2],
+                'team_value': float(row[3]),
+                'own_value': float(row[4])
+            })
+
+    except psycopg2.Error as e:
+        print(f"Erro ao calcular ranking de vendas por equipe: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    return result
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+import psycopg2
+from app.dao.base_dao import get_read_connection, release_pooled_connection, execute_statement
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional: sem NumPy as cotações são calculadas item a item
+    np = None
+
+# Cotação de cestas de produtos sem gravar no banco. A tabela de preços (northwind.products) é
+# carregada uma vez por processo e recarregada a cada QUOTE_PRICE_LIST_TTL segundos; os nomes são
+# resolvidos por um dicionário (nome exato, como em find_product_id_and_price_by_name) e os itens
+# de todas as cestas são calculados de uma vez, em colunas: valor do item igual ao de
+# find_order_with_details (quantity * unitprice * (1 - discount)) e total da cesta pela soma dos
+# itens agrupada por cesta (np.bincount).
+
+class PriceList:
+    """
+    Tabela de preços em memória.
+
+    Args:
+        rows (list[tuple]): Linhas (productid, productname, unitprice)
+    """
+    def __init__(self, rows: list[tuple]):
+        self.product_ids = [row[0] for row in rows]
+        self.unit_prices = [float(row[2]) if row[2] is not None else 0.0 for row in rows]
+        self.positions = {row[1]: position for position, row in enumerate(rows)}
+        if np is not None:
+            self.price_array = np.asarray(self.unit_prices, dtype="float64")
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def quote_lines(self, basket_ids: list[int], product_names: list[str], quantities: list, discounts: list,
+                    basket_count: int) -> tuple[list[float], list[float], list[int]]:
+        """
+        Cota em colunas os itens de várias cestas: cada posição das listas é um item.
+
+        Args:
+            basket_ids (list[int]): Cesta de cada item (0 a basket_count - 1)
+            product_names (list[str]): Nome do produto de cada item
+            quantities (list): Quantidade de cada item
+            discounts (list): Desconto de cada item (0.1 para 10%)
+            basket_count (int): Quantidade de cestas
+
+        Returns:
+            tuple[list[float], list[float], list[int]]: Valor de cada item, total de cada cesta e
+                posições dos itens com produto desconhecido (que entram com valor zero)
+        """
+        positions = [self.positions.get(name, -1) for name in product_names]
+
+        if np is None:
+            line_totals = [
+                self.unit_prices[position] * quantity * (1 - discount) if position >= 0 else 0.0
+                for position, quantity, discount in zip(positions, quantities, discounts)
+            ]
+            basket_totals = [0.0] * basket_count
+            for basket_id, line_total in zip(basket_ids, line_totals):
+                basket_totals[basket_id] += line_total
+            return line_totals, basket_totals, [line for line, position in enumerate(positions) if position < 0]
+
+        positions = np.asarray(positions, dtype="int64")
+        known = positions >= 0
+        prices = np.where(known, self.price_array[np.where(known, positions, 0)], 0.0) if len(self) else np.zeros(len(positions))
+        line_totals = prices * np.asarray(quantities, dtype="float64") * (1 - np.asarray(discounts, dtype="float64"))
+        basket_totals = np.bincount(np.asarray(basket_ids, dtype="int64"), weights=line_totals, minlength=basket_count)
+        return line_totals.tolist(), basket_totals.tolist(), np.flatnonzero(~known).tolist()
+
+_price_list = None
+_price_list_loaded_at = 0.0
+_price_list_lock = threading.Lock()
+
+def _price_list_ttl() -> float:
+    return float(os.getenv("QUOTE_PRICE_LIST_TTL", "300"))
+
+def refresh_price_list() -> PriceList | None:
+    """
+    Carrega a tabela de preços do banco, substituindo a atual.
+
+    Returns:
+        PriceList | None: Tabela carregada ou None em caso de erro
+    """
+    global _price_list, _price_list_loaded_at
+
+    session = None
+    try:
+        session = get_read_connection()
+        if not session:
+            return None
+
+        with session.cursor() as cursor:
+            execute_statement(cursor, "northwind_quote_price_list",
+                              "SELECT productid, productname, unitprice FROM northwind.products")
+            rows = cursor.fetchall()
+
+    except psycopg2.Error as e:
+        print(f"Erro ao carregar a tabela de preços: {e}")
+        return None
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+    with _price_list_lock:
+        _price_list = PriceList(rows)
+        _price_list_loaded_at = time.monotonic()
+        return _price_list
+
+def _get_price_list() -> PriceList | None:
+    if _price_list is None or time.monotonic() - _price_list_loaded_at > _price_list_ttl():
+        return refresh_price_list()
+    return _price_list
+
+def quote_baskets(baskets: list[list[dict]]) -> list | None:
+    """
+    Calcula o valor dos itens e o total de várias cestas de produtos sem gravar no banco.
+
+    Args:
+        baskets (list[list[dict]]): Cestas, cada uma uma lista de itens no formato da criação de
+            pedidos: {'product_name': ..., 'quantity': 1, 'discount': 0.0}
+
+    Returns:
+        list | None: Um dicionário por cesta, na mesma ordem, com 'total_order', 'line_totals'
+            (valor de cada item) e 'unknown_products' (nomes não encontrados, que entram com
+            valor zero), ou None em caso de erro
+    """
+    price_list = _get_price_list()
+    if price_list is None:
+        return None
+
+    basket_ids = []
+    product_names = []
+    quantities = []
+    discounts = []
+    try:
+        for basket_id, items in enumerate(baskets):
+            for item in items:
+                basket_ids.append(basket_id)
+                product_names.append(item.get('product_name'))
+                quantities.append(item.get('quantity', 1))
+                discounts.append(item.get('discount', 0.0))
+
+        line_totals, basket_totals, unknown_lines = price_list.quote_lines(
+            basket_ids, product_names, quantities, discounts, len(baskets)
+        )
+
+    except (AttributeError, TypeError, ValueError) as e:
+        print(f"Erro ao cotar as cestas: {e}")
+        return None
+
+    unknown_products = {}
+    for line in unknown_lines:
+        unknown_products.setdefault(basket_ids[line], []).append(product_names[line])
+
+    result = []
+    offset = 0
+    for basket_id, items in enumerate(baskets):
+        result.append({
+            'total_order': basket_totals[basket_id],
+            'line_totals': line_totals[offset:offset + len(items)],
+            'unknown_products': unknown_products.get(basket_id, [])
+        })
+        offset += len(items)
+    return result
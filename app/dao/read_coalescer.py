@@ -0,0 +1,143 @@
+from app.dao.base_dao import OperationTimeoutError, reads_go_to_primary, set_primary_reads, reset_primary_reads
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+import threading
+
+class OrderLoadError(Exception):
+    """
+    Falha da busca agrupada de pedidos (erro do banco), repassada a todas as buscas do lote
+    """
+
+
+class SingleFlight:
+    """
+    Compartilha a execução de leituras idênticas em andamento: enquanto uma chamada
+    para uma chave está no banco, as chamadas concorrentes com a mesma chave aguardam
+    e recebem o mesmo resultado, em vez de repetir a consulta.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Executa `function` uma única vez para as chamadas concorrentes com a mesma `key`.
+
+        Args:
+            key (Hashable): Identificador da leitura (por exemplo, os parâmetros da consulta)
+            function (Callable[[], Any]): Leitura a ser executada
+
+        Returns:
+            Any: Resultado de `function`, compartilhado entre as chamadas concorrentes
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+
+class OrderReportLoader:
+    """
+    Agrupa buscas de pedidos por ID (estilo dataloader): os IDs pedidos dentro de uma
+    janela curta são buscados juntos por `batch_function` em uma única consulta
+    `IN (...)`, e pedidos repetidos, na janela ou já em andamento, compartilham o resultado.
+
+    Os dicionários devolvidos são compartilhados entre as chamadas e não devem ser alterados.
+
+    O lote é consultado no contexto de quem o conduz; se qualquer busca do lote vem de um
+    cliente que gravou há pouco (read-your-writes), o lote inteiro é lido do primário.
+    """
+    def __init__(self, batch_function: Callable[[list[int]], dict | None],
+                 window_ms: float = 2.0, max_batch_size: int = 100):
+        self._batch_function = batch_function
+        self._window = window_ms / 1000
+        self._max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: dict[int, Future] = {}
+        self._pending_primary = False
+        self._in_flight: dict[int, Future] = {}
+        self._batch_full = threading.Event()
+
+    def load(self, order_id: int) -> dict | None:
+        """
+        Busca um pedido, agrupando-o com as buscas concorrentes.
+
+        Args:
+            order_id (int): ID do pedido
+
+        Returns:
+            dict | None: Pedido no formato de find_order_with_details ou None se não encontrado
+
+        Raises:
+            OperationTimeoutError: A consulta do lote excedeu o tempo máximo
+            OrderLoadError: A consulta do lote falhou
+        """
+        primary = reads_go_to_primary()
+        with self._lock:
+            future = self._pending.get(order_id)
+            if future is None and not primary:
+                # Um lote em andamento pode ter sido lido de uma réplica: quem gravou há pouco não o aproveita
+                future = self._in_flight.get(order_id)
+            if future is not None:
+                leader = False
+            else:
+                # A primeira busca de uma janela vazia conduz o lote
+                leader = not self._pending
+                future = Future()
+                self._pending[order_id] = future
+                if len(self._pending) >= self._max_batch_size:
+                    self._batch_full.set()
+            self._pending_primary = self._pending_primary or primary
+
+        if leader:
+            self._batch_full.wait(self._window)
+            self._dispatch()
+
+        return future.result()
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            primary, self._pending_primary = self._pending_primary, False
+            self._batch_full.clear()
+            self._in_flight.update(batch)
+
+        error = None
+        token = set_primary_reads(True) if primary else None
+        try:
+            results = self._batch_function(list(batch))
+            if results is None:
+                error = OrderLoadError("Erro ao buscar os pedidos no banco de dados")
+        except OperationTimeoutError as e:
+            # O timeout é repassado a todas as buscas do lote, para que o controlador o identifique
+            error = e
+        except Exception as e:
+            error = OrderLoadError(f"Erro ao buscar os pedidos: {e}")
+        finally:
+            if token is not None:
+                reset_primary_reads(token)
+
+        with self._lock:
+            for order_id, future in batch.items():
+                if self._in_flight.get(order_id) is future:
+                    del self._in_flight[order_id]
+
+        for order_id, future in batch.items():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(order_id))
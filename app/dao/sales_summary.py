@@ -0,0 +1,76 @@
+import psycopg2
+from app.dao.base_dao import get_pooled_connection, release_pooled_connection
+
+# Resumo pré-agregado das vendas por funcionário e dia (materialized view), usado opcionalmente pelo
+# relatório de tendência: agrupar dias em semanas/meses lê uma linha por funcionário e dia em vez de
+# todos os itens de pedido. O resumo reflete os pedidos até o último refresh.
+
+def create_sales_summary() -> bool:
+    """
+    Cria a materialized view northwind.employee_sales_daily, se ainda não existir
+
+    Returns:
+        bool: True se a view existe ao final
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            cursor.execute("""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS northwind.employee_sales_daily AS
+                SELECT
+                    o.employeeid,
+                    o.orderdate::date AS salesdate,
+                    COUNT(DISTINCT o.orderid)::integer AS total_orders,
+                    SUM(od.quantity * od.unitprice * (1 - od.discount))::numeric AS total_value
+                FROM northwind.orders o
+                INNER JOIN northwind.order_details od ON o.orderid = od.orderid
+                GROUP BY o.employeeid, o.orderdate::date;
+
+                -- Índice único exigido pelo REFRESH ... CONCURRENTLY
+                CREATE UNIQUE INDEX IF NOT EXISTS employee_sales_daily_pkey
+                    ON northwind.employee_sales_daily (employeeid, salesdate);
+                """)
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao criar o resumo de vendas: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def refresh_sales_summary() -> bool:
+    """
+    Recalcula northwind.employee_sales_daily sem bloquear as leituras do resumo
+
+    Returns:
+        bool: True se o resumo foi atualizado
+    """
+    session = None
+    try:
+        session = get_pooled_connection()
+        if not session:
+            return False
+
+        with session.cursor() as cursor:
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY northwind.employee_sales_daily")
+        session.commit()
+        return True
+
+    except psycopg2.Error as e:
+        print(f"Erro ao atualizar o resumo de vendas: {e}")
+        if session:
+            session.rollback()
+        return False
+
+    finally:
+        if session:
+            release_pooled_connection(session)
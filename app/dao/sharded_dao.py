@@ -0,0 +1,549 @@
+import psycopg2
+import psycopg2.errors
+from app.dao.base_dao import (
+    get_pooled_connection,
+    get_shard_connection,
+    get_shard_count,
+    release_pooled_connection,
+    execute_statement,
+    partitioned_orders_enabled
+)
+from app.model.psycopg_model import OrderRecord, OrderDetailRecord
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import threading
+import zlib
+
+# Modo particionado (sharding): os pedidos e seus itens ficam no banco escolhido pelo hash
+# do customerid, e os IDs de pedido de cada shard pertencem à classe `orderid % N == shard`,
+# o que os mantém únicos entre os bancos e permite achar o shard de um pedido pelo próprio ID.
+# Os IDs vêm de uma sequência em cada shard (início no primeiro ID da classe acima do maior ID
+# de todos os shards, incremento N), e não do MAX(orderid) do próprio shard.
+# As tabelas de referência (clientes, funcionários, produtos...) são replicadas em todos os shards.
+
+# Ordem de cópia das tabelas de referência e suas chaves primárias
+_REFERENCE_TABLES = {
+    "categories": "categoryid",
+    "suppliers": "supplierid",
+    "shippers": "shipperid",
+    "customers": "customerid",
+    "employees": "employeeid",
+    "products": "productid",
+}
+
+_INSERT_ORDER_SQL = """
+    INSERT INTO northwind.orders
+    (orderid, customerid, employeeid, orderdate, requireddate, shippeddate, shipperid, freight, shipname, shipaddress, shipcity, shipregion, shippostalcode, shipcountry)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+    """
+
+_INSERT_ORDER_DETAIL_SQL = """
+    INSERT INTO northwind.order_details
+    (orderid, productid, unitprice, quantity, discount)
+    VALUES (%s, %s, %s, %s, %s);
+    """
+
+# Com as tabelas particionadas, os itens guardam a data do pedido (chave de partição)
+_INSERT_PARTITIONED_ORDER_DETAIL_SQL = """
+    INSERT INTO northwind.order_details
+    (orderid, productid, unitprice, quantity, discount, orderdate)
+    VALUES (%s, %s, %s, %s, %s, %s);
+    """
+
+_ORDER_ID_SEQUENCE = "northwind.shard_order_id_seq"
+
+# Shards cuja sequência de IDs já foi criada (ou encontrada) por este processo
+_order_sequences_ready = set()
+
+_reference_counter = itertools.count()
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(get_shard_count(), 1), thread_name_prefix="shard-query")
+    return _executor
+
+def _shard_count() -> int:
+    shard_count = get_shard_count()
+    if not shard_count:
+        raise psycopg2.OperationalError("Nenhum shard configurado em DB_SHARD_HOSTS")
+    return shard_count
+
+def shard_for_customer(customer_id: str) -> int:
+    """
+    Shard onde ficam os pedidos do cliente (hash estável do customerid)
+    """
+    return zlib.crc32(customer_id.strip().encode("utf-8")) % _shard_count()
+
+def shard_for_order(order_id: int) -> int:
+    """
+    Shard onde o pedido foi gravado, derivado do próprio ID
+    """
+    return order_id % _shard_count()
+
+def _fetch(shard: int, name: str, sql: str, params: tuple, many: bool = False):
+    """
+    Executa uma consulta em um shard e devolve uma linha (ou todas, com many=True).
+    Lança psycopg2.Error em caso de falha.
+    """
+    session = get_shard_connection(shard)
+    if not session:
+        raise psycopg2.OperationalError(f"Sem conexão com o shard {shard}")
+    try:
+        with session.cursor() as cursor:
+            execute_statement(cursor, name, sql, params)
+            return cursor.fetchall() if many else cursor.fetchone()
+    finally:
+        release_pooled_connection(session)
+
+def _scatter(function, shards) -> list:
+    """
+    Executa function(shard) em paralelo nos shards informados e devolve os resultados na mesma ordem
+    """
+    return list(_get_executor().map(function, shards))
+
+def _reference_shard() -> int:
+    # As tabelas de referência existem em todos os shards; as buscas são distribuídas entre eles
+    return next(_reference_counter) % _shard_count()
+
+def find_customer_id_by_name(company_name: str) -> str | None:
+    """
+    Busca o ID de um cliente pelo nome da empresa
+
+    Args:
+        company_name (str): Nome da empresa do cliente
+
+    Returns:
+        str | None: ID do cliente ou None se não encontrado
+    """
+    sql = """
+        SELECT customerid
+        FROM northwind.customers
+        WHERE companyname = %s
+        """
+
+    try:
+        row = _fetch(_reference_shard(), "northwind_find_customer_id", sql, (company_name,))
+        return row[0] if row else None
+
+    except psycopg2.Error as e:
+        print(f"Error ao buscar customer_id de '{company_name}': {e}")
+        return None
+
+def find_employee_id_by_name(first_name: str, last_name: str) -> int | None:
+    """
+    Busca o ID de um funcionário pelo primeiro e último nome
+
+    Args:
+        first_name (str): Primeiro nome do funcionário
+        last_name (str): Sobrenome do funcionário
+
+    Returns:
+        int | None: ID do funcionário ou None se não encontrado
+    """
+    sql = """
+        SELECT employeeid
+        FROM northwind.employees
+        WHERE firstname = %s AND lastname = %s
+        """
+
+    try:
+        row = _fetch(_reference_shard(), "northwind_find_employee_id", sql, (first_name, last_name))
+        return row[0] if row else None
+
+    except psycopg2.Error as e:
+        print(f"Error ao buscar employee_id de '{first_name} {last_name}': {e}")
+        return None
+
+def find_product_id_and_price_by_name(name: str) -> tuple[int, float] | None:
+    """
+    Busca o ID e preço unitário de um produto pelo nome
+
+    Args:
+        name (str): Nome do produto
+
+    Returns:
+        tuple[int, float] | None: Tupla contendo (productid, unitprice) ou None se não encontrado
+    """
+    sql = """
+        SELECT productid, unitprice
+        FROM northwind.products
+        WHERE productname = %s
+        """
+
+    try:
+        row = _fetch(_reference_shard(), "northwind_find_product", sql, (name,))
+        if not row:
+            return None
+        return (row[0], float(row[1]) if row[1] is not None else 0.0)
+
+    except psycopg2.Error as e:
+        print(f"Error ao buscar produto com nome '{name}': {e}")
+        return None
+
+def _global_max_order_id() -> int:
+    """
+    Maior ID de pedido entre todos os shards (0 sem pedidos). Lança psycopg2.Error em caso de falha.
+    """
+    rows = _scatter(
+        lambda shard: _fetch(shard, "shard_max_order_id", "SELECT MAX(orderid) FROM northwind.orders", ()),
+        range(_shard_count())
+    )
+    return max((row[0] or 0 for row in rows), default=0)
+
+def _next_order_id(session, shard: int, shard_count: int, advance: bool = False) -> int:
+    """
+    Próximo ID de pedido do shard, da sequência do shard (criada no primeiro uso, com início no
+    primeiro ID da classe do shard acima do maior ID de todos os shards e incremento N).
+    Com advance=True, a sequência é adiantada para além do maior ID atual: um ID dela já estava
+    em uso (pedido migrado ou gravado sem a sequência).
+    """
+    with session.cursor() as cursor:
+        if advance or shard not in _order_sequences_ready:
+            base_id = _global_max_order_id() + 1
+            # Menor ID maior que o atual com orderid % N == shard
+            start = base_id + (shard - base_id) % shard_count
+            cursor.execute(
+                f"CREATE SEQUENCE IF NOT EXISTS {_ORDER_ID_SEQUENCE} INCREMENT BY {shard_count} MINVALUE 0 START WITH {start}"
+            )
+            if advance:
+                cursor.execute(
+                    f"SELECT setval('{_ORDER_ID_SEQUENCE}', %s, false) FROM {_ORDER_ID_SEQUENCE} WHERE last_value < %s",
+                    (start, start)
+                )
+            # A sequência é gravada antes do pedido, para não ser desfeita junto com ele
+            session.commit()
+            _order_sequences_ready.add(shard)
+
+        execute_statement(cursor, "shard_next_order_id", f"SELECT nextval('{_ORDER_ID_SEQUENCE}')")
+        return cursor.fetchone()[0]
+
+def _order_detail_statement() -> tuple[str, str]:
+    if partitioned_orders_enabled():
+        return ("shard_insert_partitioned_order_detail", _INSERT_PARTITIONED_ORDER_DETAIL_SQL)
+    return ("shard_insert_order_detail", _INSERT_ORDER_DETAIL_SQL)
+
+def insert_order_with_details(order: OrderRecord, details: list[OrderDetailRecord]) -> int | str:
+    """
+    Insere um pedido e seus itens no shard do cliente em uma única transação, com um ID da
+    sequência do shard
+
+    Args:
+        order (OrderRecord): Registro com os dados do pedido (o orderid é ignorado)
+        details (list[OrderDetailRecord]): Itens do pedido (o orderid é ignorado)
+
+    Returns:
+        int | str: ID do pedido ou a mensagem de erro
+    """
+    session = None
+
+    try:
+        shard_count = _shard_count()
+        shard = shard_for_customer(order.customerid)
+        session = get_shard_connection(shard)
+        if not session:
+            return "Erro ao conectar ao shard do cliente"
+
+        # Uma nova tentativa cobre o caso de o ID da sequência já estar em uso
+        for attempt in range(2):
+            try:
+                order_id = _next_order_id(session, shard, shard_count, advance=attempt > 0)
+                with session.cursor() as cursor:
+                    execute_statement(cursor, "shard_insert_order", _INSERT_ORDER_SQL, order.to_insert_params(order_id))
+                    for detail in details:
+                        execute_statement(cursor, *_order_detail_statement(),
+                                          detail.to_insert_params(order_id, partitioned_orders_enabled()))
+                session.commit()
+                return order_id
+
+            except psycopg2.errors.UniqueViolation:
+                session.rollback()
+                if attempt == 1:
+                    raise
+
+    except psycopg2.Error as e:
+        print(f"Error ao inserir pedido: {e}")
+        if session:
+            session.rollback()
+        return f"Falha ao inserir o pedido ({e})"
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def insert_order(order: OrderRecord) -> int | None:
+    """
+    Insere um novo pedido no shard do cliente, com um ID da sequência do shard
+
+    Args:
+        order (OrderRecord): Registro com os dados do pedido (o orderid é ignorado)
+
+    Returns:
+        int | None: ID do pedido ou None se falhar
+    """
+    result = insert_order_with_details(order, [])
+    return result if isinstance(result, int) else None
+
+def insert_order_detail(detail: OrderDetailRecord):
+    """
+    Insere um item de pedido no shard do pedido
+
+    Args:
+        detail (OrderDetailRecord): Registro com os dados do item
+    """
+    session = None
+
+    try:
+        session = get_shard_connection(shard_for_order(detail.orderid))
+        if not session:
+            return
+
+        with session.cursor() as cursor:
+            execute_statement(cursor, *_order_detail_statement(),
+                              detail.to_insert_params(partitioned=partitioned_orders_enabled()))
+        session.commit()
+
+    except psycopg2.Error as e:
+        print(f"Error ao inserir detalhe do pedido: {e}")
+        if session:
+            session.rollback()
+
+    finally:
+        if session:
+            release_pooled_connection(session)
+
+def _find_orders_on_shard(shard: int, order_ids: list[int]) -> dict:
+    header_sql = """
+        SELECT
+            o.orderid,
+            o.orderdate,
+            c.companyname AS customer_name,
+            e.firstname || ' ' || e.lastname AS employee_name
+        FROM northwind.orders o
+        INNER JOIN northwind.customers c ON o.customerid = c.customerid
+        INNER JOIN northwind.employees e ON o.employeeid = e.employeeid
+        WHERE o.orderid = ANY(%s)
+        """
+
+    items_sql = """
+        SELECT
+            od.orderid,
+            p.productname AS product_name,
+            od.quantity,
+            od.unitprice,
+            od.discount
+        FROM northwind.order_details od
+        INNER JOIN northwind.products p ON od.productid = p.productid
+        WHERE od.orderid = ANY(%s)
+        """
+
+    result = {}
+    for row in _fetch(shard, "northwind_order_headers", header_sql, (list(order_ids),), many=True):
+        result[row[0]] = {
+            'order_id': row[0],
+            'order_date': row[1],
+            'customer_name': row[2],
+            'employee_name': row[3],
+            'items': []
+        }
+
+    if result:
+        for item in _fetch(shard, "northwind_orders_items", items_sql, (list(result),), many=True):
+            result[item[0]]['items'].append({
+                'product_name': item[1],
+                'quantity': item[2],
+                'total_price': float(item[2] * item[3] * (1 - item[4])),
+            })
+
+    for order in result.values():
+        order['total_order'] = sum(item['total_price'] for item in order['items'])
+    return result
+
+def find_orders_with_details(order_ids: list[int], start_date=None, end_date=None) -> dict | None:
+    """
+    Busca vários pedidos com seus detalhes, consultando em paralelo o shard de cada pedido.
+    Pedidos anteriores ao particionamento (fora da regra de ID) são procurados nos demais shards.
+
+    Args:
+        order_ids (list[int]): IDs dos pedidos a serem pesquisados
+        start_date: Aceito por compatibilidade com os outros DAOs; cada pedido já é buscado no seu shard
+        end_date: Aceito por compatibilidade com os outros DAOs
+
+    Returns:
+        dict | None: Dicionário {order_id: pedido} ou None em caso de erro
+    """
+    try:
+        shard_count = _shard_count()
+        by_shard = {}
+        for order_id in order_ids:
+            by_shard.setdefault(order_id % shard_count, []).append(order_id)
+
+        result = {}
+        for partial in _scatter(lambda shard: _find_orders_on_shard(shard, by_shard[shard]), list(by_shard)):
+            result.update(partial)
+
+        missing = [order_id for order_id in order_ids if order_id not in result]
+        if missing and shard_count > 1:
+            for partial in _scatter(lambda shard: _find_orders_on_shard(shard, missing), range(shard_count)):
+                result.update(partial)
+        return result
+
+    except psycopg2.Error as e:
+        print(f"Erro ao buscar detalhes dos pedidos {list(order_ids)}: {e}")
+        return None
+
+def find_order_with_details(order_id: int) -> dict | None:
+    """
+    Busca todos os detalhes do pedido no seu shard
+
+    Args:
+        order_id (int): ID do pedido a ser pesquisado
+
+    Returns:
+        dict | None: Dicionário com todas as informações do pedido ou None se não encontrado
+    """
+    orders = find_orders_with_details([order_id])
+    return orders.get(order_id) if orders else None
+
+def get_employee_sales_ranking(start_date, end_date) -> list | None:
+    """
+    Calcula o ranking de vendas dos funcionários em um período, consultando todos os shards
+    em paralelo e somando os agregados parciais de cada um.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+
+    Returns:
+        list | None: Lista de dicionários com ranking de vendas ou None em caso de erro
+    """
+    sql = """
+        SELECT
+            e.employeeid,
+            e.firstname || ' ' || e.lastname AS employee_name,
+            COUNT(DISTINCT o.orderid) AS total_orders,
+            SUM(od.quantity * od.unitprice * (1 - od.discount)) AS total_value
+        FROM northwind.employees e
+        INNER JOIN northwind.orders o ON e.employeeid = o.employeeid
+        INNER JOIN northwind.order_details od ON o.orderid = od.orderid
+        WHERE o.orderdate BETWEEN %s AND %s
+        GROUP BY e.employeeid, e.firstname, e.lastname
+        """
+
+    try:
+        partials = _scatter(
+            lambda shard: _fetch(shard, "shard_employee_ranking", sql, (start_date, end_date), many=True),
+            range(_shard_count())
+        )
+
+    except psycopg2.Error as e:
+        print(f"Erro ao calcular ranking de vendas: {e}")
+        return None
+
+    # Cada pedido está em um único shard, então contagens e valores podem ser somados
+    merged = {}
+    for rows in partials:
+        for employee_id, employee_name, total_orders, total_value in rows:
+            entry = merged.setdefault(employee_id, {'employee_name': employee_name, 'total_orders': 0, 'total_value': 0.0})
+            entry['total_orders'] += total_orders
+            entry['total_value'] += float(total_value) if total_value is not None else 0.0
+
+    ranking = sorted(merged.values(), key=lambda entry: entry['total_value'], reverse=True)
+    for entry in ranking:
+        entry['total_value'] = round(entry['total_value'], 2)
+    return ranking
+
+def find_order_ids_by_period(start_date, end_date) -> list | None:
+    """
+    Busca os IDs dos pedidos de um período em todos os shards.
+
+    Args:
+        start_date: Data de início do período (inclusive)
+        end_date: Data de fim do período (inclusive)
+
+    Returns:
+        list | None: Lista de IDs de pedidos ordenada ou None em caso de erro
+    """
+    sql = """
+        SELECT orderid
+        FROM northwind.orders
+        WHERE orderdate BETWEEN %s AND %s
+        ORDER BY orderid
+        """
+
+    try:
+        partials = _scatter(
+            lambda shard: _fetch(shard, "northwind_order_ids_by_period", sql, (start_date, end_date), many=True),
+            range(_shard_count())
+        )
+
+    except psycopg2.Error as e:
+        print(f"Erro ao buscar pedidos do período: {e}")
+        return None
+
+    return [row[0] for row in heapq.merge(*partials)]
+
+def replicate_reference_tables() -> bool:
+    """
+    Copia as tabelas de referência do banco principal (DB_HOST) para todos os shards,
+    inserindo ou atualizando cada linha pela chave primária.
+
+    Returns:
+        bool: True se todas as tabelas foram copiadas para todos os shards
+    """
+    source = None
+    tables = {}
+
+    try:
+        source = get_pooled_connection()
+        if not source:
+            return False
+        with source.cursor() as cursor:
+            for table in _REFERENCE_TABLES:
+                cursor.execute(f"SELECT * FROM northwind.{table}")
+                tables[table] = ([column.name for column in cursor.description], cursor.fetchall())
+
+    except psycopg2.Error as e:
+        print(f"Erro ao ler tabelas de referência: {e}")
+        return False
+
+    finally:
+        if source:
+            release_pooled_connection(source)
+
+    success = get_shard_count() > 0
+    for shard in range(get_shard_count()):
+        session = None
+        try:
+            session = get_shard_connection(shard)
+            if not session:
+                success = False
+                continue
+            with session.cursor() as cursor:
+                for table, key in _REFERENCE_TABLES.items():
+                    columns, rows = tables[table]
+                    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column != key)
+                    sql = (
+                        f"INSERT INTO northwind.{table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                        f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+                    )
+                    cursor.executemany(sql, rows)
+            session.commit()
+
+        except psycopg2.Error as e:
+            print(f"Erro ao replicar tabelas de referência no shard {shard}: {e}")
+            if session:
+                session.rollback()
+            success = False
+
+        finally:
+            if session:
+                release_pooled_connection(session)
+
+    return success
@@ -1,9 +1,34 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc
-from app.dao.base_dao import get_sql_alchemy_new_session
-from app.model.orm_model import Customers, Employees, Products, Orders, OrderDetails
-from typing import Optional, Tuple, List, Dict, Any
+from sqlalchemy.orm import Session, joinedload, undefer
+from sqlalchemy import (
+    Date, DateTime, Integer, Numeric, and_, cast, column, desc, func, literal_column, select, true, tuple_, union_all, update, values
+)
+from app.dao.base_dao import (
+    get_sql_alchemy_new_session,
+    get_sql_alchemy_read_session,
+    partitioned_orders_enabled,
+    order_archive_enabled,
+    order_totals_enabled,
+    stock_reservation_enabled,
+    operation_failed,
+    operation_timed_out,
+    with_statement_timeout
+)
+from app.model.orm_model import (
+    Categories,
+    Customers,
+    Employees,
+    Products,
+    Orders,
+    OrderDetails,
+    OrdersArchive,
+    OrderDetailsArchive,
+    EmployeeSalesArchive,
+    EmployeeSalesDaily,
+    EmployeeClosure
+)
+from typing import Optional, Tuple, List, Dict, Any, Union
 from datetime import date
+from types import SimpleNamespace
 
 def pattern(parameter) -> None:
     db: Session = get_sql_alchemy_new_session()
@@ -16,6 +41,7 @@ def pattern(parameter) -> None:
         db.close()
     return None
 
+@with_statement_timeout("lookup")
 def find_customer_by_name(name: str) -> Optional[Customers]:
     """
     Busca um cliente pelo nome da empresa usando SQLAlchemy ORM.
@@ -38,6 +64,7 @@ def find_customer_by_name(name: str) -> Optional[Customers]:
     finally:
         db.close()
 
+@with_statement_timeout("lookup")
 def find_employee_by_name(first_name: str, last_name: str) -> Optional[Employees]:
     """
     Busca um funcionário pelo primeiro e último nome usando SQLAlchemy ORM.
@@ -64,6 +91,7 @@ def find_employee_by_name(first_name: str, last_name: str) -> Optional[Employees
     finally:
         db.close()
 
+@with_statement_timeout("lookup")
 def find_product_by_name(name: str) -> Optional[Products]:
     """
     Busca um produto pelo nome usando SQLAlchemy ORM.
@@ -86,6 +114,7 @@ def find_product_by_name(name: str) -> Optional[Products]:
     finally:
         db.close()
 
+@with_statement_timeout("insert")
 def insert_order(order: Orders) -> Optional[Orders]:
     """
     Insere um novo pedido usando SQLAlchemy ORM.
@@ -121,6 +150,7 @@ def insert_order(order: Orders) -> Optional[Orders]:
     finally:
         db.close()
 
+@with_statement_timeout("insert")
 def insert_order_detail(detail: OrderDetails) -> None:
     """
     Insere um detalhe de pedido usando SQLAlchemy ORM.
@@ -130,6 +160,10 @@ def insert_order_detail(detail: OrderDetails) -> None:
     """
     db: Session = get_sql_alchemy_new_session()
     try:
+        # A coluna orderdate dos itens só existe com as tabelas particionadas por data
+        if not partitioned_orders_enabled():
+            detail.orderdate = None
+        
         # Adicionar o objeto à sessão e confirmar a inserção
         db.add(detail)
         db.commit()
@@ -139,6 +173,139 @@ def insert_order_detail(detail: OrderDetails) -> None:
     finally:
         db.close()
 
+def _reserve_stock(db: Session, details: List[OrderDetails]) -> List[int]:
+    """
+    Reserva o estoque dos itens de um pedido na transação da sessão, em um único UPDATE ... FROM
+    (VALUES ...). As linhas dos produtos são bloqueadas em ordem de productid (sem deadlock entre
+    pedidos concorrentes) e só são atualizadas se houver estoque para a quantidade pedida.
+    
+    Returns:
+        List[int]: IDs dos produtos sem estoque suficiente (vazia se a reserva foi feita). Nesse
+            caso, a transação deve ser desfeita, pois os demais produtos já foram atualizados
+    """
+    quantities: Dict[int, int] = {}
+    for detail in details:
+        quantities[detail.productid] = quantities.get(detail.productid, 0) + detail.quantity
+    
+    requested = values(column("productid", Integer), column("quantity", Integer), name="requested").data(list(quantities.items()))
+    locked = (
+        select(Products.productid, requested.c.quantity)
+        .join(requested, requested.c.productid == Products.productid)
+        .order_by(Products.productid)
+        .with_for_update(of=Products)
+        .cte("locked")
+    )
+    reserved = db.execute(
+        update(Products)
+        .where(Products.productid == locked.c.productid, Products.unitsinstock >= locked.c.quantity)
+        .values(unitsinstock=Products.unitsinstock - locked.c.quantity)
+        .returning(Products.productid)
+    ).scalars().all()
+    return sorted(set(quantities) - set(reserved))
+
+@with_statement_timeout("insert")
+def insert_order_with_details(order: Orders, details: List[OrderDetails]) -> Union[int, str]:
+    """
+    Insere um pedido e seus itens em uma única transação. Com a reserva de estoque ativa
+    (DB_RESERVE_STOCK=1), também desconta o estoque dos produtos e não grava nada se algum
+    produto não tiver estoque suficiente.
+    
+    Args:
+        order (Orders): Objeto Orders com os dados do pedido (o ID é calculado)
+        details (List[OrderDetails]): Itens do pedido (o orderid é preenchido)
+        
+    Returns:
+        Union[int, str]: ID do pedido ou a mensagem de erro (o timeout e as falhas do banco são
+            sinalizados com OperationTimeoutError e OperationFailedError)
+    """
+    db: Session = get_sql_alchemy_new_session()
+    try:
+        if stock_reservation_enabled():
+            missing = _reserve_stock(db, details)
+            if missing:
+                db.rollback()
+                return f"Estoque insuficiente para o(s) produto(s) com ID {', '.join(map(str, missing))}"
+        
+        max_id_result = db.query(func.max(Orders.orderid)).scalar()
+        order.orderid = (max_id_result or 0) + 1
+        db.add(order)
+        
+        for detail in details:
+            detail.orderid = order.orderid
+            # A coluna orderdate dos itens só existe com as tabelas particionadas por data
+            if not partitioned_orders_enabled():
+                detail.orderdate = None
+            db.add(detail)
+        
+        db.commit()
+        return order.orderid
+    except Exception as e:
+        print(f"Error ao inserir pedido: {e}")
+        db.rollback()
+        if operation_timed_out() or operation_failed():
+            # Sem resultado, o decorador converte o cancelamento ou a falha do banco em exceção
+            return None
+        return f"Falha ao inserir o pedido ({e})"
+    finally:
+        db.close()
+
+def _order_total_options(order_model) -> List[Any]:
+    """
+    Carrega o total gravado do pedido (DB_ORDER_TOTALS=1), que não é carregado por padrão
+    """
+    return [undefer(order_model.order_total)] if order_totals_enabled() else []
+
+def _order_detail_options(detail_model) -> List[Any]:
+    """
+    Opções de carga dos itens do pedido: produto e, com DB_ORDER_TOTALS=1, o valor líquido gravado
+    """
+    options = [joinedload(detail_model.products)]
+    if order_totals_enabled():
+        options.append(undefer(detail_model.net_amount))
+    return options
+
+def _order_to_report(order: Orders) -> Dict[str, Any]:
+    """
+    Converte um pedido carregado (com cliente, funcionário e itens) no dicionário de relatório
+    """
+    totals = order_totals_enabled()
+    # Construir dicionário de retorno no mesmo formato que a versão do psycopg
+    result = {
+        'order_id': order.orderid,
+        'order_date': order.orderdate,
+        'customer_name': order.customers.companyname if order.customers else None,
+        'employee_name': f"{order.employees.firstname} {order.employees.lastname}" if order.employees else None,
+        'items': []
+    }
+    
+    # Adicionar os itens do pedido
+    total_order = 0.0
+    for detail in order.order_details:
+        product = detail.products
+        unit_price = float(detail.unitprice) if detail.unitprice else 0.0
+        quantity = detail.quantity or 0
+        discount = float(detail.discount) if detail.discount else 0.0
+        if totals and detail.net_amount is not None:
+            # Valor líquido gravado pela trigger (app/dao/order_totals.py)
+            total_price = float(detail.net_amount)
+        else:
+            total_price = unit_price * quantity * (1 - discount)
+        
+        result['items'].append({
+            'product_name': product.productname if product else 'Unknown',
+            'quantity': quantity,
+            'total_price': total_price
+        })
+        
+        total_order += total_price
+        
+    if totals and order.order_total is not None:
+        total_order = float(order.order_total)
+    result['total_order'] = total_order
+    
+    return result
+
+@with_statement_timeout("report")
 def find_order_with_details(order_id: int) -> Optional[Dict[str, Any]]:
     """
     Busca um pedido com todos os seus detalhes usando eager loading com joinedload.
@@ -149,7 +316,7 @@ def find_order_with_details(order_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Dicionário com todas as informações do pedido ou None se não encontrado
     """
-    db: Session = get_sql_alchemy_new_session()
+    db: Session = get_sql_alchemy_read_session()
     try:
         # Buscar o pedido com eager loading para todos os relacionamentos
         order = (
@@ -157,51 +324,186 @@ def find_order_with_details(order_id: int) -> Optional[Dict[str, Any]]:
             .options(
                 joinedload(Orders.customers),
                 joinedload(Orders.employees),
-                joinedload(Orders.order_details).joinedload(OrderDetails.products)
+                joinedload(Orders.order_details).options(*_order_detail_options(OrderDetails)),
+                *_order_total_options(Orders)
             )
             .filter(Orders.orderid == order_id)
             .first()
         )
         
+        if not order and order_archive_enabled():
+            # Pedidos antigos podem ter sido movidos para as tabelas de arquivo
+            order = (
+                db.query(OrdersArchive)
+                .options(
+                    joinedload(OrdersArchive.customers),
+                    joinedload(OrdersArchive.employees),
+                    joinedload(OrdersArchive.order_details).options(*_order_detail_options(OrderDetailsArchive)),
+                    *_order_total_options(OrdersArchive)
+                )
+                .filter(OrdersArchive.orderid == order_id)
+                .first()
+            )
+        
         if not order:
             return None
             
-        # Construir dicionário de retorno no mesmo formato que a versão do psycopg
-        result = {
-            'order_id': order.orderid,
-            'order_date': order.orderdate,
-            'customer_name': order.customers.companyname if order.customers else None,
-            'employee_name': f"{order.employees.firstname} {order.employees.lastname}" if order.employees else None,
-            'items': []
-        }
+        return _order_to_report(order)
         
-        # Adicionar os itens do pedido
-        total_order = 0.0
-        for detail in order.order_details:
-            product = detail.products
-            unit_price = float(detail.unitprice) if detail.unitprice else 0.0
-            quantity = detail.quantity or 0
-            discount = float(detail.discount) if detail.discount else 0.0
-            total_price = unit_price * quantity * (1 - discount)
-            
-            result['items'].append({
-                'product_name': product.productname if product else 'Unknown',
-                'quantity': quantity,
-                'total_price': total_price
-            })
-            
-            total_order += total_price
-            
-        result['total_order'] = total_order
+    except Exception as e:
+        print(f"Error ao buscar pedido com detalhes: {e}")
+        return None
+    finally:
+        db.close()
+
+@with_statement_timeout("report")
+def find_orders_with_details(
+    order_ids: List[int],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Optional[Dict[int, Dict[str, Any]]]:
+    """
+    Busca vários pedidos com seus detalhes em uma única consulta (IN com eager loading).
+    
+    Args:
+        order_ids (List[int]): IDs dos pedidos a serem consultados
+        start_date (Optional[date]): Data de início do período dos pedidos, quando conhecida
+        end_date (Optional[date]): Data de fim do período dos pedidos, quando conhecida
         
-        return result
+    Returns:
+        Optional[Dict[int, Dict[str, Any]]]: Dicionário {order_id: pedido} (pedidos não encontrados
+            ficam fora do dicionário) ou None em caso de erro
+    """
+    db: Session = get_sql_alchemy_read_session()
+    try:
+        details_loader = joinedload(Orders.order_details)
+        if start_date is not None and end_date is not None and partitioned_orders_enabled():
+            # Limita o join dos itens às partições do período
+            details_loader = joinedload(
+                Orders.order_details.and_(OrderDetails.orderdate.between(start_date, end_date))
+            )
+        
+        query = (
+            db.query(Orders)
+            .options(
+                joinedload(Orders.customers),
+                joinedload(Orders.employees),
+                details_loader.options(*_order_detail_options(OrderDetails)),
+                *_order_total_options(Orders)
+            )
+            .filter(Orders.orderid.in_(list(order_ids)))
+        )
+        if start_date is not None and end_date is not None:
+            query = query.filter(Orders.orderdate.between(start_date, end_date))
+        orders = query.all()
+        
+        missing = set(order_ids) - {order.orderid for order in orders}
+        if missing and order_archive_enabled():
+            # Pedidos não encontrados são procurados nas tabelas de arquivo
+            archive_query = (
+                db.query(OrdersArchive)
+                .options(
+                    joinedload(OrdersArchive.customers),
+                    joinedload(OrdersArchive.employees),
+                    joinedload(OrdersArchive.order_details).options(*_order_detail_options(OrderDetailsArchive)),
+                    *_order_total_options(OrdersArchive)
+                )
+                .filter(OrdersArchive.orderid.in_(list(missing)))
+            )
+            if start_date is not None and end_date is not None:
+                archive_query = archive_query.filter(OrdersArchive.orderdate.between(start_date, end_date))
+            orders.extend(archive_query.all())
+        
+        return {order.orderid: _order_to_report(order) for order in orders}
         
     except Exception as e:
-        print(f"Error ao buscar pedido com detalhes: {e}")
+        print(f"Error ao buscar pedidos com detalhes: {e}")
         return None
     finally:
         db.close()
 
+def _order_sales_select(start_date: date, end_date: date, period: Optional[Any] = None) -> Any:
+    """
+    Vendas dos pedidos ativos no período por funcionário (e por `period`, quando informado),
+    com as colunas employeeid, [period,] total_orders e total_value
+    """
+    columns = [Orders.employeeid.label('employeeid')]
+    group_by = [Orders.employeeid]
+    if period is not None:
+        columns.append(period.label('period'))
+        group_by.append(period)
+    
+    join_condition = OrderDetails.orderid == Orders.orderid
+    if partitioned_orders_enabled():
+        # O filtro repetido nos itens permite descartar também as partições de order_details
+        join_condition = and_(
+            join_condition,
+            OrderDetails.orderdate == Orders.orderdate,
+            OrderDetails.orderdate.between(start_date, end_date)
+        )
+    
+    if order_totals_enabled():
+        # Lê os totais gravados em orders (app/dao/order_totals.py), sem o join com os itens; os
+        # pedidos ainda não calculados pelo backfill (order_total NULL) somam os seus itens
+        line_totals = (
+            select(
+                func.count().label('line_count'),
+                func.sum(
+                    OrderDetails.quantity * OrderDetails.unitprice * (1 - OrderDetails.discount)
+                ).label('total_value')
+            )
+            .where(join_condition, Orders.order_total.is_(None))
+            .lateral('line_totals')
+        )
+        return (
+            select(
+                *columns,
+                func.count().label('total_orders'),
+                func.sum(func.coalesce(Orders.order_total, line_totals.c.total_value)).label('total_value')
+            )
+            .select_from(Orders)
+            .outerjoin(line_totals, true())
+            .where(Orders.orderdate.between(start_date, end_date))
+            .where(func.coalesce(Orders.line_count, line_totals.c.line_count) > 0)
+            .group_by(*group_by)
+        )
+    
+    return (
+        select(
+            *columns,
+            func.count(func.distinct(Orders.orderid)).label('total_orders'),
+            func.sum(
+                OrderDetails.quantity * OrderDetails.unitprice * (1 - OrderDetails.discount)
+            ).label('total_value')
+        )
+        .join(OrderDetails, join_condition)
+        .where(Orders.orderdate.between(start_date, end_date))
+        .group_by(*group_by)
+    )
+
+def _merge_ranking_rows(rows: List[Any]) -> List[Any]:
+    """
+    Soma as linhas de ranking do mesmo funcionário e ordena pelo valor total
+    """
+    merged: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        entry = merged.setdefault(row.employeeid, {
+            'employeeid': row.employeeid,
+            'firstname': row.firstname,
+            'lastname': row.lastname,
+            'total_orders': 0,
+            'total_value': 0.0
+        })
+        entry['total_orders'] += row.total_orders or 0
+        entry['total_value'] += float(row.total_value) if row.total_value is not None else 0.0
+    
+    return sorted(
+        (SimpleNamespace(**entry) for entry in merged.values()),
+        key=lambda entry: entry.total_value,
+        reverse=True
+    )
+
+@with_statement_timeout("ranking")
 def get_employee_sales_ranking(start_date: date, end_date: date) -> Optional[List[Dict[str, Any]]]:
     """
     Calcula o ranking de vendas dos funcionários em um período específico.
@@ -213,31 +515,77 @@ def get_employee_sales_ranking(start_date: date, end_date: date) -> Optional[Lis
     Returns:
         Optional[List[Dict[str, Any]]]: Lista de dicionários com ranking de vendas ou None em caso de erro
     """
-    db: Session = get_sql_alchemy_new_session()
+    db: Session = get_sql_alchemy_read_session()
     try:
         # Query para calcular o ranking de vendas
         # Convertendo date para datetime para comparação com os campos DateTime do modelo
         start_datetime = date(start_date.year, start_date.month, start_date.day)
         end_datetime = date(end_date.year, end_date.month, end_date.day)
         
-        result_rows = (
-            db.query(
-                Employees.firstname,
-                Employees.lastname,
-                func.count(func.distinct(Orders.orderid)).label('total_orders'),
-                func.sum(
-                    OrderDetails.quantity * OrderDetails.unitprice * (1 - OrderDetails.discount)
-                ).label('total_value')
+        if order_totals_enabled():
+            # Totais gravados em orders, com a soma dos itens dos pedidos sem total (_order_sales_select)
+            sales = _order_sales_select(start_datetime, end_datetime).subquery()
+            query = (
+                db.query(
+                    Employees.employeeid,
+                    Employees.firstname,
+                    Employees.lastname,
+                    cast(func.sum(sales.c.total_orders), Integer).label('total_orders'),
+                    func.sum(sales.c.total_value).label('total_value')
+                )
+                .join(sales, sales.c.employeeid == Employees.employeeid)
             )
-            .join(Orders, Orders.employeeid == Employees.employeeid)
-            .join(OrderDetails, OrderDetails.orderid == Orders.orderid)
-            .filter(Orders.orderdate >= start_datetime)
-            .filter(Orders.orderdate <= end_datetime)
+        else:
+            query = (
+                db.query(
+                    Employees.employeeid,
+                    Employees.firstname,
+                    Employees.lastname,
+                    func.count(func.distinct(Orders.orderid)).label('total_orders'),
+                    func.sum(
+                        OrderDetails.quantity * OrderDetails.unitprice * (1 - OrderDetails.discount)
+                    ).label('total_value')
+                )
+                .join(Orders, Orders.employeeid == Employees.employeeid)
+                .join(OrderDetails, OrderDetails.orderid == Orders.orderid)
+                .filter(Orders.orderdate >= start_datetime)
+                .filter(Orders.orderdate <= end_datetime)
+            )
+        
+        if partitioned_orders_enabled() and not order_totals_enabled():
+            # O filtro repetido nos itens permite descartar também as partições de order_details
+            query = (
+                query
+                .filter(OrderDetails.orderdate == Orders.orderdate)
+                .filter(OrderDetails.orderdate >= start_datetime)
+                .filter(OrderDetails.orderdate <= end_datetime)
+            )
+        
+        result_rows = (
+            query
             .group_by(Employees.employeeid, Employees.firstname, Employees.lastname)
             .order_by(desc('total_value'))
             .all()
         )
         
+        if order_archive_enabled():
+            # Soma às vendas das tabelas ativas os agregados diários dos pedidos arquivados
+            archive_rows = (
+                db.query(
+                    Employees.employeeid,
+                    Employees.firstname,
+                    Employees.lastname,
+                    func.sum(EmployeeSalesArchive.total_orders).label('total_orders'),
+                    func.sum(EmployeeSalesArchive.total_value).label('total_value')
+                )
+                .join(EmployeeSalesArchive, EmployeeSalesArchive.employeeid == Employees.employeeid)
+                .filter(EmployeeSalesArchive.salesdate >= start_date)
+                .filter(EmployeeSalesArchive.salesdate <= end_date)
+                .group_by(Employees.employeeid, Employees.firstname, Employees.lastname)
+                .all()
+            )
+            result_rows = _merge_ranking_rows(result_rows + archive_rows)
+        
         if not result_rows:
             return []
             
@@ -245,7 +593,7 @@ def get_employee_sales_ranking(start_date: date, end_date: date) -> Optional[Lis
         ranking = []
         for row in result_rows:
             employee_name = f"{row.firstname} {row.lastname}"
-            total_orders = row.total_orders
+            total_orders = int(row.total_orders)
             total_value = float(row.total_value) if row.total_value is not None else 0.0
             
             ranking.append({
@@ -261,9 +609,147 @@ def get_employee_sales_ranking(start_date: date, end_date: date) -> Optional[Lis
         return None
     finally:
         db.close()
+
+@with_statement_timeout("report")
+def find_order_ids_by_period(start_date: date, end_date: date) -> Optional[List[int]]:
+    """
+    Busca os IDs dos pedidos realizados em um período específico usando SQLAlchemy ORM.
+    
+    Args:
+        start_date (date): Data de início do período
+        end_date (date): Data de fim do período
+        
+    Returns:
+        Optional[List[int]]: Lista de IDs de pedidos ordenada ou None em caso de erro
+    """
+    db: Session = get_sql_alchemy_read_session()
+    try:
+        rows = (
+            db.query(Orders.orderid)
+            .filter(Orders.orderdate >= start_date)
+            .filter(Orders.orderdate <= end_date)
+            .order_by(Orders.orderid)
+            .all()
+        )
+        return [row.orderid for row in rows]
+    except Exception as e:
+        print(f"Error ao buscar pedidos do período: {e}")
+        return None
+    finally:
+        db.close()
+
+@with_statement_timeout("report")
+def list_orders(
+    customer_id: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 50
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Lista resumos de pedidos filtrados por cliente, funcionário e/ou período em ordem de
+    (orderdate, orderid), paginados por keyset (sem OFFSET).
+    
+    Args:
+        customer_id (Optional[str]): Filtra pelo cliente
+        employee_id (Optional[int]): Filtra pelo funcionário
+        start_date (Optional[date]): Data de início do período
+        end_date (Optional[date]): Data de fim do período
+        after (Optional[Tuple[Any, int]]): (orderdate, orderid) do último pedido da página anterior
+        limit (int): Quantidade máxima de pedidos
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: Lista no mesmo formato da versão do psycopg ou None em caso de erro
+    """
+    db: Session = get_sql_alchemy_read_session()
+    try:
+        totals = order_totals_enabled()
+        
+        def page(order_model):
+            columns = [
+                order_model.orderid,
+                order_model.orderdate,
+                order_model.customerid,
+                order_model.employeeid,
+                order_model.shipcountry
+            ]
+            if totals:
+                columns += [order_model.line_count, order_model.order_total]
+            query = select(*columns).where(order_model.orderdate.isnot(None))
+            if customer_id is not None:
+                query = query.where(order_model.customerid == customer_id)
+            if employee_id is not None:
+                query = query.where(order_model.employeeid == employee_id)
+            if start_date is not None:
+                query = query.where(order_model.orderdate >= start_date)
+            if end_date is not None:
+                query = query.where(order_model.orderdate <= end_date)
+            if after is not None:
+                # Comparação de linha: percorre o índice (..., orderdate, orderid) a partir do cursor
+                query = query.where(tuple_(order_model.orderdate, order_model.orderid) > tuple_(*after))
+            return select(query.order_by(order_model.orderdate, order_model.orderid).limit(limit).subquery())
+        
+        sources = [page(Orders)]
+        if order_archive_enabled():
+            # Cada tabela devolve a sua página pelo próprio índice; a consulta externa junta as duas
+            sources.append(page(OrdersArchive))
+        page_rows = (union_all(*sources) if len(sources) > 1 else sources[0]).subquery('page')
+        
+        rows = (
+            db.query(page_rows, Customers.companyname, Employees.firstname, Employees.lastname)
+            .outerjoin(Customers, Customers.customerid == page_rows.c.customerid)
+            .outerjoin(Employees, Employees.employeeid == page_rows.c.employeeid)
+            .order_by(page_rows.c.orderdate, page_rows.c.orderid)
+            .limit(limit)
+            .all()
+        )
+        
+        line_totals: Dict[int, Tuple[int, Any]] = {}
+        if rows and not totals:
+            # Itens somados em uma consulta por tabela, apenas para os pedidos da página
+            order_ids = [row.orderid for row in rows]
+            detail_models = [OrderDetails] + ([OrderDetailsArchive] if order_archive_enabled() else [])
+            for detail_model in detail_models:
+                query = (
+                    db.query(
+                        detail_model.orderid,
+                        func.count().label('line_count'),
+                        func.sum(
+                            detail_model.quantity * detail_model.unitprice * (1 - detail_model.discount)
+                        ).label('order_total')
+                    )
+                    .filter(detail_model.orderid.in_(order_ids))
+                )
+                if detail_model is OrderDetails and partitioned_orders_enabled():
+                    # Limita a busca dos itens às partições das datas da página
+                    query = query.filter(OrderDetails.orderdate.between(rows[0].orderdate, rows[-1].orderdate))
+                for total_row in query.group_by(detail_model.orderid).all():
+                    line_totals[total_row.orderid] = (total_row.line_count, total_row.order_total)
+        
+        result = []
+        for row in rows:
+            line_count, order_total = (row.line_count, row.order_total) if totals else line_totals.get(row.orderid, (0, None))
+            result.append({
+                'order_id': row.orderid,
+                'order_date': row.orderdate,
+                'customer_name': row.companyname,
+                'employee_name': f"{row.firstname} {row.lastname}" if row.firstname is not None else None,
+                'ship_country': row.shipcountry,
+                'line_count': line_count or 0,
+                'total_order': float(order_total) if order_total is not None else 0.0
+            })
+        return result
+        
+    except Exception as e:
+        print(f"Error ao listar pedidos: {e}")
+        return None
+    finally:
+        db.close()
         
 # Funções auxiliares para compatibilidade com o código existente
 
+@with_statement_timeout("lookup")
 def find_customer_id_by_name(company_name: str) -> Optional[str]:
     """
     Busca o ID de um cliente pelo nome da empresa (função de compatibilidade)
@@ -277,6 +763,7 @@ def find_customer_id_by_name(company_name: str) -> Optional[str]:
     customer = find_customer_by_name(company_name)
     return customer.customerid if customer else None
 
+@with_statement_timeout("lookup")
 def find_employee_id_by_name(first_name: str, last_name: str) -> Optional[int]:
     """
     Busca o ID de um funcionário pelo nome (função de compatibilidade)
@@ -291,6 +778,7 @@ def find_employee_id_by_name(first_name: str, last_name: str) -> Optional[int]:
     employee = find_employee_by_name(first_name, last_name)
     return employee.employeeid if employee else None
 
+@with_statement_timeout("lookup")
 def find_product_id_and_price_by_name(name: str) -> Optional[Tuple[int, float]]:
     """
     Busca o ID e preço de um produto pelo nome (função de compatibilidade)
@@ -304,4 +792,313 @@ def find_product_id_and_price_by_name(name: str) -> Optional[Tuple[int, float]]:
     product = find_product_by_name(name)
     if product and product.unitprice is not None:
         return (product.productid, float(product.unitprice))
-    return None
\ No newline at end of file
+    return None
+
+@with_statement_timeout("ranking")
+def get_sales_rollup(start_date: date, end_date: date, grouping_sets: List[Tuple[str, ...]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Calcula o valor líquido e a quantidade de pedidos de um período agregados por vários
+    conjuntos de dimensões em uma única consulta (GROUPING SETS).
+    
+    Args:
+        start_date (date): Data de início do período
+        end_date (date): Data de fim do período
+        grouping_sets (List[Tuple[str, ...]]): Conjuntos de dimensões (employee, customer, product,
+            category, ship_country); o conjunto vazio () produz o total geral
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: Lista no mesmo formato da versão do psycopg ou None em caso de erro
+    """
+    db: Session = get_sql_alchemy_read_session()
+    try:
+        if order_archive_enabled():
+            # Inclui os pedidos arquivados, que saíram das tabelas ativas
+            orders = union_all(
+                select(Orders.orderid, Orders.customerid, Orders.employeeid, Orders.orderdate, Orders.shipcountry),
+                select(OrdersArchive.orderid, OrdersArchive.customerid, OrdersArchive.employeeid,
+                       OrdersArchive.orderdate, OrdersArchive.shipcountry)
+            ).subquery('o')
+            details = union_all(
+                select(OrderDetails.orderid, OrderDetails.productid, OrderDetails.unitprice,
+                       OrderDetails.quantity, OrderDetails.discount),
+                select(OrderDetailsArchive.orderid, OrderDetailsArchive.productid, OrderDetailsArchive.unitprice,
+                       OrderDetailsArchive.quantity, OrderDetailsArchive.discount)
+            ).subquery('od')
+            join_condition = details.c.orderid == orders.c.orderid
+        else:
+            orders = Orders.__table__.alias('o')
+            details = OrderDetails.__table__.alias('od')
+            join_condition = details.c.orderid == orders.c.orderid
+            if partitioned_orders_enabled():
+                # O filtro repetido nos itens permite descartar também as partições de order_details
+                join_condition = and_(
+                    join_condition,
+                    details.c.orderdate == orders.c.orderdate,
+                    details.c.orderdate.between(start_date, end_date)
+                )
+        
+        # Dimensões: (expressão exibida, colunas agrupadas)
+        available = {
+            'employee': (Employees.firstname + ' ' + Employees.lastname,
+                         (Employees.employeeid, Employees.firstname, Employees.lastname)),
+            'customer': (Customers.companyname, (Customers.customerid, Customers.companyname)),
+            'product': (Products.productname, (Products.productid, Products.productname)),
+            'category': (Categories.categoryname, (Categories.categoryid, Categories.categoryname)),
+            'ship_country': (orders.c.shipcountry, (orders.c.shipcountry,)),
+        }
+        dimensions = [name for name in available if any(name in grouping_set for grouping_set in grouping_sets)]
+        
+        query = db.query(
+            *[available[name][0].label(name) for name in dimensions],
+            *[func.grouping(available[name][1][0]).label(f"{name}_grouping") for name in dimensions],
+            func.count(func.distinct(orders.c.orderid)).label('total_orders'),
+            func.round(
+                func.sum(details.c.quantity * details.c.unitprice * (1 - details.c.discount)), 2
+            ).label('total_value')
+        ).select_from(orders).join(details, join_condition)
+        
+        if 'employee' in dimensions:
+            query = query.join(Employees, Employees.employeeid == orders.c.employeeid)
+        if 'customer' in dimensions:
+            query = query.join(Customers, Customers.customerid == orders.c.customerid)
+        if 'product' in dimensions or 'category' in dimensions:
+            query = query.join(Products, Products.productid == details.c.productid)
+        if 'category' in dimensions:
+            query = query.join(Categories, Categories.categoryid == Products.categoryid)
+        
+        sets = [
+            tuple_(*[column for name in grouping_set for column in available[name][1]]) if grouping_set
+            else literal_column("()")
+            for grouping_set in grouping_sets
+        ]
+        rows = (
+            query
+            .filter(orders.c.orderdate >= start_date)
+            .filter(orders.c.orderdate <= end_date)
+            .group_by(func.grouping_sets(*sets))
+            .order_by(*[literal_column(f"{name}_grouping") for name in dimensions], desc('total_value'))
+            .all()
+        )
+        
+        result = []
+        for row in rows:
+            entry = {'grouped_by': [name for name in dimensions if getattr(row, f"{name}_grouping") == 0]}
+            for name in dimensions:
+                entry[name] = getattr(row, name)
+            entry['total_orders'] = row.total_orders
+            entry['total_value'] = float(row.total_value) if row.total_value is not None else 0.0
+            result.append(entry)
+            
+        return result
+        
+    except Exception as e:
+        print(f"Error ao calcular resumo de vendas: {e}")
+        return None
+    finally:
+        db.close()
+
+@with_statement_timeout("ranking")
+def get_employee_sales_trend(
+    start_date: date,
+    end_date: date,
+    bucket: str = "month",
+    window: int = 3,
+    use_summary: bool = False
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Calcula, em uma única consulta, as vendas de cada funcionário por período com o total
+    acumulado e a média móvel das últimas `window` janelas (funções de janela no servidor).
+    
+    Args:
+        start_date (date): Data de início do período
+        end_date (date): Data de fim do período
+        bucket (str): Granularidade dos períodos: day, week ou month
+        window (int): Quantidade de períodos da média móvel
+        use_summary (bool): Lê o resumo diário pré-agregado em vez dos itens de pedido
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: Lista no mesmo formato da versão do psycopg ou None em caso de erro
+    """
+    if bucket not in ("day", "week", "month") or window < 1:
+        print(f"Error ao calcular tendência de vendas: período '{bucket}' ou janela {window} inválidos")
+        return None
+    
+    db: Session = get_sql_alchemy_read_session()
+    try:
+        # Unidade como literal (já validada): o mesmo date_trunc aparece no SELECT e no GROUP BY
+        unit = literal_column(f"'{bucket}'")
+        
+        def daily_source(model):
+            period = cast(func.date_trunc(unit, model.salesdate), Date)
+            return (
+                select(
+                    model.employeeid.label('employeeid'),
+                    period.label('period'),
+                    func.sum(model.total_orders).label('total_orders'),
+                    func.sum(model.total_value).label('total_value')
+                )
+                .where(model.salesdate.between(start_date, end_date))
+                .group_by(model.employeeid, period)
+            )
+        
+        if use_summary:
+            summary = daily_source(EmployeeSalesDaily)
+            if order_archive_enabled():
+                # Até o próximo REFRESH, o resumo ainda contém os pedidos já arquivados, que são
+                # somados pelos agregados de employee_sales_archive: os dias arquivados ficam de fora
+                last_archived = select(
+                    func.coalesce(func.max(EmployeeSalesArchive.salesdate), literal_column("DATE '-infinity'"))
+                ).scalar_subquery()
+                summary = summary.where(EmployeeSalesDaily.salesdate > last_archived)
+            sources = [summary]
+        else:
+            period = cast(func.date_trunc(unit, Orders.orderdate), Date)
+            sources = [_order_sales_select(start_date, end_date, period)]
+        
+        if order_archive_enabled():
+            # Soma os agregados diários dos pedidos arquivados
+            sources.append(daily_source(EmployeeSalesArchive))
+        
+        sales = union_all(*sources).subquery('sales')
+        buckets = (
+            select(
+                sales.c.employeeid,
+                sales.c.period,
+                func.sum(sales.c.total_orders).label('total_orders'),
+                func.sum(sales.c.total_value).label('total_value')
+            )
+            .group_by(sales.c.employeeid, sales.c.period)
+            .subquery('buckets')
+        )
+        periods = select(
+            cast(
+                func.generate_series(
+                    func.date_trunc(unit, cast(start_date, DateTime)),
+                    cast(end_date, DateTime),
+                    literal_column(f"interval '1 {bucket}'")
+                ),
+                Date
+            ).label('period')
+        ).subquery('periods')
+        sellers = select(buckets.c.employeeid).distinct().subquery('sellers')
+        
+        # Períodos sem vendas entram com zero, para que acumulado e média móvel sigam o calendário
+        total_value = func.coalesce(buckets.c.total_value, 0)
+        running = {'partition_by': sellers.c.employeeid, 'order_by': periods.c.period}
+        rows = (
+            db.query(
+                Employees.firstname,
+                Employees.lastname,
+                periods.c.period,
+                func.coalesce(buckets.c.total_orders, 0).label('total_orders'),
+                func.round(cast(total_value, Numeric), 2).label('total_value'),
+                func.round(cast(func.sum(total_value).over(**running), Numeric), 2).label('running_total'),
+                func.round(
+                    cast(func.avg(total_value).over(**running, rows=(-(window - 1), 0)), Numeric), 2
+                ).label('moving_average')
+            )
+            .select_from(sellers)
+            .join(periods, true())
+            .join(Employees, Employees.employeeid == sellers.c.employeeid)
+            .outerjoin(buckets, and_(
+                buckets.c.employeeid == sellers.c.employeeid,
+                buckets.c.period == periods.c.period
+            ))
+            .order_by(Employees.firstname, Employees.lastname, periods.c.period)
+            .all()
+        )
+        
+        return [
+            {
+                'employee_name': f"{row.firstname} {row.lastname}",
+                'period': row.period,
+                'total_orders': int(row.total_orders),
+                'total_value': float(row.total_value),
+                'running_total': float(row.running_total),
+                'moving_average': float(row.moving_average)
+            }
+            for row in rows
+        ]
+        
+    except Exception as e:
+        print(f"Error ao calcular tendência de vendas: {e}")
+        return None
+    finally:
+        db.close()
+
+@with_statement_timeout("ranking")
+def get_team_sales_ranking(start_date: date, end_date: date) -> Optional[List[Dict[str, Any]]]:
+    """
+    Calcula o ranking de vendas por equipe (cada funcionário somado aos subordinados diretos
+    e indiretos) usando a closure table da hierarquia.
+    
+    Args:
+        start_date (date): Data de início do período
+        end_date (date): Data de fim do período
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: Lista no mesmo formato da versão do psycopg ou None em caso de erro
+    """
+    db: Session = get_sql_alchemy_read_session()
+    try:
+        sources = [_order_sales_select(start_date, end_date)]
+        
+        if order_archive_enabled():
+            # Soma os agregados diários dos pedidos arquivados
+            sources.append(
+                select(
+                    EmployeeSalesArchive.employeeid,
+                    func.sum(EmployeeSalesArchive.total_orders),
+                    func.sum(EmployeeSalesArchive.total_value)
+                )
+                .where(EmployeeSalesArchive.salesdate.between(start_date, end_date))
+                .group_by(EmployeeSalesArchive.employeeid)
+            )
+        
+        sales = union_all(*sources).subquery('sales')
+        employee_sales = (
+            select(
+                sales.c.employeeid,
+                func.sum(sales.c.total_orders).label('total_orders'),
+                func.sum(sales.c.total_value).label('total_value')
+            )
+            .group_by(sales.c.employeeid)
+            .subquery('employee_sales')
+        )
+        
+        team_value = func.round(cast(func.coalesce(func.sum(employee_sales.c.total_value), 0), Numeric), 2)
+        rows = (
+            db.query(
+                Employees.firstname,
+                Employees.lastname,
+                (func.count() - 1).label('team_size'),
+                func.coalesce(func.sum(employee_sales.c.total_orders), 0).label('team_orders'),
+                team_value.label('team_value'),
+                func.round(cast(func.coalesce(
+                    func.sum(employee_sales.c.total_value).filter(EmployeeClosure.depth == 0), 0
+                ), Numeric), 2).label('own_value')
+            )
+            .select_from(EmployeeClosure)
+            .join(Employees, Employees.employeeid == EmployeeClosure.ancestorid)
+            .outerjoin(employee_sales, employee_sales.c.employeeid == EmployeeClosure.descendantid)
+            .group_by(Employees.employeeid, Employees.firstname, Employees.lastname)
+            .order_by(desc('team_value'))
+            .all()
+        )
+        
+        return [
+            {
+                'employee_name': f"{row.firstname} {row.lastname}",
+                'team_size': row.team_size,
+                'team_orders': int(row.team_orders),
+                'team_value': float(row.team_value),
+                'own_value': float(row.own_value)
+            }
+            for row in rows
+        ]
+        
+    except Exception as e:
+        print(f"Error ao calcular ranking de vendas por equipe: {e}")
+        return None
+    finally:
+        db.close()
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKeyConstraint, Index, Integer, Numeric, PrimaryKeyConstraint, SmallInteger, String, Text
+from sqlalchemy import Date, DateTime, FetchedValue, ForeignKeyConstraint, Index, Integer, Numeric, PrimaryKeyConstraint, SmallInteger, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import datetime
 import decimal
@@ -133,6 +133,9 @@ class Orders(Base):
         Index('fki_fk_orders_customers', 'employeeid'),
         {'schema': 'northwind'}
     )
+    # Sem eager defaults, o INSERT não pede de volta (RETURNING) os totais, que só existem após
+    # `totals backfill`
+    __mapper_args__ = {'eager_defaults': False}
 
     orderid: Mapped[int] = mapped_column(Integer, primary_key=True)
     customerid: Mapped[str] = mapped_column(String(5))
@@ -148,6 +151,10 @@ class Orders(Base):
     shippostalcode: Mapped[Optional[str]] = mapped_column(String(9))
     shipcountry: Mapped[Optional[str]] = mapped_column(String(15))
     shipperid: Mapped[Optional[int]] = mapped_column(Integer)
+    # Totais mantidos por triggers (app/dao/order_totals.py): existem apenas após `totals backfill`,
+    # por isso não são carregados por padrão e ficam fora do INSERT
+    order_total: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric, deferred=True, server_default=FetchedValue())
+    line_count: Mapped[Optional[int]] = mapped_column(Integer, deferred=True, server_default=FetchedValue())
 
     customers: Mapped['Customers'] = relationship('Customers', back_populates='orders')
     employees: Mapped['Employees'] = relationship('Employees', back_populates='orders')
@@ -164,12 +171,112 @@ class OrderDetails(Base):
         Index('fki_fk_order_details_products', 'productid'),
         {'schema': 'northwind'}
     )
+    # Sem eager defaults, o INSERT não pede de volta (RETURNING) as colunas com server_default,
+    # que podem não existir no banco (orderdate e net_amount abaixo)
+    __mapper_args__ = {'eager_defaults': False}
 
     orderid: Mapped[int] = mapped_column(Integer, primary_key=True)
     productid: Mapped[int] = mapped_column(Integer, primary_key=True)
     unitprice: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric(13, 4))
     quantity: Mapped[Optional[int]] = mapped_column(SmallInteger)
     discount: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric(10, 4))
+    # Existe apenas com as tabelas particionadas por data (app/dao/partitioning.py): não é carregada
+    # por padrão e, quando vazia, fica fora do INSERT
+    orderdate: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, deferred=True, server_default=FetchedValue())
+    # Totais mantidos por triggers (app/dao/order_totals.py): existem apenas após `totals backfill`,
+    # por isso não são carregados por padrão e ficam fora do INSERT
+    net_amount: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric, deferred=True, server_default=FetchedValue())
 
     orders: Mapped['Orders'] = relationship('Orders', back_populates='order_details')
     products: Mapped['Products'] = relationship('Products', back_populates='order_details')
+
+
+class OrdersArchive(Base):
+    __tablename__ = 'orders_archive'
+    __table_args__ = (
+        PrimaryKeyConstraint('orderid', name='orders_archive_pkey'),
+        {'schema': 'northwind'}
+    )
+
+    orderid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    customerid: Mapped[str] = mapped_column(String(5))
+    employeeid: Mapped[int] = mapped_column(Integer)
+    orderdate: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime)
+    requireddate: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime)
+    shippeddate: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime)
+    freight: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric(15, 4))
+    shipname: Mapped[Optional[str]] = mapped_column(String(35))
+    shipaddress: Mapped[Optional[str]] = mapped_column(String(50))
+    shipcity: Mapped[Optional[str]] = mapped_column(String(15))
+    shipregion: Mapped[Optional[str]] = mapped_column(String(15))
+    shippostalcode: Mapped[Optional[str]] = mapped_column(String(9))
+    shipcountry: Mapped[Optional[str]] = mapped_column(String(15))
+    shipperid: Mapped[Optional[int]] = mapped_column(Integer)
+    order_total: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric, deferred=True, server_default=FetchedValue())
+    line_count: Mapped[Optional[int]] = mapped_column(Integer, deferred=True, server_default=FetchedValue())
+
+    # As tabelas de arquivo não têm chaves estrangeiras; os relacionamentos são apenas para leitura
+    customers: Mapped['Customers'] = relationship(
+        'Customers', primaryjoin='foreign(OrdersArchive.customerid) == Customers.customerid', viewonly=True)
+    employees: Mapped['Employees'] = relationship(
+        'Employees', primaryjoin='foreign(OrdersArchive.employeeid) == Employees.employeeid', viewonly=True)
+    order_details: Mapped[List['OrderDetailsArchive']] = relationship(
+        'OrderDetailsArchive', primaryjoin='foreign(OrderDetailsArchive.orderid) == OrdersArchive.orderid', viewonly=True)
+
+
+class OrderDetailsArchive(Base):
+    __tablename__ = 'order_details_archive'
+    __table_args__ = (
+        PrimaryKeyConstraint('orderid', 'productid', name='order_details_archive_pkey'),
+        {'schema': 'northwind'}
+    )
+
+    orderid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    productid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    unitprice: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric(13, 4))
+    quantity: Mapped[Optional[int]] = mapped_column(SmallInteger)
+    discount: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric(10, 4))
+    net_amount: Mapped[Optional[decimal.Decimal]] = mapped_column(Numeric, deferred=True, server_default=FetchedValue())
+
+    products: Mapped['Products'] = relationship(
+        'Products', primaryjoin='foreign(OrderDetailsArchive.productid) == Products.productid', viewonly=True)
+
+
+class EmployeeSalesArchive(Base):
+    __tablename__ = 'employee_sales_archive'
+    __table_args__ = (
+        PrimaryKeyConstraint('employeeid', 'salesdate', name='employee_sales_archive_pkey'),
+        {'schema': 'northwind'}
+    )
+
+    employeeid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    salesdate: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    total_orders: Mapped[int] = mapped_column(Integer)
+    total_value: Mapped[decimal.Decimal] = mapped_column(Numeric)
+
+
+class EmployeeSalesDaily(Base):
+    # Materialized view criada por app/dao/sales_summary.py (somente leitura)
+    __tablename__ = 'employee_sales_daily'
+    __table_args__ = (
+        PrimaryKeyConstraint('employeeid', 'salesdate', name='employee_sales_daily_pkey'),
+        {'schema': 'northwind'}
+    )
+
+    employeeid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    salesdate: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    total_orders: Mapped[int] = mapped_column(Integer)
+    total_value: Mapped[decimal.Decimal] = mapped_column(Numeric)
+
+
+class EmployeeClosure(Base):
+    # Closure table da hierarquia (reportsto), mantida por app/dao/employee_hierarchy.py
+    __tablename__ = 'employee_closure'
+    __table_args__ = (
+        PrimaryKeyConstraint('ancestorid', 'descendantid', name='employee_closure_pkey'),
+        {'schema': 'northwind'}
+    )
+
+    ancestorid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    descendantid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer)
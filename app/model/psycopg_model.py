@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 import datetime
 import decimal
 
@@ -138,11 +138,79 @@ class Orders:
 class OrderDetails:
     def __init__(self, orderid: int = None, productid: int = None, 
                  unitprice: Optional[decimal.Decimal] = None, quantity: Optional[int] = None,
-                 discount: Optional[decimal.Decimal] = None):
+                 discount: Optional[decimal.Decimal] = None, orderdate: Optional[datetime.datetime] = None):
         self.orderid = orderid
         self.productid = productid
         self.unitprice = unitprice
         self.quantity = quantity
         self.discount = discount
+        # Cópia da data do pedido, gravada apenas com as tabelas particionadas por data
+        self.orderdate = orderdate
         self.orders = None
         self.products = None
+
+
+# Registros compactos e imutáveis usados pelos DAOs baseados em SQL (psycopg, sharded e asyncpg)
+# e pelos caminhos de gravação em lote. Por serem tuplas, não têm __dict__ por instância nem os
+# atributos de relacionamento das classes acima. A ordem dos campos é a ordem das colunas dos
+# INSERTs, então a conversão de/para linhas do banco é uma cópia de tupla.
+
+class OrderRecord(NamedTuple):
+    orderid: Optional[int] = None
+    customerid: Optional[str] = None
+    employeeid: Optional[int] = None
+    orderdate: Optional[datetime.datetime] = None
+    requireddate: Optional[datetime.datetime] = None
+    shippeddate: Optional[datetime.datetime] = None
+    shipperid: Optional[int] = None
+    freight: Optional[decimal.Decimal] = None
+    shipname: Optional[str] = None
+    shipaddress: Optional[str] = None
+    shipcity: Optional[str] = None
+    shipregion: Optional[str] = None
+    shippostalcode: Optional[str] = None
+    shipcountry: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "OrderRecord":
+        """
+        Cria o registro a partir de uma linha com as colunas na ordem dos campos
+        (colunas finais ausentes ficam None)
+        """
+        return cls(*row)
+
+    def to_insert_params(self, orderid: Optional[int] = None) -> tuple:
+        """
+        Parâmetros do INSERT em northwind.orders, opcionalmente com outro orderid
+        """
+        if orderid is None:
+            return tuple(self)
+        return (orderid,) + self[1:]
+
+
+class OrderDetailRecord(NamedTuple):
+    orderid: Optional[int] = None
+    productid: Optional[int] = None
+    unitprice: Optional[decimal.Decimal] = None
+    quantity: Optional[int] = None
+    discount: Optional[decimal.Decimal] = None
+    # Cópia da data do pedido, gravada apenas com as tabelas particionadas por data
+    orderdate: Optional[datetime.datetime] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "OrderDetailRecord":
+        """
+        Cria o registro a partir de uma linha com as colunas na ordem dos campos
+        (colunas finais ausentes ficam None)
+        """
+        return cls(*row)
+
+    def to_insert_params(self, orderid: Optional[int] = None, partitioned: bool = False) -> tuple:
+        """
+        Parâmetros do INSERT em northwind.order_details (com orderdate apenas nas tabelas
+        particionadas), opcionalmente com outro orderid
+        """
+        params = self if partitioned else self[:5]
+        if orderid is None:
+            return tuple(params)
+        return (orderid,) + params[1:]
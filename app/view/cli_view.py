@@ -1,7 +1,70 @@
 from app.controller.order_controller import OrderController
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Callable
 from datetime import datetime, date
 
+try:
+    import readline
+except ImportError:  # Indisponível no Windows: os nomes são digitados sem autocompletar
+    readline = None
+
+def _name_completer(search: Callable) -> Callable:
+    """
+    Cria um completer do readline que sugere os nomes encontrados por `search` para o texto digitado
+    """
+    matches = []
+    
+    def complete(text: str, state: int) -> str | None:
+        if state == 0:
+            success, results = search(text, 10)
+            matches[:] = [result['name'] for result in results] if success else []
+        return matches[state] if state < len(matches) else None
+    
+    return complete
+
+def _input_name(prompt: str, search: Callable) -> str:
+    """
+    Lê o nome de um cliente ou produto com autocompletar (Tab). Se não existir um nome igual
+    ao digitado, oferece os mais parecidos antes de seguir com o pedido.
+    
+    Args:
+        prompt (str): Texto exibido ao usuário
+        search (Callable): OrderController.search_customers ou OrderController.search_products
+        
+    Returns:
+        str: Nome escolhido ou, sem escolha, o nome digitado
+    """
+    if readline is not None:
+        readline.set_completer(_name_completer(search))
+        # Nomes têm espaços: o texto completado é a linha inteira
+        readline.set_completer_delims("")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+    try:
+        typed = input(prompt)
+    finally:
+        if readline is not None:
+            readline.set_completer(None)
+    
+    if not typed.strip():
+        return typed
+    
+    success, results = search(typed, 5)
+    if not success or not results:
+        return typed
+    if results[0]['match'] == "exact":
+        # Igual a menos de maiúsculas e acentos: usa o nome como está cadastrado
+        return results[0]['name']
+    
+    print("Nome não encontrado. Você quis dizer:")
+    for number, result in enumerate(results, start=1):
+        print(f"  {number}. {result['name']}")
+    choice = input("Escolha um número (Enter mantém o nome digitado): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(results):
+        return results[int(choice) - 1]['name']
+    return typed
+
 def get_order_input() -> dict:
     """
     Coleta todos os dados necessários para criar um novo pedido através da linha de comando.
@@ -12,7 +75,7 @@ def get_order_input() -> dict:
     order_data = {}
     
     print("\n===== DADOS DO CLIENTE =====")
-    order_data['customer'] = input("Nome Cliente: ")
+    order_data['customer'] = _input_name("Nome Cliente: ", OrderController.search_customers)
     
     print("\n===== DADOS DO FUNCIONÁRIO =====")
     first_name = input("Primeiro nome do funcionário: ")
@@ -48,7 +111,7 @@ def get_order_input() -> dict:
         print(f"\nItem #{len(items_data) + 1}")
         item = {}
         
-        item['product_name'] = input("Nome do produto: ")
+        item['product_name'] = _input_name("Nome do produto: ", OrderController.search_products)
         
         try:
             item['quantity'] = int(input("Quantidade: "))
@@ -173,6 +236,91 @@ def display_employee_ranking(ranking_data: list) -> None:
     
     print(separator)
 
+def display_team_ranking(ranking_data: list) -> None:
+    """
+    Exibe o ranking de vendas por equipe (funcionário somado aos seus subordinados).
+    
+    Args:
+        ranking_data (list): Lista de dados do ranking a serem exibidos
+    """
+    if isinstance(ranking_data, str):
+        print(f"\n{ranking_data}")
+        return
+    
+    separator = "=" * 95
+    
+    print(separator)
+    print("RANKING DE VENDAS POR EQUIPE")
+    print(separator)
+    
+    print(f"{'POSIÇÃO':<8} {'GESTOR':<25} {'EQUIPE':>7} {'PEDIDOS':>9} {'VALOR DA EQUIPE':>18} {'VALOR PRÓPRIO':>18}")
+    print("-" * 95)
+    
+    for i, team in enumerate(ranking_data, 1):
+        print(
+            f"{i:<8} {team['employee_name'][:25]:<25} {team['team_size']:>7} {team['team_orders']:>9} "
+            f"{team['team_value']:>18.2f} {team['own_value']:>18.2f}"
+        )
+    
+    print(separator)
+
+def display_sales_rollup(rollup_data: list) -> None:
+    """
+    Exibe o resumo de vendas agrupado por combinações de dimensões.
+    
+    Args:
+        rollup_data (list): Linhas do resumo a serem exibidas
+    """
+    if isinstance(rollup_data, str):
+        print(f"\n{rollup_data}")
+        return
+    
+    separator = "=" * 95
+    
+    print(separator)
+    print("RESUMO DE VENDAS")
+    print(separator)
+    
+    print(f"{'AGRUPAMENTO':<45} {'QTD PEDIDOS':<15} {'VALOR TOTAL':>15}")
+    print("-" * 95)
+    
+    for row in rollup_data:
+        if row['grouped_by']:
+            label = " / ".join(f"{row[dimension]}" for dimension in row['grouped_by'])
+        else:
+            label = "TOTAL GERAL"
+        print(f"{label[:45]:<45} {row['total_orders']:<15} {row['total_value']:>15.2f}")
+    
+    print(separator)
+
+def display_sales_trend(trend_data: list) -> None:
+    """
+    Exibe a tendência de vendas por funcionário e período.
+    
+    Args:
+        trend_data (list): Linhas da tendência a serem exibidas
+    """
+    if isinstance(trend_data, str):
+        print(f"\n{trend_data}")
+        return
+    
+    separator = "=" * 95
+    
+    print(separator)
+    print("TENDÊNCIA DE VENDAS POR FUNCIONÁRIO")
+    print(separator)
+    
+    print(f"{'FUNCIONÁRIO':<25} {'PERÍODO':<12} {'PEDIDOS':>8} {'VALOR':>14} {'ACUMULADO':>16} {'MÉDIA MÓVEL':>14}")
+    print("-" * 95)
+    
+    for row in trend_data:
+        print(
+            f"{row['employee_name'][:25]:<25} {str(row['period']):<12} {row['total_orders']:>8} "
+            f"{row['total_value']:>14.2f} {row['running_total']:>16.2f} {row['moving_average']:>14.2f}"
+        )
+    
+    print(separator)
+
 def run_order_creation(mode: str) -> None:
     """
     Função principal que orquestra o processo de criação de pedido,
@@ -198,6 +346,14 @@ def run_order_creation(mode: str) -> None:
             items_data=order_data['items'],
             shipping_data=order_data['shipping']
         )
+    elif mode == "auto":
+        success, message = OrderController.create_new_order_auto(
+            customer_name=order_data['customer'],
+            employee_first_name=order_data['employee'][0],
+            employee_last_name=order_data['employee'][1],
+            items_data=order_data['items'],
+            shipping_data=order_data['shipping']
+        )
     
     display_result(success, message)
 
@@ -214,6 +370,8 @@ def run_order_report(mode: str) -> None:
         success, data = OrderController.get_order_report_psycopg(order_id)
     elif mode == "sqlalchemy":
         success, data = OrderController.get_order_report_sqlalchemy(order_id)
+    elif mode == "auto":
+        success, data = OrderController.get_order_report_auto(order_id)
     
     if success:
         display_order_report(data)
@@ -235,11 +393,94 @@ def run_employee_ranking_report(mode: str) -> None:
         success, data = OrderController.get_employee_ranking_report_psycopg(start_date, end_date)
     elif mode == "sqlalchemy":
         success, data = OrderController.get_employee_ranking_report_sqlalchemy(start_date, end_date)
+    elif mode == "auto":
+        success, data = OrderController.get_employee_ranking_report_auto(start_date, end_date)
     
     if success:
         display_employee_ranking(data)
     else:
         print(f"\n[ERRO] {data}")
 
+def run_team_ranking_report(mode: str) -> None:
+    """
+    Função principal que orquestra o processo de geração do ranking por equipe,
+    coletando o intervalo de datas e exibindo o ranking.
+    """
+    print("\n=== RANKING DE VENDAS POR EQUIPE ===")
+    
+    start_date, end_date = get_date_range_input()
+    
+    print(f"\nGerando ranking por equipe para o período de {start_date} a {end_date}...")
+    
+    if mode == "psycopg":
+        success, data = OrderController.get_team_ranking_report_psycopg(start_date, end_date)
+    elif mode == "sqlalchemy":
+        success, data = OrderController.get_team_ranking_report_sqlalchemy(start_date, end_date)
+    elif mode == "auto":
+        success, data = OrderController.get_team_ranking_report_auto(start_date, end_date)
+    
+    if success:
+        display_team_ranking(data)
+    else:
+        print(f"\n[ERRO] {data}")
+
+def run_sales_rollup_report(mode: str) -> None:
+    """
+    Função principal que orquestra o processo de geração do resumo de vendas,
+    coletando o intervalo de datas e as dimensões e exibindo o resumo.
+    """
+    print("\n=== RESUMO DE VENDAS ===")
+    
+    start_date, end_date = get_date_range_input()
+    
+    print("Dimensões: employee, customer, product, category, ship_country")
+    rollup_str = input("Dimensões hierárquicas separadas por vírgula (em branco para cada dimensão isolada): ")
+    rollup = [dimension.strip() for dimension in rollup_str.split(",") if dimension.strip()]
+    
+    print(f"\nGerando resumo para o período de {start_date} a {end_date}...")
+    
+    if mode == "psycopg":
+        success, data = OrderController.get_sales_rollup_report_psycopg(start_date, end_date, rollup=rollup)
+    elif mode == "sqlalchemy":
+        success, data = OrderController.get_sales_rollup_report_sqlalchemy(start_date, end_date, rollup=rollup)
+    elif mode == "auto":
+        success, data = OrderController.get_sales_rollup_report_auto(start_date, end_date, rollup=rollup)
+    
+    if success:
+        display_sales_rollup(data)
+    else:
+        print(f"\n[ERRO] {data}")
+
+def run_sales_trend_report(mode: str) -> None:
+    """
+    Função principal que orquestra o processo de geração da tendência de vendas,
+    coletando o intervalo de datas, a granularidade e a janela da média móvel.
+    """
+    print("\n=== TENDÊNCIA DE VENDAS ===")
+    
+    start_date, end_date = get_date_range_input()
+    
+    bucket = input("Período (day, week, month) [month]: ").strip() or "month"
+    window_str = input("Períodos da média móvel [3]: ").strip()
+    try:
+        window = int(window_str) if window_str else 3
+    except ValueError:
+        print("\n[ERRO] A janela da média móvel deve ser um número inteiro.")
+        return
+    
+    print(f"\nGerando tendência para o período de {start_date} a {end_date}...")
+    
+    if mode == "psycopg":
+        success, data = OrderController.get_sales_trend_report_psycopg(start_date, end_date, bucket, window)
+    elif mode == "sqlalchemy":
+        success, data = OrderController.get_sales_trend_report_sqlalchemy(start_date, end_date, bucket, window)
+    elif mode == "auto":
+        success, data = OrderController.get_sales_trend_report_auto(start_date, end_date, bucket, window)
+    
+    if success:
+        display_sales_trend(data)
+    else:
+        print(f"\n[ERRO] {data}")
+
 if __name__ == "__main__":
     run_order_creation()
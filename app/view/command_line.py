@@ -0,0 +1,757 @@
+from app.controller.order_controller import OrderController, JOB_KINDS, NAME_SEARCH_CATALOGS, SALES_ROLLUP_DIMENSIONS, SALES_TREND_BUCKETS
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, NamedTuple, TextIO
+import argparse
+import contextlib
+import json
+import sys
+
+BACKENDS = ("psycopg", "sqlalchemy", "sharded", "auto")
+EXPORT_CHUNK_SIZE = 500
+FEED_BACKENDS = ("psycopg", "sqlalchemy", "auto")
+
+def _parse_date(value: str) -> date:
+    """
+    Converte uma data no formato AAAA-MM-DD (usado como `type` do argparse).
+    """
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data inválida '{value}'. Use AAAA-MM-DD.")
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def write_json(payload: Any, output: TextIO) -> None:
+    """
+    Escreve um objeto como uma linha JSON na saída informada.
+    """
+    output.write(json.dumps(payload, default=json_default, ensure_ascii=False))
+    output.write("\n")
+    output.flush()
+
+class InvalidLine(NamedTuple):
+    """
+    Linha de um arquivo JSON Lines que não pôde ser lida, no lugar do valor da linha
+    """
+    line_number: int
+    error: str
+
+    def as_result(self) -> dict:
+        return {'ok': False, 'line': self.line_number, 'error': f"JSON inválido: {self.error}"}
+
+def _read_orders(source: TextIO) -> list:
+    """
+    Lê pedidos de um arquivo: aceita um objeto JSON, uma lista JSON ou um objeto por linha (JSON Lines).
+    As linhas inválidas são devolvidas como InvalidLine, para que as demais sejam processadas.
+    """
+    content = source.read().strip()
+    if not content:
+        return []
+    try:
+        data = json.loads(content)
+        return data if isinstance(data, list) else [data]
+    except json.JSONDecodeError:
+        pass
+
+    orders = []
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            orders.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            orders.append(InvalidLine(line_number, str(e)))
+    return orders
+
+def create_order(backend: str, order: dict) -> dict:
+    """
+    Cria um pedido a partir de um dicionário no mesmo formato coletado por get_order_input:
+    {"customer": ..., "employee": [nome, sobrenome], "shipping": {...}, "items": [...]}
+    """
+    if isinstance(order, InvalidLine):
+        return order.as_result()
+    if not isinstance(order, dict):
+        return {'ok': False, 'error': "Pedido inválido: o pedido deve ser um objeto JSON."}
+    try:
+        first_name, last_name = order['employee']
+        create = getattr(OrderController, f"create_new_order_{backend}")
+        success, message = create(
+            customer_name=order['customer'],
+            employee_first_name=first_name,
+            employee_last_name=last_name,
+            items_data=order.get('items', []),
+            shipping_data=order.get('shipping', {})
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return {'ok': False, 'error': f"Pedido inválido: {e}"}
+
+    if success:
+        return {'ok': True, 'message': message}
+    return {'ok': False, 'error': message}
+
+def order_report(backend: str, order_id: int) -> dict:
+    """
+    Obtém o relatório de um pedido.
+    """
+    report = getattr(OrderController, f"get_order_report_{backend}")
+    success, data = report(order_id)
+    if success:
+        return {'ok': True, 'order': data}
+    return {'ok': False, 'order_id': order_id, 'error': data}
+
+def employee_ranking(backend: str, start_date: date, end_date: date) -> dict:
+    """
+    Obtém o ranking de vendas por funcionário no período.
+    """
+    ranking = getattr(OrderController, f"get_employee_ranking_report_{backend}")
+    success, data = ranking(start_date, end_date)
+    if not success:
+        return {'ok': False, 'error': data}
+    # O controller devolve uma mensagem quando não há pedidos no período
+    return {'ok': True, 'ranking': data if isinstance(data, list) else []}
+
+def team_ranking(backend: str, start_date: date, end_date: date) -> dict:
+    """
+    Obtém o ranking de vendas por equipe (hierarquia de employees.reportsto) no período.
+    """
+    ranking = getattr(OrderController, f"get_team_ranking_report_{backend}", None)
+    if ranking is None:
+        return {'ok': False, 'error': f"Ranking por equipe não disponível no backend {backend}."}
+    success, data = ranking(start_date, end_date)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'ranking': data if isinstance(data, list) else []}
+
+def _parse_dimensions(value: str) -> list[str]:
+    """
+    Converte uma lista de dimensões separadas por vírgula (usado como `type` do argparse).
+    "total" (ou vazio) representa o total geral.
+    """
+    dimensions = [dimension.strip() for dimension in value.split(",") if dimension.strip()]
+    if dimensions == ["total"]:
+        return []
+    for dimension in dimensions:
+        if dimension not in SALES_ROLLUP_DIMENSIONS:
+            raise argparse.ArgumentTypeError(
+                f"Dimensão inválida '{dimension}'. Use: {', '.join(SALES_ROLLUP_DIMENSIONS)} ou total."
+            )
+    return dimensions
+
+def sales_rollup(backend: str, start_date: date, end_date: date,
+                 grouping_sets: list[list[str]] | None = None, rollup: list[str] | None = None) -> dict:
+    """
+    Obtém o resumo de vendas do período agregado pelas combinações de dimensões informadas.
+    """
+    report = getattr(OrderController, f"get_sales_rollup_report_{backend}", None)
+    if report is None:
+        return {'ok': False, 'error': f"Resumo de vendas não disponível no backend {backend}."}
+    success, data = report(start_date, end_date, grouping_sets, rollup)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'rollup': data if isinstance(data, list) else []}
+
+def sales_trend(backend: str, start_date: date, end_date: date, bucket: str = "month",
+                window: int = 3, use_summary: bool = False) -> dict:
+    """
+    Obtém a tendência de vendas por funcionário (por período, acumulada e em média móvel).
+    """
+    report = getattr(OrderController, f"get_sales_trend_report_{backend}", None)
+    if report is None:
+        return {'ok': False, 'error': f"Tendência de vendas não disponível no backend {backend}."}
+    success, data = report(start_date, end_date, bucket, window, use_summary)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'trend': data if isinstance(data, list) else []}
+
+def list_orders(backend: str, customer: str | None = None, employee: list[str] | None = None,
+                start_date: date | None = None, end_date: date | None = None,
+                cursor: str | None = None, page_size: int = 50) -> dict:
+    """
+    Lista uma página de pedidos filtrados por cliente, funcionário e/ou período.
+    """
+    listing = getattr(OrderController, f"list_orders_{backend}", None)
+    if listing is None:
+        return {'ok': False, 'error': f"Listagem de pedidos não disponível no backend {backend}."}
+    success, data = listing(customer, tuple(employee) if employee else None, start_date, end_date, cursor, page_size)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, **data}
+
+def search_names(catalog: str, term: str, limit: int = 10) -> dict:
+    """
+    Busca clientes ou produtos por nome parcial ou com erros de digitação.
+    """
+    if catalog not in NAME_SEARCH_CATALOGS:
+        return {'ok': False, 'error': f"Catálogo inválido: {catalog}. Use: {', '.join(NAME_SEARCH_CATALOGS)}."}
+    search = getattr(OrderController, f"search_{catalog}")
+    success, data = search(term, limit)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'results': data}
+
+def quote_baskets(baskets: list) -> dict:
+    """
+    Cota cestas de produtos sem criar pedidos. Cada cesta pode ser uma lista de itens ou um
+    pedido no formato de create-order (apenas "items" é usado).
+    """
+    baskets = [basket.get('items') if isinstance(basket, dict) else basket for basket in baskets]
+    success, data = OrderController.quote_baskets(baskets)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'quotes': data}
+
+def read_order_feed(backend: str, consumer: str, offset: str | None = None, batch_size: int = 100) -> dict:
+    """
+    Lê os próximos pedidos novos do feed de um consumidor, sem confirmar o offset.
+    """
+    if backend not in FEED_BACKENDS:
+        return {'ok': False, 'error': f"O feed de pedidos não está disponível no backend {backend}."}
+    read = getattr(OrderController, f"read_order_feed_{backend}")
+    success, data = read(consumer, offset, batch_size)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, **data}
+
+def ack_order_feed(consumer: str, offset: str) -> dict:
+    """
+    Confirma o processamento dos pedidos do feed até o offset informado.
+    """
+    success, data = OrderController.ack_order_feed(consumer, offset)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'offset': data}
+
+def tail_order_feed(backend: str, consumer: str, offset: str | None, batch_size: int, follow: bool,
+                    poll_interval: float, output: TextIO) -> bool:
+    """
+    Escreve os pedidos novos do feed (um por linha) e confirma o offset depois de cada leitura.
+    Com follow, continua esperando pedidos novos (avisos do NOTIFY, ou uma nova leitura a cada
+    poll_interval segundos) até ser interrompido.
+    """
+    from app.dao.order_feed import OrderFeedListener
+
+    listener = OrderFeedListener()
+    if follow:
+        listener.listen()
+    try:
+        while True:
+            result = read_order_feed(backend, consumer, offset, batch_size)
+            if not result['ok']:
+                write_json(result, output)
+                return False
+            for entry in result['orders']:
+                write_json(entry, output)
+            if result['orders']:
+                # Só confirma depois de escrever: uma falha antes disso repete a leitura (pelo menos uma vez)
+                acked = ack_order_feed(consumer, result['offset'])
+                if not acked['ok']:
+                    write_json(acked, output)
+                    return False
+                offset = result['offset']
+            if len(result['orders']) < batch_size:
+                if not follow:
+                    return True
+                listener.wait(poll_interval)
+    except KeyboardInterrupt:
+        return True
+    finally:
+        listener.close()
+
+def submit_job(backend: str, kind: str, params: dict) -> dict:
+    """
+    Enfileira um relatório para execução em segundo plano (ver o comando jobs worker).
+    """
+    success, data = OrderController.submit_job(kind, params, backend)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, **data}
+
+def job_status(job_id: str, include_result: bool = False) -> dict:
+    """
+    Obtém o status de um job e, se pedido, o seu resultado.
+    """
+    success, data = OrderController.get_job(job_id, include_result)
+    if not success:
+        return {'ok': False, 'error': data}
+    return {'ok': True, 'job': data}
+
+def write_job_result(job_id: str, output: TextIO) -> bool:
+    """
+    Escreve o resultado de um job concluído. Os pedidos de jobs 'export' e 'reports' são
+    escritos como JSON Lines (um relatório de pedido por linha, como no comando export).
+    """
+    result = job_status(job_id, include_result=True)
+    if not result['ok']:
+        write_json(result, output)
+        return False
+
+    job = result['job']
+    if job['status'] != "done":
+        error = job['error'] or f"O job ainda não foi concluído (status: {job['status']})."
+        write_json({'ok': False, 'job_id': job_id, 'status': job['status'], 'error': error}, output)
+        return False
+
+    if job['kind'] in ("export", "reports"):
+        for order in job['result']['orders']:
+            write_json(order, output)
+        for order_id in job['result']['not_found']:
+            write_json({'ok': False, 'order_id': order_id, 'error': f"Erro: Pedido com ID {order_id} não encontrado."}, output)
+        return not job['result']['not_found']
+
+    write_json({'ok': True, 'job_id': job_id, 'result': job['result']}, output)
+    return True
+
+def run_job_workers(workers: int, poll_interval: float, drain: bool, output: TextIO) -> bool:
+    """
+    Executa os jobs enfileirados com um pool de workers até ser interrompido (ou, com drain,
+    até a fila esvaziar).
+    """
+    from app.controller.job_worker import JobWorkerPool
+
+    pool = JobWorkerPool(workers, poll_interval)
+    pool.start(drain)
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        pool.stop()
+    write_json({'ok': True, 'executed': pool.executed}, output)
+    return True
+
+def export_orders(backend: str, start_date: date, end_date: date, output: TextIO) -> bool:
+    """
+    Exporta os pedidos de um período como JSON Lines (um relatório de pedido por linha).
+    """
+    list_ids = getattr(OrderController, f"list_order_ids_{backend}")
+    success, order_ids = list_ids(start_date, end_date)
+    if not success:
+        write_json({'ok': False, 'error': order_ids}, output)
+        return False
+
+    # Os pedidos são buscados em blocos, informando o período para limitar as partições lidas
+    get_reports = getattr(OrderController, f"get_order_reports_{backend}")
+    all_ok = True
+    for position in range(0, len(order_ids), EXPORT_CHUNK_SIZE):
+        chunk = order_ids[position:position + EXPORT_CHUNK_SIZE]
+        success, orders = get_reports(chunk, start_date, end_date)
+        if not success:
+            write_json({'ok': False, 'error': orders}, output)
+            return False
+        for order_id in chunk:
+            if order_id in orders:
+                write_json(orders[order_id], output)
+            else:
+                all_ok = False
+                write_json({'ok': False, 'order_id': order_id, 'error': f"Erro: Pedido com ID {order_id} não encontrado."}, output)
+    return all_ok
+
+def execute_request(backend: str, request: dict) -> dict:
+    """
+    Executa uma requisição do modo batch. Formatos aceitos:
+        {"command": "create-order", "order": {...}}
+        {"command": "report", "order_ids": [10248, 10249]}
+        {"command": "ranking", "from": "1997-01-01", "to": "1997-12-31"}
+        {"command": "team-ranking", "from": "1997-01-01", "to": "1997-12-31"}
+        {"command": "rollup", "from": "1997-01-01", "to": "1997-12-31", "grouping_sets": [["employee"], []]}
+        {"command": "trend", "from": "1996-07-01", "to": "1998-06-30", "bucket": "month", "window": 3}
+        {"command": "list-orders", "customer": "Alfreds Futterkiste", "from": "1997-01-01", "page_size": 20, "cursor": null}
+        {"command": "search", "catalog": "customers", "term": "alfred", "limit": 10}
+        {"command": "quote", "baskets": [[{"product_name": "Chai", "quantity": 10, "discount": 0.05}]]}
+        {"command": "feed-read", "consumer": "faturamento", "offset": null, "batch_size": 100}
+        {"command": "feed-ack", "consumer": "faturamento", "offset": "<offset da leitura>"}
+        {"command": "job-submit", "kind": "ranking", "params": {"from": "1997-01-01", "to": "1997-12-31"}}
+        {"command": "job-status", "job_id": "<ID do job>", "result": true}
+    A chave opcional "backend" sobrescreve o backend da linha de comando.
+    """
+    if not isinstance(request, dict):
+        return {'ok': False, 'error': "Requisição inválida: cada linha deve ser um objeto JSON."}
+
+    backend = request.get('backend', backend)
+    if backend not in BACKENDS:
+        return {'ok': False, 'error': f"Backend inválido: {backend}"}
+
+    command = request.get('command')
+    try:
+        if command == "create-order":
+            return create_order(backend, request['order'])
+        if command == "report":
+            return {'ok': True, 'results': [order_report(backend, int(order_id)) for order_id in request['order_ids']]}
+        if command == "ranking":
+            return employee_ranking(backend, _parse_date(request['from']), _parse_date(request['to']))
+        if command == "team-ranking":
+            return team_ranking(backend, _parse_date(request['from']), _parse_date(request['to']))
+        if command == "rollup":
+            return sales_rollup(backend, _parse_date(request['from']), _parse_date(request['to']),
+                                request.get('grouping_sets'), request.get('rollup'))
+        if command == "trend":
+            return sales_trend(backend, _parse_date(request['from']), _parse_date(request['to']),
+                               request.get('bucket', "month"), int(request.get('window', 3)),
+                               bool(request.get('summary', False)))
+        if command == "list-orders":
+            return list_orders(backend, request.get('customer'), request.get('employee'),
+                               _parse_date(request['from']) if request.get('from') else None,
+                               _parse_date(request['to']) if request.get('to') else None,
+                               request.get('cursor'), int(request.get('page_size', 50)))
+        if command == "search":
+            return search_names(request['catalog'], request['term'], int(request.get('limit', 10)))
+        if command == "quote":
+            return quote_baskets(request['baskets'])
+        if command == "feed-read":
+            return read_order_feed(backend, request['consumer'], request.get('offset'),
+                                   int(request.get('batch_size', 100)))
+        if command == "feed-ack":
+            return ack_order_feed(request['consumer'], request['offset'])
+        if command == "job-submit":
+            return submit_job(backend, request['kind'], request['params'])
+        if command == "job-status":
+            return job_status(request['job_id'], bool(request.get('result', False)))
+    except (AttributeError, KeyError, TypeError, ValueError, argparse.ArgumentTypeError) as e:
+        return {'ok': False, 'error': f"Requisição inválida: {e}"}
+
+    return {'ok': False, 'error': f"Comando desconhecido: {command}"}
+
+def run_batch(backend: str, source: TextIO, output: TextIO) -> bool:
+    """
+    Processa requisições JSON (uma por linha) da entrada até o fim do arquivo,
+    escrevendo uma resposta JSON por linha na mesma ordem.
+    """
+    all_ok = True
+    for line in source:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            result = {'ok': False, 'error': f"JSON inválido: {e}"}
+        else:
+            result = execute_request(backend, request)
+        all_ok = all_ok and result['ok']
+        write_json(result, output)
+    return all_ok
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Sistema de Pedidos Northwind - interface não interativa (saída em JSON)"
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="psycopg",
+                        help="Método de acesso ao banco (padrão: psycopg)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create-order", help="Cria pedidos a partir de JSON")
+    create_parser.add_argument("file", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin,
+                               help="Arquivo JSON com o pedido (padrão: entrada padrão)")
+
+    report_parser = subparsers.add_parser("report", help="Relatório de um ou mais pedidos")
+    report_parser.add_argument("order_ids", nargs="+", type=int, metavar="ID")
+
+    ranking_parser = subparsers.add_parser("ranking", help="Ranking de vendas por funcionário")
+    ranking_parser.add_argument("--from", dest="start_date", type=_parse_date, required=True)
+    ranking_parser.add_argument("--to", dest="end_date", type=_parse_date, required=True)
+    ranking_parser.add_argument("--snapshot", action="store_true",
+                                help="Calcula a partir do snapshot colunar em memória (ver o comando snapshot)")
+
+    team_ranking_parser = subparsers.add_parser("team-ranking",
+                                                help="Ranking de vendas por equipe (funcionário e subordinados)")
+    team_ranking_parser.add_argument("--from", dest="start_date", type=_parse_date, required=True)
+    team_ranking_parser.add_argument("--to", dest="end_date", type=_parse_date, required=True)
+
+    rollup_parser = subparsers.add_parser("rollup", help="Resumo de vendas por combinações de dimensões (GROUPING SETS)")
+    rollup_parser.add_argument("--from", dest="start_date", type=_parse_date, required=True)
+    rollup_parser.add_argument("--to", dest="end_date", type=_parse_date, required=True)
+    rollup_parser.add_argument("--snapshot", action="store_true",
+                               help="Calcula a partir do snapshot colunar em memória (ver o comando snapshot)")
+    rollup_parser.add_argument("--by", dest="grouping_sets", type=_parse_dimensions, action="append", metavar="DIMENSÕES",
+                               help="Combinação de dimensões separadas por vírgula (repetível; 'total' para o total geral). "
+                                    f"Dimensões: {', '.join(SALES_ROLLUP_DIMENSIONS)}")
+    rollup_parser.add_argument("--rollup", type=_parse_dimensions, metavar="DIMENSÕES",
+                               help="Dimensões hierárquicas (ROLLUP), por exemplo category,product")
+
+    trend_parser = subparsers.add_parser("trend", help="Tendência de vendas por funcionário (acumulado e média móvel)")
+    trend_parser.add_argument("--from", dest="start_date", type=_parse_date, required=True)
+    trend_parser.add_argument("--to", dest="end_date", type=_parse_date, required=True)
+    trend_parser.add_argument("--bucket", choices=SALES_TREND_BUCKETS, default="month",
+                              help="Granularidade dos períodos (padrão: month)")
+    trend_parser.add_argument("--window", type=int, default=3, help="Períodos da média móvel (padrão: 3)")
+    trend_parser.add_argument("--summary", action="store_true",
+                              help="Lê o resumo diário pré-agregado (ver o comando sales-summary)")
+
+    list_parser = subparsers.add_parser("list-orders", help="Lista pedidos por cliente, funcionário e/ou período (paginado)")
+    list_parser.add_argument("--customer", help="Nome da empresa do cliente")
+    list_parser.add_argument("--employee", nargs=2, metavar=("NOME", "SOBRENOME"), help="Funcionário")
+    list_parser.add_argument("--from", dest="start_date", type=_parse_date, help="Data inicial (AAAA-MM-DD)")
+    list_parser.add_argument("--to", dest="end_date", type=_parse_date, help="Data final (AAAA-MM-DD)")
+    list_parser.add_argument("--page-size", type=int, default=50, help="Pedidos por página (padrão: 50)")
+    list_parser.add_argument("--cursor", help="next_cursor da página anterior")
+
+    search_parser = subparsers.add_parser("search", help="Busca clientes ou produtos por nome parcial ou com erros")
+    search_parser.add_argument("catalog", choices=NAME_SEARCH_CATALOGS)
+    search_parser.add_argument("term", help="Texto a buscar")
+    search_parser.add_argument("--limit", type=int, default=10, help="Quantidade máxima de resultados (padrão: 10)")
+
+    quote_parser = subparsers.add_parser("quote", help="Cota cestas de produtos sem criar pedidos")
+    quote_parser.add_argument("file", type=argparse.FileType("r", encoding="utf-8"),
+                              help="Cestas (listas de itens ou pedidos) em JSON ou JSON Lines")
+
+    import_parser = subparsers.add_parser("import", help="Importa pedidos de um arquivo JSON Lines")
+    import_parser.add_argument("file", type=argparse.FileType("r", encoding="utf-8"))
+
+    export_parser = subparsers.add_parser("export", help="Exporta os pedidos de um período em JSON Lines")
+    export_parser.add_argument("--from", dest="start_date", type=_parse_date, required=True)
+    export_parser.add_argument("--to", dest="end_date", type=_parse_date, required=True)
+    export_parser.add_argument("--output", type=argparse.FileType("w", encoding="utf-8"), default=sys.stdout)
+
+    subparsers.add_parser("batch", help="Processa requisições JSON (uma por linha) da entrada padrão")
+
+    partitions_parser = subparsers.add_parser("partitions", help="Particionamento de pedidos por data")
+    partitions_parser.add_argument("action", choices=("migrate", "maintain", "list"),
+                                   help="migrate: converte as tabelas; maintain: cria partições futuras; list: lista as partições")
+    partitions_parser.add_argument("--granularity", choices=("month", "year"), default="month",
+                                   help="Tamanho de cada partição na conversão (padrão: month)")
+    partitions_parser.add_argument("--ahead", type=int, default=3, help="Partições futuras a manter criadas")
+
+    archive_parser = subparsers.add_parser("archive", help="Move os pedidos anteriores a uma data para as tabelas de arquivo")
+    archive_parser.add_argument("--before", dest="cutoff", type=_parse_date, required=True,
+                                help="Data de corte (exclusiva), no formato AAAA-MM-DD")
+    archive_parser.add_argument("--batch-size", type=int, default=1000, help="Pedidos movidos por transação")
+
+    summary_parser = subparsers.add_parser("sales-summary", help="Resumo diário de vendas usado por trend --summary")
+    summary_parser.add_argument("action", choices=("create", "refresh"),
+                                help="create: cria a materialized view; refresh: recalcula o resumo")
+
+    hierarchy_parser = subparsers.add_parser("hierarchy", help="Hierarquia de funcionários usada pelo team-ranking")
+    hierarchy_parser.add_argument("action", choices=("build",),
+                                  help="build: cria a closure table e a trigger que a mantém atualizada")
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Snapshot colunar (NumPy) usado por ranking/rollup --snapshot")
+    snapshot_parser.add_argument("action", choices=("refresh",),
+                                 help="refresh: carrega os pedidos novos (incremental por ID de pedido)")
+    snapshot_parser.add_argument("--full", action="store_true", help="Recarrega todos os pedidos")
+
+    listing_index_parser = subparsers.add_parser("listing-index", help="Índices usados pelo list-orders")
+    listing_index_parser.add_argument("action", choices=("create",),
+                                      help="create: cria os índices por cliente, funcionário e data")
+
+    search_index_parser = subparsers.add_parser("search-index", help="Índices de trigramas usados pelo search em catálogos grandes")
+    search_index_parser.add_argument("action", choices=("create",),
+                                     help="create: cria a extensão pg_trgm e os índices dos nomes")
+
+    totals_parser = subparsers.add_parser("totals", help="Totais gravados dos pedidos (DB_ORDER_TOTALS)")
+    totals_parser.add_argument("action", choices=("backfill",),
+                               help="backfill: cria as colunas e triggers e calcula os totais dos pedidos existentes")
+    totals_parser.add_argument("--batch-size", type=int, default=5000, help="Linhas atualizadas por transação")
+
+    feed_parser = subparsers.add_parser("feed", help="Feed de pedidos novos (outbox com NOTIFY)")
+    feed_parser.add_argument("action", choices=("install", "tail", "prune"),
+                             help="install: cria o feed e a trigger; tail: lê os pedidos novos; "
+                                  "prune: remove as entradas já confirmadas por todos os consumidores")
+    feed_parser.add_argument("--consumer", help="Nome do consumidor (tail), que guarda o offset confirmado")
+    feed_parser.add_argument("--offset", help="Lê a partir deste offset em vez do último confirmado")
+    feed_parser.add_argument("--batch-size", type=int, default=100, help="Pedidos por leitura (padrão: 100)")
+    feed_parser.add_argument("--follow", action="store_true", help="Continua esperando pedidos novos")
+    feed_parser.add_argument("--poll-interval", type=float, default=5.0,
+                             help="Espera máxima (s) por um aviso antes de ler o feed novamente (padrão: 5)")
+
+    jobs_parser = subparsers.add_parser("jobs", help="Relatórios demorados em segundo plano (fila local com resultados)")
+    jobs_parser.add_argument("action", choices=("submit", "status", "result", "worker", "purge"),
+                             help="submit: enfileira um job e escreve o seu ID; status: situação do job; "
+                                  "result: resultado do job concluído; worker: executa os jobs enfileirados; "
+                                  "purge: remove os resultados expirados")
+    jobs_parser.add_argument("job_id", nargs="?", help="ID do job (status e result)")
+    jobs_parser.add_argument("--kind", choices=JOB_KINDS, help="Tipo do job (submit)")
+    jobs_parser.add_argument("--from", dest="start_date", type=_parse_date, help="Data inicial (ranking, rollup e export)")
+    jobs_parser.add_argument("--to", dest="end_date", type=_parse_date, help="Data final (ranking, rollup e export)")
+    jobs_parser.add_argument("--by", dest="grouping_sets", type=_parse_dimensions, action="append", metavar="DIMENSÕES",
+                             help="Combinação de dimensões do rollup (repetível), como no comando rollup")
+    jobs_parser.add_argument("--rollup", type=_parse_dimensions, metavar="DIMENSÕES", help="Dimensões hierárquicas do rollup")
+    jobs_parser.add_argument("--order-ids", type=int, nargs="+", metavar="ID", help="Pedidos do job reports")
+    jobs_parser.add_argument("--output", type=argparse.FileType("w", encoding="utf-8"), default=sys.stdout,
+                             help="Arquivo do resultado (result)")
+    jobs_parser.add_argument("--workers", type=int, default=4, help="Threads do worker (padrão: 4)")
+    jobs_parser.add_argument("--poll-interval", type=float, default=1.0,
+                             help="Espera (s) entre consultas à fila vazia (padrão: 1)")
+    jobs_parser.add_argument("--drain", action="store_true", help="O worker termina quando a fila esvaziar")
+
+    subparsers.add_parser("replicate-reference",
+                          help="Copia as tabelas de referência do banco principal para os shards (DB_SHARD_HOSTS)")
+
+    serve_parser = subparsers.add_parser("serve", help="Inicia o serviço HTTP/JSON")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--workers", type=int, default=8, help="Threads que atendem requisições")
+    serve_parser.add_argument("--queue-size", type=int, default=64, help="Conexões aguardando um worker antes de responder 503")
+    serve_parser.add_argument("--timeout", type=float, default=10.0, help="Tempo máximo (s) de espera por dados do cliente")
+    serve_parser.add_argument("--keepalive-timeout", type=float, default=2.0,
+                              help="Tempo máximo (s) de espera pela próxima requisição em uma conexão keep-alive")
+    serve_parser.add_argument("--batch-writes", action="store_true",
+                              help="Grava os pedidos do psycopg em lotes (group commit)")
+    serve_parser.add_argument("--coalesce-reads", action="store_true",
+                              help="Agrupa relatórios e rankings idênticos em andamento")
+
+    return parser
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Ponto de entrada da interface não interativa.
+
+    Returns:
+        int: Código de saída (0 quando todas as operações foram bem-sucedidas)
+    """
+    args = build_parser().parse_args(argv)
+    output = sys.stdout
+
+    if args.command == "serve":
+        from app.view.http_service import serve
+        serve(args.host, args.port, args.backend, args.workers, args.queue_size, args.timeout,
+              args.keepalive_timeout, args.batch_writes, args.coalesce_reads)
+        return 0
+
+    # Mensagens impressas pelas camadas internas vão para stderr, mantendo stdout apenas com JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.command in ("create-order", "import"):
+            all_ok = True
+            for order in _read_orders(args.file):
+                result = create_order(args.backend, order)
+                all_ok = all_ok and result['ok']
+                write_json(result, output)
+        elif args.command == "report":
+            results = [order_report(args.backend, order_id) for order_id in args.order_ids]
+            all_ok = all(result['ok'] for result in results)
+            for result in results:
+                write_json(result, output)
+        elif args.command == "ranking":
+            result = employee_ranking("columnar" if args.snapshot else args.backend, args.start_date, args.end_date)
+            all_ok = result['ok']
+            write_json(result, output)
+        elif args.command == "team-ranking":
+            result = team_ranking(args.backend, args.start_date, args.end_date)
+            all_ok = result['ok']
+            write_json(result, output)
+        elif args.command == "rollup":
+            result = sales_rollup("columnar" if args.snapshot else args.backend, args.start_date, args.end_date,
+                                  args.grouping_sets, args.rollup)
+            all_ok = result['ok']
+            write_json(result, output)
+        elif args.command == "trend":
+            result = sales_trend(args.backend, args.start_date, args.end_date, args.bucket, args.window, args.summary)
+            all_ok = result['ok']
+            write_json(result, output)
+        elif args.command == "list-orders":
+            result = list_orders(args.backend, args.customer, args.employee, args.start_date, args.end_date,
+                                 args.cursor, args.page_size)
+            all_ok = result['ok']
+            write_json(result, output)
+        elif args.command == "search":
+            result = search_names(args.catalog, args.term, args.limit)
+            all_ok = result['ok']
+            write_json(result, output)
+        elif args.command == "quote":
+            baskets = _read_orders(args.file)
+            invalid = [basket for basket in baskets if isinstance(basket, InvalidLine)]
+            result = invalid[0].as_result() if invalid else quote_baskets(baskets)
+            all_ok = result['ok'] and not any(quote['unknown_products'] for quote in result['quotes'])
+            if not result['ok']:
+                write_json(result, output)
+            for quote in result.get('quotes', ()):
+                write_json(quote, output)
+        elif args.command == "export":
+            all_ok = export_orders(args.backend, args.start_date, args.end_date, args.output)
+        elif args.command == "partitions":
+            from app.dao import partitioning
+            if args.action == "migrate":
+                all_ok = partitioning.partition_order_tables(args.granularity, args.ahead)
+                write_json({'ok': all_ok}, output)
+            elif args.action == "maintain":
+                created = partitioning.ensure_order_partitions(args.ahead)
+                all_ok = created is not None
+                write_json({'ok': all_ok, 'created': created}, output)
+            else:
+                partitions = partitioning.list_order_partitions()
+                all_ok = partitions is not None
+                write_json({'ok': all_ok, 'partitions': partitions or []}, output)
+        elif args.command == "archive":
+            from app.dao.archive import archive_orders
+            archived = archive_orders(args.cutoff, args.batch_size)
+            all_ok = archived is not None
+            write_json({'ok': all_ok, 'archived': archived}, output)
+        elif args.command == "sales-summary":
+            from app.dao import sales_summary
+            if args.action == "create":
+                all_ok = sales_summary.create_sales_summary()
+            else:
+                all_ok = sales_summary.refresh_sales_summary()
+            write_json({'ok': all_ok}, output)
+        elif args.command == "hierarchy":
+            from app.dao.employee_hierarchy import build_employee_closure
+            all_ok = build_employee_closure()
+            write_json({'ok': all_ok}, output)
+        elif args.command == "snapshot":
+            from app.dao.columnar_dao import refresh_snapshot
+            added = refresh_snapshot(args.full)
+            all_ok = added is not None
+            write_json({'ok': all_ok, 'added': added}, output)
+        elif args.command == "listing-index":
+            from app.dao.order_listing import create_order_listing_indexes
+            all_ok = create_order_listing_indexes()
+            write_json({'ok': all_ok}, output)
+        elif args.command == "search-index":
+            from app.dao.name_search import install_name_search_indexes
+            all_ok = install_name_search_indexes()
+            write_json({'ok': all_ok}, output)
+        elif args.command == "totals":
+            from app.dao.order_totals import backfill_order_totals
+            filled = backfill_order_totals(args.batch_size)
+            all_ok = filled is not None
+            write_json({'ok': all_ok, 'filled': filled}, output)
+        elif args.command == "feed":
+            from app.dao import order_feed
+            if args.action == "install":
+                all_ok = order_feed.install_order_feed()
+                write_json({'ok': all_ok}, output)
+            elif args.action == "prune":
+                removed = order_feed.prune_order_feed()
+                all_ok = removed is not None
+                write_json({'ok': all_ok, 'removed': removed}, output)
+            else:
+                all_ok = tail_order_feed(args.backend, args.consumer, args.offset, args.batch_size,
+                                         args.follow, args.poll_interval, output)
+        elif args.command == "jobs":
+            if args.action == "submit":
+                if args.kind == "reports":
+                    params = {'order_ids': args.order_ids}
+                else:
+                    params = {
+                        'from': args.start_date.isoformat() if args.start_date else None,
+                        'to': args.end_date.isoformat() if args.end_date else None
+                    }
+                    if args.kind == "rollup":
+                        params.update(grouping_sets=args.grouping_sets, rollup=args.rollup)
+                result = submit_job(args.backend, args.kind, params)
+                all_ok = result['ok']
+                write_json(result, output)
+            elif args.action == "status":
+                result = job_status(args.job_id)
+                all_ok = result['ok']
+                write_json(result, output)
+            elif args.action == "result":
+                all_ok = write_job_result(args.job_id, args.output)
+            elif args.action == "worker":
+                all_ok = run_job_workers(args.workers, args.poll_interval, args.drain, output)
+            else:
+                from app.dao.job_store import purge_expired_jobs
+                removed = purge_expired_jobs()
+                all_ok = removed is not None
+                write_json({'ok': all_ok, 'removed': removed}, output)
+        elif args.command == "replicate-reference":
+            from app.dao.sharded_dao import replicate_reference_tables
+            all_ok = replicate_reference_tables()
+            write_json({'ok': all_ok}, output)
+        else:
+            all_ok = run_batch(args.backend, sys.stdin, output)
+
+    return 0 if all_ok else 1
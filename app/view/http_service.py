@@ -0,0 +1,263 @@
+from app.view.command_line import BACKENDS, create_order, order_report, employee_ranking, search_names, json_default
+from app.controller.order_controller import OrderController, BackendFailure, TimeoutResult, NAME_SEARCH_CATALOGS
+from app.dao.base_dao import configure_connection_pool, set_current_client, reset_current_client, partitioned_orders_enabled
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+import json
+import signal
+import threading
+
+MAX_BODY_SIZE = 1024 * 1024
+
+class WorkerPoolHTTPServer(HTTPServer):
+    """
+    Servidor HTTP que atende as conexões em um pool de threads de tamanho fixo.
+    Conexões além da capacidade (workers + fila) recebem 503 imediatamente,
+    em vez de criar threads sem limite como o ThreadingHTTPServer.
+    """
+    def __init__(self, server_address, handler_class, workers: int = 8, queue_size: int = 64):
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        # Aguarda as requisições em andamento antes de encerrar
+        self._executor.shutdown(wait=True)
+
+
+class OrderRequestHandler(BaseHTTPRequestHandler):
+    """
+    Rotas:
+        POST /orders                Cria um pedido (mesmo JSON aceito por `main.py create-order`)
+        GET  /orders/<id>           Relatório do pedido
+        GET  /ranking?from=&to=     Ranking de vendas por funcionário (datas AAAA-MM-DD)
+        GET  /search/<catálogo>?q=  Clientes (customers) ou produtos (products) por nome parcial ou com erros
+        GET  /backends              Latência medida de cada backend por operação (modo auto)
+    O parâmetro opcional ?backend=psycopg|sqlalchemy|sharded|auto escolhe o método de acesso ao banco.
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "NorthwindOrders/1.0"
+    default_backend = "psycopg"
+    keepalive_timeout = 2.0
+
+    def log_message(self, format, *args):
+        # O log padrão escreve uma linha por requisição no stderr; mantém apenas os erros
+        pass
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            # Uma conexão keep-alive ociosa ocupa um worker: a próxima requisição tem
+            # keepalive_timeout segundos para começar, em vez do timeout de leitura inteiro
+            self.connection.settimeout(self.keepalive_timeout)
+            self.handle_one_request()
+
+    def parse_request(self):
+        # A linha da requisição chegou: o restante dela volta a ter o timeout de leitura
+        self.connection.settimeout(self.timeout)
+        return super().parse_request()
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload, default=json_default, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_result(self, result: dict, success_status: int, error_status: int) -> None:
+        """
+        Envia o resultado de uma operação; as canceladas por tempo limite respondem 504 e as que
+        falharam no banco, 503
+        """
+        if result['ok']:
+            status = success_status
+        elif isinstance(result.get('error'), TimeoutResult):
+            status = 504
+        elif isinstance(result.get('error'), BackendFailure):
+            status = 503
+        else:
+            status = error_status
+        self._send_json(status, result)
+
+    def _backend(self, query: dict) -> str | None:
+        backend = query.get("backend", [self.default_backend])[0]
+        return backend if backend in BACKENDS else None
+
+    def _as_client(self, handler) -> None:
+        # Identifica o cliente (X-Client-Id ou IP) para que ele leia as próprias gravações
+        token = set_current_client(self.headers.get("X-Client-Id") or self.client_address[0])
+        try:
+            handler()
+        finally:
+            reset_current_client(token)
+
+    def do_GET(self):
+        self._as_client(self._handle_get)
+
+    def do_POST(self):
+        self._as_client(self._handle_post)
+
+    def _handle_get(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        backend = self._backend(query)
+        if backend is None:
+            self._send_json(400, {'ok': False, 'error': "Backend inválido."})
+            return
+
+        parts = [part for part in url.path.split("/") if part]
+
+        if len(parts) == 2 and parts[0] == "orders":
+            try:
+                order_id = int(parts[1])
+            except ValueError:
+                self._send_json(400, {'ok': False, 'error': "ID do pedido deve ser um número inteiro."})
+                return
+            result = order_report(backend, order_id)
+            self._send_result(result, 200, 404)
+            return
+
+        if parts == ["ranking"]:
+            try:
+                start_date = datetime.strptime(query["from"][0], "%Y-%m-%d").date()
+                end_date = datetime.strptime(query["to"][0], "%Y-%m-%d").date()
+            except (KeyError, ValueError):
+                self._send_json(400, {'ok': False, 'error': "Informe from e to no formato AAAA-MM-DD."})
+                return
+            result = employee_ranking(backend, start_date, end_date)
+            self._send_result(result, 200, 400)
+            return
+
+        if len(parts) == 2 and parts[0] == "search":
+            # Autocompletar: /search/customers?q=alfr ou /search/products?q=chai&limit=5
+            try:
+                limit = int(query.get("limit", ["10"])[0])
+            except ValueError:
+                self._send_json(400, {'ok': False, 'error': "limit deve ser um número inteiro."})
+                return
+            result = search_names(parts[1], query.get("q", [""])[0], limit)
+            self._send_result(result, 200, 400)
+            return
+
+        if parts == ["backends"]:
+            self._send_json(200, {'ok': True, 'operations': OrderController.get_backend_statistics()})
+            return
+
+        self._send_json(404, {'ok': False, 'error': "Rota não encontrada."})
+
+    def _handle_post(self):
+        url = urlsplit(self.path)
+        backend = self._backend(parse_qs(url.query))
+        if backend is None:
+            self._send_json(400, {'ok': False, 'error': "Backend inválido."})
+            return
+
+        if url.path.rstrip("/") != "/orders":
+            self._send_json(404, {'ok': False, 'error': "Rota não encontrada."})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = 0
+        if length <= 0 or length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self._send_json(413 if length > MAX_BODY_SIZE else 400, {'ok': False, 'error': "Corpo da requisição inválido."})
+            return
+
+        try:
+            order = json.loads(self.rfile.read(length))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self._send_json(400, {'ok': False, 'error': f"JSON inválido: {e}"})
+            return
+
+        if not isinstance(order, dict):
+            self._send_json(400, {'ok': False, 'error': "O pedido deve ser um objeto JSON."})
+            return
+
+        result = create_order(backend, order)
+        self._send_result(result, 201, 422)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, backend: str = "psycopg",
+          workers: int = 8, queue_size: int = 64, request_timeout: float = 10.0,
+          keepalive_timeout: float = 2.0, batch_writes: bool = False, coalesce_reads: bool = False) -> None:
+    """
+    Inicia o serviço HTTP e bloqueia até receber SIGINT/SIGTERM.
+
+    Args:
+        host (str): Endereço de escuta
+        port (int): Porta de escuta
+        backend (str): Backend padrão quando a requisição não informa ?backend=
+        workers (int): Quantidade de threads que atendem requisições
+        queue_size (int): Conexões aceitas aguardando um worker antes de responder 503
+        request_timeout (float): Tempo máximo (s) de espera por dados do cliente em uma conexão
+        keepalive_timeout (float): Tempo máximo (s) que uma conexão keep-alive ociosa aguarda a
+            próxima requisição antes de ser fechada
+        batch_writes (bool): Agrupa as gravações de pedidos do psycopg em lotes (group commit)
+        coalesce_reads (bool): Agrupa relatórios de pedido e rankings idênticos em andamento
+    """
+    # Cada worker precisa de uma conexão própria, assim como as threads em segundo plano: a
+    # recarga do índice de cada catálogo da busca por nome e a manutenção das partições (o gravador
+    # em lote reserva a sua). Com o pool esgotado, o psycopg falha em vez de esperar uma conexão ser
+    # devolvida. (O agrupamento de leituras roda na thread do worker que conduz o lote.)
+    background_connections = len(NAME_SEARCH_CATALOGS) + int(partitioned_orders_enabled())
+    configure_connection_pool(workers + background_connections)
+    if batch_writes:
+        OrderController.enable_write_batching()
+    if coalesce_reads:
+        OrderController.enable_read_coalescing()
+    partition_maintenance = None
+    if partitioned_orders_enabled():
+        # Mantém criadas as partições dos próximos meses enquanto o serviço estiver no ar
+        from app.dao.partitioning import start_partition_maintenance
+        partition_maintenance = start_partition_maintenance()
+
+    handler = type("ConfiguredOrderRequestHandler", (OrderRequestHandler,), {
+        'default_backend': backend,
+        'timeout': request_timeout,
+        'keepalive_timeout': keepalive_timeout,
+    })
+    server = WorkerPoolHTTPServer((host, port), handler, workers=workers, queue_size=queue_size)
+
+    def _request_shutdown(signum, frame):
+        # shutdown() espera o loop terminar, então não pode rodar na thread do serve_forever
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, _request_shutdown)
+    signal.signal(signal.SIGTERM, _request_shutdown)
+
+    print(f"Servindo em http://{host}:{port} (backend padrão: {backend}, workers: {workers})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if partition_maintenance is not None:
+            partition_maintenance.set()
+        OrderController.disable_write_batching()
+        OrderController.disable_read_coalescing()
+        print("Servidor encerrado.")
@@ -0,0 +1,64 @@
+"""
+Compara a memória por objeto das classes de app/model/psycopg_model.py com os registros
+compactos (OrderRecord/OrderDetailRecord) usados pelos DAOs e pelas gravações em lote.
+
+Uso:
+    python benchmarks/model_memory.py [--count 100000]
+"""
+import argparse
+import datetime
+import decimal
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.model.psycopg_model import Orders, OrderDetails, OrderRecord, OrderDetailRecord
+
+ORDER_DATE = datetime.date(1997, 1, 1)
+FREIGHT = decimal.Decimal("32.38")
+
+def build_orders(model, count: int) -> list:
+    return [
+        model(orderid=10248 + i, customerid="VINET", employeeid=5, orderdate=ORDER_DATE,
+              freight=FREIGHT, shipname="Vins et alcools Chevalier", shipcity="Reims", shipcountry="France")
+        for i in range(count)
+    ]
+
+def build_details(model, count: int) -> list:
+    return [
+        model(orderid=10248 + i, productid=11, unitprice=14.0, quantity=12, discount=0.0, orderdate=ORDER_DATE)
+        for i in range(count)
+    ]
+
+def measure(build, model, count: int) -> tuple[float, float]:
+    """
+    Retorna (bytes por objeto, segundos de construção) para `count` objetos
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    objects = build(model, count)
+    elapsed = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return allocated / count, elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="Objetos criados por classe")
+    args = parser.parse_args()
+
+    print(f"{'CLASSE':<20} {'BYTES/OBJETO':>14} {'CONSTRUÇÃO (s)':>16}")
+    for build, classic, compact in ((build_orders, Orders, OrderRecord),
+                                    (build_details, OrderDetails, OrderDetailRecord)):
+        classic_size, classic_time = measure(build, classic, args.count)
+        compact_size, compact_time = measure(build, compact, args.count)
+        print(f"{classic.__name__:<20} {classic_size:>14.1f} {classic_time:>16.3f}")
+        print(f"{compact.__name__:<20} {compact_size:>14.1f} {compact_time:>16.3f}")
+        print(f"{'economia':<20} {1 - compact_size / classic_size:>14.1%}")
+
+if __name__ == "__main__":
+    main()
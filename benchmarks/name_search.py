@@ -0,0 +1,77 @@
+"""
+Mede a latência do índice de nomes em memória (app/dao/name_search.py) com um catálogo sintético:
+prefixos curtos e longos, palavras do meio do nome e nomes com erros de digitação.
+
+Uso:
+    python benchmarks/name_search.py [--rows 20000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.dao.name_search import NameIndex
+
+CONSONANTS = "bcdfghjklmnpqrstvwxz"
+VOWELS = "aeiouéã"
+SUFFIXES = ("Delikatessen", "Imports", "Markt", "Comercial", "Supermercado", "Trading", "Foods", "Restaurante")
+
+def random_word(rng: random.Random) -> str:
+    syllables = (rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 4)))
+    return ("".join(syllables) + rng.choice(("", "", "r", "s", "n", "l"))).capitalize()
+
+def build_catalog(rows: int, rng: random.Random) -> list[tuple]:
+    return [(position, f"{random_word(rng)} {random_word(rng)} {rng.choice(SUFFIXES)}") for position in range(rows)]
+
+def with_typo(name: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(name) - 1)
+    return name[:position] + rng.choice("aeiourst") + name[position + 1:]
+
+def build_queries(catalog: list[tuple], count: int, rng: random.Random) -> dict[str, list[tuple[str, str]]]:
+    """
+    Buscas por tipo, cada uma com o nome que deveria aparecer nos resultados
+    """
+    names = [name for _, name in rng.sample(catalog, count)]
+    return {
+        "prefixo (2)": [(name[:2], name) for name in names],
+        "prefixo (6)": [(name[:6], name) for name in names],
+        "palavra": [(name.split(" ")[1][:4], name) for name in names],
+        "erro de digitação": [(with_typo(name, rng), name) for name in names],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Nomes no catálogo")
+    parser.add_argument("--queries", type=int, default=2000, help="Buscas por tipo")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    catalog = build_catalog(args.rows, rng)
+
+    started = time.perf_counter()
+    index = NameIndex(catalog)
+    print(f"Índice de {len(index)} nomes criado em {time.perf_counter() - started:.2f} s\n")
+
+    # ENCONTRADO: fração das buscas em que o nome de origem está entre os 10 resultados (prefixos
+    # curtos têm muito mais de 10 nomes possíveis)
+    print(f"{'BUSCA':<20} {'MEDIANA (µs)':>14} {'P99 (µs)':>12} {'RESULTADOS':>12} {'ENCONTRADO':>12}")
+    for kind, queries in build_queries(catalog, min(args.queries, args.rows), rng).items():
+        timings = []
+        found = 0
+        hits = 0
+        for query, name in queries:
+            started = time.perf_counter()
+            results = index.search(query, 10)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+            found += len(results)
+            hits += any(result['name'] == name for result in results)
+        timings.sort()
+        print(f"{kind:<20} {statistics.median(timings):>14.1f} {timings[int(len(timings) * 0.99)]:>12.1f} "
+              f"{found / len(queries):>12.1f} {hits / len(queries):>12.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Mede a vazão do motor de cotação (app/dao/quote_engine.py) com uma tabela de preços sintética do
+tamanho da Northwind e cestas de 1 a 5 itens. Os totais são conferidos com o cálculo item a item.
+
+Uso:
+    python benchmarks/quote_engine.py [--baskets 100000] [--products 77]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.dao import quote_engine
+from app.dao.quote_engine import PriceList
+
+def build_baskets(names: list[str], count: int, rng: random.Random) -> list[list[dict]]:
+    return [
+        [
+            {'product_name': rng.choice(names), 'quantity': rng.randint(1, 50), 'discount': rng.choice((0.0, 0.05, 0.1))}
+            for _ in range(rng.randint(1, 5))
+        ]
+        for _ in range(count)
+    ]
+
+def quote_one_by_one(price_list: PriceList, baskets: list[list[dict]]) -> list[float]:
+    """
+    Referência: um produto resolvido e um item calculado por vez, como na criação de pedidos
+    """
+    totals = []
+    for items in baskets:
+        total = 0.0
+        for item in items:
+            position = price_list.positions[item['product_name']]
+            total += price_list.unit_prices[position] * item['quantity'] * (1 - item['discount'])
+        totals.append(total)
+    return totals
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baskets", type=int, default=100000, help="Cestas cotadas")
+    parser.add_argument("--products", type=int, default=77, help="Produtos na tabela de preços")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = [(position + 1, f"Produto {position + 1}", round(rng.uniform(2, 265), 2)) for position in range(args.products)]
+    price_list = PriceList(rows)
+    baskets = build_baskets([row[1] for row in rows], args.baskets, rng)
+
+    # Usa a tabela sintética em vez da carregada do banco
+    quote_engine._price_list = price_list
+    quote_engine._price_list_loaded_at = float("inf")
+
+    started = time.perf_counter()
+    quotes = quote_engine.quote_baskets(baskets)
+    engine_time = time.perf_counter() - started
+
+    basket_ids = [basket_id for basket_id, items in enumerate(baskets) for _ in items]
+    columns = [[item[key] for items in baskets for item in items] for key in ('product_name', 'quantity', 'discount')]
+    started = time.perf_counter()
+    price_list.quote_lines(basket_ids, *columns, len(baskets))
+    columns_time = time.perf_counter() - started
+
+    reference = quote_one_by_one(price_list, baskets)
+
+    difference = max(abs(quote['total_order'] - total) for quote, total in zip(quotes, reference))
+    lines = sum(len(items) for items in baskets)
+    print(f"{args.baskets} cestas, {lines} itens, NumPy: {'sim' if quote_engine.np is not None else 'não'}")
+    print(f"quote_baskets:  {engine_time:8.3f} s  ({args.baskets / engine_time:12,.0f} cestas/s)")
+    print(f"quote_lines:    {columns_time:8.3f} s  ({args.baskets / columns_time:12,.0f} cestas/s, itens já em colunas)")
+    print(f"maior diferença entre os totais: {difference:.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 from app.view.cli_view import (
     run_order_creation,
     run_order_report,
-    run_employee_ranking_report
+    run_employee_ranking_report,
+    run_sales_rollup_report,
+    run_sales_trend_report,
+    run_team_ranking_report
 )
-from app.view.slq_injection import demonstrar_sql_injection
+import sys
 
 def exibir_menu_principal():
     """Exibe o menu principal e processa a escolha do usuário"""
@@ -16,32 +19,38 @@ Opções:
 2. Demonstrar SQL Injection
 3. Relatório de Pedido
 4. Ranking de Vendas por Funcionário
-5. Sair
+5. Resumo de Vendas
+6. Tendência de Vendas
+7. Ranking de Vendas por Equipe
+8. Sair
 Escolha: """
     )
     
     if escolha == "2":
+        # Importado sob demanda: a demonstração usa o DAO vulnerável, que não é necessário nas demais opções
+        from app.view.slq_injection import demonstrar_sql_injection
         demonstrar_sql_injection()
         return
     
-    if escolha == "5":
+    if escolha == "8":
         print("Encerrando o programa. Até logo!")
         return
         
-    if escolha in ["1", "3", "4"]:
+    if escolha in ["1", "3", "4", "5", "6", "7"]:
         modo = ""
-        while modo not in ["1", "2"]:
+        while modo not in ["1", "2", "3"]:
             modo = input(
             """
 Selecione o modo de execução:
 1. psycopg
 2. sqlalchemy
+3. auto (backend mais rápido para cada operação)
 Escolha: """
             )
-            if modo not in ["1", "2"]:
-                print("Opção inválida. Por favor, escolha 1 ou 2.")
+            if modo not in ["1", "2", "3"]:
+                print("Opção inválida. Por favor, escolha 1, 2 ou 3.")
         
-        modo = "psycopg" if modo == "1" else "sqlalchemy"
+        modo = {"1": "psycopg", "2": "sqlalchemy", "3": "auto"}[modo]
         
         if escolha == "1":
             run_order_creation(modo)
@@ -49,11 +58,22 @@ Escolha: """
             run_order_report(modo)
         elif escolha == "4":
             run_employee_ranking_report(modo)
+        elif escolha == "5":
+            run_sales_rollup_report(modo)
+        elif escolha == "6":
+            run_sales_trend_report(modo)
+        elif escolha == "7":
+            run_team_ranking_report(modo)
     else:
-        print("Opção inválida. Por favor, escolha uma opção de 1 a 5.")
+        print("Opção inválida. Por favor, escolha uma opção de 1 a 8.")
         exibir_menu_principal()
 
 if __name__ == "__main__":
+    # Com argumentos, executa a interface não interativa (ver `python main.py --help`)
+    if len(sys.argv) > 1:
+        from app.view.command_line import main as executar_linha_de_comando
+        sys.exit(executar_linha_de_comando(sys.argv[1:]))
+    
     continuar = True
     while continuar:
         exibir_menu_principal()
@@ -0,0 +1,115 @@
+import pytest
+
+from app.controller import backend_selector, order_controller
+from app.controller.backend_selector import BackendSelector
+from app.controller.order_controller import BackendFailure, OrderController
+
+
+class FakeClock:
+    """
+    Substitui time.monotonic no seletor, para avançar o tempo sem esperar
+    """
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(backend_selector, "time", clock)
+    return clock
+
+
+def _measure(selector: BackendSelector, operation: str, latencies: dict) -> None:
+    for backend, seconds in latencies.items():
+        selector.record_success(operation, backend, seconds)
+
+
+def test_unmeasured_backends_are_tried_first(clock):
+    selector = BackendSelector(("psycopg", "sqlalchemy"))
+    assert selector.candidates("report") == ["psycopg", "sqlalchemy"]
+    selector.record_success("report", "psycopg", 0.01)
+    assert selector.candidates("report") == ["sqlalchemy", "psycopg"]
+
+
+def test_fastest_backend_is_chosen_and_the_slower_one_explored(clock):
+    selector = BackendSelector(("psycopg", "sqlalchemy"), explore_every=5)
+    _measure(selector, "report", {"psycopg": 0.050, "sqlalchemy": 0.010})
+
+    chosen = [selector.candidates("report")[0] for _ in range(10)]
+    assert chosen == ["sqlalchemy"] * 4 + ["psycopg"] + ["sqlalchemy"] * 4 + ["psycopg"]
+
+
+def test_latency_is_an_exponential_moving_average(clock):
+    selector = BackendSelector(("psycopg", "sqlalchemy"), smoothing=0.2)
+    selector.candidates("report")
+    selector.record_success("report", "psycopg", 0.100)
+    selector.record_success("report", "psycopg", 0.200)
+    selector.record_success("report", "psycopg", 0.200)
+
+    statistics = selector.statistics()["report"]["psycopg"]
+    assert statistics["latency_ms"] == pytest.approx(136.0)
+    assert statistics["executions"] == 3
+
+
+def test_failed_backend_is_suspended_for_the_cooldown(clock):
+    selector = BackendSelector(("psycopg", "sqlalchemy"), error_cooldown=30.0)
+    _measure(selector, "report", {"psycopg": 0.010, "sqlalchemy": 0.050})
+    selector.record_error("report", "psycopg")
+
+    assert selector.candidates("report") == ["sqlalchemy", "psycopg"]
+    assert selector.statistics()["report"]["psycopg"]["suspended"] is True
+    # A suspensão vale só para a operação em que o backend falhou
+    _measure(selector, "ranking", {"psycopg": 0.010, "sqlalchemy": 0.050})
+    assert selector.candidates("ranking")[0] == "psycopg"
+
+    clock.now += 31
+    assert selector.candidates("report") == ["psycopg", "sqlalchemy"]
+
+
+def test_all_suspended_backends_are_tried_by_cooldown_end(clock):
+    selector = BackendSelector(("psycopg", "sqlalchemy"))
+    selector.record_error("report", "sqlalchemy")
+    clock.now += 5
+    selector.record_error("report", "psycopg")
+    assert selector.candidates("report") == ["sqlalchemy", "psycopg"]
+
+
+@pytest.fixture
+def auto_backends(monkeypatch, clock):
+    """
+    Substitui get_order_report_<backend> pelos resultados de `results` e registra as chamadas
+    """
+    monkeypatch.setattr(order_controller, "_backend_selector", BackendSelector(order_controller.AUTO_BACKENDS))
+    results = {}
+    calls = []
+
+    def backend(name):
+        def get_order_report(order_id):
+            calls.append(name)
+            return results[name]
+        return staticmethod(get_order_report)
+
+    for name in order_controller.AUTO_BACKENDS:
+        monkeypatch.setattr(OrderController, f"get_order_report_{name}", backend(name))
+    return results, calls
+
+
+def test_auto_falls_back_when_the_backend_fails(auto_backends):
+    results, calls = auto_backends
+    results.update(psycopg=(False, BackendFailure("report")), sqlalchemy=(True, {'order_id': 1}))
+
+    assert OrderController.get_order_report_auto(1) == (True, {'order_id': 1})
+    assert calls == ["psycopg", "sqlalchemy"]
+    assert order_controller._backend_selector.statistics()["get_order_report"]["psycopg"]["errors"] == 1
+
+
+def test_auto_returns_not_found_without_fallback(auto_backends):
+    results, calls = auto_backends
+    results.update(psycopg=(False, "Erro: Pedido com ID 1 não encontrado."), sqlalchemy=(True, {}))
+
+    assert OrderController.get_order_report_auto(1) == (False, "Erro: Pedido com ID 1 não encontrado.")
+    assert calls == ["psycopg"]
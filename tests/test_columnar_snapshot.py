@@ -0,0 +1,89 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+columnar_dao = pytest.importorskip("app.dao.columnar_dao", exc_type=ImportError)
+
+
+class FakeSession:
+    """
+    Conexão com os itens de `orders`: o ID do pedido (um item, do produto 1) ou (pedido, produto),
+    devolvidos como pela consulta do snapshot
+    """
+    def __init__(self, orders: list):
+        self.orders = orders
+
+    def cursor(self, name=None):
+        return FakeCursor(self.orders)
+
+    def rollback(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, orders: list):
+        self.orders = orders
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql, params):
+        items = sorted(item if isinstance(item, tuple) else (item, 1) for item in self.orders)
+        self.rows = [
+            (order_id, 10000, 1, "Nancy Davolio", "ALFKI", "Alfreds", product_id, f"Produto {product_id}", 1, "Beverages", "Germany", "Germany", 10.0)
+            for order_id, product_id in items if order_id > params[0]
+        ]
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+
+@pytest.fixture
+def database(monkeypatch, tmp_path):
+    orders = []
+    monkeypatch.setenv("ANALYTICS_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(columnar_dao, "get_read_connection", lambda: FakeSession(orders))
+    monkeypatch.setattr(columnar_dao, "release_pooled_connection", lambda session: None)
+    monkeypatch.setattr(columnar_dao, "order_archive_enabled", lambda: False)
+    return orders
+
+
+def _snapshot_order_ids(tmp_path) -> list:
+    return sorted(np.fromfile(tmp_path / "orderid.bin", dtype="int32").tolist())
+
+
+def test_late_committed_lower_id_is_loaded(database, tmp_path):
+    database.extend([1, 2, 4])
+    assert columnar_dao.refresh_snapshot() == 3
+
+    # O pedido 3 foi confirmado depois do 4
+    database.extend([3, 5])
+    assert columnar_dao.refresh_snapshot() == 2
+    assert columnar_dao.refresh_snapshot() == 0
+    assert _snapshot_order_ids(tmp_path) == [1, 2, 3, 4, 5]
+
+
+def test_orders_before_the_safety_window_are_not_reread(database, tmp_path, monkeypatch):
+    monkeypatch.setenv("ANALYTICS_SNAPSHOT_SAFETY_WINDOW", "2")
+    database.extend([1, 5])
+    columnar_dao.refresh_snapshot()
+
+    # A janela relê os IDs maiores que 3: o pedido 4 entra, o 2 fica para o refresh --full
+    database.extend([2, 4])
+    assert columnar_dao.refresh_snapshot() == 1
+    assert _snapshot_order_ids(tmp_path) == [1, 4, 5]
+
+
+def test_line_committed_after_its_order_was_loaded(database, tmp_path):
+    # insert_order e insert_order_detail gravam o cabeçalho e cada item em transações separadas
+    database.extend([(1, 11), (2, 11)])
+    assert columnar_dao.refresh_snapshot() == 2
+
+    database.extend([(1, 42), (2, 72)])
+    assert columnar_dao.refresh_snapshot() == 2
+    assert columnar_dao.refresh_snapshot() == 0
+    assert _snapshot_order_ids(tmp_path) == [1, 1, 2, 2]
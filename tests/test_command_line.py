@@ -0,0 +1,41 @@
+import io
+import json
+
+from app.view import command_line
+
+
+def _results(output: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_batch_reports_invalid_lines_and_continues():
+    source = io.StringIO('{"command": "ranking"\n[1]\n"texto"\n{"command": "desconhecido"}\n')
+    output = io.StringIO()
+
+    assert command_line.run_batch("psycopg", source, output) is False
+
+    results = _results(output)
+    assert len(results) == 4
+    assert all(result['ok'] is False for result in results)
+    assert results[0]['error'].startswith("JSON inválido")
+    assert results[1]['error'].startswith("Requisição inválida")
+    assert results[2]['error'].startswith("Requisição inválida")
+    assert results[3]['error'] == "Comando desconhecido: desconhecido"
+
+
+def test_read_orders_keeps_valid_lines_around_invalid_ones():
+    orders = command_line._read_orders(io.StringIO('{"customer": "A"}\n{quebrado\n\n{"customer": "B"}\n'))
+
+    assert orders[0] == {'customer': "A"}
+    assert isinstance(orders[1], command_line.InvalidLine)
+    assert orders[1].line_number == 2
+    assert orders[2] == {'customer': "B"}
+
+
+def test_create_order_rejects_invalid_lines_and_non_objects():
+    invalid = command_line.InvalidLine(3, "Expecting value")
+
+    assert command_line.create_order("psycopg", invalid) == {
+        'ok': False, 'line': 3, 'error': "JSON inválido: Expecting value"
+    }
+    assert command_line.create_order("psycopg", [1])['ok'] is False
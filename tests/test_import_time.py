@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Orçamento de importação de main.py (tempo cumulativo medido por `python -X importtime`).
+# Sem os backends, fica em torno de 20 ms; o asyncio sozinho já passa de 50 ms e o SQLAlchemy de 100 ms.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "50"))
+
+# Módulos que só devem ser importados quando um backend (ou recurso opcional) é usado
+LAZY_MODULES = ("sqlalchemy", "psycopg2", "asyncpg", "asyncio", "numpy", "dotenv", "app.dao")
+
+
+def _import_main_time_ms() -> float:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "main":
+            return int(fields[1]) / 1000
+    raise AssertionError(f"main não aparece na saída de -X importtime:\n{completed.stderr}")
+
+
+def test_import_main_does_not_load_backends():
+    code = (
+        "import json, sys, main; "
+        f"print(json.dumps(sorted(m for m in sys.modules if m.startswith({LAZY_MODULES!r}))))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert json.loads(completed.stdout) == []
+
+
+def test_import_main_within_budget():
+    # O melhor de algumas execuções, para não depender de ruído da máquina
+    best = min(_import_main_time_ms() for _ in range(3))
+
+    assert best <= IMPORT_TIME_BUDGET_MS, f"import main levou {best:.1f} ms (orçamento: {IMPORT_TIME_BUDGET_MS} ms)"
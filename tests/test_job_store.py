@@ -0,0 +1,46 @@
+import pytest
+
+from app.dao import job_store
+
+
+@pytest.fixture(autouse=True)
+def jobs_db(monkeypatch, tmp_path):
+    monkeypatch.setenv("JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+
+
+def test_finished_job_keeps_its_result():
+    job_id, created = job_store.submit_job("ranking", "psycopg", {"start_date": "1997-01-01"})
+    assert created
+
+    job = job_store.claim_job(stale_after=3600)
+    assert (job['job_id'], job['status'], job['attempts']) == (job_id, 'running', 1)
+    assert job_store.finish_job(job_id, job['attempts'], True, [{"employee": "Nancy"}])
+
+    stored = job_store.find_job(job_id, include_result=True)
+    assert (stored['status'], stored['result']) == ('done', [{"employee": "Nancy"}])
+
+
+def test_result_of_a_reclaimed_attempt_is_discarded():
+    job_id, _ = job_store.submit_job("ranking", "psycopg", {})
+    first = job_store.claim_job(stale_after=3600)
+
+    # A primeira execução passou do limite e o job foi retomado, mas ela ainda termina
+    second = job_store.claim_job(stale_after=0)
+    assert second['attempts'] == 2
+    assert not job_store.finish_job(job_id, first['attempts'], True, "primeira")
+    assert job_store.find_job(job_id)['status'] == 'running'
+
+    assert job_store.finish_job(job_id, second['attempts'], True, "segunda")
+    assert not job_store.finish_job(job_id, first['attempts'], False, "Erro")
+    assert job_store.find_job(job_id, include_result=True)['result'] == "segunda"
+
+
+def test_unserializable_result_fails_the_job():
+    job_id, _ = job_store.submit_job("export", "psycopg", {})
+    job = job_store.claim_job(stale_after=3600)
+
+    assert not job_store.finish_job(job_id, job['attempts'], True, {"order": object()})
+    stored = job_store.find_job(job_id)
+    assert stored['status'] == 'failed'
+    assert "não pôde ser gravado" in stored['error']
+    assert job_store.claim_job(stale_after=0) is None
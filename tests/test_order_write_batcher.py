@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+order_write_batcher = pytest.importorskip("app.dao.order_write_batcher", exc_type=ImportError)
+from app.dao import base_dao
+from app.dao.base_dao import OperationTimeoutError
+from app.model.psycopg_model import OrderRecord
+
+OrderWriteBatcher = order_write_batcher.OrderWriteBatcher
+OrderWriteError = order_write_batcher.OrderWriteError
+
+
+def _order(customer_id: str) -> OrderRecord:
+    return OrderRecord(orderid=None, customerid=customer_id, employeeid=1, orderdate=None)
+
+
+class StubInsert:
+    """
+    Substitui insert_order_batch: registra os lotes recebidos e devolve o resultado de `outcome`
+    para cada pedido (um ID sequencial quando `outcome` devolve None)
+    """
+    def __init__(self, outcome=lambda order: None, delay: float = 0.0):
+        self.batches = []
+        self._outcome = outcome
+        self._delay = delay
+        self._next_id = 1
+
+    def __call__(self, entries):
+        time.sleep(self._delay)
+        self.batches.append([order.customerid for order, _ in entries])
+        results = []
+        for order, _ in entries:
+            result = self._outcome(order)
+            if result is None:
+                result, self._next_id = self._next_id, self._next_id + 1
+            results.append(result)
+        return results
+
+
+@pytest.fixture
+def stub_insert(monkeypatch):
+    def install(**kwargs):
+        stub = StubInsert(**kwargs)
+        monkeypatch.setattr(order_write_batcher, "insert_order_batch", stub)
+        return stub
+    return install
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_latency(stub_insert):
+    stub = stub_insert()
+    batcher = OrderWriteBatcher(max_batch_size=3, max_latency_ms=10_000)
+    try:
+        started = time.monotonic()
+        futures = [batcher.submit(_order(name), []) for name in ("A", "B", "C")]
+        assert [future.result(timeout=2) for future in futures] == [1, 2, 3]
+        assert time.monotonic() - started < 2
+        assert stub.batches == [["A", "B", "C"]]
+    finally:
+        batcher.close()
+
+
+def test_partial_batch_is_flushed_after_the_latency(stub_insert):
+    stub = stub_insert()
+    batcher = OrderWriteBatcher(max_batch_size=50, max_latency_ms=20)
+    try:
+        assert batcher.write(_order("A"), []) == 1
+        assert stub.batches == [["A"]]
+    finally:
+        batcher.close()
+
+
+def test_failed_orders_do_not_fail_the_rest_of_the_batch(stub_insert):
+    # Cada pedido do lote tem o seu SAVEPOINT: erros e timeouts chegam só ao pedido afetado
+    timeout = OperationTimeoutError("insert", 100)
+    outcomes = {"B": "Estoque insuficiente", "C": timeout}
+    stub_insert(outcome=lambda order: outcomes.get(order.customerid))
+    batcher = OrderWriteBatcher(max_batch_size=4, max_latency_ms=10_000)
+    try:
+        futures = {name: batcher.submit(_order(name), []) for name in ("A", "B", "C", "D")}
+        assert futures["A"].result(timeout=2) == 1
+        assert futures["D"].result(timeout=2) == 2
+        with pytest.raises(OrderWriteError, match="Estoque insuficiente"):
+            futures["B"].result(timeout=2)
+        with pytest.raises(OperationTimeoutError):
+            futures["C"].result(timeout=2)
+    finally:
+        batcher.close()
+
+
+def test_write_gives_up_after_the_result_timeout(stub_insert):
+    stub_insert(delay=0.5)
+    batcher = OrderWriteBatcher(max_batch_size=1, max_latency_ms=1, result_timeout=0.05)
+    try:
+        with pytest.raises(OrderWriteError, match="não foi confirmada"):
+            batcher.write(_order("A"), [])
+    finally:
+        batcher.close()
+
+
+def test_writer_reserves_a_pool_connection_while_active(stub_insert):
+    stub_insert()
+    reserved = base_dao._reserved_connections
+    batcher = OrderWriteBatcher()
+    assert base_dao._reserved_connections == reserved + 1
+    batcher.close()
+    assert base_dao._reserved_connections == reserved
+
+
+def test_closed_batcher_rejects_new_orders(stub_insert):
+    stub_insert()
+    batcher = OrderWriteBatcher()
+    batcher.close()
+    with pytest.raises(OrderWriteError):
+        batcher.submit(_order("A"), [])
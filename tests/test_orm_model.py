@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+orm_model = pytest.importorskip("app.model.orm_model", exc_type=ImportError)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+# Tabelas do esquema original: sem orderdate em order_details (tabelas particionadas) e sem os
+# totais (order_total, line_count, net_amount) criados por `totals backfill`
+_BASELINE_SCHEMA = (
+    """
+    CREATE TABLE northwind.orders (
+        orderid INTEGER PRIMARY KEY, customerid VARCHAR(5), employeeid INTEGER, orderdate DATETIME,
+        requireddate DATETIME, shippeddate DATETIME, freight NUMERIC(15, 4), shipname VARCHAR(35),
+        shipaddress VARCHAR(50), shipcity VARCHAR(15), shipregion VARCHAR(15),
+        shippostalcode VARCHAR(9), shipcountry VARCHAR(15), shipperid INTEGER
+    )
+    """,
+    """
+    CREATE TABLE northwind.order_details (
+        orderid INTEGER, productid INTEGER, unitprice NUMERIC(13, 4), quantity SMALLINT,
+        discount NUMERIC(10, 4), PRIMARY KEY (orderid, productid)
+    )
+    """,
+)
+
+
+@pytest.fixture
+def baseline_session():
+    """
+    Sessão em um SQLite com as tabelas do esquema original e os comandos SQL emitidos
+    """
+    engine = create_engine("sqlite://")
+    statements = []
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(connection, record):
+        connection.execute("ATTACH DATABASE ':memory:' AS northwind")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with engine.begin() as connection:
+        for ddl in _BASELINE_SCHEMA:
+            connection.exec_driver_sql(ddl)
+    statements.clear()
+
+    with Session(engine) as session:
+        yield session, statements
+    engine.dispose()
+
+
+def _inserts(statements: list, table: str) -> list:
+    return [statement for statement in statements if statement.startswith(f"INSERT INTO northwind.{table} ")]
+
+
+def test_order_detail_insert_leaves_out_columns_missing_from_the_baseline(baseline_session):
+    session, statements = baseline_session
+    # Como em insert_order_with_details sem as tabelas particionadas
+    session.add(orm_model.OrderDetails(orderid=1, productid=11, unitprice=14, quantity=12, discount=0, orderdate=None))
+    session.commit()
+
+    [insert] = _inserts(statements, "order_details")
+    assert "orderdate" not in insert
+    assert "net_amount" not in insert
+
+
+def test_order_insert_leaves_out_the_totals(baseline_session):
+    session, statements = baseline_session
+    order = orm_model.Orders(orderid=1, customerid="ALFKI", employeeid=1, orderdate=datetime.datetime(1997, 1, 1))
+    session.add(order)
+    session.add(orm_model.OrderDetails(orderid=1, productid=11, unitprice=14, quantity=12, discount=0))
+    session.commit()
+    assert order.orderid == 1
+
+    [insert] = _inserts(statements, "orders")
+    assert "order_total" not in insert
+    assert "line_count" not in insert
+    assert "net_amount" not in _inserts(statements, "order_details")[0]
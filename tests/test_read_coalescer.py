@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+read_coalescer = pytest.importorskip("app.dao.read_coalescer", exc_type=ImportError)
+from app.dao import base_dao
+
+OrderReportLoader = read_coalescer.OrderReportLoader
+OrderLoadError = read_coalescer.OrderLoadError
+
+
+def _load_concurrently(loader, requests):
+    """
+    Executa loader.load para cada (cliente, order_id) em uma thread própria e devolve, na mesma
+    ordem, o resultado ou a exceção de cada busca
+    """
+    results = [None] * len(requests)
+
+    def load(position, client_id, order_id):
+        token = base_dao.set_current_client(client_id)
+        try:
+            results[position] = loader.load(order_id)
+        except Exception as e:
+            results[position] = e
+        finally:
+            base_dao.reset_current_client(token)
+
+    threads = [threading.Thread(target=load, args=(position, *request)) for position, request in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_loads_share_one_batch():
+    batches = []
+
+    def batch_function(order_ids):
+        batches.append(sorted(order_ids))
+        return {order_id: {'order_id': order_id} for order_id in order_ids if order_id != 3}
+
+    loader = OrderReportLoader(batch_function, window_ms=200)
+    results = _load_concurrently(loader, [("a", 1), ("b", 2), ("c", 3), ("d", 1)])
+    assert batches == [[1, 2, 3]]
+    assert results == [{'order_id': 1}, {'order_id': 2}, None, {'order_id': 1}]
+
+
+def test_failed_batch_is_an_error_for_every_load():
+    # None é o erro do DAO: não pode chegar às buscas como "pedido não encontrado"
+    loader = OrderReportLoader(lambda order_ids: None, window_ms=200)
+    results = _load_concurrently(loader, [("a", 1), ("b", 2)])
+    assert all(isinstance(result, OrderLoadError) for result in results)
+
+
+def test_timeout_reaches_every_load():
+    def batch_function(order_ids):
+        raise base_dao.OperationTimeoutError("report", 100)
+
+    loader = OrderReportLoader(batch_function, window_ms=200)
+    results = _load_concurrently(loader, [("a", 1), ("b", 2)])
+    assert all(isinstance(result, base_dao.OperationTimeoutError) for result in results)
+
+
+def test_batch_goes_to_primary_when_any_client_wrote_recently(monkeypatch):
+    monkeypatch.setattr(base_dao, "_recent_writes", {"writer": float("inf")})
+    routed_to_primary = []
+
+    def batch_function(order_ids):
+        routed_to_primary.append(base_dao.reads_go_to_primary())
+        return {order_id: {'order_id': order_id} for order_id in order_ids}
+
+    loader = OrderReportLoader(batch_function, window_ms=200)
+    _load_concurrently(loader, [("reader", 1), ("writer", 2)])
+    assert routed_to_primary == [True]
+
+    _load_concurrently(loader, [("reader", 1), ("other", 2)])
+    assert routed_to_primary == [True, False]
@@ -0,0 +1,118 @@
+import itertools
+import threading
+
+import pytest
+
+base_dao = pytest.importorskip("app.dao.base_dao", exc_type=ImportError)
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    """
+    Duas réplicas cujo atraso é lido de `lags` (None: réplica inacessível), sem acessar o banco
+    """
+    replicas = [base_dao.ReadReplica("replica-a", "5432"), base_dao.ReadReplica("replica-b", "5432")]
+    lags = {"replica-a": 0.0, "replica-b": 0.0}
+    measured = []
+
+    def measure(replica):
+        measured.append(replica.host)
+        return lags[replica.host]
+
+    monkeypatch.setattr(base_dao, "_read_replicas", replicas)
+    monkeypatch.setattr(base_dao, "_read_replica_counter", itertools.count())
+    monkeypatch.setattr(base_dao, "_measure_replica_lag", measure)
+    monkeypatch.setattr(base_dao, "_recent_writes", {})
+    monkeypatch.setenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "0")
+    monkeypatch.setenv("DB_REPLICA_MAX_LAG_SECONDS", "5")
+    monkeypatch.setenv("DB_READ_YOUR_WRITES_SECONDS", "60")
+    return lags, measured
+
+
+def _chosen_hosts(count: int) -> list:
+    hosts = []
+    for _ in range(count):
+        replica = base_dao._choose_read_replica()
+        hosts.append(replica.host if replica is not None else None)
+    return hosts
+
+
+def test_reads_alternate_between_healthy_replicas(replicas):
+    assert _chosen_hosts(4) == ["replica-a", "replica-b", "replica-a", "replica-b"]
+
+
+def test_lagging_or_unreachable_replica_is_skipped(replicas):
+    lags, _ = replicas
+    lags["replica-a"] = 30.0
+    assert _chosen_hosts(2) == ["replica-b", "replica-b"]
+
+    lags["replica-b"] = None
+    assert _chosen_hosts(2) == [None, None]
+
+    lags["replica-a"] = 0.5
+    assert _chosen_hosts(2) == ["replica-a", "replica-a"]
+
+
+def test_lag_is_measured_once_per_check_interval(replicas, monkeypatch):
+    _, measured = replicas
+    monkeypatch.setenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "3600")
+    _chosen_hosts(6)
+    assert sorted(measured) == ["replica-a", "replica-b"]
+
+
+def test_client_reads_its_own_writes_from_the_primary(replicas):
+    token = base_dao.set_current_client("writer")
+    try:
+        base_dao.mark_recent_write()
+        assert _chosen_hosts(2) == [None, None]
+    finally:
+        base_dao.reset_current_client(token)
+
+    token = base_dao.set_current_client("reader")
+    try:
+        assert _chosen_hosts(1) == ["replica-a"]
+    finally:
+        base_dao.reset_current_client(token)
+
+
+def test_reads_return_to_replicas_after_the_window(replicas, monkeypatch):
+    monkeypatch.setenv("DB_READ_YOUR_WRITES_SECONDS", "0")
+    token = base_dao.set_current_client("writer")
+    try:
+        base_dao.mark_recent_write()
+        assert _chosen_hosts(1) == ["replica-a"]
+    finally:
+        base_dao.reset_current_client(token)
+
+
+def test_primary_reads_override_replicas(replicas):
+    token = base_dao.set_primary_reads(True)
+    try:
+        assert _chosen_hosts(1) == [None]
+    finally:
+        base_dao.reset_primary_reads(token)
+    assert _chosen_hosts(1) == ["replica-a"]
+
+
+def test_concurrent_writes_while_pruning(replicas, monkeypatch):
+    # Acima de 10000 clientes, mark_recent_write remove os vencidos enquanto outras threads gravam
+    monkeypatch.setattr(base_dao, "_recent_writes", {f"old-{n}": 0.0 for n in range(10001)})
+    errors = []
+
+    def write(thread_number):
+        try:
+            for n in range(200):
+                token = base_dao.set_current_client(f"client-{thread_number}-{n}")
+                base_dao.mark_recent_write()
+                assert base_dao.reads_go_to_primary()
+                base_dao.reset_current_client(token)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert errors == []
+    assert not any(client_id.startswith("old-") for client_id in base_dao._recent_writes)
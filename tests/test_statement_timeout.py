@@ -0,0 +1,60 @@
+import pytest
+
+base_dao = pytest.importorskip("app.dao.base_dao", exc_type=ImportError)
+
+
+def _cancelled(result):
+    """
+    Função do DAO que teve um comando cancelado por tempo e devolve `result`
+    """
+    @base_dao.with_statement_timeout("insert")
+    def operation():
+        base_dao._current_budget.get().timed_out = True
+        return result
+    return operation
+
+
+def test_timeout_without_result_raises():
+    base_dao.set_statement_timeout("insert", 100)
+    with pytest.raises(base_dao.OperationTimeoutError) as error:
+        _cancelled(None)()
+    assert error.value.operation == "insert"
+    assert error.value.timeout_ms == 100
+
+
+def test_timeout_with_result_is_reported_by_the_function():
+    # insert_order_batch grava os demais pedidos e informa o timeout só no pedido cancelado
+    timeout = base_dao.OperationTimeoutError("insert", 100)
+    assert _cancelled([1, timeout, 3])() == [1, timeout, 3]
+
+
+def test_operation_timed_out_outside_an_operation():
+    assert base_dao.operation_timed_out() is False
+
+
+def _failed(result):
+    """
+    Função do DAO que teve um erro do banco e devolve `result`
+    """
+    @base_dao.with_statement_timeout("lookup")
+    def operation():
+        base_dao._mark_operation_failed()
+        return result
+    return operation
+
+
+def test_database_failure_without_result_raises():
+    # Sem a exceção, o None seria lido como "registro não encontrado"
+    base_dao.set_statement_timeout("lookup", 100)
+    with pytest.raises(base_dao.OperationFailedError) as error:
+        _failed(None)()
+    assert error.value.operation == "lookup"
+
+
+def test_not_found_is_not_a_failure():
+    base_dao.set_statement_timeout("lookup", 100)
+    @base_dao.with_statement_timeout("lookup")
+    def operation():
+        return None
+    assert operation() is None
+    assert _failed(42)() == 42